@@ -9,24 +9,37 @@ Verwendung:
     python bin/bulk_import.py --dir ~/Downloads/Docs --config config/import_rules.yaml
     python bin/bulk_import.py --dir ~/Downloads/Docs --base-url https://renfield.local
     python bin/bulk_import.py --dir ~/Downloads/Docs --verify-ssl   # erzwingt SSL-Verifikation
+    python bin/bulk_import.py --dir ~/Downloads/Docs --workers 8     # 8 parallele Uploads
 
 Klassifizierungsreihenfolge:
     1. Dateiname: enthält PRIVAT / XIDRA / SSV / VP / VuP  →  KB-Name aus Regeln
     2. Adressat:  Text der 1. Seite (PDF) auf bekannte Muster prüfen
     3. Fallback:  unclassified — wird separat gemeldet (kein Upload)
 
-Duplikate (HTTP 409) werden als "bereits importiert" gewertet, nicht als Fehler.
+Duplikate werden als "bereits importiert" gewertet, nicht als Fehler. Vor dem
+Upload fragt der Importer per SHA-256 beim Server nach, welche Dateien schon in
+der Ziel-KB liegen (POST /api/knowledge/documents/check-hashes) — diese werden
+gar nicht erst übertragen. HTTP 409 beim Upload bleibt als Rückfallebene.
+
+Klassifizierung, Hashing und Uploads laufen parallel (--workers) über eine
+gemeinsame HTTP-Verbindung. Ein lokales Manifest (SQLite, Standard:
+<dir>/.bulk_import_manifest.sqlite) merkt sich erledigte Dateien samt Hash;
+ein abgebrochener Lauf setzt beim erneuten Aufruf dort fort.
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import re
+import sqlite3
 import subprocess
 import sys
+import threading
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -69,6 +82,12 @@ SUPPORTED_EXTENSIONS = {
     ".html", ".pptx", ".xlsx", ".png", ".jpg", ".jpeg",
 }
 
+MANIFEST_NAME = ".bulk_import_manifest.sqlite"
+# Status, mit denen eine Datei als erledigt gilt (Resume überspringt sie).
+DONE_STATUSES = {"uploaded", "duplicate"}
+# Max. Hashes pro Vorabprüfung (Server-Limit).
+HASH_CHECK_BATCH = 1000
+
 # ---------------------------------------------------------------------------
 # Datenklassen
 # ---------------------------------------------------------------------------
@@ -84,6 +103,9 @@ class ImportResult:
     chunk_count: int = 0
     error: Optional[str] = None
     force_ocr: bool = False
+    file_hash: Optional[str] = None
+    job_id: Optional[str] = None
+    from_manifest: bool = False  # In einem früheren Lauf erledigt
 
 
 # ---------------------------------------------------------------------------
@@ -150,15 +172,34 @@ def resolve_local_hostname(url: str) -> str:
     return url  # Auflösung fehlgeschlagen, Original-URL zurückgeben
 
 
-def fetch_kb_map(base_url: str, token: Optional[str], verify_ssl: bool = True) -> dict[str, int]:
-    """Lädt alle Knowledge Bases und gibt name→id zurück."""
+def make_client(base_url: str, token: Optional[str], verify_ssl: bool = True, workers: int = 1) -> httpx.Client:
+    """Gemeinsamer HTTP-Client (Keep-Alive, thread-safe) für alle Requests eines Laufs."""
     headers = {"Authorization": f"Bearer {token}"} if token else {}
-    with httpx.Client(base_url=base_url, timeout=10, verify=verify_ssl) as client:
-        r = client.get("/api/knowledge/bases", headers=headers)
-        r.raise_for_status()
+    return httpx.Client(
+        base_url=base_url,
+        headers=headers,
+        timeout=httpx.Timeout(300, connect=10),
+        verify=verify_ssl,
+        limits=httpx.Limits(max_connections=workers, max_keepalive_connections=workers),
+    )
+
+
+def fetch_kb_map(client: httpx.Client) -> dict[str, int]:
+    """Lädt alle Knowledge Bases und gibt name→id zurück."""
+    r = client.get("/api/knowledge/bases", timeout=10)
+    r.raise_for_status()
     return {kb["name"]: kb["id"] for kb in r.json()}
 
 
+def file_sha256(path: Path) -> str:
+    """SHA-256 des Dateiinhalts (wie der Server ihn für Duplikate berechnet)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def extract_first_page_text(path: Path) -> str:
     """Versucht, Text der 1. Seite eines PDFs zu extrahieren (best-effort)."""
     if path.suffix.lower() != ".pdf":
@@ -216,26 +257,12 @@ def should_force_ocr(path: Path, cfg: dict) -> bool:
     return path.suffix.lower() == ".pdf" and threshold > 0 and path.stat().st_size > threshold
 
 
-def upload_file(
-    path: Path,
-    kb_id: int,
-    force_ocr: bool,
-    base_url: str,
-    token: Optional[str],
-    verify_ssl: bool = True,
-) -> dict:
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
+def upload_file(client: httpx.Client, path: Path, kb_id: int, force_ocr: bool) -> dict:
     params = {"knowledge_base_id": kb_id, "force_ocr": str(force_ocr).lower()}
 
     with open(path, "rb") as f:
         files = {"file": (path.name, f, "application/octet-stream")}
-        with httpx.Client(base_url=base_url, timeout=300, verify=verify_ssl) as client:
-            r = client.post(
-                "/api/knowledge/upload",
-                params=params,
-                files=files,
-                headers=headers,
-            )
+        r = client.post("/api/knowledge/upload", params=params, files=files)
 
     if r.status_code == 409:
         return {"_duplicate": True, **r.json()}
@@ -243,6 +270,80 @@ def upload_file(
     return r.json()
 
 
+def check_hashes(client: httpx.Client, kb_id: int, hashes: list[str]) -> Optional[dict[str, int]]:
+    """Fragt ab, welche Hashes in der KB schon existieren (hash → Dokument-ID).
+
+    None, wenn der Server die Vorabprüfung nicht kennt (ältere Version) —
+    dann greift weiterhin HTTP 409 beim Upload.
+    """
+    existing: dict[str, int] = {}
+    for start in range(0, len(hashes), HASH_CHECK_BATCH):
+        r = client.post(
+            "/api/knowledge/documents/check-hashes",
+            json={"hashes": hashes[start:start + HASH_CHECK_BATCH], "knowledge_base_id": kb_id},
+            timeout=30,
+        )
+        if r.status_code in (404, 405):
+            return None
+        r.raise_for_status()
+        existing.update(r.json().get("existing", {}))
+    return existing
+
+
+class Manifest:
+    """Lokales Import-Protokoll (SQLite) — erneute Läufe setzen dort fort.
+
+    Ein Eintrag gilt nur, solange Größe und mtime der Datei unverändert sind.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                sha256 TEXT,
+                kb TEXT,
+                status TEXT,
+                document_id INTEGER,
+                job_id TEXT,
+                error TEXT,
+                updated_at TEXT
+            )
+        """)
+        self._conn.commit()
+
+    def lookup(self, path: Path) -> Optional[dict]:
+        stat = path.stat()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, kb, status, document_id, job_id FROM files WHERE path = ? AND size = ? AND mtime = ?",
+                (str(path.resolve()), stat.st_size, stat.st_mtime),
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("sha256", "kb", "status", "document_id", "job_id"), row, strict=True))
+
+    def record(self, r: ImportResult) -> None:
+        stat = r.path.stat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(r.path.resolve()), stat.st_size, stat.st_mtime, r.file_hash, r.kb_name,
+                    r.status, r.document_id, r.job_id, r.error, datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 # ---------------------------------------------------------------------------
 # Haupt-Ablauf
 # ---------------------------------------------------------------------------
@@ -259,12 +360,41 @@ def scan_directory(directory: Path, recursive: bool) -> list[Path]:
     )
 
 
+def prepare(path: Path, cfg: dict, manifest: Optional[Manifest]) -> ImportResult:
+    """Klassifiziert eine Datei und berechnet ihren Hash (aus dem Manifest, falls unverändert)."""
+    entry = manifest.lookup(path) if manifest else None
+    if entry and entry["status"] in DONE_STATUSES:
+        return ImportResult(
+            path=path,
+            kb_name=entry["kb"],
+            classification_reason="Manifest",
+            status=entry["status"],
+            document_id=entry["document_id"],
+            file_hash=entry["sha256"],
+            job_id=entry["job_id"],
+            from_manifest=True,
+        )
+
+    kb_name, reason = classify(path, cfg)
+    file_hash = None
+    if kb_name is not None:
+        file_hash = (entry or {}).get("sha256") or file_sha256(path)
+    return ImportResult(
+        path=path,
+        kb_name=kb_name,
+        classification_reason=reason,
+        force_ocr=should_force_ocr(path, cfg),
+        file_hash=file_hash,
+    )
+
+
 def print_plan(results: list[ImportResult], kb_map: dict[str, int]) -> None:
     print(f"\n{'='*72}")
     print(f"  RENFIELD BULK IMPORT — DRY RUN")
     print(f"{'='*72}")
+    done = [r for r in results if r.from_manifest]
     unclassified = [r for r in results if r.kb_name is None]
-    classified = [r for r in results if r.kb_name is not None]
+    classified = [r for r in results if r.kb_name is not None and not r.from_manifest]
 
     print(f"\n✅ Klassifiziert ({len(classified)} Dateien):\n")
     for r in classified:
@@ -277,69 +407,131 @@ def print_plan(results: list[ImportResult], kb_map: dict[str, int]) -> None:
         print(f"\n⚠️  Nicht klassifiziert ({len(unclassified)} Dateien — werden übersprungen):\n")
         for r in unclassified:
             print(f"  {r.path.name}")
+    if done:
+        print(f"\n⏭  Laut Manifest bereits erledigt: {len(done)} Dateien")
     print()
 
 
+def import_one(
+    r: ImportResult,
+    kb_id: int,
+    client: httpx.Client,
+    delay: float,
+) -> str:
+    """Lädt eine Datei hoch, setzt r.status und gibt die Ausgabezeile zurück."""
+    size_mb = r.path.stat().st_size / 1024 / 1024
+    ocr_flag = " [OCR]" if r.force_ocr else ""
+    line = f"⬆  {r.path.name} ({size_mb:.1f}MB){ocr_flag} → {r.kb_name}"
+
+    try:
+        data = upload_file(client, r.path, kb_id, r.force_ocr)
+        if data.get("_duplicate"):
+            r.status = "duplicate"
+            existing = data.get("detail", {})
+            if isinstance(existing, dict):
+                existing = existing.get("existing_document", {})
+            r.document_id = existing.get("id")
+            line += f" ⚠️  bereits vorhanden (ID={existing.get('id', '?')})"
+        elif data.get("status") == "failed":
+            r.status = "failed"
+            r.error = data.get("error_message") or data.get("error") or "Unbekannter Fehler"
+            line += f" ❌ Verarbeitung fehlgeschlagen: {r.error}"
+        elif data.get("job_id"):
+            # Server mit Ingestion Queue: 202 + Job, Indexierung läuft im Hintergrund
+            r.status = "uploaded"
+            r.document_id = data.get("document_id")
+            r.job_id = data["job_id"]
+            line += f" ✅ ID={r.document_id}, eingereiht ({r.job_id})"
+        else:
+            r.status = "uploaded"
+            r.document_id = data.get("id")
+            r.chunk_count = data.get("chunk_count", 0)
+            line += f" ✅ ID={r.document_id}, {r.chunk_count} Chunks"
+    except httpx.HTTPStatusError as e:
+        r.status = "failed"
+        r.error = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
+        line += f" ❌ {r.error}"
+    except Exception as e:
+        r.status = "failed"
+        r.error = str(e)
+        line += f" ❌ {r.error}"
+
+    if delay > 0:
+        time.sleep(delay)
+    return line
+
+
+def precheck_duplicates(pending: list[ImportResult], kb_map: dict[str, int], client: httpx.Client) -> int:
+    """Markiert Dateien, deren Hash in der Ziel-KB schon existiert, als Duplikat."""
+    by_kb: dict[int, list[ImportResult]] = {}
+    for r in pending:
+        by_kb.setdefault(kb_map[r.kb_name], []).append(r)
+
+    found = 0
+    for kb_id, group in by_kb.items():
+        try:
+            existing = check_hashes(client, kb_id, sorted({r.file_hash for r in group}))
+        except Exception as e:
+            print(f"   ⚠️  Hash-Vorabprüfung fehlgeschlagen ({e}) — Duplikate werden beim Upload erkannt")
+            return found
+        if existing is None:
+            print("   ℹ️  Server ohne Hash-Vorabprüfung — Duplikate werden beim Upload erkannt")
+            return found
+        for r in group:
+            if r.file_hash in existing:
+                r.status = "duplicate"
+                r.document_id = existing[r.file_hash]
+                found += 1
+    return found
+
+
 def run_import(
     results: list[ImportResult],
     kb_map: dict[str, int],
-    base_url: str,
-    token: Optional[str],
+    client: httpx.Client,
     delay: float,
-    verify_ssl: bool = True,
+    workers: int = 1,
+    manifest: Optional[Manifest] = None,
+    hash_check: bool = True,
 ) -> None:
-    to_upload = [r for r in results if r.kb_name is not None]
+    to_upload = [r for r in results if r.kb_name is not None and not r.from_manifest]
     skipped = [r for r in results if r.kb_name is None]
 
     for r in skipped:
         r.status = "skipped"
 
-    total = len(to_upload)
-    for i, r in enumerate(to_upload, 1):
-        kb_id = kb_map.get(r.kb_name)
-        if kb_id is None:
+    pending = []
+    for r in to_upload:
+        if kb_map.get(r.kb_name) is None:
             r.status = "failed"
             r.error = f"KB '{r.kb_name}' nicht gefunden (verfügbar: {list(kb_map)})"
-            print(f"[{i}/{total}] ❌ FEHLER {r.path.name}: {r.error}")
-            continue
-
-        size_mb = r.path.stat().st_size / 1024 / 1024
-        ocr_flag = " [OCR]" if r.force_ocr else ""
-        print(f"[{i}/{total}] ⬆  {r.path.name} ({size_mb:.1f}MB){ocr_flag} → {r.kb_name}", end=" ", flush=True)
-
-        try:
-            data = upload_file(r.path, kb_id, r.force_ocr, base_url, token, verify_ssl)
-            if data.get("_duplicate"):
-                r.status = "duplicate"
-                existing = data.get("detail", {})
-                if isinstance(existing, dict):
-                    existing = existing.get("existing_document", {})
-                print(f"⚠️  bereits vorhanden (ID={existing.get('id', '?')})")
-            elif data.get("status") == "failed":
-                r.status = "failed"
-                r.error = data.get("error_message", "Unbekannter Fehler")
-                print(f"❌ Verarbeitung fehlgeschlagen: {r.error}")
-            else:
-                r.status = "uploaded"
-                r.document_id = data.get("id")
-                r.chunk_count = data.get("chunk_count", 0)
-                print(f"✅ ID={r.document_id}, {r.chunk_count} Chunks")
-        except httpx.HTTPStatusError as e:
-            r.status = "failed"
-            r.error = f"HTTP {e.response.status_code}: {e.response.text[:200]}"
-            print(f"❌ {r.error}")
-        except Exception as e:
-            r.status = "failed"
-            r.error = str(e)
-            print(f"❌ {r.error}")
-
-        if i < total and delay > 0:
-            time.sleep(delay)
+            print(f"❌ FEHLER {r.path.name}: {r.error}")
+        else:
+            pending.append(r)
+
+    if hash_check and pending:
+        known = precheck_duplicates(pending, kb_map, client)
+        if known:
+            print(f"⚠️  {known} Dateien bereits vorhanden (Hash-Vorabprüfung) — werden nicht hochgeladen\n")
+        for r in pending:
+            if r.status == "duplicate" and manifest:
+                manifest.record(r)
+        pending = [r for r in pending if r.status == "pending"]
+
+    total = len(pending)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(import_one, r, kb_map[r.kb_name], client, delay): r for r in pending}
+        for i, future in enumerate(as_completed(futures), 1):
+            r = futures[future]
+            print(f"[{i}/{total}] {future.result()}", flush=True)
+            if manifest:
+                manifest.record(r)
 
 
 def print_summary(results: list[ImportResult]) -> None:
     counts = {s: sum(1 for r in results if r.status == s)
               for s in ("uploaded", "duplicate", "skipped", "failed")}
+    resumed = sum(1 for r in results if r.from_manifest)
     print(f"\n{'='*72}")
     print(f"  ZUSAMMENFASSUNG")
     print(f"{'='*72}")
@@ -348,6 +540,8 @@ def print_summary(results: list[ImportResult]) -> None:
     print(f"  ⏭  Übersprungen:      {counts['skipped']}")
     print(f"  ❌ Fehlgeschlagen:    {counts['failed']}")
     print(f"  Gesamt:              {len(results)}")
+    if resumed:
+        print(f"  (davon {resumed} laut Manifest aus früheren Läufen)")
     print()
 
     if counts["failed"] > 0:
@@ -370,6 +564,8 @@ def write_report(results: list[ImportResult], directory: Path) -> Path:
             "document_id": r.document_id,
             "chunk_count": r.chunk_count,
             "force_ocr": r.force_ocr,
+            "sha256": r.file_hash,
+            "job_id": r.job_id,
             "error": r.error,
         }
         for r in results
@@ -394,13 +590,19 @@ def main() -> None:
     parser.add_argument("--config", type=Path, default=None, help="Pfad zur YAML/JSON-Konfigurationsdatei")
     parser.add_argument("--dry-run", action="store_true", help="Nur anzeigen, nichts hochladen")
     parser.add_argument("--recursive", action="store_true", help="Unterverzeichnisse einschließen")
-    parser.add_argument("--delay", type=float, default=1.0, help="Pause zwischen Uploads in Sekunden (default: 1.0)")
+    parser.add_argument("--delay", type=float, default=1.0, help="Pause nach jedem Upload pro Worker in Sekunden (default: 1.0)")
     parser.add_argument("--no-report", action="store_true", help="Keinen JSON-Bericht schreiben")
     parser.add_argument("--verify-ssl", action="store_true", help="SSL-Zertifikat verifizieren (default: aus für self-signed)")
+    parser.add_argument("--workers", type=int, default=4, help="Parallele Klassifizierungen/Uploads (default: 4)")
+    parser.add_argument("--manifest", type=Path, default=None, help=f"Manifest-Datei (default: <dir>/{MANIFEST_NAME})")
+    parser.add_argument("--no-manifest", action="store_true", help="Kein Manifest — alle Dateien neu prüfen")
+    parser.add_argument("--no-hash-check", action="store_true", help="Keine Hash-Vorabprüfung beim Server")
     args = parser.parse_args()
 
     if not args.dir.is_dir():
         sys.exit(f"Verzeichnis nicht gefunden: {args.dir}")
+    if args.workers < 1:
+        sys.exit("--workers muss mindestens 1 sein")
 
     cfg = load_config(args.config)
     verify_ssl = args.verify_ssl
@@ -412,43 +614,51 @@ def main() -> None:
     # .local-Hostname auflösen (mDNS-Fallback für macOS + Python)
     base_url = resolve_local_hostname(args.base_url)
 
-    # KB-Map vom Server laden
-    print(f"🔗 Verbinde mit {base_url} …")
+    client = make_client(base_url, args.token, verify_ssl, args.workers)
+    manifest = None
     try:
-        kb_map = fetch_kb_map(base_url, args.token, verify_ssl)
-    except Exception as e:
-        sys.exit(f"❌ Kann Knowledge Bases nicht laden: {e}")
-    print(f"   Gefundene KBs: {', '.join(f'{n} (ID={i})' for n, i in kb_map.items())}\n")
-
-    # Dateien einlesen und klassifizieren
-    files = scan_directory(args.dir, args.recursive)
-    if not files:
-        print("Keine unterstützten Dateien gefunden.")
-        return
-
-    print(f"🔍 {len(files)} Dateien gefunden — klassifiziere …\n")
-    results: list[ImportResult] = []
-    for path in files:
-        kb_name, reason = classify(path, cfg)
-        force_ocr = should_force_ocr(path, cfg)
-        results.append(ImportResult(
-            path=path,
-            kb_name=kb_name,
-            classification_reason=reason,
-            force_ocr=force_ocr,
-        ))
-
-    if args.dry_run:
-        print_plan(results, kb_map)
-        return
-
-    # Import durchführen
-    run_import(results, kb_map, base_url, args.token, args.delay, verify_ssl)
-    print_summary(results)
-
-    if not args.no_report:
-        report = write_report(results, args.dir)
-        print(f"📄 Bericht gespeichert: {report}")
+        # KB-Map vom Server laden
+        print(f"🔗 Verbinde mit {base_url} …")
+        try:
+            kb_map = fetch_kb_map(client)
+        except Exception as e:
+            sys.exit(f"❌ Kann Knowledge Bases nicht laden: {e}")
+        print(f"   Gefundene KBs: {', '.join(f'{n} (ID={i})' for n, i in kb_map.items())}\n")
+
+        # Dateien einlesen und klassifizieren
+        files = scan_directory(args.dir, args.recursive)
+        if not files:
+            print("Keine unterstützten Dateien gefunden.")
+            return
+
+        manifest_path = args.manifest or args.dir / MANIFEST_NAME
+        if not args.no_manifest and (not args.dry_run or manifest_path.exists()):
+            manifest = Manifest(manifest_path)
+
+        print(f"🔍 {len(files)} Dateien gefunden — klassifiziere …\n")
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            results: list[ImportResult] = list(pool.map(lambda p: prepare(p, cfg, manifest), files))
+
+        if args.dry_run:
+            print_plan(results, kb_map)
+            return
+
+        # Import durchführen
+        run_import(
+            results, kb_map, client, args.delay,
+            workers=args.workers, manifest=manifest, hash_check=not args.no_hash_check,
+        )
+        print_summary(results)
+
+        if not args.no_report:
+            report = write_report(results, args.dir)
+            print(f"📄 Bericht gespeichert: {report}")
+        if manifest:
+            print(f"🗂  Manifest: {manifest.path}")
+    finally:
+        client.close()
+        if manifest:
+            manifest.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,74 @@
+"""Add halfvec HNSW indexes for all remaining embedding columns
+
+Revision ID: r3s4t5u6v7w8
+Revises: 1a054148bfb1
+Create Date: 2026-10-16
+
+cce1984705df resized every embedding column to vector(2560), which dropped
+the plain vector_cosine_ops HNSW indexes on intent_corrections and
+conversation_memories (regular HNSW is limited to 2000 dimensions).
+notifications and notification_suppressions never had one. All vector
+queries now go through services/vector_search.py, which orders by
+(embedding::halfvec(EMBEDDING_DIMENSION)) <=> ... — these indexes use the
+same setting, and the halfvec(2560) indexes of cce1984705df/p1q2r3s4t5u6
+are rebuilt when EMBEDDING_DIMENSION differs. Startup aborts when the
+columns or indexes do not match the setting (vector_search.embedding_dimension_mismatches).
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from utils.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 'r3s4t5u6v7w8'
+down_revision: Union[str, None] = '1a054148bfb1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "document_chunks",
+    "kg_entities",
+    "intent_corrections",
+    "conversation_memories",
+    "notifications",
+    "notification_suppressions",
+]
+# Created before this revision (with a hardcoded halfvec(2560))
+EXISTING = {"document_chunks", "kg_entities"}
+
+
+def index_ddl(table: str, dimension: int | None = None) -> str:
+    """HNSW index on the halfvec expression used by services/vector_search.py."""
+    dimension = dimension or settings.embedding_dimension
+    return f"""
+        CREATE INDEX IF NOT EXISTS idx_{table}_embedding_hnsw
+        ON {table}
+        USING hnsw ((embedding::halfvec({dimension})) halfvec_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """
+
+
+def upgrade() -> None:
+    # Leftovers from j0k1l2m3n4o5 / s2t3u4v5w6x7 (vector_cosine_ops, unusable at 2560 dims)
+    op.execute("DROP INDEX IF EXISTS idx_intent_corrections_embedding_hnsw")
+    op.execute("DROP INDEX IF EXISTS ix_conversation_memories_embedding_hnsw")
+
+    bind = op.get_bind()
+    expected = f"halfvec({settings.embedding_dimension})"
+    for table in TABLES:
+        if table in EXISTING:
+            indexdef = bind.execute(
+                sa.text("SELECT indexdef FROM pg_indexes WHERE indexname = :name"),
+                {"name": f"idx_{table}_embedding_hnsw"},
+            ).scalar()
+            if indexdef is not None and expected not in indexdef:
+                op.execute(f"DROP INDEX idx_{table}_embedding_hnsw")
+        op.execute(index_ddl(table))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        if table not in EXISTING:
+            op.execute(f"DROP INDEX IF EXISTS idx_{table}_embedding_hnsw")
@@ -0,0 +1,37 @@
+"""Store speaker embeddings as raw float32 bytes
+
+Revision ID: s4t5u6v7w8x9
+Revises: r3s4t5u6v7w8
+Create Date: 2026-10-16
+
+speaker_embeddings.embedding held base64 text of the float32 array. The
+speaker index (services/speaker_index.py) reads the raw bytes directly via
+np.frombuffer, so the column becomes BYTEA. decode(..., 'base64') yields
+exactly the bytes that were base64-encoded.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 's4t5u6v7w8x9'
+down_revision: Union[str, None] = 'r3s4t5u6v7w8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE speaker_embeddings
+        ALTER COLUMN embedding TYPE BYTEA
+        USING decode(embedding, 'base64')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        ALTER TABLE speaker_embeddings
+        ALTER COLUMN embedding TYPE TEXT
+        USING translate(encode(embedding, 'base64'), E'\\n', '')
+    """)
@@ -0,0 +1,52 @@
+"""Add content hash and embedding model to document_chunks
+
+Revision ID: t5u6v7w8x9y0
+Revises: s4t5u6v7w8x9
+Create Date: 2026-10-16
+
+Re-indexing a document now diffs the new chunks against the stored ones by
+SHA-256 of the chunk text and only re-embeds new or changed chunks. The
+embedding model name/version per chunk lets a model switch be re-embedded
+in the background (services/chunk_reembedder.py) instead of all at once.
+
+Existing chunks are hashed in SQL and stamped with the currently configured
+model (OLLAMA_EMBED_MODEL / EMBEDDING_MODEL_VERSION) — they were embedded
+with it.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+from utils.config import settings
+
+# revision identifiers, used by Alembic.
+revision: str = 't5u6v7w8x9y0'
+down_revision: Union[str, None] = 's4t5u6v7w8x9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('document_chunks', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('document_chunks', sa.Column('embedding_model', sa.String(255), nullable=True))
+    op.add_column('document_chunks', sa.Column('embedding_version', sa.String(64), nullable=True))
+
+    op.execute("""
+        UPDATE document_chunks
+        SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')
+        WHERE content IS NOT NULL
+    """)
+    op.execute(
+        sa.text("""
+            UPDATE document_chunks
+            SET embedding_model = :model, embedding_version = :version
+            WHERE embedding IS NOT NULL
+        """).bindparams(model=settings.ollama_embed_model, version=settings.embedding_model_version)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('document_chunks', 'embedding_version')
+    op.drop_column('document_chunks', 'embedding_model')
+    op.drop_column('document_chunks', 'content_hash')
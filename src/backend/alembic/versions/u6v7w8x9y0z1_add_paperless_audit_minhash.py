@@ -0,0 +1,30 @@
+"""Add MinHash signature to paperless_audit_results
+
+Revision ID: u6v7w8x9y0z1
+Revises: t5u6v7w8x9y0
+Create Date: 2026-10-16
+
+Duplicate detection compares MinHash signatures of the document content
+(utils/minhash.py) instead of the MD5 of the first 1000 characters.
+Nullable — results audited before get a signature on their next audit and
+only match on identical content_hash until then.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'u6v7w8x9y0z1'
+down_revision: Union[str, None] = 't5u6v7w8x9y0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('paperless_audit_results', sa.Column('content_minhash', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('paperless_audit_results', 'content_minhash')
@@ -29,6 +29,19 @@ _startup_tasks: list[asyncio.Task] = []
 async def _init_database():
     """Initialize database and run migrations."""
     await init_db()
+
+    # Vector queries cast to halfvec(EMBEDDING_DIMENSION) — refuse to start on a schema of another dimension
+    from services.vector_search import embedding_dimension_mismatches
+
+    async with AsyncSessionLocal() as db:
+        mismatches = await embedding_dimension_mismatches(db)
+    if mismatches:
+        logger.critical(
+            f"EMBEDDING_DIMENSION={settings.embedding_dimension} does not match the database: "
+            f"{', '.join(mismatches)}. Set EMBEDDING_DIMENSION to the column dimension "
+            "(or migrate the vector columns and indexes)."
+        )
+        raise SystemExit(1)
     logger.info("✅ Datenbank initialisiert")
 
 
@@ -81,8 +94,11 @@ def _schedule_whisper_preload():
         async def preload_whisper():
             """Load Whisper model in background."""
             try:
+                from services.stt_executor import STTPriority, get_stt_executor
+
+                # Load on an STT worker so the event loop stays responsive
                 whisper_service = get_whisper_service()
-                whisper_service.load_model()
+                await get_stt_executor().run(whisper_service.load_model, priority=STTPriority.VOICE)
                 logger.info("✅ Whisper Service bereit (STT aktiviert)")
             except Exception as e:
                 logger.warning(f"⚠️  Whisper konnte nicht vorgeladen werden: {e}")
@@ -303,6 +319,60 @@ def _schedule_ha_keywords_preload():
         logger.warning(f"⚠️  Keyword-Preloading fehlgeschlagen: {e}")
 
 
+def _start_ha_state_mirror():
+    """Start the push-based Home Assistant state mirror."""
+    if not settings.ha_state_mirror_enabled:
+        return
+    if not settings.home_assistant_url or not settings.home_assistant_token:
+        return
+
+    from integrations.ha_state_mirror import get_ha_state_mirror
+
+    get_ha_state_mirror().start()
+    logger.info("HA State Mirror gestartet")
+
+
+async def _start_ingestion_worker():
+    """Start the document ingestion consumers and Docling worker processes."""
+    if not (settings.rag_enabled and settings.rag_ingest_queue_enabled):
+        return
+
+    try:
+        from services.ingestion_queue import get_ingestion_worker
+
+        await get_ingestion_worker().start()
+    except Exception as e:
+        logger.warning(f"⚠️  Ingestion Worker konnte nicht gestartet werden: {e}")
+
+
+def _start_chunk_reembedder():
+    """Re-embed chunks of a previous embedding model in the background."""
+    if not (settings.rag_enabled and settings.rag_reembed_enabled):
+        return
+
+    from services.chunk_reembedder import get_chunk_reembedder
+
+    get_chunk_reembedder().start()
+
+
+def _schedule_intent_classifier_build():
+    """Build the intent fast path index in background."""
+    if not settings.intent_fastpath_enabled:
+        return
+
+    async def build_index():
+        try:
+            from services.intent_classifier import get_intent_classifier
+
+            async with AsyncSessionLocal() as db_session:
+                await get_intent_classifier().build(db_session)
+        except Exception as e:
+            logger.warning(f"⚠️  Intent Fast Path Index konnte nicht aufgebaut werden: {e}")
+
+    task = asyncio.create_task(build_index())
+    _startup_tasks.append(task)
+
+
 async def _init_mcp(app: "FastAPI"):
     """Initialize MCP client connections to external tool servers."""
     if not settings.mcp_enabled:
@@ -473,8 +543,9 @@ async def lifespan(app: "FastAPI"):
     - Authentication system setup
     - Ollama LLM service
     - Task queue
+    - Document ingestion worker + chunk re-embedding (background)
     - Whisper STT (background)
-    - Home Assistant keywords (background)
+    - Home Assistant state mirror + keywords (background)
     - Zeroconf for satellite discovery
     """
     logger.info("🚀 Renfield startet...")
@@ -502,9 +573,14 @@ async def lifespan(app: "FastAPI"):
     await _init_agent_router(app)
     await _init_paperless_audit(app)
 
+    await _start_ingestion_worker()
+    _start_chunk_reembedder()
+
     # Background preloading
     _schedule_whisper_preload()
+    _start_ha_state_mirror()
     _schedule_ha_keywords_preload()
+    _schedule_intent_classifier_build()
     _schedule_notification_cleanup()
     _schedule_reminder_checker()
     _schedule_notification_poller(app)
@@ -589,6 +665,26 @@ async def lifespan(app: "FastAPI"):
     if zeroconf_service:
         await zeroconf_service.stop()
 
+    # Running ingestion jobs are picked up again after the restart
+    from services.ingestion_queue import get_ingestion_worker
+    await get_ingestion_worker().stop()
+
+    # Chunk re-embedding resumes with the remaining chunks after the restart
+    from services.chunk_reembedder import get_chunk_reembedder
+    await get_chunk_reembedder().stop()
+
+    # Drop queued transcriptions, let running ones finish in their threads
+    from services.stt_executor import get_stt_executor
+    get_stt_executor().shutdown()
+
+    # Stop persistent Piper TTS processes
+    from services.piper_service import get_piper_service
+    await get_piper_service().shutdown()
+
+    # Stop HA state mirror before closing the HA client
+    from integrations.ha_state_mirror import get_ha_state_mirror
+    await get_ha_state_mirror().stop()
+
     # Close HTTP client singletons
     from integrations.frigate import close_frigate_client
     from integrations.homeassistant import close_ha_client
@@ -10,7 +10,7 @@ import os
 from pathlib import Path
 
 import aiofiles
-from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Response, UploadFile
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -25,6 +25,9 @@ from utils.config import settings
 # Import all schemas from separate file
 from .knowledge_schemas import (
     DocumentResponse,
+    HashCheckRequest,
+    HashCheckResponse,
+    IngestionJobResponse,
     KBPermissionCreate,
     KBPermissionResponse,
     KnowledgeBaseCreate,
@@ -155,8 +158,38 @@ async def get_user_kb_permission(
 # Document Upload
 # =============================================================================
 
-@router.post("/upload", response_model=DocumentResponse)
+async def _check_upload_access(knowledge_base_id: int | None, user: User | None, db: AsyncSession) -> None:
+    """Upload (und Hash-Vorabprüfung) erfordert rag.manage oder Schreibzugriff auf die KB"""
+    if not settings.auth_enabled:
+        return
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    user_perms = user.get_permissions()
+
+    # Check if user can upload to KBs
+    if not has_permission(user_perms, Permission.RAG_MANAGE):
+        # If not general RAG_MANAGE, check specific KB permission
+        if knowledge_base_id:
+            result = await db.execute(
+                select(KnowledgeBase).where(KnowledgeBase.id == knowledge_base_id)
+            )
+            kb = result.scalar_one_or_none()
+            if kb and not await check_kb_access(kb, user, "write", db):
+                raise HTTPException(
+                    status_code=403,
+                    detail="No write access to this knowledge base"
+                )
+        else:
+            raise HTTPException(
+                status_code=403,
+                detail="Permission required: rag.manage"
+            )
+
+
+@router.post("/upload", response_model=DocumentResponse | IngestionJobResponse)
 async def upload_document(
+    response: Response,
     file: UploadFile = File(...),
     knowledge_base_id: int | None = Query(None, description="Knowledge Base ID"),
     force_ocr: bool = Query(False, description="Force full-page OCR (ignores embedded text). Useful for scanned PDFs with garbled text layer."),
@@ -169,33 +202,13 @@ async def upload_document(
 
     Unterstützte Formate: PDF, DOCX, TXT, MD, HTML, PPTX, XLSX
 
+    Mit RAG_INGEST_QUEUE_ENABLED (Default) wird das Dokument als Job
+    eingereiht: 202 mit Job-ID, Fortschritt über GET /jobs/{job_id}.
+
     Requires: rag.manage permission or write access to KB
     """
-    # Permission check
-    if settings.auth_enabled:
-        if not user:
-            raise HTTPException(status_code=401, detail="Authentication required")
-
-        user_perms = user.get_permissions()
+    await _check_upload_access(knowledge_base_id, user, db)
 
-        # Check if user can upload to KBs
-        if not has_permission(user_perms, Permission.RAG_MANAGE):
-            # If not general RAG_MANAGE, check specific KB permission
-            if knowledge_base_id:
-                result = await db.execute(
-                    select(KnowledgeBase).where(KnowledgeBase.id == knowledge_base_id)
-                )
-                kb = result.scalar_one_or_none()
-                if kb and not await check_kb_access(kb, user, "write", db):
-                    raise HTTPException(
-                        status_code=403,
-                        detail="No write access to this knowledge base"
-                    )
-            else:
-                raise HTTPException(
-                    status_code=403,
-                    detail="Permission required: rag.manage"
-                )
     # Validierung: Dateiformat
     extension = Path(file.filename).suffix.lower().lstrip('.')
     allowed = settings.allowed_extensions_list
@@ -267,6 +280,12 @@ async def upload_document(
         logger.error(f"Fehler beim Speichern der Datei: {e}")
         raise HTTPException(status_code=500, detail=f"Fehler beim Speichern: {e!s}")
 
+    if settings.rag_ingest_queue_enabled:
+        return await _enqueue_ingestion(
+            rag, response, str(file_path), file.filename, file_hash,
+            knowledge_base_id, user.id if user else None, force_ocr,
+        )
+
     # Dokument verarbeiten und indexieren
     try:
         document = await rag.ingest_document(
@@ -301,6 +320,119 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/documents/check-hashes", response_model=HashCheckResponse)
+async def check_document_hashes(
+    request: HashCheckRequest,
+    user: User | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Prüft vor dem Upload, welche Dateien (SHA-256 des Inhalts) bereits in der
+    Knowledge Base existieren — gleiche Regel wie die 409-Duplikatprüfung
+    beim Upload. Bulk-Importer überspringen bekannte Dateien so, ohne sie zu
+    übertragen.
+
+    Requires: rag.manage permission or write access to KB
+    """
+    await _check_upload_access(request.knowledge_base_id, user, db)
+
+    hashes = list(dict.fromkeys(h.strip().lower() for h in request.hashes))
+    result = await db.execute(
+        select(Document.file_hash, Document.id).where(
+            Document.file_hash.in_(hashes),
+            Document.knowledge_base_id == request.knowledge_base_id
+        )
+    )
+    existing: dict[str, int] = {}
+    for file_hash, document_id in result.all():
+        existing.setdefault(file_hash, document_id)
+
+    return HashCheckResponse(
+        existing=existing,
+        missing=[h for h in hashes if h not in existing],
+    )
+
+
+async def _enqueue_ingestion(
+    rag: RAGService,
+    response: Response,
+    file_path: str,
+    filename: str,
+    file_hash: str,
+    knowledge_base_id: int | None,
+    user_id: int | None,
+    force_ocr: bool,
+) -> IngestionJobResponse:
+    """Legt das Dokument als pending an und reiht den Ingestion-Job ein (202)."""
+    from services.ingestion_queue import JOB_QUEUED, get_ingestion_queue, ingestion_lane
+
+    document = await rag.create_document(file_path, knowledge_base_id, filename, file_hash)
+    try:
+        job_id = await get_ingestion_queue().submit(
+            document.id, file_path, filename,
+            knowledge_base_id=knowledge_base_id, user_id=user_id, force_ocr=force_ocr,
+        )
+    except Exception as e:
+        await rag.delete_document(document.id)
+        logger.error(f"Ingestion-Job konnte nicht eingereiht werden: {e}")
+        raise HTTPException(status_code=503, detail="Ingestion Queue nicht erreichbar")
+
+    response.status_code = 202
+    return IngestionJobResponse(
+        job_id=job_id,
+        status=JOB_QUEUED,
+        lane=ingestion_lane(filename, force_ocr),
+        document_id=document.id,
+        filename=filename,
+        knowledge_base_id=knowledge_base_id,
+    )
+
+
+async def _get_job_for_user(job_id: str, user: User | None) -> dict:
+    """Lädt einen Ingestion-Job; nur der Uploader oder rag.manage darf ihn sehen."""
+    from services.ingestion_queue import get_ingestion_queue
+
+    job = await get_ingestion_queue().get_task_status(job_id)
+    if not job or job.get("type") != "ingest":
+        raise HTTPException(status_code=404, detail="Job nicht gefunden")
+
+    if settings.auth_enabled:
+        if not user:
+            raise HTTPException(status_code=401, detail="Authentication required")
+        owner_id = job.get("parameters", {}).get("user_id")
+        if owner_id != user.id and not has_permission(user.get_permissions(), Permission.RAG_MANAGE):
+            raise HTTPException(status_code=403, detail="No access to this job")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(
+    job_id: str,
+    user: User | None = Depends(get_optional_user),
+):
+    """Status und Fortschritt eines Ingestion-Jobs"""
+    from services.ingestion_queue import job_to_response
+
+    return IngestionJobResponse(**job_to_response(await _get_job_for_user(job_id, user)))
+
+
+@router.delete("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def cancel_ingestion_job(
+    job_id: str,
+    rag: RAGService = Depends(get_rag_service),
+    user: User | None = Depends(get_optional_user),
+):
+    """Bricht einen Ingestion-Job ab (wartend: sofort, laufend: beim nächsten Schritt)"""
+    from services.ingestion_queue import JOB_CANCELLED, JOB_QUEUED, get_ingestion_queue, job_to_response
+
+    previous = await _get_job_for_user(job_id, user)
+    job = await get_ingestion_queue().cancel(job_id)
+    if previous.get("status") == JOB_QUEUED and job.get("status") == JOB_CANCELLED:
+        # Never reached a worker — remove the pending document right away
+        await rag.delete_document(previous["parameters"]["document_id"])
+    return IngestionJobResponse(**job_to_response(job))
+
+
 # =============================================================================
 # Document Management
 # =============================================================================
@@ -431,7 +563,7 @@ async def reindex_document(
     user: User | None = Depends(get_optional_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Re-indexiert ein Dokument (löscht alte Chunks und erstellt neue)"""
+    """Re-indexiert ein Dokument (embedded nur neue oder geänderte Chunks)"""
     if settings.auth_enabled:
         if not user:
             raise HTTPException(status_code=401, detail="Authentication required")
@@ -29,6 +29,7 @@ from models.permissions import Permission
 from services.api_rate_limiter import limiter
 from services.auth_service import require_permission
 from services.database import get_db
+from services.kg_cleanup_service import MIN_DUPLICATE_THRESHOLD, KGCleanupService
 from services.knowledge_graph_service import KnowledgeGraphService
 from utils.config import settings
 
@@ -382,8 +383,6 @@ async def cleanup_invalid_entities(
 ):
     """Scan and soft-delete entities failing validation rules. dry_run=true by default."""
     try:
-        from services.kg_cleanup_service import KGCleanupService
-
         svc = KGCleanupService(db)
         result = await svc.cleanup_invalid_entities(dry_run=dry_run)
         return CleanupInvalidResponse(**result)
@@ -397,15 +396,13 @@ async def cleanup_invalid_entities(
 async def find_duplicate_clusters(
     request: Request,
     entity_type: str | None = Query(None, description="Filter by entity type"),
-    threshold: float | None = Query(None, ge=0.5, le=1.0, description="Similarity threshold"),
+    threshold: float | None = Query(None, ge=MIN_DUPLICATE_THRESHOLD, le=1.0, description="Similarity threshold"),
     limit: int = Query(50, ge=1, le=200, description="Max clusters to return"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_permission(Permission.ADMIN)),
 ):
-    """Find clusters of likely-duplicate entities via embedding similarity."""
+    """Find clusters of likely-duplicate entities via string similarity."""
     try:
-        from services.kg_cleanup_service import KGCleanupService
-
         svc = KGCleanupService(db)
         clusters = await svc.find_duplicate_clusters(
             entity_type=entity_type,
@@ -426,15 +423,13 @@ async def find_duplicate_clusters(
 async def merge_duplicate_clusters(
     request: Request,
     entity_type: str | None = Query(None, description="Filter by entity type"),
-    threshold: float | None = Query(None, ge=0.5, le=1.0, description="Similarity threshold"),
+    threshold: float | None = Query(None, ge=MIN_DUPLICATE_THRESHOLD, le=1.0, description="Similarity threshold"),
     dry_run: bool = Query(True, description="Preview mode — no merges"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(require_permission(Permission.ADMIN)),
 ):
     """Auto-merge duplicate entity clusters. dry_run=true by default."""
     try:
-        from services.kg_cleanup_service import KGCleanupService
-
         svc = KGCleanupService(db)
         result = await svc.merge_duplicate_clusters(
             entity_type=entity_type,
@@ -69,6 +69,30 @@ class DocumentResponse(BaseModel):
     processed_at: str | None
 
 
+class IngestionJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, processing, completed, failed, cancelled
+    stage: str | None = None  # converting, embedding, saving
+    progress: float = 0.0
+    attempts: int = 0
+    lane: str | None = None  # ocr, text
+    document_id: int | None = None
+    filename: str | None = None
+    knowledge_base_id: int | None = None
+    chunk_count: int | None = None
+    error: str | None = None
+
+
+class HashCheckRequest(BaseModel):
+    hashes: list[str] = Field(..., min_length=1, max_length=1000)  # SHA-256 (hex) of the file contents
+    knowledge_base_id: int | None = None
+
+
+class HashCheckResponse(BaseModel):
+    existing: dict[str, int]  # hash → document id
+    missing: list[str]
+
+
 # --- Search Models ---
 
 class SearchRequest(BaseModel):
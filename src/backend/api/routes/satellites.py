@@ -34,6 +34,9 @@ class SatelliteMetricsResponse(BaseModel):
     audio_rms: float | None = Field(None, description="Audio RMS level (0-32768)")
     audio_db: float | None = Field(None, description="Audio level in dB")
     is_speech: bool | None = Field(None, description="Voice activity detected")
+    audio_cpu_percent: dict[str, float] | None = Field(
+        None, description="CPU usage per audio analysis stage (percent of one core)"
+    )
     cpu_percent: float | None = Field(None, description="CPU usage percentage")
     memory_percent: float | None = Field(None, description="Memory usage percentage")
     temperature: float | None = Field(None, description="CPU temperature in Celsius")
@@ -5,7 +5,6 @@ Endpoints for speaker enrollment, identification, verification, and management.
 Uses SpeechBrain ECAPA-TDNN for speaker embeddings.
 """
 
-import numpy as np
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from loguru import logger
 from pydantic import BaseModel
@@ -15,6 +14,7 @@ from sqlalchemy.orm import selectinload
 
 from models.database import Speaker, SpeakerEmbedding
 from services.database import get_db
+from services.speaker_index import get_speaker_index
 from services.speaker_service import SPEECHBRAIN_ERROR, get_speaker_service
 
 router = APIRouter()
@@ -94,35 +94,14 @@ async def get_speaker_embeddings_averaged(
     """
     Load all speakers with their averaged embeddings.
 
+    Served from the in-memory speaker index (loaded from the database once).
+
     Returns:
         List of (speaker_id, speaker_name, averaged_embedding) tuples
     """
-    service = get_speaker_service()
-
-    # Get all speakers with embeddings (eagerly loaded)
-    result = await db.execute(
-        select(Speaker)
-        .where(Speaker.embeddings.any())
-        .options(selectinload(Speaker.embeddings))
-    )
-    speakers = result.scalars().all()
-
-    speaker_data = []
-    for speaker in speakers:
-        if not speaker.embeddings:
-            continue
-
-        # Decode and average embeddings
-        embeddings = [
-            service.embedding_from_base64(emb.embedding)
-            for emb in speaker.embeddings
-        ]
-
-        if embeddings:
-            averaged = np.mean(embeddings, axis=0)
-            speaker_data.append((speaker.id, speaker.name, averaged))
-
-    return speaker_data
+    index = get_speaker_index()
+    await index.ensure_loaded(db)
+    return index.known_speakers()
 
 
 # --- Endpoints ---
@@ -267,6 +246,7 @@ async def update_speaker(
         speaker.is_admin = update.is_admin
 
     await db.commit()
+    get_speaker_index().update_speaker(speaker_id, speaker.name, speaker.alias)
 
     # Re-query with eager loading to avoid lazy load issue
     result = await db.execute(
@@ -302,6 +282,7 @@ async def delete_speaker(
     speaker_name = speaker.name
     await db.delete(speaker)
     await db.commit()
+    get_speaker_index().remove_speaker(speaker_id)
 
     logger.info(f"🗑️ Deleted speaker: {speaker_name}")
 
@@ -372,6 +353,7 @@ async def merge_speakers(
 
     # Commit all changes
     await db.commit()
+    get_speaker_index().invalidate()  # Centroids of both speakers changed
 
     # Refresh target speaker to get updated embedding count
     await db.refresh(target_speaker)
@@ -448,20 +430,21 @@ async def enroll_speaker(
             detail="Failed to extract voice embedding. Audio may be too short or unclear."
         )
 
-    # Serialize and store
-    embedding_b64 = service.embedding_to_base64(embedding)
+    # Serialize and store (raw float32 bytes)
+    embedding_bytes = service.embedding_to_bytes(embedding)
 
     # Calculate duration (approximate from file size for PCM)
     duration_ms = int(len(audio_bytes) / 32)  # Rough estimate
 
     new_embedding = SpeakerEmbedding(
         speaker_id=speaker_id,
-        embedding=embedding_b64,
+        embedding=embedding_bytes,
         sample_duration=duration_ms
     )
     db.add(new_embedding)
     await db.commit()
     await db.refresh(new_embedding)
+    get_speaker_index().add_embedding(speaker_id, speaker.name, speaker.alias, embedding)
 
     # Get updated embedding count - count directly to avoid session issues
     from sqlalchemy import func
@@ -606,7 +589,7 @@ async def verify_speaker(
 
     # Get speaker's embeddings (already loaded via selectinload)
     claimed_embeddings = [
-        service.embedding_from_base64(emb.embedding)
+        service.embedding_from_bytes(emb.embedding)
         for emb in speaker.embeddings
     ]
 
@@ -646,5 +629,6 @@ async def delete_embedding(
 
     await db.delete(embedding)
     await db.commit()
+    get_speaker_index().invalidate()
 
     return {"message": "Embedding deleted"}
@@ -15,14 +15,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.api_rate_limiter import limiter
 from services.database import get_db
-from services.piper_service import PiperService
+from services.piper_service import get_piper_service
+from services.stt_executor import STTQueueFullError
 from services.whisper_service import WhisperService
 from utils.config import settings
 
 router = APIRouter()
 
 whisper_service = WhisperService()
-piper_service = PiperService()
+piper_service = get_piper_service()
 
 
 class TTSRequest(BaseModel):
@@ -103,6 +104,9 @@ async def speech_to_text(
             "speaker_alias": speaker_alias,
             "speaker_confidence": speaker_confidence
         }
+    except STTQueueFullError as e:
+        logger.warning(f"⚠️ STT ausgelastet: {e}")
+        raise HTTPException(status_code=503, detail="Spracherkennung ausgelastet, bitte später erneut versuchen")
     except Exception as e:
         logger.error(f"❌ STT Fehler: {e}")
         import traceback
@@ -243,6 +247,9 @@ async def voice_chat(
             "speaker_alias": speaker_alias,
             "speaker_confidence": speaker_confidence
         }
+    except STTQueueFullError as e:
+        logger.warning(f"⚠️ STT ausgelastet: {e}")
+        raise HTTPException(status_code=503, detail="Spracherkennung ausgelastet, bitte später erneut versuchen")
     except Exception as e:
         logger.error(f"❌ Voice Chat Fehler: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -18,38 +18,69 @@ from models.database import DEFAULT_CAPABILITIES, DEVICE_TYPE_SATELLITE, DEVICE_
 from models.websocket_messages import WSAudioMessage, WSErrorCode, WSRegisterMessage
 from services.database import AsyncSessionLocal
 from services.device_manager import DeviceManager, DeviceState, get_device_manager
+from services.stt_executor import STTPriority, STTQueueFullError
 from services.wakeword_config_manager import get_wakeword_config_manager
 from services.websocket_auth import WSAuthError, authenticate_websocket
 from services.websocket_rate_limiter import get_connection_limiter, get_rate_limiter
 from utils.config import settings
 
-from .shared import get_whisper_service, send_ws_error
+from .shared import get_whisper_service, send_tts_stream, send_ws_error
 
 router = APIRouter()
 
 
+async def _send_device_tts(
+    device_manager: DeviceManager,
+    device,
+    session_id: str,
+    response_text: str
+) -> bool:
+    """
+    Synthesize and send TTS to the input device itself.
+
+    Devices advertising the tts_streaming capability get one WAV per
+    sentence; all others get the whole response as a single WAV.
+    """
+    if not device.capabilities.has_speaker:
+        logger.debug(f"📵 Device {device.device_id} has no speaker, skipping TTS")
+        return True
+    if device.capabilities.tts_streaming:
+        return await send_tts_stream(device_manager, session_id, response_text)
+
+    from services.piper_service import get_piper_service
+    tts_audio = await get_piper_service().synthesize_to_bytes(response_text)
+    if not tts_audio:
+        return False
+    await device_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+    return True
+
+
 async def _route_tts_output(
     device_manager: DeviceManager,
     device,
     session_id: str,
-    tts_audio: bytes
-):
+    response_text: str
+) -> bool:
     """
-    Route TTS audio to the best available output device.
+    Synthesize TTS and route it to the best available output device.
 
     Routing logic:
     1. If device has no room_id → output on input device
     2. Check configured output devices for room
     3. Use best available output device (by priority)
     4. Fallback to input device if no output devices available
+
+    Output on the input device is streamed per sentence when supported;
+    configured output devices receive the complete WAV.
+
+    Returns True if audio was produced.
     """
     # If device is not registered or has no room, fallback to input device
     if not device.room_id:
         logger.debug(f"Device {device.device_id} has no room_id, using input device for output")
-        if device.capabilities.has_speaker:
-            await device_manager.send_tts_audio(session_id, tts_audio, is_final=True)
-        return
+        return await _send_device_tts(device_manager, device, session_id, response_text)
 
+    tts_audio = None
     try:
         from services.audio_output_service import get_audio_output_service
         from services.output_routing_service import OutputRoutingService
@@ -68,29 +99,33 @@ async def _route_tts_output(
 
             if decision.output_device and not decision.fallback_to_input:
                 # Use configured output device
+                from services.piper_service import get_piper_service
+                tts_audio = await get_piper_service().synthesize_to_bytes(response_text)
+                if not tts_audio:
+                    return False
+
                 success = await audio_output_service.play_audio(
                     audio_bytes=tts_audio,
                     output_device=decision.output_device,
                     session_id=session_id
                 )
+                if success:
+                    return True
 
-                if not success:
-                    # Fallback to input device if output failed
-                    logger.warning("Output device playback failed, falling back to input device")
-                    if device.capabilities.has_speaker:
-                        await device_manager.send_tts_audio(session_id, tts_audio, is_final=True)
-            else:
-                # Fallback to input device
-                if device.capabilities.has_speaker:
-                    await device_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+                # Fallback to input device if output failed
+                logger.warning("Output device playback failed, falling back to input device")
 
     except Exception as e:
         logger.error(f"❌ Output routing failed: {e}, falling back to input device")
         import traceback
         logger.error(traceback.format_exc())
-        # Fallback to input device on error
+
+    # Fallback to input device (reuse audio that was already synthesized)
+    if tts_audio:
         if device.capabilities.has_speaker:
             await device_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+        return True
+    return await _send_device_tts(device_manager, device, session_id, response_text)
 
 
 async def _process_device_session(app: FastAPI, device_manager: DeviceManager, session_id: str):
@@ -112,7 +147,6 @@ async def _process_device_session(app: FastAPI, device_manager: DeviceManager, s
     # Transcribe with Whisper
     try:
         whisper = get_whisper_service()
-        whisper.load_model()
 
         # Create WAV file with proper header
         import io
@@ -137,7 +171,8 @@ async def _process_device_session(app: FastAPI, device_manager: DeviceManager, s
                 result = await whisper.transcribe_bytes_with_speaker(
                     wav_bytes,
                     filename="device_audio.wav",
-                    db_session=db_session
+                    db_session=db_session,
+                    priority=STTPriority.VOICE,
                 )
                 text = result.get("text", "")
                 speaker_name = result.get("speaker_name")
@@ -147,7 +182,7 @@ async def _process_device_session(app: FastAPI, device_manager: DeviceManager, s
                 if speaker_name:
                     logger.info(f"🎤 Speaker identified: {speaker_name} (@{speaker_alias}) - {speaker_confidence:.2f}")
         else:
-            text = await whisper.transcribe_bytes(wav_bytes, "device_audio.wav")
+            text = await whisper.transcribe_bytes(wav_bytes, "device_audio.wav", priority=STTPriority.VOICE)
 
         if not text or not text.strip():
             logger.warning(f"⚠️ Empty transcription for session {session_id}")
@@ -160,6 +195,10 @@ async def _process_device_session(app: FastAPI, device_manager: DeviceManager, s
         # Process the transcribed text
         await _process_text_input(app, device_manager, session_id, text, speaker_name, speaker_alias)
 
+    except STTQueueFullError as e:
+        logger.warning(f"⚠️ STT overloaded, dropping session {session_id}: {e}")
+        await device_manager.end_session(session_id, reason="stt_busy")
+
     except Exception as e:
         logger.error(f"❌ Audio processing failed: {e}")
         import traceback
@@ -252,14 +291,9 @@ Gib eine kurze, natürliche Antwort. KEIN JSON, nur Text."""
 
         # Generate TTS audio if response text exists
         if response_text:
-            from services.piper_service import PiperService
-            piper = PiperService()
-            tts_audio = await piper.synthesize_to_bytes(response_text)
-
-            if tts_audio:
-                # Route TTS to the best available output device
-                await _route_tts_output(device_manager, device, session_id, tts_audio)
-            else:
+            # Route TTS to the best available output device
+            tts_sent = await _route_tts_output(device_manager, device, session_id, response_text)
+            if not tts_sent:
                 logger.warning(f"⚠️ TTS synthesis failed for session {session_id}")
 
     except Exception as e:
@@ -11,40 +11,85 @@ This module handles:
 """
 
 import asyncio
+import functools
+import json
+from collections.abc import AsyncIterable
 from datetime import date
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from loguru import logger
 
 from models.websocket_messages import WSErrorCode
+from services.audio_frames import FRAME_AUDIO, AudioFrameError, decode_frame
 from services.database import AsyncSessionLocal
+from services.streaming_stt import StreamingTranscriber
+from services.stt_executor import STTPriority, STTQueueFullError
 from services.wakeword_config_manager import get_wakeword_config_manager
 from services.websocket_auth import WSAuthError, authenticate_websocket
 from services.websocket_rate_limiter import get_connection_limiter, get_rate_limiter
 from utils.config import settings
 
-from .shared import get_whisper_service, send_ws_error
+from .shared import get_whisper_service, send_tts_stream, send_ws_error
 
 router = APIRouter()
 
 
+async def _collect_text(response: str | AsyncIterable[str]) -> str:
+    """Wait for the complete response text."""
+    if isinstance(response, str):
+        return response
+    return "".join([chunk async for chunk in response])
+
+
+async def _send_satellite_tts(
+    satellite_manager,
+    satellite,
+    session_id: str,
+    response: str | AsyncIterable[str],
+    language: str
+) -> bool:
+    """
+    Synthesize and send TTS to the satellite itself.
+
+    Satellites advertising the tts_streaming capability get one WAV per
+    sentence, synthesized while the LLM is still generating *response*.
+    Older satellites get the whole response as a single WAV.
+    """
+    if satellite and satellite.capabilities.tts_streaming:
+        return await send_tts_stream(satellite_manager, session_id, response, language=language)
+
+    from services.piper_service import get_piper_service
+    response_text = await _collect_text(response)
+    tts_audio = await get_piper_service().synthesize_to_bytes(response_text, language=language)
+    if not tts_audio:
+        return False
+    await satellite_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+    return True
+
+
 async def _route_satellite_tts_output(
     satellite_manager,
     satellite,
     session_id: str,
-    tts_audio: bytes
-):
+    response: str | AsyncIterable[str],
+    language: str
+) -> bool:
     """
-    Route TTS audio for satellite devices to the best available output device.
+    Synthesize TTS for a satellite and route it to the best available output device.
 
     Similar to _route_tts_output but for the satellite WebSocket handler.
+    *response* may be the LLM token stream; it is always consumed completely.
+    Playback on the satellite itself is streamed per sentence when supported;
+    configured output devices receive the complete WAV.
+
+    Returns True if audio was produced.
     """
     # If satellite has no room_id, fallback to satellite itself
     if not satellite or not satellite.room_id:
         logger.debug("Satellite has no room_id, using satellite for output")
-        await satellite_manager.send_tts_audio(session_id, tts_audio, is_final=True)
-        return
+        return await _send_satellite_tts(satellite_manager, satellite, session_id, response, language)
 
+    tts_audio = None
     try:
         from services.audio_output_service import get_audio_output_service
         from services.output_routing_service import OutputRoutingService
@@ -59,30 +104,37 @@ async def _route_satellite_tts_output(
                 input_device_id=satellite.satellite_id
             )
 
-            logger.info(f"🔊 Satellite output routing: {decision.reason} → {decision.target_type}:{decision.target_id}")
+        logger.info(f"🔊 Satellite output routing: {decision.reason} → {decision.target_type}:{decision.target_id}")
 
-            if decision.output_device and not decision.fallback_to_input:
-                # Use configured output device
-                success = await audio_output_service.play_audio(
-                    audio_bytes=tts_audio,
-                    output_device=decision.output_device,
-                    session_id=session_id
-                )
+        if decision.output_device and not decision.fallback_to_input:
+            # Use configured output device
+            from services.piper_service import get_piper_service
+            response = await _collect_text(response)
+            tts_audio = await get_piper_service().synthesize_to_bytes(response, language=language)
+            if not tts_audio:
+                return False
 
-                if not success:
-                    # Fallback to satellite if output failed
-                    logger.warning("Output device playback failed, falling back to satellite")
-                    await satellite_manager.send_tts_audio(session_id, tts_audio, is_final=True)
-            else:
-                # Fallback to satellite
-                await satellite_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+            success = await audio_output_service.play_audio(
+                audio_bytes=tts_audio,
+                output_device=decision.output_device,
+                session_id=session_id
+            )
+            if success:
+                return True
+
+            # Fallback to satellite if output failed
+            logger.warning("Output device playback failed, falling back to satellite")
 
     except Exception as e:
         logger.error(f"❌ Satellite output routing failed: {e}, falling back to satellite")
         import traceback
         logger.error(traceback.format_exc())
-        # Fallback to satellite on error
+
+    # Fallback to satellite (reuse audio that was already synthesized)
+    if tts_audio:
         await satellite_manager.send_tts_audio(session_id, tts_audio, is_final=True)
+        return True
+    return await _send_satellite_tts(satellite_manager, satellite, session_id, response, language)
 
 
 @router.websocket("/ws/satellite")
@@ -98,16 +150,22 @@ async def satellite_websocket(
         - {"type": "register", "satellite_id": str, "room": str, "capabilities": {...}}
         - {"type": "wakeword_detected", "keyword": str, "confidence": float, "session_id": str}
         - {"type": "audio", "chunk": str (base64), "sequence": int, "session_id": str}
-        - {"type": "audio_end", "session_id": str, "reason": str}
+        - {"type": "audio_end", "session_id": str, "reason": str}  (reason "canceled" = stop word, aborts the response)
         - {"type": "heartbeat", "status": str, "uptime_seconds": int}
 
     Server → Satellite:
         - {"type": "register_ack", "success": bool, "config": {...}, "protocol_version": str}
         - {"type": "state", "state": "idle|listening|processing|speaking"}
+        - {"type": "partial_transcription", "session_id": str, "text": str, "stable_text": str}
         - {"type": "transcription", "session_id": str, "text": str}
         - {"type": "action", "session_id": str, "intent": {...}, "success": bool}
         - {"type": "tts_audio", "session_id": str, "audio": str (base64), "is_final": bool}
         - {"type": "error", "code": str, "message": str}
+
+    Protocol v1.1 (satellite capability "binary_audio"):
+        register_ack carries "audio_transport": {"binary": true, "codec": "pcm|opus", "tts_codec": "wav|opus"}
+        (null = stay on v1.0). Audio and tts_audio are then sent as binary frames
+        (services/audio_frames.py), all other messages remain JSON.
     """
     # Extract client info
     ip_address = websocket.client.host if websocket.client else "unknown"
@@ -142,9 +200,338 @@ async def satellite_websocket(
     satellite_history_loaded = False
     satellite_db_session_id = None  # Will be set after registration
 
+    # Incremental Whisper transcription per active session (STT_STREAMING_ENABLED)
+    streaming_transcribers: dict[str, StreamingTranscriber] = {}
+
+    # Background processing per finished utterance (cancelled on barge-in)
+    processing_tasks: dict[str, asyncio.Task] = {}
+
+    async def _process_utterance(session_id: str, transcriber: StreamingTranscriber | None):
+        """STT → Intent → Action → Response → TTS for one finished utterance."""
+        nonlocal satellite_history_loaded
+
+        try:
+            # Update state to processing
+            await satellite_manager.set_session_state(session_id, SatelliteState.PROCESSING)
+
+            # Get audio buffer
+            audio_bytes = satellite_manager.get_audio_buffer(session_id)
+
+            if not audio_bytes:
+                logger.warning(f"⚠️ No audio buffered for session {session_id}")
+                if transcriber:
+                    transcriber.cancel()
+                await satellite_manager.end_session(session_id, reason="no_audio")
+                return
+
+            logger.info(f"🎵 Processing {len(audio_bytes)} bytes of audio")
+
+            # Get satellite's configured language
+            satellite_info = satellite_manager.get_satellite_by_session(session_id)
+            satellite_language = satellite_info.language if satellite_info else settings.default_language
+            logger.info(f"🌐 Using language: {satellite_language}")
+
+            # Transcribe with Whisper (with speaker recognition)
+            try:
+                whisper = get_whisper_service()
+                await asyncio.to_thread(whisper.load_model)  # No-op if already loaded
+
+                # Create WAV file with proper header
+                import io
+                import wave
+                wav_buffer = io.BytesIO()
+                with wave.open(wav_buffer, 'wb') as wav_file:
+                    wav_file.setnchannels(1)
+                    wav_file.setsampwidth(2)  # 16-bit
+                    wav_file.setframerate(16000)
+                    wav_file.writeframes(audio_bytes)
+
+                wav_bytes = wav_buffer.getvalue()
+                logger.info(f"📦 Created WAV: {len(wav_bytes)} bytes")
+
+                # Transcribe with speaker recognition (if enabled)
+                speaker_name = None
+                speaker_alias = None
+                speaker_confidence = 0.0
+
+                if transcriber and settings.speaker_recognition_enabled:
+                    # Streaming: only the uncommitted tail is decoded now,
+                    # speaker recognition runs on the full utterance meanwhile
+                    async with AsyncSessionLocal() as db_session:
+                        text, result = await asyncio.gather(
+                            transcriber.finalize(),
+                            whisper.identify_speaker_bytes(
+                                wav_bytes,
+                                filename="satellite_audio.wav",
+                                db_session=db_session,
+                            ),
+                        )
+                        speaker_name = result.get("speaker_name")
+                        speaker_alias = result.get("speaker_alias")
+                        speaker_confidence = result.get("speaker_confidence", 0.0)
+
+                        if speaker_name:
+                            logger.info(f"🎤 Satellite Sprecher erkannt: {speaker_name} (@{speaker_alias}) - Konfidenz: {speaker_confidence:.2f}")
+                        else:
+                            logger.info("🎤 Satellite Sprecher nicht erkannt")
+                elif transcriber:
+                    text = await transcriber.finalize()
+                elif settings.speaker_recognition_enabled:
+                    async with AsyncSessionLocal() as db_session:
+                        result = await whisper.transcribe_bytes_with_speaker(
+                            wav_bytes,
+                            filename="satellite_audio.wav",
+                            db_session=db_session,
+                            language=satellite_language,
+                            priority=STTPriority.VOICE,
+                        )
+                        text = result.get("text", "")
+                        speaker_name = result.get("speaker_name")
+                        speaker_alias = result.get("speaker_alias")
+                        speaker_confidence = result.get("speaker_confidence", 0.0)
+
+                        if speaker_name:
+                            logger.info(f"🎤 Satellite Sprecher erkannt: {speaker_name} (@{speaker_alias}) - Konfidenz: {speaker_confidence:.2f}")
+                        else:
+                            logger.info("🎤 Satellite Sprecher nicht erkannt")
+                else:
+                    text = await whisper.transcribe_bytes(
+                        wav_bytes, "satellite_audio.wav", language=satellite_language, priority=STTPriority.VOICE
+                    )
+
+                if not text or not text.strip():
+                    logger.warning(f"⚠️ Empty transcription for session {session_id}")
+                    await satellite_manager.end_session(session_id, reason="empty_transcription")
+                    return
+
+                logger.info(f"📝 Transcription: '{text}'")
+                await satellite_manager.send_transcription(session_id, text)
+
+            except STTQueueFullError as e:
+                logger.warning(f"⚠️ STT overloaded, dropping session {session_id}: {e}")
+                await satellite_manager.end_session(session_id, reason="stt_busy")
+                return
+
+            except Exception as e:
+                logger.error(f"❌ Whisper transcription failed: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+                await satellite_manager.end_session(session_id, reason="transcription_error")
+                return
+
+            # Process with Ollama (intent extraction + action)
+            try:
+                ollama = app.state.ollama
+
+                # Load conversation history from DB if not already loaded (once per day)
+                if satellite_db_session_id and not satellite_history_loaded:
+                    try:
+                        async with AsyncSessionLocal() as db_session:
+                            db_history = await ollama.load_conversation_context(
+                                satellite_db_session_id, db_session, max_messages=5
+                            )
+                            if db_history:
+                                satellite_conversation_history.extend(db_history)
+                                logger.info(f"📚 Satellite conversation history loaded: {len(db_history)} messages")
+                            satellite_history_loaded = True
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to load satellite conversation history: {e}")
+
+                # Build room context for satellite
+                satellite = satellite_manager.get_satellite(satellite_id)
+                room_context = None
+                if satellite:
+                    room_context = {
+                        "room_name": satellite.room,
+                        "room_id": satellite.room_id,
+                        "device_type": "satellite",
+                    }
+                    if speaker_name:
+                        room_context["speaker_name"] = speaker_name
+                    if speaker_alias:
+                        room_context["speaker_alias"] = speaker_alias
+
+                    logger.info(f"🏠 Satellite room context: {satellite.room} (ID: {satellite.room_id})")
+
+                # Extract ranked intents with room context and conversation history
+                ranked_intents = await ollama.extract_ranked_intents(
+                    text,
+                    room_context=room_context,
+                    conversation_history=satellite_conversation_history if satellite_conversation_history else None
+                )
+
+                # Fallback chain: try intents until one works
+                from services.action_executor import ActionExecutor
+                mcp_mgr = getattr(websocket.app.state, 'mcp_manager', None)
+                action_result = None
+                intent = None
+
+                # Load user permissions from speaker recognition
+                sat_user_permissions = None
+                sat_user_id = None
+                if speaker_name and (settings.auth_enabled or settings.presence_enabled):
+                    try:
+                        from sqlalchemy import select
+
+                        from models.database import Speaker, User
+                        async with AsyncSessionLocal() as perm_db:
+                            spk_result = await perm_db.execute(
+                                select(Speaker).where(Speaker.name == speaker_name)
+                            )
+                            spk = spk_result.scalar_one_or_none()
+                            if spk:
+                                # Speaker → User via User.speaker_id FK
+                                usr_result = await perm_db.execute(
+                                    select(User).where(User.speaker_id == spk.id)
+                                )
+                                usr = usr_result.scalar_one_or_none()
+                                if usr:
+                                    sat_user_permissions = usr.get_permissions()
+                                    sat_user_id = usr.id
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to load satellite user permissions: {e}")
+
+                # Register voice presence if speaker was recognized
+                if sat_user_id and settings.presence_enabled and satellite and satellite.room_id:
+                    try:
+                        from services.presence_service import get_presence_service
+                        presence_svc = get_presence_service()
+                        await presence_svc.register_voice_presence(
+                            user_id=sat_user_id,
+                            room_id=satellite.room_id,
+                            room_name=satellite.room,
+                        )
+                    except Exception as e:
+                        logger.warning(f"⚠️ Voice presence update failed: {e}")
+
+                for intent_candidate in ranked_intents:
+                    intent_name = intent_candidate.get("intent", "general.conversation")
+                    logger.info(f"🎯 Satellite versucht Intent: {intent_name} (confidence: {intent_candidate.get('confidence', 0):.2f})")
+
+                    if intent_name == "general.conversation":
+                        intent = intent_candidate
+                        break
+
+                    executor = ActionExecutor(mcp_manager=mcp_mgr)
+                    candidate_result = await executor.execute(
+                        intent_candidate, user_permissions=sat_user_permissions,
+                        user_id=sat_user_id,
+                    )
+
+                    if candidate_result.get("success") and not candidate_result.get("empty_result"):
+                        intent = intent_candidate
+                        action_result = candidate_result
+                        logger.info(f"⚡ Action result: {candidate_result.get('success')}")
+                        await satellite_manager.send_action_result(
+                            session_id, intent, candidate_result.get("success", False)
+                        )
+                        break
+
+                    logger.info(f"⏭️ Intent {intent_name} leer, versuche nächsten...")
+
+                # Fallback to conversation if no intent worked
+                if intent is None:
+                    intent = {"intent": "general.conversation", "parameters": {}, "confidence": 1.0}
+
+                # Generate response (with conversation history for context).
+                # The token stream goes straight into TTS: sentences are
+                # synthesized and sent while the LLM is still generating.
+                response_parts: list[str] = []
+
+                async def response_stream():
+                    if action_result and action_result.get("success"):
+                        result_info = action_result.get("message", "")
+                        prompt = f"""Der Nutzer hat gefragt: "{text}"
+Die Aktion wurde ausgeführt: {result_info}
+Gib eine kurze, natürliche Antwort. KEIN JSON, nur Text."""
+                    elif action_result and not action_result.get("success"):
+                        message = f"Entschuldigung, das konnte ich nicht ausführen: {action_result.get('message')}"
+                        response_parts.append(message)
+                        yield message
+                        return
+                    else:
+                        # Normal conversation (with history for follow-up questions)
+                        prompt = text
+
+                    async for chunk in ollama.chat_stream(prompt, history=satellite_conversation_history):
+                        response_parts.append(chunk)
+                        yield chunk
+
+                # Generate TTS with satellite's language and route it to the best output device
+                tts_sent = await _route_satellite_tts_output(
+                    satellite_manager, satellite, session_id, response_stream(), satellite_language
+                )
+                response_text = "".join(response_parts)
+                if not tts_sent:
+                    logger.warning(f"⚠️ TTS synthesis failed for session {session_id}")
+
+                logger.info(f"💬 Response: '{response_text[:100]}...'")
+
+                # Update in-memory conversation history (keep max 5 exchanges = 10 messages)
+                satellite_conversation_history.append({"role": "user", "content": text})
+                satellite_conversation_history.append({"role": "assistant", "content": response_text})
+                if len(satellite_conversation_history) > 10:
+                    satellite_conversation_history[:] = satellite_conversation_history[-10:]
+
+                # Persist messages to DB if we have a session ID
+                if satellite_db_session_id and response_text:
+                    try:
+                        async with AsyncSessionLocal() as db_session:
+                            await ollama.save_message(
+                                satellite_db_session_id, "user", text, db_session,
+                                metadata={
+                                    "satellite_id": satellite_id,
+                                    "room": satellite.room if satellite else None,
+                                    "speaker": speaker_name
+                                }
+                            )
+                            await ollama.save_message(
+                                satellite_db_session_id, "assistant", response_text, db_session,
+                                metadata={
+                                    "intent": intent.get("intent") if intent else None,
+                                    "action_success": action_result.get("success") if action_result else None
+                                }
+                            )
+                            logger.debug(f"💾 Satellite messages saved to DB: {satellite_db_session_id}")
+                    except Exception as e:
+                        logger.warning(f"⚠️ Failed to save satellite messages to DB: {e}")
+
+            except Exception as e:
+                logger.error(f"❌ Processing failed: {e}")
+                import traceback
+                logger.error(traceback.format_exc())
+
+            # End session
+            await satellite_manager.end_session(session_id, reason="completed")
+        finally:
+            processing_tasks.pop(session_id, None)
+
+
+    async def _on_audio_buffered(session_id: str, success: bool, error: str):
+        """Feed a buffered audio chunk to the transcriber, or end the session on buffer overflow."""
+        if not success:
+            # End session on buffer full to prevent further errors
+            if "buffer full" in error.lower():
+                transcriber = streaming_transcribers.pop(session_id, None)
+                if transcriber:
+                    transcriber.cancel()
+                await satellite_manager.end_session(session_id, reason="buffer_full")
+            await send_ws_error(websocket, WSErrorCode.BUFFER_FULL, error)
+            return
+
+        # Feed the streaming transcriber, decode a partial when due
+        transcriber = streaming_transcribers.get(session_id)
+        session = satellite_manager.get_session(session_id)
+        if transcriber and session and transcriber.feed(session.audio_chunks[-1]):
+            transcriber.start_partial(
+                functools.partial(satellite_manager.send_partial_transcription, session_id)
+            )
+
     try:
         while True:
-            data = await websocket.receive_json()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
 
             # Rate limiting
             rate_key = satellite_id if satellite_id else ip_address
@@ -153,6 +540,31 @@ async def satellite_websocket(
                 await send_ws_error(websocket, WSErrorCode.RATE_LIMITED, rate_reason)
                 continue
 
+            # Binary audio frame (protocol v1.1)
+            if message.get("bytes") is not None:
+                raw = message["bytes"]
+                if len(raw) > settings.ws_max_message_size:
+                    await send_ws_error(websocket, WSErrorCode.INVALID_MESSAGE, "Audio frame too large")
+                    continue
+                try:
+                    frame = decode_frame(raw)
+                except AudioFrameError as e:
+                    await send_ws_error(websocket, WSErrorCode.INVALID_MESSAGE, str(e))
+                    continue
+                if frame.frame_type != FRAME_AUDIO:
+                    await send_ws_error(websocket, WSErrorCode.INVALID_MESSAGE, "Unexpected frame type")
+                    continue
+                if frame.payload:
+                    success, error = satellite_manager.buffer_audio_frame(frame)
+                    await _on_audio_buffered(frame.session_id, success, error)
+                continue
+
+            try:
+                data = json.loads(message.get("text") or "")
+            except json.JSONDecodeError:
+                await send_ws_error(websocket, WSErrorCode.INVALID_MESSAGE, "Invalid JSON")
+                continue
+
             msg_type = data.get("type", "")
 
             # Handle registration
@@ -204,6 +616,9 @@ async def satellite_websocket(
                 async with AsyncSessionLocal() as db_session:
                     wakeword_config = await wakeword_config_manager.get_config(db_session)
 
+                registered = satellite_manager.get_satellite(satellite_id) if success else None
+                transport = registered.audio_transport if registered else None
+
                 # Subscribe to config updates with device info for tracking
                 wakeword_config_manager.subscribe(
                     websocket=websocket,
@@ -218,6 +633,7 @@ async def satellite_websocket(
                     "room_id": room_id,
                     "protocol_version": settings.ws_protocol_version,
                     "model_download_url": "/api/settings/wakeword/models",
+                    "audio_transport": transport.to_dict() if transport else None,
                 })
                 logger.info(f"📡 Satellite {satellite_id} registered from {room}")
 
@@ -277,6 +693,21 @@ async def satellite_websocket(
 
                 if session_id:
                     logger.info(f"🎙️ Wake word '{keyword}' detected by {sat_id}, session: {session_id}")
+
+                    # A satellite has one session at a time — drop leftovers of
+                    # sessions that ended without audio_end (timeout, buffer full)
+                    for stale in streaming_transcribers.values():
+                        stale.cancel()
+                    streaming_transcribers.clear()
+
+                    if settings.stt_streaming_enabled:
+                        whisper = get_whisper_service()
+                        await asyncio.to_thread(whisper.load_model)  # No-op if already loaded
+                        satellite_info = satellite_manager.get_satellite_by_session(session_id)
+                        streaming_transcribers[session_id] = StreamingTranscriber(
+                            whisper,
+                            language=satellite_info.language if satellite_info else settings.default_language,
+                        )
                 else:
                     logger.warning(f"⚠️ Could not start session for {sat_id}")
 
@@ -288,11 +719,7 @@ async def satellite_websocket(
 
                 if session_id and chunk_b64:
                     success, error = satellite_manager.buffer_audio(session_id, chunk_b64, sequence)
-                    if not success:
-                        # End session on buffer full to prevent further errors
-                        if "buffer full" in error.lower():
-                            await satellite_manager.end_session(session_id, reason="buffer_full")
-                        await send_ws_error(websocket, WSErrorCode.BUFFER_FULL, error)
+                    await _on_audio_buffered(session_id, success, error)
 
             # Handle end of audio
             elif msg_type == "audio_end":
@@ -302,266 +729,22 @@ async def satellite_websocket(
                 if not session_id:
                     continue
 
-                logger.info(f"🔚 Audio ended for session {session_id} (reason: {reason})")
-
-                # Update state to processing
-                await satellite_manager.set_session_state(session_id, SatelliteState.PROCESSING)
-
-                # Get audio buffer
-                audio_bytes = satellite_manager.get_audio_buffer(session_id)
-
-                if not audio_bytes:
-                    logger.warning(f"⚠️ No audio buffered for session {session_id}")
-                    await satellite_manager.end_session(session_id, reason="no_audio")
-                    continue
-
-                logger.info(f"🎵 Processing {len(audio_bytes)} bytes of audio")
-
-                # Get satellite's configured language
-                satellite_info = satellite_manager.get_satellite_by_session(session_id)
-                satellite_language = satellite_info.language if satellite_info else settings.default_language
-                logger.info(f"🌐 Using language: {satellite_language}")
+                transcriber = streaming_transcribers.pop(session_id, None)
 
-                # Transcribe with Whisper (with speaker recognition)
-                try:
-                    whisper = get_whisper_service()
-                    await asyncio.to_thread(whisper.load_model)  # No-op if already loaded
-
-                    # Create WAV file with proper header
-                    import io
-                    import wave
-                    wav_buffer = io.BytesIO()
-                    with wave.open(wav_buffer, 'wb') as wav_file:
-                        wav_file.setnchannels(1)
-                        wav_file.setsampwidth(2)  # 16-bit
-                        wav_file.setframerate(16000)
-                        wav_file.writeframes(audio_bytes)
-
-                    wav_bytes = wav_buffer.getvalue()
-                    logger.info(f"📦 Created WAV: {len(wav_bytes)} bytes")
-
-                    # Transcribe with speaker recognition (if enabled)
-                    speaker_name = None
-                    speaker_alias = None
-                    speaker_confidence = 0.0
-
-                    if settings.speaker_recognition_enabled:
-                        async with AsyncSessionLocal() as db_session:
-                            result = await whisper.transcribe_bytes_with_speaker(
-                                wav_bytes,
-                                filename="satellite_audio.wav",
-                                db_session=db_session,
-                                language=satellite_language
-                            )
-                            text = result.get("text", "")
-                            speaker_name = result.get("speaker_name")
-                            speaker_alias = result.get("speaker_alias")
-                            speaker_confidence = result.get("speaker_confidence", 0.0)
-
-                            if speaker_name:
-                                logger.info(f"🎤 Satellite Sprecher erkannt: {speaker_name} (@{speaker_alias}) - Konfidenz: {speaker_confidence:.2f}")
-                            else:
-                                logger.info("🎤 Satellite Sprecher nicht erkannt")
-                    else:
-                        text = await whisper.transcribe_bytes(wav_bytes, "satellite_audio.wav", language=satellite_language)
-
-                    if not text or not text.strip():
-                        logger.warning(f"⚠️ Empty transcription for session {session_id}")
-                        await satellite_manager.end_session(session_id, reason="empty_transcription")
-                        continue
-
-                    logger.info(f"📝 Transcription: '{text}'")
-                    await satellite_manager.send_transcription(session_id, text)
+                logger.info(f"🔚 Audio ended for session {session_id} (reason: {reason})")
 
-                except Exception as e:
-                    logger.error(f"❌ Whisper transcription failed: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-                    await satellite_manager.end_session(session_id, reason="transcription_error")
+                if reason == "canceled":
+                    # Stop word (barge-in): abort transcription, response generation and TTS
+                    if transcriber:
+                        transcriber.cancel()
+                    task = processing_tasks.pop(session_id, None)
+                    if task:
+                        task.cancel()
+                    await satellite_manager.end_session(session_id, reason="canceled")
                     continue
 
-                # Process with Ollama (intent extraction + action)
-                try:
-                    ollama = app.state.ollama
-
-                    # Load conversation history from DB if not already loaded (once per day)
-                    if satellite_db_session_id and not satellite_history_loaded:
-                        try:
-                            async with AsyncSessionLocal() as db_session:
-                                db_history = await ollama.load_conversation_context(
-                                    satellite_db_session_id, db_session, max_messages=5
-                                )
-                                if db_history:
-                                    satellite_conversation_history.extend(db_history)
-                                    logger.info(f"📚 Satellite conversation history loaded: {len(db_history)} messages")
-                                satellite_history_loaded = True
-                        except Exception as e:
-                            logger.warning(f"⚠️ Failed to load satellite conversation history: {e}")
-
-                    # Build room context for satellite
-                    satellite = satellite_manager.get_satellite(satellite_id)
-                    room_context = None
-                    if satellite:
-                        room_context = {
-                            "room_name": satellite.room,
-                            "room_id": satellite.room_id,
-                            "device_type": "satellite",
-                        }
-                        if speaker_name:
-                            room_context["speaker_name"] = speaker_name
-                        if speaker_alias:
-                            room_context["speaker_alias"] = speaker_alias
-
-                        logger.info(f"🏠 Satellite room context: {satellite.room} (ID: {satellite.room_id})")
-
-                    # Extract ranked intents with room context and conversation history
-                    ranked_intents = await ollama.extract_ranked_intents(
-                        text,
-                        room_context=room_context,
-                        conversation_history=satellite_conversation_history if satellite_conversation_history else None
-                    )
-
-                    # Fallback chain: try intents until one works
-                    from services.action_executor import ActionExecutor
-                    mcp_mgr = getattr(websocket.app.state, 'mcp_manager', None)
-                    action_result = None
-                    intent = None
-
-                    # Load user permissions from speaker recognition
-                    sat_user_permissions = None
-                    sat_user_id = None
-                    if speaker_name and (settings.auth_enabled or settings.presence_enabled):
-                        try:
-                            from sqlalchemy import select
-
-                            from models.database import Speaker, User
-                            async with AsyncSessionLocal() as perm_db:
-                                spk_result = await perm_db.execute(
-                                    select(Speaker).where(Speaker.name == speaker_name)
-                                )
-                                spk = spk_result.scalar_one_or_none()
-                                if spk:
-                                    # Speaker → User via User.speaker_id FK
-                                    usr_result = await perm_db.execute(
-                                        select(User).where(User.speaker_id == spk.id)
-                                    )
-                                    usr = usr_result.scalar_one_or_none()
-                                    if usr:
-                                        sat_user_permissions = usr.get_permissions()
-                                        sat_user_id = usr.id
-                        except Exception as e:
-                            logger.warning(f"⚠️ Failed to load satellite user permissions: {e}")
-
-                    # Register voice presence if speaker was recognized
-                    if sat_user_id and settings.presence_enabled and satellite and satellite.room_id:
-                        try:
-                            from services.presence_service import get_presence_service
-                            presence_svc = get_presence_service()
-                            await presence_svc.register_voice_presence(
-                                user_id=sat_user_id,
-                                room_id=satellite.room_id,
-                                room_name=satellite.room,
-                            )
-                        except Exception as e:
-                            logger.warning(f"⚠️ Voice presence update failed: {e}")
-
-                    for intent_candidate in ranked_intents:
-                        intent_name = intent_candidate.get("intent", "general.conversation")
-                        logger.info(f"🎯 Satellite versucht Intent: {intent_name} (confidence: {intent_candidate.get('confidence', 0):.2f})")
-
-                        if intent_name == "general.conversation":
-                            intent = intent_candidate
-                            break
-
-                        executor = ActionExecutor(mcp_manager=mcp_mgr)
-                        candidate_result = await executor.execute(
-                            intent_candidate, user_permissions=sat_user_permissions,
-                            user_id=sat_user_id,
-                        )
-
-                        if candidate_result.get("success") and not candidate_result.get("empty_result"):
-                            intent = intent_candidate
-                            action_result = candidate_result
-                            logger.info(f"⚡ Action result: {candidate_result.get('success')}")
-                            await satellite_manager.send_action_result(
-                                session_id, intent, candidate_result.get("success", False)
-                            )
-                            break
-
-                        logger.info(f"⏭️ Intent {intent_name} leer, versuche nächsten...")
-
-                    # Fallback to conversation if no intent worked
-                    if intent is None:
-                        intent = {"intent": "general.conversation", "parameters": {}, "confidence": 1.0}
-
-                    # Generate response (with conversation history for context)
-                    response_text = ""
-                    if action_result and action_result.get("success"):
-                        result_info = action_result.get("message", "")
-                        enhanced_prompt = f"""Der Nutzer hat gefragt: "{text}"
-Die Aktion wurde ausgeführt: {result_info}
-Gib eine kurze, natürliche Antwort. KEIN JSON, nur Text."""
-
-                        async for chunk in ollama.chat_stream(enhanced_prompt, history=satellite_conversation_history):
-                            response_text += chunk
-                    elif action_result and not action_result.get("success"):
-                        response_text = f"Entschuldigung, das konnte ich nicht ausführen: {action_result.get('message')}"
-                    else:
-                        # Normal conversation (with history for follow-up questions)
-                        async for chunk in ollama.chat_stream(text, history=satellite_conversation_history):
-                            response_text += chunk
-
-                    logger.info(f"💬 Response: '{response_text[:100]}...'")
-
-                    # Update in-memory conversation history (keep max 5 exchanges = 10 messages)
-                    satellite_conversation_history.append({"role": "user", "content": text})
-                    satellite_conversation_history.append({"role": "assistant", "content": response_text})
-                    if len(satellite_conversation_history) > 10:
-                        satellite_conversation_history[:] = satellite_conversation_history[-10:]
-
-                    # Persist messages to DB if we have a session ID
-                    if satellite_db_session_id and response_text:
-                        try:
-                            async with AsyncSessionLocal() as db_session:
-                                await ollama.save_message(
-                                    satellite_db_session_id, "user", text, db_session,
-                                    metadata={
-                                        "satellite_id": satellite_id,
-                                        "room": satellite.room if satellite else None,
-                                        "speaker": speaker_name
-                                    }
-                                )
-                                await ollama.save_message(
-                                    satellite_db_session_id, "assistant", response_text, db_session,
-                                    metadata={
-                                        "intent": intent.get("intent") if intent else None,
-                                        "action_success": action_result.get("success") if action_result else None
-                                    }
-                                )
-                                logger.debug(f"💾 Satellite messages saved to DB: {satellite_db_session_id}")
-                        except Exception as e:
-                            logger.warning(f"⚠️ Failed to save satellite messages to DB: {e}")
-
-                    # Generate TTS with satellite's language
-                    from services.piper_service import get_piper_service
-                    piper = get_piper_service()
-                    tts_audio = await piper.synthesize_to_bytes(response_text, language=satellite_language)
-
-                    if tts_audio:
-                        # Route TTS to the best available output device
-                        await _route_satellite_tts_output(
-                            satellite_manager, satellite, session_id, tts_audio
-                        )
-                    else:
-                        logger.warning(f"⚠️ TTS synthesis failed for session {session_id}")
-
-                except Exception as e:
-                    logger.error(f"❌ Processing failed: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-
-                # End session
-                await satellite_manager.end_session(session_id, reason="completed")
+                # Process in the background so that a stop word can still be received
+                processing_tasks[session_id] = asyncio.create_task(_process_utterance(session_id, transcriber))
 
             # Handle heartbeat with optional metrics
             elif msg_type == "heartbeat":
@@ -658,6 +841,11 @@ Gib eine kurze, natürliche Antwort. KEIN JSON, nur Text."""
         import traceback
         logger.error(traceback.format_exc())
     finally:
+        for transcriber in streaming_transcribers.values():
+            transcriber.cancel()
+        for task in list(processing_tasks.values()):
+            task.cancel()
+
         # Clean up connection limiter
         if satellite_id and ip_address:
             connection_limiter.remove_connection(ip_address, satellite_id)
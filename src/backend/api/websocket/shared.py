@@ -5,9 +5,11 @@ This module contains:
 - ConversationSessionState: Session state management for WebSocket conversations
 - Helper functions for WebSocket communication
 - Whisper service singleton
+- Sentence-level TTS streaming
 """
 
 import re
+from collections.abc import AsyncIterable
 from dataclasses import dataclass, field
 from time import time
 
@@ -182,6 +184,35 @@ async def send_ws_error(websocket: WebSocket, code: WSErrorCode, message: str, r
         pass  # WebSocket may already be closed
 
 
+async def send_tts_stream(
+    manager,
+    session_id: str,
+    text: str | AsyncIterable[str],
+    language: str | None = None,
+) -> bool:
+    """
+    Stream TTS sentence by sentence via manager.send_tts_audio().
+
+    Each sentence is sent as a non-final WAV chunk as soon as Piper has
+    synthesized it; an empty final chunk marks the end of the response.
+    *text* may be a live LLM token stream. Only for clients that play
+    consecutive chunks in order.
+
+    Returns True if any audio was sent.
+    """
+    from services.piper_service import get_piper_service
+
+    sent = False
+    try:
+        async for chunk in get_piper_service().synthesize_stream(text, language=language):
+            await manager.send_tts_audio(session_id, chunk, is_final=False)
+            sent = True
+    finally:
+        if sent:
+            await manager.send_tts_audio(session_id, b"", is_final=True)
+    return sent
+
+
 # =============================================================================
 # WebSocket Connection Registry
 # =============================================================================
@@ -0,0 +1,309 @@
+"""
+Home Assistant State Mirror — push-based in-memory copy of all HA entities.
+
+Intent extraction, keyword detection and output routing used to fetch
+/api/states over REST (entity map cached for 60s). The mirror keeps one
+authenticated WebSocket API connection open instead:
+
+1. subscribe_events for state_changed and the area/device/entity registry
+   update events
+2. snapshot: get_states + config/{area,device,entity}_registry/list
+   (events arriving before the snapshot is complete are applied afterwards)
+3. state_changed events update single entities; a *_registry_updated event
+   refetches that registry list over the same connection
+
+Lookups by entity_id, area and domain are dict accesses. While the
+connection is down (reconnect with exponential backoff) is_ready is False
+and HomeAssistantClient falls back to REST.
+"""
+import asyncio
+import json
+import time
+
+from loguru import logger
+
+_REGISTRY_COMMANDS = {
+    "areas": "config/area_registry/list",
+    "devices": "config/device_registry/list",
+    "entities": "config/entity_registry/list",
+}
+_REGISTRY_EVENTS = {
+    "area_registry_updated": "areas",
+    "device_registry_updated": "devices",
+    "entity_registry_updated": "entities",
+}
+_SNAPSHOT_KINDS = {"states", *_REGISTRY_COMMANDS}
+
+MAX_RECONNECT_DELAY = 60.0
+
+
+class HAStateMirror:
+    """In-memory entity, area and state mirror fed by the HA WebSocket API."""
+
+    def __init__(self):
+        from integrations.homeassistant import HomeAssistantClient
+
+        self._client = HomeAssistantClient()
+        self._task: asyncio.Task | None = None
+        self._ready = False
+        self._reset_connection()
+        self._clear()
+
+    def _reset_connection(self) -> None:
+        self._next_id = 0
+        self._pending: dict[int, str] = {}   # Request id → "states" | "areas" | "devices" | "entities"
+        self._refetch: set[str] = set()      # Registry changed again while its list was in flight
+        self._snapshot: dict[str, list] = {}
+        self._buffered_events: list[dict] = []
+
+    def _clear(self) -> None:
+        self._states: dict[str, dict] = {}
+        self._areas: dict[str, dict] = {}                        # area_id → area
+        self._area_ids_by_name: dict[str, str] = {}              # lowercase name → area_id
+        self._device_areas: dict[str, str] = {}                  # device_id → area_id
+        self._entity_registry: dict[str, tuple[str | None, str | None]] = {}  # entity_id → (area_id, device_id)
+        self._entity_areas: dict[str, str] = {}                  # entity_id → effective area_id
+        self._by_area: dict[str, set[str]] = {}
+        self._by_domain: dict[str, set[str]] = {}
+        self._entity_map: dict[str, dict] = {}                   # Entries for intent recognition
+        self._keywords: set | None = None
+        self.last_event_at: float | None = None
+
+    @property
+    def is_ready(self) -> bool:
+        """True while connected and the snapshot is loaded."""
+        return self._ready
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background subscriber (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ha-state-mirror")
+
+    async def stop(self) -> None:
+        """Stop the subscriber; lookups fall back to REST afterwards."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._ready = False
+
+    async def _run(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                async with self._client.ws_connect() as ws:
+                    await self._subscribe(ws)
+                    async for raw in ws:
+                        await self._handle_message(ws, json.loads(raw))
+                logger.warning("⚠️ HA State Mirror: Verbindung geschlossen")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ HA State Mirror getrennt: {e}")
+
+            if self._ready:
+                delay = 1.0  # Was healthy, reconnect quickly
+            self._ready = False
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    async def _send(self, ws, ws_type: str, kind: str | None = None, **kwargs) -> None:
+        self._next_id += 1
+        if kind:
+            self._pending[self._next_id] = kind
+        await ws.send(json.dumps({"id": self._next_id, "type": ws_type, **kwargs}))
+
+    async def _subscribe(self, ws) -> None:
+        """Subscribe to events first, then request the snapshot."""
+        self._reset_connection()
+        await self._send(ws, "subscribe_events", event_type="state_changed")
+        for event_type in _REGISTRY_EVENTS:
+            await self._send(ws, "subscribe_events", event_type=event_type)
+        await self._send(ws, "get_states", kind="states")
+        for kind, command in _REGISTRY_COMMANDS.items():
+            await self._send(ws, command, kind=kind)
+
+    async def _handle_message(self, ws, msg: dict) -> None:
+        msg_type = msg.get("type")
+        if msg_type == "event":
+            event = msg.get("event", {})
+            if self._ready:
+                await self._apply_event(ws, event)
+            else:
+                self._buffered_events.append(event)
+            return
+        if msg_type != "result":
+            return
+
+        kind = self._pending.pop(msg.get("id"), None)
+        if not msg.get("success"):
+            # Subscriptions and snapshot are required, a failed refetch is not
+            if kind is None or not self._ready:
+                raise ConnectionError(f"HA WS command failed: {msg.get('error')}")
+            logger.warning(f"⚠️ HA State Mirror: {kind} refetch failed: {msg.get('error')}")
+            return
+        if kind is None:
+            return  # Subscription ack
+
+        result = msg.get("result") or []
+        if self._ready:
+            self._apply_registry(kind, result)
+            if kind in self._refetch:
+                self._refetch.discard(kind)
+                await self._send(ws, _REGISTRY_COMMANDS[kind], kind=kind)
+            return
+
+        self._snapshot[kind] = result
+        if self._snapshot.keys() >= _SNAPSHOT_KINDS:
+            self.load(**self._snapshot)
+            self._ready = True
+            for event in self._buffered_events:
+                await self._apply_event(ws, event)
+            self._buffered_events.clear()
+
+    async def _apply_event(self, ws, event: dict) -> None:
+        event_type = event.get("event_type")
+        data = event.get("data", {})
+        if event_type == "state_changed":
+            entity_id = data.get("entity_id")
+            if entity_id:
+                self._set_state(entity_id, data.get("new_state"))
+                self.last_event_at = time.time()
+        elif event_type in _REGISTRY_EVENTS:
+            kind = _REGISTRY_EVENTS[event_type]
+            if kind in self._pending.values():
+                self._refetch.add(kind)
+            else:
+                await self._send(ws, _REGISTRY_COMMANDS[kind], kind=kind)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def load(self, states: list[dict], areas: list[dict], devices: list[dict], entities: list[dict]) -> None:
+        """Replace the mirror with a full snapshot."""
+        self._clear()
+        self._apply_registry("areas", areas, rebuild=False)
+        self._apply_registry("devices", devices, rebuild=False)
+        self._apply_registry("entities", entities)
+        for state in states:
+            if state.get("entity_id"):
+                self._set_state(state["entity_id"], state)
+        logger.info(f"✅ HA State Mirror: {len(self._states)} Entities, {len(self._areas)} Areas")
+
+    def _apply_registry(self, kind: str, items: list[dict], rebuild: bool = True) -> None:
+        if kind == "areas":
+            self._areas = {a["area_id"]: a for a in items if a.get("area_id")}
+            self._area_ids_by_name = {
+                (a.get("name") or "").lower(): area_id for area_id, a in self._areas.items()
+            }
+            self._keywords = None
+        elif kind == "devices":
+            self._device_areas = {d["id"]: d["area_id"] for d in items if d.get("id") and d.get("area_id")}
+        elif kind == "entities":
+            self._entity_registry = {
+                e["entity_id"]: (e.get("area_id"), e.get("device_id")) for e in items if e.get("entity_id")
+            }
+        if rebuild:
+            self._rebuild_areas()
+
+    def _rebuild_areas(self) -> None:
+        """Resolve entity → area (entity override, else device area)."""
+        self._entity_areas = {}
+        self._by_area = {}
+        for entity_id, (area_id, device_id) in self._entity_registry.items():
+            area_id = area_id or self._device_areas.get(device_id)
+            if area_id:
+                self._entity_areas[entity_id] = area_id
+                self._by_area.setdefault(area_id, set()).add(entity_id)
+        for entity_id, state in self._states.items():
+            self._update_entity_map(entity_id, state)
+
+    def _set_state(self, entity_id: str, state: dict | None) -> None:
+        old = self._states.get(entity_id)
+        domain = entity_id.split(".", 1)[0]
+
+        if state is None:
+            if old is not None:
+                del self._states[entity_id]
+                self._by_domain.get(domain, set()).discard(entity_id)
+                self._entity_map.pop(entity_id, None)
+                self._keywords = None
+            return
+
+        self._states[entity_id] = state
+        if old is None:
+            self._by_domain.setdefault(domain, set()).add(entity_id)
+            self._keywords = None
+        elif old.get("attributes", {}).get("friendly_name") != state.get("attributes", {}).get("friendly_name"):
+            self._keywords = None
+        self._update_entity_map(entity_id, state)
+
+    def _update_entity_map(self, entity_id: str, state: dict) -> None:
+        area = self._areas.get(self._entity_areas.get(entity_id))
+        entry = self._client.entity_map_entry(state, area.get("name") if area else None)
+        if entry:
+            self._entity_map[entity_id] = entry
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def get_state(self, entity_id: str) -> dict | None:
+        return self._states.get(entity_id)
+
+    def get_states(self) -> list[dict]:
+        return list(self._states.values())
+
+    def get_states_in_domain(self, domain: str) -> list[dict]:
+        return [self._states[e] for e in self._by_domain.get(domain, ())]
+
+    def get_states_in_area(self, area: str) -> list[dict]:
+        """States of an area, by area_id or (case-insensitive) name."""
+        area_id = area if area in self._areas else self._area_ids_by_name.get(area.lower())
+        return [self._states[e] for e in self._by_area.get(area_id, ()) if e in self._states]
+
+    def get_area(self, entity_id: str) -> dict | None:
+        return self._areas.get(self._entity_areas.get(entity_id))
+
+    def get_areas(self) -> list[dict]:
+        return list(self._areas.values())
+
+    def get_entity_map(self) -> list[dict]:
+        """Entity map for intent recognition (same format as HomeAssistantClient.get_entity_map)."""
+        return list(self._entity_map.values())
+
+    def get_keywords(self) -> set:
+        """Keywords from entity names and areas; recomputed only after entity or area changes."""
+        if self._keywords is None:
+            keywords = self._client.extract_keywords(self._states.values())
+            for area_name in self._area_ids_by_name:
+                keywords.update(area_name.split())
+            self._keywords = keywords
+        return self._keywords
+
+
+# Global instance
+_ha_state_mirror: HAStateMirror | None = None
+
+
+def get_ha_state_mirror() -> HAStateMirror:
+    """Get or create the global HA state mirror instance."""
+    global _ha_state_mirror
+    if _ha_state_mirror is None:
+        _ha_state_mirror = HAStateMirror()
+    return _ha_state_mirror
@@ -3,10 +3,15 @@ Home Assistant Integration
 
 Provides REST API client for controlling devices and WebSocket API client
 for Area Registry operations (listing, creating, updating areas).
+
+Entity map, keywords and states are served from the push-based state mirror
+(integrations/ha_state_mirror.py) while it is connected; REST is the fallback.
 """
 import asyncio
 import json
 import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 import httpx
@@ -16,6 +21,26 @@ from utils.config import settings
 
 _shared_http_client: httpx.AsyncClient | None = None
 
+# Domains included in the entity map for intent recognition
+ENTITY_MAP_DOMAINS = {
+    "light", "switch", "binary_sensor", "sensor",
+    "climate", "cover", "lock", "fan", "media_player",
+    "vacuum", "camera", "alarm_control_panel", "scene"
+}
+
+# Deutsche Übersetzungen für häufige Domains (Keywords, Intent Fast Path)
+DOMAIN_TRANSLATIONS = {
+    "light": ["licht", "lampe", "beleuchtung"],
+    "switch": ["schalter", "steckdose"],
+    "binary_sensor": ["sensor", "fenster", "tür", "kontakt"],
+    "climate": ["thermostat", "heizung", "klima"],
+    "cover": ["rolladen", "jalousie", "rollo"],
+    "media_player": ["fernseher", "tv", "player"],
+    "lock": ["schloss", "türschloss"],
+    "fan": ["lüfter", "ventilator"],
+    "vacuum": ["staubsauger", "saugroboter"]
+}
+
 
 async def get_ha_http_client() -> httpx.AsyncClient:
     global _shared_http_client
@@ -154,9 +179,18 @@ class HomeAssistantClient:
                 {attribute: value}
             )
 
+    async def _current_states(self) -> list[dict]:
+        """Alle States aus dem State Mirror, REST falls nicht verbunden"""
+        from integrations.ha_state_mirror import get_ha_state_mirror
+
+        mirror = get_ha_state_mirror()
+        if mirror.is_ready:
+            return mirror.get_states()
+        return await self.get_states()
+
     async def search_entities(self, query: str) -> list[dict]:
         """Entities nach Namen suchen"""
-        all_states = await self.get_states()
+        all_states = await self._current_states()
         query_lower = query.lower()
 
         results = []
@@ -176,7 +210,10 @@ class HomeAssistantClient:
 
     async def get_entities_by_domain(self, domain: str) -> list[dict]:
         """Alle Entities eines bestimmten Domains"""
-        all_states = await self.get_states()
+        from integrations.ha_state_mirror import get_ha_state_mirror
+
+        mirror = get_ha_state_mirror()
+        all_states = mirror.get_states_in_domain(domain) if mirror.is_ready else await self.get_states()
         return [
             {
                 "entity_id": s.get("entity_id"),
@@ -191,13 +228,20 @@ class HomeAssistantClient:
         """
         Extrahiere alle Keywords aus Home Assistant Entities
 
-        Cached für 5 Minuten, refresh=True erzwingt Neuladung
+        Aus dem State Mirror, falls verbunden. Sonst cached für 5 Minuten,
+        refresh=True erzwingt Neuladung
 
         Returns:
             set: Keywords (Gerätenamen, Räume, Domains)
         """
         from datetime import datetime, timedelta
 
+        from integrations.ha_state_mirror import get_ha_state_mirror
+
+        mirror = get_ha_state_mirror()
+        if mirror.is_ready:
+            return mirror.get_keywords()
+
         # Prüfe Cache
         if not refresh and self._keywords_cache is not None:
             if self._keywords_last_updated:
@@ -214,54 +258,7 @@ class HomeAssistantClient:
                 logger.warning("⚠️  Keine States von Home Assistant erhalten")
                 return self._get_fallback_keywords()
 
-            keywords = set()
-
-            for state in states:
-                entity_id = state.get("entity_id", "")
-                attributes = state.get("attributes", {})
-                friendly_name = attributes.get("friendly_name", "")
-
-                # Domain extrahieren (light, switch, etc.)
-                if "." in entity_id:
-                    domain, name = entity_id.split(".", 1)
-                    keywords.add(domain)
-
-                    # Name extrahieren (z.B. arbeitszimmer aus light.arbeitszimmer)
-                    # Ersetze _ durch Leerzeichen für besseres Matching
-                    name_parts = name.replace("_", " ").split()
-                    keywords.update(name_parts)
-
-                # Friendly Name parsen (z.B. "Licht Arbeitszimmer")
-                if friendly_name:
-                    # Alle Wörter als Keywords (lowercase für besseres Matching)
-                    name_words = friendly_name.lower().split()
-                    keywords.update(name_words)
-
-            # Deutsche Übersetzungen für häufige Domains hinzufügen
-            domain_translations = {
-                "light": ["licht", "lampe", "beleuchtung"],
-                "switch": ["schalter", "steckdose"],
-                "binary_sensor": ["sensor", "fenster", "tür", "kontakt"],
-                "climate": ["thermostat", "heizung", "klima"],
-                "cover": ["rolladen", "jalousie", "rollo"],
-                "media_player": ["fernseher", "tv", "player"],
-                "lock": ["schloss", "türschloss"],
-                "fan": ["lüfter", "ventilator"],
-                "vacuum": ["staubsauger", "saugroboter"]
-            }
-
-            # Füge Übersetzungen für vorhandene Domains hinzu
-            for domain, translations in domain_translations.items():
-                if domain in keywords:
-                    keywords.update(translations)
-
-            # Häufige Aktions-Verben hinzufügen
-            action_words = [
-                "ein", "aus", "an", "schalten", "stelle", "setze",
-                "öffne", "schließe", "öffnen", "schließen",
-                "dimme", "dimmen", "erhöhe", "verringere"
-            ]
-            keywords.update(action_words)
+            keywords = self.extract_keywords(states)
 
             # Cache aktualisieren
             self._keywords_cache = keywords
@@ -276,6 +273,46 @@ class HomeAssistantClient:
             logger.error(f"❌ Fehler beim Laden der Keywords: {e}")
             return self._get_fallback_keywords()
 
+    def extract_keywords(self, states) -> set:
+        """Keywords (Gerätenamen, Räume, Domains) aus Entity States extrahieren"""
+        keywords = set()
+
+        for state in states:
+            entity_id = state.get("entity_id", "")
+            attributes = state.get("attributes", {})
+            friendly_name = attributes.get("friendly_name", "")
+
+            # Domain extrahieren (light, switch, etc.)
+            if "." in entity_id:
+                domain, name = entity_id.split(".", 1)
+                keywords.add(domain)
+
+                # Name extrahieren (z.B. arbeitszimmer aus light.arbeitszimmer)
+                # Ersetze _ durch Leerzeichen für besseres Matching
+                name_parts = name.replace("_", " ").split()
+                keywords.update(name_parts)
+
+            # Friendly Name parsen (z.B. "Licht Arbeitszimmer")
+            if friendly_name:
+                # Alle Wörter als Keywords (lowercase für besseres Matching)
+                name_words = friendly_name.lower().split()
+                keywords.update(name_words)
+
+        # Füge Übersetzungen für vorhandene Domains hinzu
+        for domain, translations in DOMAIN_TRANSLATIONS.items():
+            if domain in keywords:
+                keywords.update(translations)
+
+        # Häufige Aktions-Verben hinzufügen
+        action_words = [
+            "ein", "aus", "an", "schalten", "stelle", "setze",
+            "öffne", "schließe", "öffnen", "schließen",
+            "dimme", "dimmen", "erhöhe", "verringere"
+        ]
+        keywords.update(action_words)
+
+        return keywords
+
     def _get_fallback_keywords(self) -> set:
         """Fallback Keywords wenn HA nicht erreichbar"""
         return {
@@ -287,12 +324,19 @@ class HomeAssistantClient:
         """
         Erstelle eine Map aller Entities für Intent Recognition.
 
-        Uses a class-level TTL cache (60s) to avoid hitting the HA REST API
-        on every intent extraction call.
+        Served from the HA state mirror while it is connected. Otherwise
+        a class-level TTL cache (60s) avoids hitting the HA REST API on
+        every intent extraction call.
 
         Returns:
             List[Dict]: Liste mit entity_id, friendly_name, domain, room (falls vorhanden)
         """
+        from integrations.ha_state_mirror import get_ha_state_mirror
+
+        mirror = get_ha_state_mirror()
+        if mirror.is_ready:
+            return mirror.get_entity_map()
+
         # Check class-level cache
         now = time.time()
         cls = HomeAssistantClient
@@ -307,31 +351,10 @@ class HomeAssistantClient:
                 return []
 
             entity_map = []
-
-            # Use a set for O(1) domain lookups
-            relevant_domains = {
-                "light", "switch", "binary_sensor", "sensor",
-                "climate", "cover", "lock", "fan", "media_player",
-                "vacuum", "camera", "alarm_control_panel", "scene"
-            }
-
             for state in states:
-                entity_id = state.get("entity_id", "")
-                attributes = state.get("attributes", {})
-                friendly_name = attributes.get("friendly_name", "")
-                domain = entity_id.split(".")[0] if "." in entity_id else ""
-
-                # Extrahiere Raum aus friendly_name oder entity_id
-                room = self._extract_room(entity_id, friendly_name)
-
-                if domain in relevant_domains:
-                    entity_map.append({
-                        "entity_id": entity_id,
-                        "friendly_name": friendly_name,
-                        "domain": domain,
-                        "room": room,
-                        "state": state.get("state", "unknown")
-                    })
+                entry = self.entity_map_entry(state)
+                if entry:
+                    entity_map.append(entry)
 
             logger.info(f"✅ {len(entity_map)} relevante Entities für Intent Recognition geladen")
 
@@ -345,6 +368,26 @@ class HomeAssistantClient:
             logger.error(f"❌ Fehler beim Erstellen der Entity Map: {e}")
             return []
 
+    def entity_map_entry(self, state: dict, area_name: str | None = None) -> dict | None:
+        """
+        Entity-Map-Eintrag für einen State (None für nicht relevante Domains).
+
+        Raum: HA-Area falls zugeordnet, sonst aus friendly_name/entity_id geraten.
+        """
+        entity_id = state.get("entity_id", "")
+        domain = entity_id.split(".")[0] if "." in entity_id else ""
+        if domain not in ENTITY_MAP_DOMAINS:
+            return None
+
+        friendly_name = state.get("attributes", {}).get("friendly_name", "")
+        return {
+            "entity_id": entity_id,
+            "friendly_name": friendly_name,
+            "domain": domain,
+            "room": area_name or self._extract_room(entity_id, friendly_name),
+            "state": state.get("state", "unknown")
+        }
+
     def _extract_room(self, entity_id: str, friendly_name: str) -> str | None:
         """
         Versuche Raum aus Entity ID oder Friendly Name zu extrahieren
@@ -381,9 +424,10 @@ class HomeAssistantClient:
 
     # --- Area Registry (WebSocket API) ---
 
-    async def _ws_send_command(self, ws_type: str, **kwargs) -> dict | None:
+    @asynccontextmanager
+    async def ws_connect(self) -> AsyncIterator[Any]:
         """
-        Send a command via WebSocket API.
+        Open an authenticated WebSocket API connection.
 
         Home Assistant WebSocket API uses a different URL and protocol than REST.
         Protocol:
@@ -393,12 +437,8 @@ class HomeAssistantClient:
         4. Receive auth_ok or auth_invalid
         5. Send commands with incrementing id
 
-        Args:
-            ws_type: WebSocket message type (e.g., "config/area_registry/list")
-            **kwargs: Additional parameters for the command
-
-        Returns:
-            Response data or None on error
+        Raises:
+            ConnectionError: If the handshake or authentication fails
         """
         import websockets
 
@@ -406,36 +446,48 @@ class HomeAssistantClient:
         ws_url = self.base_url.replace("http://", "ws://").replace("https://", "wss://")
         ws_url = f"{ws_url}/api/websocket"
 
-        try:
-            async with websockets.connect(ws_url) as ws:
-                # 1. Receive auth_required
-                msg = await asyncio.wait_for(ws.recv(), timeout=5.0)
-                data = json.loads(msg)
+        async with websockets.connect(ws_url, max_size=None) as ws:
+            # 1. Receive auth_required
+            msg = await asyncio.wait_for(ws.recv(), timeout=5.0)
+            data = json.loads(msg)
 
-                if data.get("type") != "auth_required":
-                    logger.error(f"Unexpected HA WS message: {data}")
-                    return None
+            if data.get("type") != "auth_required":
+                raise ConnectionError(f"Unexpected HA WS message: {data}")
 
-                # 2. Send authentication
-                await ws.send(json.dumps({
-                    "type": "auth",
-                    "access_token": self.token
-                }))
+            # 2. Send authentication
+            await ws.send(json.dumps({
+                "type": "auth",
+                "access_token": self.token
+            }))
 
-                # 3. Receive auth result
-                msg = await asyncio.wait_for(ws.recv(), timeout=5.0)
-                data = json.loads(msg)
+            # 3. Receive auth result
+            msg = await asyncio.wait_for(ws.recv(), timeout=5.0)
+            data = json.loads(msg)
 
-                if data.get("type") != "auth_ok":
-                    logger.error(f"HA WS auth failed: {data}")
-                    return None
+            if data.get("type") != "auth_ok":
+                raise ConnectionError(f"HA WS auth failed: {data}")
+
+            yield ws
 
-                # 4. Send command
+    async def _ws_send_command(self, ws_type: str, **kwargs) -> dict | None:
+        """
+        Send a single command via WebSocket API.
+
+        Args:
+            ws_type: WebSocket message type (e.g., "config/area_registry/list")
+            **kwargs: Additional parameters for the command
+
+        Returns:
+            Response data or None on error
+        """
+        try:
+            async with self.ws_connect() as ws:
+                # Send command
                 cmd = {"id": 1, "type": ws_type}
                 cmd.update(kwargs)
                 await ws.send(json.dumps(cmd))
 
-                # 5. Receive response
+                # Receive response
                 msg = await asyncio.wait_for(ws.recv(), timeout=10.0)
                 data = json.loads(msg)
 
@@ -402,27 +402,34 @@ async def reembed_all(
     Re-generate embeddings for all tables using the current embed model.
 
     Useful after switching to a new embedding model. Iterates over all tables
-    with embedding columns in batches of 50, skipping individual errors.
+    with embedding columns in batches of 50 (each sent to Ollama as batched
+    /api/embed requests), skipping individual errors.
+
+    Document chunks already embedded with the current OLLAMA_EMBED_MODEL and
+    EMBEDDING_MODEL_VERSION are skipped (bump the version to force them); the
+    rest is handled by the shared background re-embedder.
 
     Requires: admin permission (when auth is enabled)
     """
+    import asyncio
+
     from sqlalchemy import func, select
 
     from models.database import (
         ConversationMemory,
-        DocumentChunk,
         IntentCorrection,
         KGEntity,
         Notification,
         NotificationSuppression,
     )
+    from services.chunk_reembedder import get_chunk_reembedder
+    from services.embedding_service import get_embedding_service
     from utils.llm_client import get_default_client
 
     BATCH_SIZE = 50
 
     # Table configs: (model, text_extractor_fn, label)
     table_configs = [
-        (DocumentChunk, lambda r: r.content, "document_chunks"),
         (ConversationMemory, lambda r: r.content, "conversation_memories"),
         (IntentCorrection, lambda r: r.message_text, "intent_corrections"),
         (Notification, lambda r: f"{r.title} {r.message}", "notifications"),
@@ -432,9 +439,17 @@ async def reembed_all(
 
     client = get_default_client()
     embed_model = settings.ollama_embed_model
+    embedding_service = get_embedding_service()
+    embedding_service.clear()
     counts: dict[str, int] = {}
     errors: dict[str, int] = {}
 
+    # Shielded: the background pass keeps running if the request is aborted
+    chunk_totals = await asyncio.shield(get_chunk_reembedder().start())
+    counts["document_chunks"] = chunk_totals["reembedded"]
+    if chunk_totals["failed"]:
+        errors["document_chunks"] = chunk_totals["failed"]
+
     async with AsyncSessionLocal() as db:
         for model_cls, text_fn, label in table_configs:
             # Count total records
@@ -461,22 +476,26 @@ async def reembed_all(
                 if not batch:
                     break
 
+                records = []
+                texts = []
                 for record in batch:
-                    try:
-                        text = text_fn(record)
-                        if not text or not text.strip():
-                            continue
-                        response = await client.embeddings(
-                            model=embed_model,
-                            prompt=text,
-                        )
-                        record.embedding = response.embedding
-                        updated += 1
-                    except Exception as e:
+                    text = text_fn(record)
+                    if text and text.strip():
+                        records.append(record)
+                        texts.append(text)
+
+                embeddings = await embedding_service.embed_many(
+                    texts, model=embed_model, client=client, cache=False, return_exceptions=True,
+                )
+                for record, embedding in zip(records, embeddings, strict=True):
+                    if isinstance(embedding, BaseException):
                         error_count += 1
                         logger.warning(
-                            f"⚠️ {label} id={record.id}: embedding failed: {e}"
+                            f"⚠️ {label} id={record.id}: embedding failed: {embedding}"
                         )
+                        continue
+                    record.embedding = embedding
+                    updated += 1
 
                 await db.commit()
                 offset += BATCH_SIZE
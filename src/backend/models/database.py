@@ -3,7 +3,7 @@ Datenbank Models
 """
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -125,7 +125,7 @@ class SpeakerEmbedding(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     speaker_id = Column(Integer, ForeignKey("speakers.id"), nullable=False, index=True)
-    embedding = Column(Text, nullable=False)         # Base64-encoded numpy array
+    embedding = Column(LargeBinary, nullable=False)  # Raw float32 bytes (numpy tobytes)
     sample_duration = Column(Integer, nullable=True)  # Dauer des Samples in Millisekunden
     created_at = Column(DateTime, default=_utcnow)
 
@@ -482,6 +482,11 @@ class DocumentChunk(Base):
         nullable=True
     )
 
+    # Re-Indexierung: unveränderte Chunks (gleicher Hash, aktuelles Modell) behalten ihr Embedding
+    content_hash = Column(String(64), nullable=True)        # SHA-256 von content (hex)
+    embedding_model = Column(String(255), nullable=True)    # OLLAMA_EMBED_MODEL beim Embedding
+    embedding_version = Column(String(64), nullable=True)   # EMBEDDING_MODEL_VERSION beim Embedding
+
     # Chunk Metadata
     chunk_index = Column(Integer)           # Position im Dokument (0-basiert)
     page_number = Column(Integer, nullable=True)
@@ -1143,6 +1148,7 @@ class PaperlessAuditResult(Base):
 
     # Content hash for duplicate detection
     content_hash = Column(String(32), nullable=True)      # MD5 of first 1000 chars
+    content_minhash = Column(JSON, nullable=True)         # MinHash signature (utils/minhash.py)
 
     # Assessment
     ocr_quality = Column(Integer, nullable=True)          # 1-5
@@ -95,6 +95,7 @@ class WSCapabilities(BaseModel):
     has_leds: bool = False
     led_count: int = Field(default=0, ge=0)
     has_button: bool = False
+    tts_streaming: bool = False
 
 
 class WSRegisterMessage(BaseModel):
@@ -76,6 +76,27 @@ def _compress_history_message(content: str, max_chars: int = 500) -> str:
     return action_prefix + response_text
 
 
+def _history_labels(lang: str) -> dict[str, str]:
+    """Language-specific labels for step history."""
+    if lang == "en":
+        return {
+            "header": "PREVIOUS STEPS:",
+            "step": "Step",
+            "tool_called": "Tool '{tool}' called",
+            "result": "Result:",
+            "error": "Error:",
+            "no_result": "No result",
+        }
+    return {
+        "header": "BISHERIGE SCHRITTE:",
+        "step": "Schritt",
+        "tool_called": "Tool '{tool}' aufgerufen",
+        "result": "Ergebnis:",
+        "error": "Fehler:",
+        "no_result": "Kein Ergebnis",
+    }
+
+
 @dataclass
 class AgentStep:
     """Represents one step in the Agent Loop."""
@@ -104,9 +125,24 @@ class AgentContext:
     # Keys are "$blob:stepN_fieldname", values are the actual base64 strings.
     blob_store: dict[str, str] = field(default_factory=dict)
 
-    # Metadata for blobs (filename, mime_type) keyed by step number.
+    # Metadata for blobs (filename, mime_type) keyed by blob key: the step
+    # number, or "<step>_<n>" for the n-th of several tool calls in one step.
     # E.g. {2: {"filename": "invoice.pdf", "mime_type": "application/pdf"}}
-    blob_meta: dict[int, dict[str, str]] = field(default_factory=dict)
+    blob_meta: dict[int | str, dict[str, str]] = field(default_factory=dict)
+
+    # Chat messages sent to the LLM: frozen prefix (system + first prompt),
+    # then one assistant/user pair per step. Append-only, so every step
+    # starts with the previous request and Ollama reuses its KV cache.
+    messages: list[dict] = field(default_factory=list)
+    prefix_length: int = 0
+
+    # Per-step prompt evaluation stats from the Ollama responses
+    llm_stats: list[dict] = field(default_factory=list)
+
+    # Prompt ingredients that do not change during a run (memoized by
+    # AgentService._build_agent_prompt, None = not computed yet)
+    tools_prompt: str | None = None
+    tool_corrections: str | None = None
 
     # Token tracking
     total_input_tokens: int = 0
@@ -126,6 +162,81 @@ class AgentContext:
             "total_tokens": self.total_input_tokens + self.total_output_tokens,
         }
 
+    def start_messages(self, system_message: str, prompt: str) -> None:
+        """Freeze the prompt prefix for this run."""
+        self.messages = [
+            {"role": "system", "content": system_message},
+            {"role": "user", "content": prompt},
+        ]
+        self.prefix_length = len(self.messages)
+
+    def add_turn(self, response_text: str, *steps: AgentStep, lang: str = "de") -> None:
+        """Append the LLM response and the tool results (or errors) it led to, in call order."""
+        labels = _history_labels(lang)
+        lines = []
+        for step in steps:
+            prefix = f"[{step.tool}] " if len(steps) > 1 else ""
+            if step.step_type == "tool_result":
+                lines.append(f"{prefix}{labels['result']} {step.content[:8000] if step.content else labels['no_result']}")
+            else:
+                lines.append(f"{prefix}{labels['error']} {step.content[:1500]}")
+        directive = prompt_manager.get("agent", "step_directive_next", lang=lang)
+        self.messages.append({"role": "assistant", "content": response_text})
+        self.messages.append({"role": "user", "content": "\n".join(lines) + f"\n\n{directive}"})
+
+    def get_messages(self) -> list[dict]:
+        """
+        Messages for the next LLM call.
+
+        Sliding window: beyond MAX_HISTORY_STEPS step messages the oldest
+        turns are dropped (this gives up KV-cache reuse for the history).
+        """
+        turns = self.messages[self.prefix_length:]
+        limit = self.MAX_HISTORY_STEPS - self.MAX_HISTORY_STEPS % 2  # Whole assistant/user pairs
+        if len(turns) <= limit:
+            return list(self.messages)
+        return self.messages[:self.prefix_length] + (turns[-limit:] if limit else [])
+
+    def record_llm_stats(self, step_num: int, response, messages: list[dict]) -> dict:
+        """
+        Record prompt evaluation stats of one LLM response.
+
+        Ollama only evaluates prompt tokens that are not in its KV cache, so
+        prompt_eval_count below the (estimated) prompt size means the prefix
+        was reused.
+        """
+        def field_value(name: str) -> int | None:
+            value = getattr(response, name, None)
+            return value if isinstance(value, int) else None
+
+        prompt_tokens = sum(token_counter.count(m.get("content") or "") for m in messages)
+        evaluated = field_value("prompt_eval_count")
+        stats = {
+            "step": step_num,
+            "prompt_tokens": prompt_tokens,
+            "prompt_eval_count": evaluated,
+            "prompt_eval_ms": (field_value("prompt_eval_duration") or 0) / 1e6,  # Ollama reports nanoseconds
+            "eval_count": field_value("eval_count"),
+            "eval_ms": (field_value("eval_duration") or 0) / 1e6,
+            "cached_tokens": max(0, prompt_tokens - evaluated) if evaluated is not None else None,
+        }
+        self.llm_stats.append(stats)
+        return stats
+
+    def get_prompt_cache_stats(self) -> dict:
+        """Prompt tokens evaluated vs. served from the KV cache over the run."""
+        steps = [s for s in self.llm_stats if s["cached_tokens"] is not None]
+        prompt_tokens = sum(s["prompt_tokens"] for s in steps)
+        cached = sum(s["cached_tokens"] for s in steps)
+        return {
+            "steps": len(steps),
+            "prompt_tokens": prompt_tokens,
+            "evaluated_tokens": sum(s["prompt_eval_count"] for s in steps),
+            "cached_tokens": cached,
+            "cache_hit_rate": round(cached / prompt_tokens, 3) if prompt_tokens else 0.0,
+            "prompt_eval_ms": round(sum(s["prompt_eval_ms"] for s in steps), 1),
+        }
+
     def build_history_prompt(self, lang: str = "de") -> str:
         """
         Build prompt section from accumulated step history.
@@ -142,36 +253,21 @@ class AgentContext:
         # Sliding window: only include last N steps
         recent_steps = self.steps[-self.MAX_HISTORY_STEPS:]
 
-        # Language-specific labels
-        if lang == "en":
-            header = "PREVIOUS STEPS:"
-            step_label = "Step"
-            tool_called = "Tool '{tool}' called"
-            result_label = "Result:"
-            error_label = "Error:"
-            no_result = "No result"
-        else:
-            header = "BISHERIGE SCHRITTE:"
-            step_label = "Schritt"
-            tool_called = "Tool '{tool}' aufgerufen"
-            result_label = "Ergebnis:"
-            error_label = "Fehler:"
-            no_result = "Kein Ergebnis"
-
-        lines = [header]
+        labels = _history_labels(lang)
+        lines = [labels["header"]]
         for step in recent_steps:
             if step.step_type == "tool_call":
-                tool_text = tool_called.format(tool=step.tool)
+                tool_text = labels["tool_called"].format(tool=step.tool)
                 lines.append(
-                    f"  {step_label} {step.step_number}: {tool_text}"
+                    f"  {labels['step']} {step.step_number}: {tool_text}"
                     f" mit {json.dumps(step.parameters, ensure_ascii=False)}"
                 )
             elif step.step_type == "tool_result":
                 # With 32k context window, tool results can be much more detailed
-                content = step.content[:8000] if step.content else no_result
-                lines.append(f"  {result_label} {content}")
+                content = step.content[:8000] if step.content else labels["no_result"]
+                lines.append(f"  {labels['result']} {content}")
             elif step.step_type == "error":
-                lines.append(f"  {error_label} {step.content[:1500]}")
+                lines.append(f"  {labels['error']} {step.content[:1500]}")
 
         return "\n".join(lines)
 
@@ -213,7 +309,13 @@ def _truncate(text: str, max_length: int = settings.agent_response_truncation) -
 _BLOB_FIELDS = {"content_base64"}
 
 
-def _extract_blobs(data: any, step_num, blob_store: dict[str, str], blob_meta: dict[int, dict[str, str]] | None = None) -> any:
+def _extract_blobs(
+    data: any,
+    step_num,
+    blob_store: dict[str, str],
+    blob_meta: dict[int | str, dict[str, str]] | None = None,
+    meta_key: int | str | None = None,
+) -> any:
     """
     Extract large binary fields from tool result data, store them in the
     blob store, and replace with $blob:stepN_field references.
@@ -221,8 +323,13 @@ def _extract_blobs(data: any, step_num, blob_store: dict[str, str], blob_meta: d
     Handles nested JSON strings from MCP tool results (e.g.
     [{"type": "text", "text": '{"content_base64": "..."}'}]).
 
+    Metadata is stored under *meta_key* (default: *step_num*), which stays
+    fixed while list items get "_<index>" suffixed refs.
+
     Returns a modified copy of the data with blobs replaced by references.
     """
+    if meta_key is None:
+        meta_key = step_num
     if isinstance(data, dict):
         result = {}
         for key, value in data.items():
@@ -235,35 +342,28 @@ def _extract_blobs(data: any, step_num, blob_store: dict[str, str], blob_meta: d
                 logger.debug(f"🗄️ Stored blob {ref} ({size_kb}KB)")
                 # Store metadata (filename, mime_type) for auto-attach
                 if blob_meta is not None:
-                    # Extract integer step from "2" or "2_0" (list index suffix)
-                    if isinstance(step_num, int):
-                        step_key = step_num
-                    else:
-                        base = str(step_num).split("_")[0]
-                        step_key = int(base) if base.isdigit() else None
-                    if step_key is not None:
-                        meta = blob_meta.setdefault(step_key, {})
-                        if "filename" in data:
-                            meta["filename"] = data["filename"]
-                        if "mime_type" in data:
-                            meta["mime_type"] = data["mime_type"]
-                        meta["blob_ref"] = ref
+                    meta = blob_meta.setdefault(meta_key, {})
+                    if "filename" in data:
+                        meta["filename"] = data["filename"]
+                    if "mime_type" in data:
+                        meta["mime_type"] = data["mime_type"]
+                    meta["blob_ref"] = ref
             elif key == "text" and isinstance(value, str) and "content_base64" in value:
                 # MCP raw_data format: {"type": "text", "text": "<json_string>"}
                 # Parse the nested JSON, extract blobs, re-serialize
                 try:
                     parsed = json.loads(value)
-                    cleaned = _extract_blobs(parsed, step_num, blob_store, blob_meta)
+                    cleaned = _extract_blobs(parsed, step_num, blob_store, blob_meta, meta_key)
                     result[key] = json.dumps(cleaned, ensure_ascii=False)
                 except (json.JSONDecodeError, TypeError):
                     result[key] = value
             elif isinstance(value, (dict, list)):
-                result[key] = _extract_blobs(value, step_num, blob_store, blob_meta)
+                result[key] = _extract_blobs(value, step_num, blob_store, blob_meta, meta_key)
             else:
                 result[key] = value
         return result
     elif isinstance(data, list):
-        return [_extract_blobs(item, f"{step_num}_{i}", blob_store, blob_meta) for i, item in enumerate(data)]
+        return [_extract_blobs(item, f"{step_num}_{i}", blob_store, blob_meta, meta_key) for i, item in enumerate(data)]
     return data
 
 
@@ -288,6 +388,7 @@ def _parse_agent_json(raw: str) -> dict | None:
 
     Handles:
     - Clean JSON (including deeply nested structures)
+    - A bare list of action objects (returned as {"actions": [...]})
     - Markdown code blocks (```json ... ```)
     - JSON embedded in text
     - Common formatting issues
@@ -301,17 +402,21 @@ def _parse_agent_json(raw: str) -> dict | None:
         result = json.loads(raw)
         if isinstance(result, dict):
             return result
+        if _is_action_list(result):
+            return {"actions": result}
     except json.JSONDecodeError:
         pass
 
     # Method 2: Markdown code block
     if "```" in raw:
-        match = re.search(r'```(?:json)?\s*(\{.*\})\s*```', raw, re.DOTALL)
+        match = re.search(r'```(?:json)?\s*(\{.*\}|\[.*\])\s*```', raw, re.DOTALL)
         if match:
             try:
                 result = json.loads(match.group(1))
                 if isinstance(result, dict):
                     return result
+                if _is_action_list(result):
+                    return {"actions": result}
             except json.JSONDecodeError:
                 pass
 
@@ -363,6 +468,25 @@ def _parse_agent_json(raw: str) -> dict | None:
     return None
 
 
+def _is_action_list(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(item, dict) for item in value)
+
+
+def _agent_actions(parsed: dict) -> list[dict]:
+    """
+    Tool calls of one agent response.
+
+    Either a single {"action": ...} object or {"actions": [{...}, ...]} with
+    independent calls that are executed concurrently.
+    """
+    actions = parsed.get("actions")
+    if isinstance(actions, list):
+        calls = [a for a in actions if isinstance(a, dict)]
+        if calls:
+            return calls
+    return [parsed]
+
+
 class AgentService:
     """
     ReAct Agent Loop — iteratively calls tools until a final answer is produced.
@@ -389,6 +513,23 @@ class AgentService:
         self.total_timeout = total_timeout or settings.agent_total_timeout
         self._prompt_key = (role.prompt_key if role else None) or "agent_prompt"
 
+    async def _load_tool_corrections(self, message: str, lang: str = "de") -> str:
+        """Load tool corrections from semantic feedback (embedding + vector query)."""
+        try:
+            from services.database import AsyncSessionLocal
+            from services.intent_feedback_service import IntentFeedbackService
+            async with AsyncSessionLocal() as feedback_db:
+                service = IntentFeedbackService(feedback_db)
+                similar = await service.find_similar_corrections(
+                    message, feedback_type="agent_tool"
+                )
+                if similar:
+                    logger.info(f"📝 {len(similar)} tool correction(s) injected into agent prompt")
+                    return service.format_agent_corrections(similar, lang=lang)
+        except Exception as e:
+            logger.warning(f"⚠️ Agent tool correction lookup failed: {e}")
+        return ""
+
     async def _build_agent_prompt(
         self,
         message: str,
@@ -400,7 +541,12 @@ class AgentService:
         document_context: str = "",
     ) -> str:
         """Build the prompt for the Agent LLM call."""
-        tools_prompt = self.tool_registry.build_tools_prompt()
+        if context.tools_prompt is None:
+            context.tools_prompt = self.tool_registry.build_tools_prompt()
+        if context.tool_corrections is None:
+            context.tool_corrections = await self._load_tool_corrections(message, lang)
+        tools_prompt = context.tools_prompt
+        tool_corrections = context.tool_corrections
         history_prompt = context.build_history_prompt(lang=lang)
 
         # Build room context string for the prompt
@@ -432,22 +578,6 @@ class AgentService:
         else:
             step_directive = prompt_manager.get("agent", "step_directive_first", lang=lang)
 
-        # Load tool corrections from semantic feedback
-        tool_corrections = ""
-        try:
-            from services.database import AsyncSessionLocal
-            from services.intent_feedback_service import IntentFeedbackService
-            async with AsyncSessionLocal() as feedback_db:
-                service = IntentFeedbackService(feedback_db)
-                similar = await service.find_similar_corrections(
-                    message, feedback_type="agent_tool"
-                )
-                if similar:
-                    tool_corrections = service.format_agent_corrections(similar, lang=lang)
-                    logger.info(f"📝 {len(similar)} tool correction(s) injected into agent prompt")
-        except Exception as e:
-            logger.warning(f"⚠️ Agent tool correction lookup failed: {e}")
-
         # Build prompt from externalized template (role-specific or default)
         prompt = prompt_manager.get(
             "agent", self._prompt_key, lang=lang,
@@ -545,6 +675,11 @@ class AgentService:
         }
         json_system_message = prompt_manager.get("agent", "json_system_message", lang=lang)
 
+        # Built once per run: later steps only append their turn, so the
+        # prompt stays a byte-identical prefix for Ollama's KV cache
+        prompt = await self._build_agent_prompt(message, context, conversation_history, room_context=room_context, lang=lang, memory_context=memory_context, document_context=document_context)
+        context.start_messages(json_system_message, prompt)
+
         for step_num in range(1, self.max_steps + 1):
             # Check total timeout
             elapsed = time.monotonic() - start_time
@@ -554,9 +689,11 @@ class AgentService:
                 yield summary_step
                 return
 
-            # Build prompt with all available tools (32k context fits all tools)
-            prompt = await self._build_agent_prompt(message, context, conversation_history, room_context=room_context, lang=lang, memory_context=memory_context, document_context=document_context)
-            logger.info(f"🤖 Agent step {step_num} prompt ({len(prompt)} chars, {total_tools} tools)")
+            messages = context.get_messages()
+            logger.info(
+                f"🤖 Agent step {step_num} prompt ({sum(len(m['content']) for m in messages)} chars, "
+                f"{len(messages)} messages, {total_tools} tools)"
+            )
 
             # Check circuit breaker before LLM call
             if not await agent_circuit_breaker.allow_request():
@@ -575,10 +712,7 @@ class AgentService:
                 raw_response = await asyncio.wait_for(
                     agent_client.chat(
                         model=agent_model,
-                        messages=[
-                            {"role": "system", "content": json_system_message},
-                            {"role": "user", "content": prompt},
-                        ],
+                        messages=messages,
                         options=llm_options,
                     ),
                     timeout=self.step_timeout,
@@ -586,8 +720,9 @@ class AgentService:
                 response_text = raw_response.message.content or ""
                 await agent_circuit_breaker.record_success()
 
-                # Track token usage
-                context.track_tokens(prompt, response_text)
+                # Track token usage and KV-cache reuse
+                context.track_tokens("".join(m["content"] for m in messages), response_text)
+                self._record_prompt_eval(context, step_num, raw_response, messages)
                 logger.info(f"🤖 Agent step {step_num} LLM response ({len(response_text)} chars): {response_text[:500]}")
             except TimeoutError:
                 await agent_circuit_breaker.record_failure()
@@ -614,8 +749,8 @@ class AgentService:
             # Parse JSON response
             parsed = _parse_agent_json(response_text)
 
-            # Treat JSON without "action" field as malformed (LLM output just parameters)
-            if parsed and "action" not in parsed:
+            # Treat JSON without "action"/"actions" field as malformed (LLM output just parameters)
+            if parsed and "action" not in parsed and not _is_action_list(parsed.get("actions")):
                 logger.info(f"🔄 Agent step {step_num}: JSON missing 'action' field, treating as empty for retry")
                 parsed = None
                 response_text = ""
@@ -624,15 +759,13 @@ class AgentService:
             if not parsed and not response_text.strip():
                 logger.info(f"🔄 Agent step {step_num}: Empty LLM response, retrying with nudge...")
                 retry_nudge = prompt_manager.get("agent", "retry_nudge", lang=lang)
-                nudge = prompt + retry_nudge
+                # Nudge the last user message; everything before it stays cached
+                nudge = messages[-1]["content"] + retry_nudge
                 try:
                     retry_response = await asyncio.wait_for(
                         agent_client.chat(
                             model=agent_model,
-                            messages=[
-                                {"role": "system", "content": json_system_message},
-                                {"role": "user", "content": nudge},
-                            ],
+                            messages=[*messages[:-1], {"role": "user", "content": nudge}],
                             options=llm_options_retry,
                         ),
                         timeout=self.step_timeout,
@@ -686,151 +819,130 @@ class AgentService:
                     )
                 return
 
-            action = parsed.get("action", "")
+            calls = _agent_actions(parsed)
 
-            # Handle final_answer
-            if action == "final_answer":
-                answer = parsed.get("answer", "")
+            # Handle final_answer: a step with only final_answer action(s) ends the run
+            # with the first one. Next to tool calls it cannot use their results, so
+            # it is rejected below and the LLM answers after seeing them.
+            if all(c.get("action") == "final_answer" for c in calls):
+                if len(calls) > 1:
+                    logger.info(f"🤖 Agent step {step_num}: {len(calls)} final_answer actions, using the first")
                 yield AgentStep(
                     step_number=step_num,
                     step_type="final_answer",
-                    content=answer,
-                    reason=parsed.get("reason", ""),
+                    content=calls[0].get("answer", ""),
+                    reason=calls[0].get("reason", ""),
                 )
                 return
 
-            # Validate and resolve tool name (supports short names from small LLMs)
-            resolved = self.tool_registry.resolve_tool_name(action)
-            if not resolved:
-                logger.warning(f"⚠️ Agent step {step_num}: Invalid tool '{action}'")
-                error_content = f"Unknown tool: {action}" if lang == "en" else f"Unbekanntes Tool: {action}"
-                error_step = AgentStep(
+            # Validate all calls first; results go into history in call order
+            outcomes: list[AgentStep | None] = []
+            pending: list[tuple[int, str, dict]] = []  # (outcome index, tool, resolved parameters)
+            tool_count = 0
+            for call in calls:
+                action = call.get("action", "")
+                if action == "final_answer":
+                    logger.info(f"🤖 Agent step {step_num}: final_answer next to tool calls, asking again after results")
+                    rejected = (
+                        "final_answer ignored: it must be the only action. Answer after the tool results."
+                        if lang == "en" else
+                        "final_answer ignoriert: muss die einzige Aktion sein. Antworte nach den Tool-Ergebnissen."
+                    )
+                    error_step = AgentStep(step_number=step_num, step_type="error", content=rejected, tool=action)
+                    context.steps.append(error_step)
+                    outcomes.append(error_step)
+                    yield error_step
+                    continue
+                tool_count += 1
+                if tool_count > settings.agent_max_parallel_tools:
+                    skipped = (
+                        f"Not executed (max {settings.agent_max_parallel_tools} tools per step), call it again: {action}"
+                        if lang == "en" else
+                        f"Nicht ausgeführt (max. {settings.agent_max_parallel_tools} Tools pro Schritt), erneut aufrufen: {action}"
+                    )
+                    error_step = AgentStep(step_number=step_num, step_type="error", content=skipped, tool=action)
+                    context.steps.append(error_step)
+                    outcomes.append(error_step)
+                    yield error_step
+                    continue
+
+                # Validate and resolve tool name (supports short names from small LLMs)
+                resolved = self.tool_registry.resolve_tool_name(action)
+                if not resolved:
+                    logger.warning(f"⚠️ Agent step {step_num}: Invalid tool '{action}'")
+                    error_content = f"Unknown tool: {action}" if lang == "en" else f"Unbekanntes Tool: {action}"
+                    error_step = AgentStep(
+                        step_number=step_num,
+                        step_type="error",
+                        content=error_content,
+                        tool=action,
+                    )
+                    context.steps.append(error_step)
+                    outcomes.append(error_step)
+                    yield error_step
+                    continue
+                if resolved != action:
+                    logger.info(f"🔧 Agent step {step_num}: Resolved '{action}' → '{resolved}'")
+                    action = resolved
+
+                parameters = call.get("parameters", {})
+                reason = call.get("reason") or parsed.get("reason", "")
+
+                # Auto-attach downloaded documents to email calls
+                if "send_email" in action and context.blob_store:
+                    parameters = _auto_attach_blobs(parameters, context)
+
+                # Resolve any $blob: references from previous tool results
+                resolved_parameters = _resolve_blobs(parameters, context.blob_store)
+
+                # Yield tool_call step (with display-safe params — no base64 content)
+                display_params = {
+                    k: (f"[{len(v)} chars]" if isinstance(v, str) and len(v) > 200 else v)
+                    for k, v in parameters.items()
+                } if parameters else parameters
+                # Truncate attachment content in display
+                if "attachments" in (display_params or {}):
+                    display_params["attachments"] = [
+                        {k: (f"[{len(v)} chars]" if k == "content_base64" and isinstance(v, str) else v)
+                         for k, v in att.items()}
+                        for att in display_params.get("attachments", [])
+                        if isinstance(att, dict)
+                    ]
+                tool_call_step = AgentStep(
                     step_number=step_num,
-                    step_type="error",
-                    content=error_content,
+                    step_type="tool_call",
                     tool=action,
+                    parameters=display_params,
+                    reason=reason,
                 )
-                context.steps.append(error_step)
-                yield error_step
-                # Continue loop — LLM will see the error in history
-                continue
-            if resolved != action:
-                logger.info(f"🔧 Agent step {step_num}: Resolved '{action}' → '{resolved}'")
-                action = resolved
-
-            parameters = parsed.get("parameters", {})
-            reason = parsed.get("reason", "")
-
-            # Auto-attach downloaded documents to email calls
-            if "send_email" in action and context.blob_store:
-                parameters = _auto_attach_blobs(parameters, context)
-
-            # Resolve any $blob: references from previous tool results
-            resolved_parameters = _resolve_blobs(parameters, context.blob_store)
-
-            # Yield tool_call step (with display-safe params — no base64 content)
-            display_params = {
-                k: (f"[{len(v)} chars]" if isinstance(v, str) and len(v) > 200 else v)
-                for k, v in parameters.items()
-            } if parameters else parameters
-            # Truncate attachment content in display
-            if "attachments" in (display_params or {}):
-                display_params["attachments"] = [
-                    {k: (f"[{len(v)} chars]" if k == "content_base64" and isinstance(v, str) else v)
-                     for k, v in att.items()}
-                    for att in display_params.get("attachments", [])
-                    if isinstance(att, dict)
-                ]
-            tool_call_step = AgentStep(
-                step_number=step_num,
-                step_type="tool_call",
-                tool=action,
-                parameters=display_params,
-                reason=reason,
-            )
-            context.steps.append(tool_call_step)
-            yield tool_call_step
+                context.steps.append(tool_call_step)
+                yield tool_call_step
 
-            # Execute the tool (with resolved blob data)
-            try:
-                intent_data = {
-                    "intent": action,
-                    "parameters": resolved_parameters,
-                    "confidence": 1.0,
-                }
-                result = await executor.execute(
-                    intent_data, user_permissions=user_permissions,
-                    user_id=user_id,
-                )
-            except Exception as e:
-                logger.error(f"❌ Agent tool execution failed: {action} — {e}")
-                error_msg = f"Tool error: {e!s}" if lang == "en" else f"Tool-Fehler: {e!s}"
-                result = {
-                    "success": False,
-                    "message": error_msg,
-                    "action_taken": False,
-                }
-
-            logger.info(f"🤖 Agent step {step_num} tool result: success={result.get('success')}, has_data={result.get('data') is not None}, message_len={len(result.get('message', ''))}")
-
-            # Extract large binary blobs before building LLM summary
-            result_data = result.get("data")
-            blob_count_before = len(context.blob_store)
-            if result_data:
-                result_data_for_llm = _extract_blobs(result_data, step_num, context.blob_store, context.blob_meta)
-            else:
-                result_data_for_llm = result_data
-            blob_count_after = len(context.blob_store)
-            if blob_count_after > blob_count_before:
-                logger.info(f"🗄️ Step {step_num}: Extracted {blob_count_after - blob_count_before} blob(s) from data")
-
-            # Also extract blobs from the message text (may contain JSON with content_base64)
-            raw_message = result.get("message", "")
-            if "content_base64" in raw_message:
-                logger.info(f"🗄️ Step {step_num}: Found content_base64 in message ({len(raw_message)} chars)")
-                try:
-                    parsed_msg = json.loads(raw_message)
-                    cleaned_msg = _extract_blobs(parsed_msg, step_num, context.blob_store, context.blob_meta)
-                    result_message = json.dumps(cleaned_msg, ensure_ascii=False)
-                    blob_count_after = len(context.blob_store)  # update after message extraction
-                except (json.JSONDecodeError, TypeError):
-                    result_message = raw_message
-            else:
-                result_message = raw_message
+                pending.append((len(outcomes), action, resolved_parameters))
+                outcomes.append(None)
 
-            # Build result summary for the LLM history prompt.
-            # For download results with blobs: show clean metadata only (no blob refs).
-            # The LLM doesn't need to know about blob mechanics — auto-attach handles it.
-            no_result = "No result" if lang == "en" else "Kein Ergebnis"
-            result_message = result_message or no_result
-
-            if blob_count_after > blob_count_before:
-                # This step produced blobs — show clean metadata summary
-                meta = context.blob_meta.get(step_num, {})
-                fname = meta.get("filename", "document.pdf")
-                mtype = meta.get("mime_type", "unknown")
-                attach_note = "Will be auto-attached to email." if lang == "en" else "Wird automatisch an E-Mail angehängt."
-                result_summary = f"Document downloaded: {fname} ({mtype}). {attach_note}"
-                logger.info(f"📎 Step {step_num} summary: {result_summary}")
-            elif result_data_for_llm:
-                data_label = "Data" if lang == "en" else "Daten"
-                data_str = json.dumps(result_data_for_llm, ensure_ascii=False)
-                result_summary = _truncate(f"{result_message} | {data_label}: {data_str}", max_length=4000)
-            else:
-                result_summary = _truncate(result_message, max_length=4000)
+            if not pending:
+                # Continue loop — LLM will see the error(s) in history
+                context.add_turn(response_text, *outcomes, lang=lang)
+                continue
 
-            # Yield tool_result step
-            tool_result_step = AgentStep(
-                step_number=step_num,
-                step_type="tool_result",
-                content=result_summary,
-                tool=action,
-                success=result.get("success", False),
-                data=result.get("data"),
-            )
-            context.steps.append(tool_result_step)
-            context.tool_results.append(result)
-            yield tool_result_step
+            # Execute the tools (with resolved blob data); independent calls run concurrently
+            if len(pending) > 1:
+                logger.info(f"🤖 Agent step {step_num}: {len(pending)} tool calls concurrently")
+            results = await asyncio.gather(*(
+                self._execute_tool(executor, action, resolved_parameters, user_permissions, user_id, lang)
+                for _, action, resolved_parameters in pending
+            ))
+
+            for call_num, ((outcome_index, action, _), result) in enumerate(zip(pending, results, strict=True)):
+                # Blob keys must stay unique when one step runs several tools
+                blob_key = step_num if len(pending) == 1 else f"{step_num}_{call_num}"
+                tool_result_step = self._build_tool_result_step(context, step_num, blob_key, action, result, lang)
+                context.steps.append(tool_result_step)
+                context.tool_results.append(result)
+                outcomes[outcome_index] = tool_result_step
+                yield tool_result_step
+            context.add_turn(response_text, *outcomes, lang=lang)
 
             # Check for infinite loop (same tool called repeatedly)
             if context.detect_infinite_loop(min_repetitions=3):
@@ -850,6 +962,116 @@ class AgentService:
         summary_step = await self._build_summary_answer(context, self.max_steps, message, ollama, agent_model, lang=lang, agent_client=agent_client)
         yield summary_step
 
+    @staticmethod
+    async def _execute_tool(
+        executor: "ActionExecutor",
+        action: str,
+        parameters: dict,
+        user_permissions: list[str] | None,
+        user_id: int | None,
+        lang: str,
+    ) -> dict:
+        """Execute one tool call; exceptions become a failed result."""
+        try:
+            intent_data = {
+                "intent": action,
+                "parameters": parameters,
+                "confidence": 1.0,
+            }
+            return await executor.execute(
+                intent_data, user_permissions=user_permissions,
+                user_id=user_id,
+            )
+        except Exception as e:
+            logger.error(f"❌ Agent tool execution failed: {action} — {e}")
+            error_msg = f"Tool error: {e!s}" if lang == "en" else f"Tool-Fehler: {e!s}"
+            return {
+                "success": False,
+                "message": error_msg,
+                "action_taken": False,
+            }
+
+    @staticmethod
+    def _build_tool_result_step(
+        context: AgentContext,
+        step_num: int,
+        blob_key: int | str,
+        action: str,
+        result: dict,
+        lang: str,
+    ) -> AgentStep:
+        """Turn a tool result into a tool_result step, moving large blobs into the blob store."""
+        logger.info(f"🤖 Agent step {step_num} tool result: success={result.get('success')}, has_data={result.get('data') is not None}, message_len={len(result.get('message', ''))}")
+
+        # Extract large binary blobs before building LLM summary
+        result_data = result.get("data")
+        blob_count_before = len(context.blob_store)
+        if result_data:
+            result_data_for_llm = _extract_blobs(result_data, blob_key, context.blob_store, context.blob_meta)
+        else:
+            result_data_for_llm = result_data
+        blob_count_after = len(context.blob_store)
+        if blob_count_after > blob_count_before:
+            logger.info(f"🗄️ Step {step_num}: Extracted {blob_count_after - blob_count_before} blob(s) from data")
+
+        # Also extract blobs from the message text (may contain JSON with content_base64)
+        raw_message = result.get("message", "")
+        if "content_base64" in raw_message:
+            logger.info(f"🗄️ Step {step_num}: Found content_base64 in message ({len(raw_message)} chars)")
+            try:
+                parsed_msg = json.loads(raw_message)
+                cleaned_msg = _extract_blobs(parsed_msg, blob_key, context.blob_store, context.blob_meta)
+                result_message = json.dumps(cleaned_msg, ensure_ascii=False)
+                blob_count_after = len(context.blob_store)  # update after message extraction
+            except (json.JSONDecodeError, TypeError):
+                result_message = raw_message
+        else:
+            result_message = raw_message
+
+        # Build result summary for the LLM history prompt.
+        # For download results with blobs: show clean metadata only (no blob refs).
+        # The LLM doesn't need to know about blob mechanics — auto-attach handles it.
+        no_result = "No result" if lang == "en" else "Kein Ergebnis"
+        result_message = result_message or no_result
+
+        if blob_count_after > blob_count_before:
+            # This step produced blobs — show clean metadata summary
+            meta = context.blob_meta.get(blob_key, {})
+            fname = meta.get("filename", "document.pdf")
+            mtype = meta.get("mime_type", "unknown")
+            attach_note = "Will be auto-attached to email." if lang == "en" else "Wird automatisch an E-Mail angehängt."
+            result_summary = f"Document downloaded: {fname} ({mtype}). {attach_note}"
+            logger.info(f"📎 Step {step_num} summary: {result_summary}")
+        elif result_data_for_llm:
+            data_label = "Data" if lang == "en" else "Daten"
+            data_str = json.dumps(result_data_for_llm, ensure_ascii=False)
+            result_summary = _truncate(f"{result_message} | {data_label}: {data_str}", max_length=4000)
+        else:
+            result_summary = _truncate(result_message, max_length=4000)
+
+        return AgentStep(
+            step_number=step_num,
+            step_type="tool_result",
+            content=result_summary,
+            tool=action,
+            success=result.get("success", False),
+            data=result.get("data"),
+        )
+
+    @staticmethod
+    def _record_prompt_eval(context: AgentContext, step_num: int, response, messages: list[dict]) -> None:
+        """Record prompt eval counts/timings of a step in the context and Prometheus."""
+        from utils.metrics import record_agent_prompt_eval
+
+        stats = context.record_llm_stats(step_num, response, messages)
+        if stats["prompt_eval_count"] is None:
+            return
+        record_agent_prompt_eval(stats["prompt_eval_count"], stats["cached_tokens"], stats["prompt_eval_ms"] / 1000)
+        logger.debug(
+            f"🤖 Agent step {step_num} prompt eval: {stats['prompt_eval_count']}/{stats['prompt_tokens']} tokens "
+            f"in {stats['prompt_eval_ms']:.0f}ms (~{stats['cached_tokens']} cached)"
+        )
+
     async def _build_summary_answer(
         self,
         context: AgentContext,
@@ -962,12 +1184,13 @@ def _auto_attach_blobs(parameters: dict, context: AgentContext) -> dict:
 
     # Build attachments from blob store metadata
     auto_attachments = []
-    for step_key, meta in sorted(context.blob_meta.items()):
+    # Insertion order is download order (keys mix int and "<step>_<n>")
+    for blob_key, meta in context.blob_meta.items():
         blob_ref = meta.get("blob_ref")
         if not blob_ref or blob_ref not in context.blob_store:
             continue
         auto_attachments.append({
-            "filename": meta.get("filename", f"document_{step_key}.pdf"),
+            "filename": meta.get("filename", f"document_{blob_key}.pdf"),
             "mime_type": meta.get("mime_type", "application/pdf"),
             "content_base64": context.blob_store[blob_ref],
         })
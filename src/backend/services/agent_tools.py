@@ -19,6 +19,12 @@ from loguru import logger
 if TYPE_CHECKING:
     from services.mcp_client import MCPManager
 
+# Rendered tool prompts, shared by all registries of the process. Keyed by
+# MCPManager.tools_version (bumped by refresh_tools/set_tool_override when the
+# MCP tool index changes) and the registered tool names.
+_tools_prompt_cache: dict[tuple, str] = {}
+_TOOLS_PROMPT_CACHE_SIZE = 32
+
 
 @dataclass
 class ToolDefinition:
@@ -52,6 +58,10 @@ class AgentToolRegistry:
                             None means include all internal tools.
         """
         self._tools: dict[str, ToolDefinition] = {}
+        # None = no tools_version available, prompt is not cached
+        self._tools_version: int | None = getattr(mcp_manager, "tools_version", None) if mcp_manager else 0
+        if not isinstance(self._tools_version, int):
+            self._tools_version = None
 
         # Register MCP tools (includes HA, n8n, weather, search, etc.)
         if mcp_manager:
@@ -164,12 +174,25 @@ class AgentToolRegistry:
         Build a compact text description of tools for the LLM prompt.
 
         Args:
-            tools: Optional dict of tools to include. If None, uses all registered tools.
+            tools: Optional dict of tools to include. If None, uses all registered
+                tools (cached per process until the MCP tool index changes).
 
         Returns:
             Formatted string listing tools with parameters.
         """
-        tool_set = tools if tools is not None else self._tools
+        if tools is None and self._tools_version is not None:
+            # Plugins may add tools after construction, so the names are part of the key
+            key = (self._tools_version, tuple(self._tools))
+            prompt = _tools_prompt_cache.get(key)
+            if prompt is None:
+                if len(_tools_prompt_cache) >= _TOOLS_PROMPT_CACHE_SIZE:
+                    _tools_prompt_cache.clear()
+                prompt = _tools_prompt_cache[key] = self._render_tools_prompt(self._tools)
+            return prompt
+        return self._render_tools_prompt(tools if tools is not None else self._tools)
+
+    @staticmethod
+    def _render_tools_prompt(tool_set: dict[str, "ToolDefinition"]) -> str:
         if not tool_set:
             return "KEINE TOOLS VERFÜGBAR."
 
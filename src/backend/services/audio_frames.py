@@ -0,0 +1,207 @@
+"""
+Binary audio frames for the satellite WebSocket protocol (v1.1).
+
+Protocol 1.0 carries audio as base64 inside JSON messages (+33% size plus
+JSON/base64 work per 80 ms chunk). Satellites that advertise binary_audio
+exchange audio as binary WebSocket frames instead:
+
+    offset  size  field
+    0       1     frame type  (1 = microphone audio, 2 = TTS audio)
+    1       1     codec       (0 = PCM s16le, 1 = Opus, 2 = WAV)
+    2       1     flags       (bit 0: final TTS chunk)
+    3       1     session id length N
+    4       4     sequence    (uint32, little endian)
+    8       N     session id  (UTF-8)
+    8+N     ...   payload
+
+Opus payloads are a sequence of 20 ms packets, each prefixed with its
+uint16 length. Microphone audio is 16 kHz mono; Opus TTS is resampled to
+24 kHz mono (Opus does not support Piper's 22.05 kHz).
+
+The transport is negotiated at registration: the satellite lists
+binary_audio and its audio_codecs in its capabilities, the server answers
+with audio_transport in register_ack. Clients without binary_audio keep
+using JSON.
+"""
+import io
+import struct
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+
+# Optional: opuslib (pip install opuslib, needs libopus0)
+try:
+    import opuslib
+    OPUS_AVAILABLE = True
+except Exception:  # ImportError, or libopus missing (opuslib raises on load)
+    opuslib = None
+    OPUS_AVAILABLE = False
+
+FRAME_AUDIO = 1
+FRAME_TTS = 2
+
+CODEC_PCM = 0
+CODEC_OPUS = 1
+CODEC_WAV = 2
+CODECS = {"pcm": CODEC_PCM, "opus": CODEC_OPUS, "wav": CODEC_WAV}
+
+FLAG_FINAL = 0x01
+
+_HEADER = struct.Struct("<BBBBI")
+
+MIC_SAMPLE_RATE = 16000
+TTS_OPUS_SAMPLE_RATE = 24000
+OPUS_FRAME_MS = 20
+
+
+class AudioFrameError(Exception):
+    """Raised for malformed binary audio frames."""
+    pass
+
+
+@dataclass
+class AudioFrame:
+    """One binary audio frame."""
+    frame_type: int
+    codec: int
+    session_id: str
+    sequence: int
+    payload: bytes
+    is_final: bool = False
+
+
+@dataclass
+class AudioTransport:
+    """Negotiated binary audio transport of a satellite."""
+    codec: str = "pcm"      # Microphone audio: pcm | opus
+    tts_codec: str = "wav"  # TTS audio: wav | opus
+
+    def to_dict(self) -> dict:
+        return {"binary": True, "codec": self.codec, "tts_codec": self.tts_codec}
+
+
+def encode_frame(frame: AudioFrame) -> bytes:
+    """Serialize a frame."""
+    session = frame.session_id.encode("utf-8")
+    if len(session) > 255:
+        raise AudioFrameError("Session ID too long")
+    flags = FLAG_FINAL if frame.is_final else 0
+    header = _HEADER.pack(frame.frame_type, frame.codec, flags, len(session), frame.sequence & 0xFFFFFFFF)
+    return header + session + frame.payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Parse a frame; raises AudioFrameError if it is malformed."""
+    if len(data) < _HEADER.size:
+        raise AudioFrameError(f"Frame too short ({len(data)} bytes)")
+    frame_type, codec, flags, session_len, sequence = _HEADER.unpack_from(data)
+    if codec not in CODECS.values():
+        raise AudioFrameError(f"Unknown codec {codec}")
+    end = _HEADER.size + session_len
+    if len(data) < end:
+        raise AudioFrameError("Truncated session ID")
+    try:
+        session_id = data[_HEADER.size:end].decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise AudioFrameError("Invalid session ID") from e
+    return AudioFrame(
+        frame_type=frame_type,
+        codec=codec,
+        session_id=session_id,
+        sequence=sequence,
+        payload=data[end:],
+        is_final=bool(flags & FLAG_FINAL),
+    )
+
+
+def pack_opus_packets(packets: list[bytes]) -> bytes:
+    return b"".join(struct.pack("<H", len(packet)) + packet for packet in packets)
+
+
+def unpack_opus_packets(payload: bytes) -> list[bytes]:
+    packets = []
+    offset = 0
+    while offset < len(payload):
+        if offset + 2 > len(payload):
+            raise AudioFrameError("Truncated Opus packet length")
+        (length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        if offset + length > len(payload):
+            raise AudioFrameError("Truncated Opus packet")
+        packets.append(payload[offset:offset + length])
+        offset += length
+    return packets
+
+
+class OpusStreamEncoder:
+    """Encode a stream of 16-bit mono PCM into 20 ms Opus packets."""
+
+    def __init__(self, sample_rate: int, application: str = "voip"):
+        self.frame_samples = sample_rate * OPUS_FRAME_MS // 1000
+        self._encoder = opuslib.Encoder(sample_rate, 1, application)
+        self._pending = b""
+
+    def encode(self, pcm: bytes) -> bytes:
+        """Encode all complete frames; the remainder waits for more audio."""
+        self._pending += pcm
+        frame_bytes = self.frame_samples * 2
+        packets = []
+        while len(self._pending) >= frame_bytes:
+            packets.append(self._encoder.encode(self._pending[:frame_bytes], self.frame_samples))
+            self._pending = self._pending[frame_bytes:]
+        return pack_opus_packets(packets)
+
+    def flush(self) -> bytes:
+        """Encode the remainder, padded with silence."""
+        if not self._pending:
+            return b""
+        pcm = self._pending.ljust(self.frame_samples * 2, b"\x00")
+        self._pending = b""
+        return pack_opus_packets([self._encoder.encode(pcm, self.frame_samples)])
+
+
+class OpusStreamDecoder:
+    """Decode length-prefixed Opus packets into 16-bit mono PCM."""
+
+    def __init__(self, sample_rate: int):
+        self.frame_samples = sample_rate * OPUS_FRAME_MS // 1000
+        self._decoder = opuslib.Decoder(sample_rate, 1)
+
+    def decode(self, payload: bytes) -> bytes:
+        return b"".join(
+            self._decoder.decode(packet, self.frame_samples)
+            for packet in unpack_opus_packets(payload)
+        )
+
+
+def encode_tts_opus(wav_bytes: bytes) -> bytes:
+    """Convert a mono 16-bit WAV (Piper output) into packed Opus packets at 24 kHz."""
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+        rate = wav_file.getframerate()
+        samples = np.frombuffer(wav_file.readframes(wav_file.getnframes()), dtype=np.int16)
+    if rate != TTS_OPUS_SAMPLE_RATE and len(samples):
+        target_len = int(len(samples) * TTS_OPUS_SAMPLE_RATE / rate)
+        positions = np.linspace(0, len(samples) - 1, target_len)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.int16)
+    encoder = OpusStreamEncoder(TTS_OPUS_SAMPLE_RATE, application="audio")
+    return encoder.encode(samples.tobytes()) + encoder.flush()
+
+
+def negotiate_audio_transport(
+    capabilities: dict,
+    binary_enabled: bool,
+    opus_enabled: bool,
+) -> AudioTransport | None:
+    """
+    Choose the audio transport for a registering satellite.
+
+    Returns None (JSON/base64, protocol 1.0) unless the satellite
+    advertises binary_audio. Opus is used in both directions if both sides
+    support it.
+    """
+    if not binary_enabled or not capabilities.get("binary_audio"):
+        return None
+    if opus_enabled and OPUS_AVAILABLE and "opus" in (capabilities.get("audio_codecs") or []):
+        return AudioTransport(codec="opus", tts_codec="opus")
+    return AudioTransport()
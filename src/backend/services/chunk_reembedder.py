@@ -0,0 +1,160 @@
+"""
+Chunk Re-Embedder — background re-embedding after an embedding model switch.
+
+Every DocumentChunk records the model (OLLAMA_EMBED_MODEL) and version
+(EMBEDDING_MODEL_VERSION) its vector was created with. After a switch the
+outdated chunks are re-embedded in batches of RAG_REEMBED_BATCH_SIZE with one
+commit per batch. The "outdated" filter itself is the resume point: after a
+restart the next run continues with the chunks that are still left.
+
+The knowledge base stays online meanwhile: dense search only compares chunks
+of the current model, outdated chunks remain reachable via BM25.
+"""
+import asyncio
+
+from loguru import logger
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import DocumentChunk
+from services.embedding_service import get_embedding_service
+from services.rag_service import current_embedding_model
+from utils.config import settings
+from utils.llm_client import get_embed_client
+
+
+def outdated_chunk_filter():
+    """WHERE clause for chunks not embedded with the current model/version."""
+    embed_model, embed_version = current_embedding_model()
+    return or_(
+        DocumentChunk.embedding_model.is_distinct_from(embed_model),
+        DocumentChunk.embedding_version.is_distinct_from(embed_version),
+    )
+
+
+class ChunkReembedder:
+    """Re-embeds outdated document chunks in resumable batches."""
+
+    def __init__(self, batch_size: int | None = None):
+        self.batch_size = batch_size or settings.rag_reembed_batch_size
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        """Start a background run (or return the one already running)."""
+        if not self.running:
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel a running pass; the next start() resumes where it stopped."""
+        if self.running:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def run(self) -> dict[str, int]:
+        """
+        Re-embed all outdated chunks.
+
+        Returns:
+            Dict with reembedded and failed counts. Failed chunks keep their
+            old vector and are retried by the next run.
+        """
+        from services.database import AsyncSessionLocal
+
+        embed_model, embed_version = current_embedding_model()
+        totals = {"reembedded": 0, "failed": 0}
+        last_id = 0
+
+        while True:
+            async with AsyncSessionLocal() as db_session:
+                try:
+                    batch_last_id, reembedded, failed = await self.run_batch(db_session, last_id)
+                except Exception as e:
+                    # e.g. a chunk deleted by a concurrent re-index — skip the batch
+                    await db_session.rollback()
+                    logger.warning(f"⚠️ Chunk Re-Embedding: Batch nach ID {last_id} fehlgeschlagen: {e}")
+                    batch_last_id = await self._skip_batch(db_session, last_id)
+                    reembedded, failed = 0, 0
+            if batch_last_id is None:
+                break
+            last_id = batch_last_id
+            totals["reembedded"] += reembedded
+            totals["failed"] += failed
+
+        if totals["reembedded"] or totals["failed"]:
+            logger.info(
+                f"✅ Chunk Re-Embedding auf {embed_model} (Version {embed_version}): "
+                f"{totals['reembedded']} Chunks, {totals['failed']} Fehler"
+            )
+        return totals
+
+    async def run_batch(self, db: AsyncSession, after_id: int) -> tuple[int | None, int, int]:
+        """
+        Re-embed the next batch of outdated chunks with id > after_id.
+
+        Returns:
+            (last chunk id of the batch or None when nothing is left,
+            reembedded count, failed count)
+        """
+        result = await db.execute(
+            select(DocumentChunk)
+            .where(DocumentChunk.id > after_id, outdated_chunk_filter())
+            .order_by(DocumentChunk.id)
+            .limit(self.batch_size)
+        )
+        batch = list(result.scalars().all())
+        if not batch:
+            return None, 0, 0
+
+        embed_model, embed_version = current_embedding_model()
+        embeddings = await get_embedding_service().embed_many(
+            [chunk.content for chunk in batch],
+            model=embed_model,
+            client=get_embed_client(),
+            cache=False,
+            return_exceptions=True,
+        )
+
+        reembedded = failed = 0
+        for chunk, embedding in zip(batch, embeddings, strict=True):
+            if isinstance(embedding, BaseException):
+                failed += 1
+                logger.warning(f"⚠️ Chunk {chunk.id}: Re-Embedding fehlgeschlagen: {embedding}")
+                continue
+            chunk.embedding = embedding
+            chunk.embedding_model = embed_model
+            chunk.embedding_version = embed_version
+            reembedded += 1
+
+        await db.commit()
+        return batch[-1].id, reembedded, failed
+
+    async def _skip_batch(self, db: AsyncSession, after_id: int) -> int | None:
+        """Last id of the batch after after_id, so a failing batch is not retried endlessly."""
+        result = await db.execute(
+            select(DocumentChunk.id)
+            .where(DocumentChunk.id > after_id, outdated_chunk_filter())
+            .order_by(DocumentChunk.id)
+            .limit(self.batch_size)
+        )
+        ids = list(result.scalars().all())
+        return ids[-1] if ids else None
+
+
+_chunk_reembedder: ChunkReembedder | None = None
+
+
+def get_chunk_reembedder() -> ChunkReembedder:
+    """Get or create the global ChunkReembedder instance."""
+    global _chunk_reembedder
+    if _chunk_reembedder is None:
+        _chunk_reembedder = ChunkReembedder()
+    return _chunk_reembedder
@@ -26,6 +26,8 @@ from models.database import (
     ConversationMemory,
     MemoryHistory,
 )
+from services.embedding_service import get_embedding_service
+from services.vector_search import cosine_distance, cosine_similarity, prepare_vector_query, to_pgvector
 from utils.config import settings
 from utils.llm_client import get_embed_client
 
@@ -36,6 +38,9 @@ class ConversationMemoryService:
     and retrieval via pgvector cosine similarity.
     """
 
+    # retrieve() re-ranks this many nearest neighbours per result by similarity * importance
+    _RERANK_CANDIDATE_FACTOR = 4
+
     def __init__(self, db: AsyncSession):
         self.db = db
         self._ollama_client = None
@@ -49,11 +54,9 @@ class ConversationMemoryService:
     async def _get_embedding(self, text_input: str) -> list[float]:
         """Generate embedding using Ollama (nomic-embed-text, 768 dims)."""
         client = await self._get_ollama_client()
-        response = await client.embeddings(
-            model=settings.ollama_embed_model,
-            prompt=text_input
+        return await get_embedding_service().embed(
+            text_input, model=settings.ollama_embed_model, client=client,
         )
-        return response.embedding
 
     # =========================================================================
     # Save
@@ -326,30 +329,39 @@ class ConversationMemoryService:
             logger.warning(f"Could not generate query embedding for memory retrieval: {e}")
             return []
 
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
-
         # Build user filter
         user_filter = "AND user_id = :user_id" if user_id is not None else ""
 
+        # Ranking by similarity * importance cannot use the HNSW index, so
+        # fetch the nearest neighbours by distance first and re-rank those.
+        candidates = limit * self._RERANK_CANDIDATE_FACTOR
+        await prepare_vector_query(self.db, limit=candidates, filtered=True)
+
         sql = text(f"""
-            SELECT
-                id,
-                content,
-                category,
-                importance,
-                access_count,
-                created_at,
-                1 - (embedding <=> CAST(:embedding AS vector)) as similarity
-            FROM conversation_memories
-            WHERE is_active = true
-              AND embedding IS NOT NULL
-              {user_filter}
-            ORDER BY (1 - (embedding <=> CAST(:embedding AS vector))) * importance DESC
+            SELECT id, content, category, importance, access_count, created_at, similarity
+            FROM (
+                SELECT
+                    id,
+                    content,
+                    category,
+                    importance,
+                    access_count,
+                    created_at,
+                    {cosine_similarity()} as similarity
+                FROM conversation_memories
+                WHERE is_active = true
+                  AND embedding IS NOT NULL
+                  {user_filter}
+                ORDER BY {cosine_distance()}
+                LIMIT :candidates
+            ) AS nearest
+            ORDER BY similarity * importance DESC
             LIMIT :limit
         """)
 
         params = {
-            "embedding": embedding_str,
+            "embedding": to_pgvector(query_embedding),
+            "candidates": candidates,
             "limit": limit,
         }
         if user_id is not None:
@@ -674,22 +686,23 @@ class ConversationMemoryService:
         lower = settings.memory_contradiction_threshold
         upper = settings.memory_dedup_threshold
         top_k = settings.memory_contradiction_top_k
-        embedding_str = f"[{','.join(map(str, embedding))}]"
 
         user_filter = "AND user_id = :user_id" if user_id is not None else ""
 
+        await prepare_vector_query(self.db, limit=top_k, filtered=True)
+
         sql = text(f"""
             SELECT id, content, category, importance,
-                   1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                   {cosine_similarity()} as similarity
             FROM conversation_memories
             WHERE is_active = true
               AND embedding IS NOT NULL
               {user_filter}
-            ORDER BY embedding <=> CAST(:embedding AS vector)
+            ORDER BY {cosine_distance()}
             LIMIT :top_k
         """)
 
-        params: dict = {"embedding": embedding_str, "top_k": top_k}
+        params: dict = {"embedding": to_pgvector(embedding), "top_k": top_k}
         if user_id is not None:
             params["user_id"] = user_id
 
@@ -988,22 +1001,23 @@ class ConversationMemoryService:
     ) -> ConversationMemory | None:
         """Find an existing memory that is semantically too similar (duplicate)."""
         threshold = settings.memory_dedup_threshold
-        embedding_str = f"[{','.join(map(str, embedding))}]"
 
         user_filter = "AND user_id = :user_id" if user_id is not None else ""
 
+        await prepare_vector_query(self.db, limit=1, filtered=True)
+
         sql = text(f"""
             SELECT id,
-                   1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                   {cosine_similarity()} as similarity
             FROM conversation_memories
             WHERE is_active = true
               AND embedding IS NOT NULL
               {user_filter}
-            ORDER BY embedding <=> CAST(:embedding AS vector)
+            ORDER BY {cosine_distance()}
             LIMIT 1
         """)
 
-        params = {"embedding": embedding_str}
+        params = {"embedding": to_pgvector(embedding)}
         if user_id is not None:
             params["user_id"] = user_id
 
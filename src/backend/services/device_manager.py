@@ -64,6 +64,9 @@ class DeviceCapabilities:
     led_count: int = 0
     has_button: bool = False
 
+    # Playback
+    tts_streaming: bool = False  # Plays consecutive tts_audio chunks in order
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "DeviceCapabilities":
         """Create from dictionary"""
@@ -78,6 +81,7 @@ class DeviceCapabilities:
             has_leds=data.get("has_leds", False),
             led_count=data.get("led_count", 0),
             has_button=data.get("has_button", False),
+            tts_streaming=data.get("tts_streaming", False),
         )
 
     def to_dict(self) -> dict[str, Any]:
@@ -93,6 +97,7 @@ class DeviceCapabilities:
             "has_leds": self.has_leds,
             "led_count": self.led_count,
             "has_button": self.has_button,
+            "tts_streaming": self.tts_streaming,
         }
 
 
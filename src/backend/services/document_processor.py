@@ -442,3 +442,29 @@ class DocumentProcessor:
         """Prüft, ob ein Dateiformat unterstützt wird"""
         ext = Path(filename).suffix.lower().lstrip('.')
         return ext in self.get_supported_formats()
+
+
+# =============================================================================
+# Ingestion worker processes (services/ingestion_queue.py)
+# =============================================================================
+
+# One processor per worker process — Docling models stay loaded between jobs
+_worker_processor: DocumentProcessor | None = None
+
+
+def init_worker() -> None:
+    """ProcessPoolExecutor initializer: load the Docling models once per process."""
+    global _worker_processor
+    _worker_processor = DocumentProcessor()
+    try:
+        _worker_processor._ensure_initialized()
+    except Exception as e:
+        logger.warning(f"Docling-Vorladen im Worker fehlgeschlagen: {e}")
+
+
+def process_in_worker(file_path: str, force_ocr: bool = False) -> dict[str, Any]:
+    """Run process_document() inside an ingestion worker process."""
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DocumentProcessor()
+    return asyncio.run(_worker_processor.process_document(file_path, force_ocr=force_ocr))
@@ -0,0 +1,333 @@
+"""
+Embedding Service — Process-wide embedding cache, request coalescing and batching.
+
+A single chat turn embeds the same user message in several places (RAG search,
+memory retrieval, intent corrections, knowledge graph, notifications). Each of
+those is an Ollama round trip returning a multi-thousand-float vector. All
+services get their vectors from here instead of calling
+``get_embed_client().embeddings`` directly, so one message is embedded once.
+
+- LRU + TTL cache keyed by (model, normalized text)
+- In-flight coalescing: concurrent requests for the same key share one call
+- Batching: cache misses wait a few milliseconds in EmbeddingBatcher and are
+  sent together through Ollama's /api/embed, so ingesting a 500-chunk PDF costs
+  ~16 requests instead of 500
+- Hit/miss/coalesced counters and batch sizes via utils.metrics
+
+Configuration:
+    EMBEDDING_CACHE_ENABLED     — Master switch (default: true)
+    EMBEDDING_CACHE_SIZE        — Max cached vectors (default: 512)
+    EMBEDDING_CACHE_TTL         — Seconds a vector stays valid (default: 300)
+    EMBEDDING_BATCH_SIZE        — Max texts per /api/embed request (default: 32)
+    EMBEDDING_BATCH_MAX_TOKENS  — Max estimated tokens per request (default: 8192)
+    EMBEDDING_BATCH_LINGER_MS   — How long a batch waits for more texts (default: 5)
+    EMBEDDING_BATCH_CONCURRENCY — Max batch requests in flight (default: 2)
+"""
+import asyncio
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+
+from loguru import logger
+
+from utils.config import settings
+from utils.llm_client import LLMClient, embed_many, get_embed_client
+from utils.metrics import record_embedding_batch, record_embedding_cache
+from utils.token_counter import token_counter
+
+CacheKey = tuple[str, str]
+BatchKey = tuple[str, int]
+
+
+class EmbeddingBatcher:
+    """
+    Groups concurrent embedding requests into size- and token-bounded batches.
+
+    Each request is queued per (model, client). A queue is flushed when it
+    reaches EMBEDDING_BATCH_SIZE texts, when the next text would exceed
+    EMBEDDING_BATCH_MAX_TOKENS, or when EMBEDDING_BATCH_LINGER_MS has passed
+    since its first text. A single queued text uses the plain embeddings()
+    call; larger batches use embed_many(). If a batch request fails, its
+    texts are retried one by one so a single bad input does not fail the rest.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int | None = None,
+        max_batch_tokens: int | None = None,
+        linger_ms: float | None = None,
+        max_concurrency: int | None = None,
+    ):
+        self.max_batch_size = max_batch_size or settings.embedding_batch_size
+        self.max_batch_tokens = max_batch_tokens or settings.embedding_batch_max_tokens
+        self.linger = (linger_ms if linger_ms is not None else settings.embedding_batch_linger_ms) / 1000
+        self._semaphore = asyncio.Semaphore(max_concurrency or settings.embedding_batch_concurrency)
+        self._queues: dict[BatchKey, list[tuple[str, asyncio.Future]]] = {}
+        self._queued_tokens: dict[BatchKey, int] = {}
+        self._clients: dict[BatchKey, LLMClient] = {}
+        self._timers: dict[BatchKey, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.requests = 0
+        self.texts = 0
+
+    async def embed(self, text: str, model: str, client: LLMClient) -> list[float]:
+        """Queue *text* for the next batch and wait for its vector."""
+        loop = asyncio.get_running_loop()
+        key = (model, id(client))
+        tokens = token_counter.count(text)
+
+        queue = self._queues.get(key)
+        if queue and self._queued_tokens[key] + tokens > self.max_batch_tokens:
+            self._flush(key)
+            queue = None
+        if queue is None:
+            queue = self._queues[key] = []
+            self._queued_tokens[key] = 0
+            self._clients[key] = client
+
+        future = loop.create_future()
+        queue.append((text, future))
+        self._queued_tokens[key] += tokens
+
+        if len(queue) >= self.max_batch_size or self._queued_tokens[key] >= self.max_batch_tokens:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.linger, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        """Send the queued texts for *key* as one batch."""
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._queues.pop(key, None)
+        self._queued_tokens.pop(key, None)
+        client = self._clients.pop(key, None)
+        if not items:
+            return
+
+        task = asyncio.create_task(self._run_batch(key[0], client, items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self,
+        model: str,
+        client: LLMClient,
+        items: list[tuple[str, asyncio.Future]],
+    ) -> None:
+        async with self._semaphore:
+            self.requests += 1
+            self.texts += len(items)
+            record_embedding_batch(len(items))
+
+            if len(items) == 1:
+                text, future = items[0]
+                await self._resolve_single(model, client, text, future)
+                return
+
+            try:
+                vectors = await embed_many(client, model, [text for text, _ in items])
+            except Exception as e:
+                logger.warning(f"Embedding batch of {len(items)} failed ({e}), retrying individually")
+                for text, future in items:
+                    await self._resolve_single(model, client, text, future)
+                return
+
+            for (_, future), vector in zip(items, vectors, strict=True):
+                if not future.done():
+                    future.set_result(vector)
+
+    @staticmethod
+    async def _resolve_single(model: str, client: LLMClient, text: str, future: asyncio.Future) -> None:
+        if future.done():
+            return
+        try:
+            response = await client.embeddings(model=model, prompt=text)
+            # ollama>=0.4.0 uses Pydantic models with .embedding attribute
+            vector = list(response.embedding)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(vector)
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a failed fetch retrieved so an error nobody awaited is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+class EmbeddingService:
+    """Embeds text via Ollama with an LRU+TTL cache, in-flight coalescing and batching."""
+
+    def __init__(self, max_entries: int | None = None, ttl: float | None = None):
+        self.max_entries = max_entries if max_entries is not None else settings.embedding_cache_size
+        self.ttl = ttl if ttl is not None else settings.embedding_cache_ttl
+        # Vectors are stored as array('d') (8 bytes/dim) instead of list[float]
+        # (~32 bytes/dim) — at 2560 dims that is 20 KB instead of 80 KB per entry.
+        self._cache: OrderedDict[CacheKey, tuple[float, array]] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Task] = {}
+        self._batcher = EmbeddingBatcher()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize text for cache keys (Unicode NFC, collapsed whitespace)."""
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    async def embed(
+        self,
+        text: str,
+        model: str | None = None,
+        client: LLMClient | None = None,
+        cache: bool = True,
+    ) -> list[float]:
+        """
+        Return the embedding for *text*, from cache when possible.
+
+        Args:
+            text: Text to embed
+            model: Embedding model (default: settings.ollama_embed_model)
+            client: LLM client to use on a cache miss (default: get_embed_client())
+            cache: False for bulk work (document chunks, re-embedding) whose
+                vectors would only evict the conversational working set
+
+        Returns:
+            Embedding vector (a fresh list — callers may mutate it)
+
+        Raises:
+            Whatever the client raises; failures are never cached.
+        """
+        model = model or settings.ollama_embed_model
+        if not cache or not settings.embedding_cache_enabled:
+            return await self._fetch(text, model, client)
+
+        key = (model, self.normalize(text))
+
+        cached = self._get_cached(key)
+        if cached is not None:
+            self.hits += 1
+            record_embedding_cache("hit")
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            record_embedding_cache("coalesced")
+            vector = await asyncio.shield(pending)
+            return vector.tolist()
+
+        self.misses += 1
+        record_embedding_cache("miss")
+
+        # The round trip runs in its own task: cancelling the caller that
+        # started it must not cancel the callers coalesced onto it.
+        task = asyncio.create_task(self._fetch_and_store(key, text, model, client))
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = task
+        vector = await asyncio.shield(task)
+        return vector.tolist()
+
+    async def _fetch_and_store(
+        self, key: CacheKey, text: str, model: str, client: LLMClient | None
+    ) -> array:
+        """Fetch one cache miss and store it; shared by all coalesced callers."""
+        try:
+            vector = array("d", await self._fetch(text, model, client))
+            self._put(key, vector)
+            return vector
+        finally:
+            self._inflight.pop(key, None)
+
+    async def embed_many(
+        self,
+        texts: list[str],
+        model: str | None = None,
+        client: LLMClient | None = None,
+        cache: bool = True,
+        return_exceptions: bool = False,
+    ) -> list[list[float] | BaseException]:
+        """
+        Embed several texts; misses are sent to Ollama in as few batches as possible.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model (default: settings.ollama_embed_model)
+            client: LLM client (default: get_embed_client())
+            cache: See embed()
+            return_exceptions: Return per-text exceptions in place of vectors
+                instead of raising the first one
+
+        Returns:
+            One vector (or exception) per text, in input order
+        """
+        client = client or get_embed_client()
+        return list(await asyncio.gather(
+            *(self.embed(text, model=model, client=client, cache=cache) for text in texts),
+            return_exceptions=return_exceptions,
+        ))
+
+    async def _fetch(self, text: str, model: str, client: LLMClient | None) -> list[float]:
+        """Embedding round trip to Ollama, batched with concurrent misses."""
+        return await self._batcher.embed(text, model, client or get_embed_client())
+
+    def _get_cached(self, key: CacheKey) -> list[float] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        stored_at, vector = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return vector.tolist()
+
+    def _put(self, key: CacheKey, vector: array) -> None:
+        if self.max_entries <= 0:
+            return
+        self._cache[key] = (time.monotonic(), vector)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached vectors (e.g. after switching the embedding model)."""
+        self._cache.clear()
+        logger.debug("Embedding cache cleared")
+
+    def get_stats(self) -> dict:
+        """Cache statistics for status/debug endpoints."""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": settings.embedding_cache_enabled,
+            "size": len(self._cache),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else 0.0,
+            "batch_requests": self._batcher.requests,
+            "batched_texts": self._batcher.texts,
+        }
+
+
+# Global service instance (lazy initialization)
+_embedding_service: EmbeddingService | None = None
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get or create the global embedding service instance"""
+    global _embedding_service
+
+    if _embedding_service is None:
+        _embedding_service = EmbeddingService()
+
+    return _embedding_service
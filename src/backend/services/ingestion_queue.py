@@ -0,0 +1,417 @@
+"""
+Ingestion Queue — Redis job queue and worker pool for document indexing.
+
+The knowledge upload stores the file, creates a pending Document and
+enqueues a job; the API answers 202 with the job id. Consumers in the
+backend claim jobs and run the Docling conversion in worker processes that
+keep their models loaded (document_processor.process_in_worker). Embedding
+and database writes stay in the backend's event loop.
+
+Two lanes with separate process pools, so one scanned 200-page PDF does not
+hold up a batch of Markdown files:
+- ocr:  PDFs, images and force_ocr uploads (RAG_INGEST_OCR_WORKERS)
+- text: everything else (RAG_INGEST_TEXT_WORKERS)
+
+Jobs are claimed with BLMOVE into a per-lane processing list and keep a
+heartbeat key while they run. A backend that shuts down drops the heartbeats
+of its running jobs, so they are put back into their lane on the next start;
+jobs of a crashed backend follow once their heartbeat has expired. Errors are retried
+RAG_INGEST_MAX_RETRIES times. Cancelling skips a queued job and stops a
+running one at its next progress report; the document is removed.
+"""
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from loguru import logger
+
+from services.task_queue import TaskQueue
+from utils.config import settings
+
+QUEUE_PREFIX = "renfield:ingest"
+
+LANE_OCR = "ocr"
+LANE_TEXT = "text"
+LANES = (LANE_OCR, LANE_TEXT)
+OCR_EXTENSIONS = {"pdf", "png", "jpg", "jpeg", "tif", "tiff", "bmp"}
+
+JOB_QUEUED = "queued"
+JOB_PROCESSING = "processing"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINAL_STATUSES = {JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED}
+
+# Overall progress per stage of RAGService.index_document: (start, end)
+STAGE_PROGRESS = {
+    "converting": (0.0, 0.1),
+    "embedding": (0.1, 0.95),
+    "saving": (0.95, 1.0),
+}
+
+CLAIM_TIMEOUT = 5.0            # BLMOVE block time (seconds)
+HEARTBEAT_INTERVAL = 15.0      # Seconds between heartbeats of a running job
+HEARTBEAT_TTL = 60             # Job counts as abandoned without heartbeat for this long
+JOB_TTL = 7 * 24 * 3600        # Finished jobs stay queryable for a week
+
+
+class IngestionCancelled(Exception):
+    """Raised from the progress callback when a running job was cancelled."""
+
+
+def ingestion_lane(filename: str, force_ocr: bool = False) -> str:
+    """OCR lane for PDFs, images and forced OCR; text lane for everything else."""
+    if force_ocr or settings.rag_force_ocr:
+        return LANE_OCR
+    extension = Path(filename).suffix.lower().lstrip(".")
+    return LANE_OCR if extension in OCR_EXTENSIONS else LANE_TEXT
+
+
+class IngestionQueue(TaskQueue):
+    """Ingestion jobs in Redis: one list per lane plus a processing list per lane."""
+
+    @staticmethod
+    def lane_queue(lane: str) -> str:
+        return f"{QUEUE_PREFIX}:{lane}"
+
+    @staticmethod
+    def processing_queue(lane: str) -> str:
+        return f"{QUEUE_PREFIX}:{lane}:processing"
+
+    @staticmethod
+    def _heartbeat_key(job_id: str) -> str:
+        return f"{QUEUE_PREFIX}:heartbeat:{job_id}"
+
+    @staticmethod
+    def _cancel_key(job_id: str) -> str:
+        return f"{QUEUE_PREFIX}:cancel:{job_id}"
+
+    async def submit(
+        self,
+        document_id: int,
+        file_path: str,
+        filename: str,
+        knowledge_base_id: int | None = None,
+        user_id: int | None = None,
+        force_ocr: bool = False,
+    ) -> str:
+        """Enqueue a pending document; returns the job id."""
+        lane = ingestion_lane(filename, force_ocr)
+        return await self.enqueue(
+            "ingest",
+            {
+                "document_id": document_id,
+                "file_path": file_path,
+                "filename": filename,
+                "knowledge_base_id": knowledge_base_id,
+                "user_id": user_id,
+                "force_ocr": force_ocr,
+                "lane": lane,
+            },
+            queue_name=self.lane_queue(lane),
+        )
+
+    async def update_job(self, job_id: str, **fields) -> dict | None:
+        """Merge *fields* into the stored job; finished jobs expire after JOB_TTL."""
+        job = await self.get_task_status(job_id)
+        if job is None:
+            return None
+        job.update(fields, updated_at=time.time())
+        ttl = JOB_TTL if job.get("status") in FINAL_STATUSES else None
+        await self.redis_client.set(job_id, json.dumps(job), ex=ttl)
+        return job
+
+    async def claim(self, lane: str, timeout: float = CLAIM_TIMEOUT) -> tuple[str, dict] | None:
+        """Move the oldest job of *lane* to its processing list; None after *timeout*."""
+        raw = await self.redis_client.blmove(
+            self.lane_queue(lane), self.processing_queue(lane), timeout, "RIGHT", "LEFT"
+        )
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        await self.heartbeat(entry["id"])
+        return raw, await self.get_task_status(entry["id"]) or entry
+
+    async def ack(self, lane: str, raw: str) -> None:
+        """Remove a claimed entry from the processing list."""
+        await self.redis_client.lrem(self.processing_queue(lane), 1, raw)
+
+    async def requeue(self, lane: str, job: dict) -> None:
+        """Put a job back at the end of its lane (retry)."""
+        entry = {"id": job["id"], "type": job.get("type", "ingest"), "parameters": job["parameters"]}
+        await self.redis_client.lpush(self.lane_queue(lane), json.dumps(entry))
+
+    async def heartbeat(self, job_id: str) -> None:
+        await self.redis_client.set(self._heartbeat_key(job_id), "1", ex=HEARTBEAT_TTL)
+
+    async def release(self, job_ids) -> None:
+        """Drop the heartbeats of jobs a stopping worker leaves unfinished, so recover() picks them up."""
+        for job_id in job_ids:
+            await self.redis_client.delete(self._heartbeat_key(job_id))
+
+    async def recover(self, lane: str) -> int:
+        """Return abandoned jobs (processing entry without heartbeat) to the front of their lane."""
+        recovered = 0
+        for raw in await self.redis_client.lrange(self.processing_queue(lane), 0, -1):
+            job_id = json.loads(raw)["id"]
+            if await self.redis_client.exists(self._heartbeat_key(job_id)):
+                continue
+            await self.redis_client.lrem(self.processing_queue(lane), 1, raw)
+            await self.redis_client.rpush(self.lane_queue(lane), raw)
+            recovered += 1
+        return recovered
+
+    async def cancel(self, job_id: str) -> dict | None:
+        """Cancel a job: queued jobs are skipped, running jobs stop at the next stage."""
+        job = await self.get_task_status(job_id)
+        if job is None or job.get("status") in FINAL_STATUSES:
+            return job
+        await self.redis_client.set(self._cancel_key(job_id), "1", ex=JOB_TTL)
+        if job.get("status") == JOB_QUEUED:
+            return await self.update_job(job_id, status=JOB_CANCELLED)
+        return await self.update_job(job_id, cancel_requested=True)
+
+    async def is_cancelled(self, job_id: str) -> bool:
+        return bool(await self.redis_client.exists(self._cancel_key(job_id)))
+
+    async def queue_lengths(self) -> dict[str, int]:
+        return {lane: await self.redis_client.llen(self.lane_queue(lane)) for lane in LANES}
+
+
+def job_to_response(job: dict) -> dict:
+    """Flatten a stored job for the API."""
+    parameters = job.get("parameters", {})
+    return {
+        "job_id": job["id"],
+        "status": job.get("status", JOB_QUEUED),
+        "stage": job.get("stage"),
+        "progress": round(job.get("progress", 0.0), 3),
+        "attempts": job.get("attempts", 0),
+        "lane": parameters.get("lane"),
+        "document_id": parameters.get("document_id"),
+        "filename": parameters.get("filename"),
+        "knowledge_base_id": parameters.get("knowledge_base_id"),
+        "chunk_count": job.get("chunk_count"),
+        "error": job.get("error"),
+    }
+
+
+class IngestionWorker:
+    """Consumes ingestion jobs; Docling runs in one process pool per lane."""
+
+    def __init__(self, queue: IngestionQueue | None = None):
+        self._queue = queue
+        self._pools: dict[str, ProcessPoolExecutor] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._held: set[str] = set()  # Claimed, not yet acknowledged job ids
+
+    @property
+    def queue(self) -> IngestionQueue:
+        if self._queue is None:
+            self._queue = get_ingestion_queue()
+        return self._queue
+
+    @staticmethod
+    def _worker_count(lane: str) -> int:
+        return settings.rag_ingest_ocr_workers if lane == LANE_OCR else settings.rag_ingest_text_workers
+
+    def _new_pool(self, lane: str) -> ProcessPoolExecutor:
+        from services.document_processor import init_worker
+
+        return ProcessPoolExecutor(
+            max_workers=self._worker_count(lane),
+            mp_context=multiprocessing.get_context("spawn"),  # No fork of the running event loop
+            initializer=init_worker,
+        )
+
+    async def start(self) -> None:
+        """Recover abandoned jobs, start the process pools and consumers."""
+        if self._tasks:
+            return
+        for lane in LANES:
+            recovered = await self.queue.recover(lane)
+            if recovered:
+                logger.info(f"📥 {recovered} unterbrochene Ingestion-Jobs ({lane}) wieder eingereiht")
+            self._pools[lane] = self._new_pool(lane)
+            for index in range(self._worker_count(lane)):
+                self._tasks.append(asyncio.create_task(self._consume(lane), name=f"ingest-{lane}-{index}"))
+        logger.info(
+            f"📥 Ingestion Worker gestartet (OCR: {settings.rag_ingest_ocr_workers}, "
+            f"Text: {settings.rag_ingest_text_workers})"
+        )
+
+    async def stop(self) -> None:
+        """Stop consumers and worker processes; running jobs are recovered on the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self._held:
+            # Without this a restart within HEARTBEAT_TTL would skip these jobs in recover()
+            try:
+                await self.queue.release(self._held)
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeats unterbrochener Ingestion-Jobs nicht gelöscht: {e}")
+            self._held.clear()
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pools.clear()
+
+    async def _consume(self, lane: str) -> None:
+        while True:
+            try:
+                claimed = await self.queue.claim(lane)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Ingestion Queue ({lane}) nicht erreichbar: {e}")
+                await asyncio.sleep(CLAIM_TIMEOUT)
+                continue
+            if claimed is None:
+                continue
+            raw, job = claimed
+            self._held.add(job["id"])
+            try:
+                await self.run_job(lane, job)
+            except Exception as e:
+                # Stays in the processing list and is recovered on the next start
+                logger.error(f"❌ Ingestion-Job {job['id']} nicht abgeschlossen: {e}")
+                continue
+            await self.queue.ack(lane, raw)
+            self._held.discard(job["id"])
+
+    async def run_job(self, lane: str, job: dict) -> None:
+        """Index the document of *job*; retries, cancellation and status updates included."""
+        from utils.metrics import record_ingest_job
+
+        job_id = job["id"]
+        parameters = job["parameters"]
+        if job.get("status") == JOB_CANCELLED or await self.queue.is_cancelled(job_id):
+            await self._discard(parameters["document_id"])
+            await self.queue.update_job(job_id, status=JOB_CANCELLED)
+            return
+
+        attempts = job.get("attempts", 0) + 1
+        await self.queue.update_job(job_id, status=JOB_PROCESSING, attempts=attempts, stage="converting", progress=0.0)
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        start = time.monotonic()
+        try:
+            document = await self._index(lane, job_id, parameters, retry=attempts > 1)
+        except IngestionCancelled:
+            await self._discard(parameters["document_id"])
+            await self.queue.update_job(job_id, status=JOB_CANCELLED, stage=None)
+            record_ingest_job(lane, JOB_CANCELLED, time.monotonic() - start)
+            logger.info(f"📥 Ingestion-Job {job_id} abgebrochen")
+        except Exception as e:
+            if attempts <= settings.rag_ingest_max_retries:
+                logger.warning(f"⚠️ Ingestion-Job {job_id} fehlgeschlagen (Versuch {attempts}), erneut eingereiht: {e}")
+                await self.queue.update_job(job_id, status=JOB_QUEUED, stage=None, progress=0.0, error=str(e))
+                await self.queue.requeue(lane, job)
+                record_ingest_job(lane, "retried", time.monotonic() - start)
+            else:
+                logger.error(f"❌ Ingestion-Job {job_id} endgültig fehlgeschlagen: {e}")
+                await self.queue.update_job(job_id, status=JOB_FAILED, stage=None, error=str(e))
+                record_ingest_job(lane, JOB_FAILED, time.monotonic() - start)
+        else:
+            from models.database import DOC_STATUS_COMPLETED
+
+            status = JOB_COMPLETED if document.status == DOC_STATUS_COMPLETED else JOB_FAILED
+            await self.queue.update_job(
+                job_id, status=status, stage=None, progress=1.0,
+                chunk_count=document.chunk_count, error=document.error_message,
+            )
+            record_ingest_job(lane, status, time.monotonic() - start)
+        finally:
+            heartbeat.cancel()
+
+    async def _index(self, lane: str, job_id: str, parameters: dict, retry: bool = False):
+        from sqlalchemy import delete
+
+        from models.database import DocumentChunk
+        from services.database import AsyncSessionLocal
+        from services.rag_service import RAGService
+
+        async with AsyncSessionLocal() as db_session:
+            rag = RAGService(db_session)
+            document = await rag.get_document(parameters["document_id"])
+            if document is None:
+                raise IngestionCancelled("document deleted")
+            if retry:
+                # Chunks of an interrupted attempt
+                await db_session.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document.id))
+                await db_session.commit()
+            return await rag.index_document(
+                document,
+                user_id=parameters.get("user_id"),
+                force_ocr=parameters.get("force_ocr", False),
+                convert=lambda file_path, force_ocr: self._convert(lane, file_path, force_ocr),
+                progress=self._progress_reporter(job_id),
+            )
+
+    async def _convert(self, lane: str, file_path: str, force_ocr: bool) -> dict:
+        from services.document_processor import process_in_worker
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._pools[lane], process_in_worker, file_path, force_ocr)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge scan) — replace the pool, the job is retried
+            self._pools[lane] = self._new_pool(lane)
+            raise
+
+    def _progress_reporter(self, job_id: str):
+        """Progress callback for index_document(): throttled Redis updates plus cancellation check."""
+        last = {"stage": None, "progress": -1.0}
+
+        async def report(stage: str, fraction: float) -> None:
+            low, high = STAGE_PROGRESS.get(stage, (0.0, 1.0))
+            progress = low + (high - low) * min(max(fraction, 0.0), 1.0)
+            if stage == last["stage"] and progress - last["progress"] < 0.05:
+                return
+            last.update(stage=stage, progress=progress)
+            if await self.queue.is_cancelled(job_id):
+                raise IngestionCancelled(job_id)
+            await self.queue.update_job(job_id, stage=stage, progress=progress)
+
+        return report
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            try:
+                await self.queue.heartbeat(job_id)
+            except Exception as e:
+                logger.debug(f"Ingestion heartbeat failed: {e}")
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    @staticmethod
+    async def _discard(document_id: int) -> None:
+        """Remove the pending document (and its file) of a cancelled job."""
+        from services.database import AsyncSessionLocal
+        from services.rag_service import RAGService
+
+        async with AsyncSessionLocal() as db_session:
+            await RAGService(db_session).delete_document(document_id)
+
+
+_ingestion_queue: IngestionQueue | None = None
+_ingestion_worker: IngestionWorker | None = None
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    """Get or create the global IngestionQueue instance."""
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        _ingestion_queue = IngestionQueue()
+    return _ingestion_queue
+
+
+def get_ingestion_worker() -> IngestionWorker:
+    """Get or create the global IngestionWorker instance."""
+    global _ingestion_worker
+    if _ingestion_worker is None:
+        _ingestion_worker = IngestionWorker()
+    return _ingestion_worker
@@ -0,0 +1,453 @@
+"""
+Intent Classifier — Embedding nearest-neighbour fast path for routine commands.
+
+Every message used to go through the intent LLM, even "Licht im Büro aus".
+IntentClassifier keeps labelled example utterances as rows of an
+L2-normalized float32 matrix (like SpeakerIndex) and answers the nearest
+neighbours with a single matrix-vector product.
+
+Example sources (later sources override earlier ones for the same text):
+1. IntentRegistry examples (core integrations) + built-in HassTurnOn/Off seeds
+2. Logged conversations: user message → assistant intent with action_success
+3. Accepted intent corrections (IntentCorrection, feedback_type="intent")
+
+A match is only used when the nearest example reaches
+INTENT_FASTPATH_THRESHOLD and leads the best competing intent by
+INTENT_FASTPATH_MARGIN. Complex messages (ComplexityDetector), references
+("mach es aus") and intents with required parameters other than the HA
+on/off target fall back to the LLM. On/off is decided lexically because
+embeddings barely separate "an" from "aus"; the HA target is resolved
+against the entity map (state mirror).
+
+Offline evaluation against logged conversations: services/intent_classifier_eval.py
+"""
+import re
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from loguru import logger
+
+from utils.config import settings
+
+HASS_TURN_ON = "mcp.homeassistant.HassTurnOn"
+HASS_TURN_OFF = "mcp.homeassistant.HassTurnOff"
+
+# On/off share one vote, the polarity comes from the wording
+_POLARITY_INTENTS = {HASS_TURN_ON: HASS_TURN_ON, HASS_TURN_OFF: HASS_TURN_ON}
+
+# Seeds so the fast path knows on/off commands before anything is logged
+SEED_EXAMPLES: dict[str, list[str]] = {
+    HASS_TURN_ON: [
+        "Schalte das Licht ein",
+        "Mach das Licht im Wohnzimmer an",
+        "Licht in der Küche an",
+        "Schalte die Steckdose ein",
+        "Turn on the light",
+        "Switch on the kitchen light",
+    ],
+    HASS_TURN_OFF: [
+        "Schalte das Licht aus",
+        "Mach das Licht im Wohnzimmer aus",
+        "Licht in der Küche aus",
+        "Schalte die Steckdose aus",
+        "Turn off the light",
+        "Switch off the kitchen light",
+    ],
+}
+
+# Domains HassTurnOn/HassTurnOff can target by area
+_SWITCHABLE_DOMAINS = ("light", "switch", "fan", "climate", "cover", "media_player", "vacuum")
+
+_ON_RE = re.compile(
+    r"\b(an|ein|on|anschalten|einschalten|anmachen|aktivieren|activate|enable)\b", re.IGNORECASE
+)
+_OFF_RE = re.compile(
+    r"\b(aus|off|ausschalten|ausmachen|abschalten|deaktivieren|deactivate|disable)\b", re.IGNORECASE
+)
+# References need the conversation history → LLM
+_REFERENCE_RE = re.compile(
+    r"\b(es|ihn|dort|dafür|davon|dasselbe|it|them|there)\b", re.IGNORECASE
+)
+
+def _vote_key(intent: str) -> str:
+    return _POLARITY_INTENTS.get(intent, intent)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, collapse whitespace, drop trailing punctuation."""
+    return " ".join(text.lower().split()).strip(" .!?")
+
+
+def detect_polarity(message: str) -> bool | None:
+    """True for on, False for off, None if both or neither appear."""
+    on, off = bool(_ON_RE.search(message)), bool(_OFF_RE.search(message))
+    return on if on != off else None
+
+
+def _intent_name(metadata: dict | None) -> tuple[str | None, bool | None]:
+    """(intent, action_success) from assistant message metadata (string or dict intent)."""
+    if not metadata:
+        return None, None
+    intent = metadata.get("intent")
+    if isinstance(intent, dict):
+        intent = intent.get("intent")
+    success = metadata.get("action_success")
+    if success is None and isinstance(metadata.get("action_result"), dict):
+        success = metadata["action_result"].get("success")
+    return intent, success
+
+
+def successful_turns(rows) -> list[tuple[str, str]]:
+    """
+    Pair user messages with the intent of the following assistant message.
+
+    Args:
+        rows: (conversation_id, role, content, message_metadata), oldest first
+
+    Returns:
+        (user message, intent) for turns whose action succeeded
+    """
+    turns = []
+    previous = None
+    for conversation_id, role, content, metadata in rows:
+        if role == "assistant" and previous and previous[0] == conversation_id:
+            intent, success = _intent_name(metadata)
+            if intent and success is True:
+                turns.append((previous[1], intent))
+        previous = (conversation_id, content) if role == "user" and content else None
+    return turns
+
+
+@dataclass
+class IntentMatch:
+    """Nearest-neighbour vote for one query."""
+    intent: str
+    score: float    # Cosine similarity of the best example of this intent
+    margin: float   # Lead over the best example of any other intent
+    example: str
+
+    def is_confident(self, threshold: float, margin: float) -> bool:
+        return self.score >= threshold and self.margin >= margin
+
+
+class IntentClassifier:
+    """In-memory nearest-neighbour index over labelled example utterances."""
+
+    def __init__(self):
+        self._loaded = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self._texts: list[str] = []
+        self._intents: list[str] = []
+        self._rows: dict[str, int] = {}  # Normalized text → row
+        self._matrix: np.ndarray | None = None
+        self.dim: int | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def build(self, db_session) -> None:
+        """Collect examples from registry, logged conversations and corrections, embed and load them."""
+        await self.load_examples(await collect_examples(db_session, settings.intent_fastpath_history_limit))
+
+    async def load_examples(self, examples: list[tuple[str, str]]) -> None:
+        """Embed (text, intent) examples and rebuild the index; texts that fail to embed are skipped."""
+        from services.embedding_service import get_embedding_service
+
+        vectors = await get_embedding_service().embed_many(
+            [text for text, _ in examples], return_exceptions=True,
+        )
+        self.load([
+            (text, intent, vector)
+            for (text, intent), vector in zip(examples, vectors, strict=True)
+            if not isinstance(vector, BaseException)
+        ])
+
+    def load(self, rows) -> None:
+        """Rebuild the index from (text, intent, embedding) rows."""
+        self._clear()
+        vectors = []
+        for text, intent, embedding in rows:
+            vector = self._normalized(embedding)
+            if vector is None:
+                continue
+            key = normalize(text)
+            if key in self._rows:
+                vectors[self._rows[key]] = vector
+                self._intents[self._rows[key]] = intent
+                continue
+            self._rows[key] = len(self._texts)
+            self._texts.append(text)
+            self._intents.append(intent)
+            vectors.append(vector)
+        if vectors:
+            self._matrix = np.vstack(vectors)
+        self._loaded = True
+        logger.info(f"⚡ Intent fast path index loaded: {len(self._texts)} examples, {len(set(self._intents))} intents")
+
+    def _normalized(self, embedding) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        if self.dim is None:
+            self.dim = vector.shape[0]
+        norm = np.linalg.norm(vector)
+        if vector.shape[0] != self.dim or norm == 0:
+            return None
+        return vector / norm
+
+    def add_example(self, text: str, intent: str, embedding) -> None:
+        """Add or relabel one example (e.g. a new correction)."""
+        if not self._loaded:
+            return  # Picked up by the next build
+        vector = self._normalized(embedding)
+        if vector is None:
+            return
+        key = normalize(text)
+        row = self._rows.get(key)
+        if row is not None:
+            self._intents[row] = intent
+            self._matrix[row] = vector
+            return
+        self._rows[key] = len(self._texts)
+        self._texts.append(text)
+        self._intents.append(intent)
+        self._matrix = vector[np.newaxis, :] if self._matrix is None else np.vstack([self._matrix, vector])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def classify(self, query_embedding) -> IntentMatch | None:
+        """Nearest example and its lead over other intents; None if the index is empty."""
+        if self._matrix is None:
+            return None
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != self.dim:
+            return None
+
+        scores = self._matrix @ (query / norm)
+        row = int(np.argmax(scores))
+        score = float(scores[row])
+        key = _vote_key(self._intents[row])
+        others = scores[[_vote_key(intent) != key for intent in self._intents]]
+        runner_up = float(others.max()) if others.size else 0.0
+        return IntentMatch(
+            intent=self._intents[row],
+            score=score,
+            margin=score - max(runner_up, 0.0),
+            example=self._texts[row],
+        )
+
+    async def predict(
+        self,
+        message: str,
+        threshold: float | None = None,
+        margin: float | None = None,
+    ) -> tuple[str, IntentMatch] | None:
+        """
+        Intent of a confident match (on/off polarity applied), without parameters.
+
+        Returns:
+            (intent, match) or None if the message should go to the LLM
+        """
+        from services.embedding_service import get_embedding_service
+
+        if self._matrix is None or is_out_of_scope(message):
+            return None
+
+        embedding = await get_embedding_service().embed(message, model=settings.ollama_embed_model)
+        match = self.classify(embedding)
+        if match is None or not match.is_confident(
+            settings.intent_fastpath_threshold if threshold is None else threshold,
+            settings.intent_fastpath_margin if margin is None else margin,
+        ):
+            return None
+
+        if match.intent not in _POLARITY_INTENTS:
+            return match.intent, match
+        polarity = detect_polarity(message)
+        if polarity is None:
+            return None
+        return (HASS_TURN_ON if polarity else HASS_TURN_OFF), match
+
+    async def resolve(self, message: str, room_context: dict | None = None) -> dict | None:
+        """
+        Fast-path intent for a simple command, or None to use the LLM.
+
+        Returns:
+            Dict with intent, parameters, confidence (same shape as
+            OllamaService.extract_intent)
+        """
+        from services.intent_registry import intent_registry
+        from utils.metrics import record_intent_fastpath
+
+        if self._matrix is None:
+            return None
+        if is_out_of_scope(message):
+            record_intent_fastpath("skipped")
+            return None
+
+        start = time.perf_counter()
+        prediction = await self.predict(message)
+        result = None
+        if prediction and intent_registry.is_intent_available(prediction[0]):
+            intent, match = prediction
+            if intent in _POLARITY_INTENTS:
+                parameters = await resolve_ha_target(message, room_context)
+            else:
+                parameters = None if _required_parameters(intent) else {}
+            if parameters is not None:
+                result = {"intent": intent, "parameters": parameters, "confidence": round(match.score, 3)}
+
+        record_intent_fastpath("hit" if result else "fallback")
+        if result:
+            logger.info(
+                f"⚡ Fast-Path Intent: {result['intent']} ({result['confidence']:.2f}) "
+                f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+        return result
+
+
+async def collect_examples(db_session, history_limit: int, is_available=None) -> list[tuple[str, str]]:
+    """
+    Labelled (text, intent) examples; later sources override earlier ones.
+
+    Args:
+        db_session: Database session
+        history_limit: Recent messages to mine for successful turns (0 = none)
+        is_available: Intent filter (default: IntentRegistry.is_intent_available)
+    """
+    from sqlalchemy import select
+
+    from models.database import IntentCorrection
+    from services.intent_registry import intent_registry
+
+    is_available = is_available or intent_registry.is_intent_available
+    labelled: dict[str, tuple[str, str]] = {}  # Normalized text → (text, intent)
+
+    def add(text: str, intent: str) -> None:
+        if text and intent and is_available(intent):
+            labelled[normalize(text)] = (text, intent)
+
+    for integration in intent_registry.get_enabled_integrations():
+        for intent in integration.intents:
+            for text in intent.examples_de + intent.examples_en:
+                add(text, intent.name)
+    for intent, texts in SEED_EXAMPLES.items():
+        for text in texts:
+            add(text, intent)
+
+    if history_limit:
+        for text, intent in successful_turns(await load_message_rows(db_session, history_limit)):
+            add(text, intent)
+
+    result = await db_session.execute(
+        select(IntentCorrection.message_text, IntentCorrection.corrected_value)
+        .where(IntentCorrection.feedback_type == "intent")
+        .order_by(IntentCorrection.created_at)
+    )
+    for text, intent in result.all():
+        add(text, intent)
+
+    return list(labelled.values())
+
+
+async def load_message_rows(db_session, limit: int) -> list[tuple]:
+    """The most recent *limit* messages as (conversation_id, role, content, metadata), oldest first."""
+    from sqlalchemy import select
+
+    from models.database import Message
+
+    result = await db_session.execute(
+        select(Message.conversation_id, Message.role, Message.content, Message.message_metadata)
+        .order_by(Message.id.desc())
+        .limit(limit)
+    )
+    return list(reversed(result.all()))
+
+
+def is_out_of_scope(message: str) -> bool:
+    """Multi-step messages and references always go to the LLM."""
+    from services.complexity_detector import ComplexityDetector
+
+    return ComplexityDetector.needs_agent(message) or _REFERENCE_RE.search(message) is not None
+
+
+def _required_parameters(intent_name: str) -> list[str]:
+    from services.intent_registry import intent_registry
+
+    definition = intent_registry.get_intent_definition(intent_name)
+    if definition is not None:
+        return [p.name for p in definition.parameters if p.required]
+    for tool in intent_registry._mcp_tools:
+        if tool.get("intent") == intent_name:
+            return list((tool.get("input_schema") or {}).get("required", []))
+    return []
+
+
+def _mentions(text: str, phrase: str) -> bool:
+    return bool(phrase) and re.search(rf"\b{re.escape(phrase)}\b", text) is not None
+
+
+async def resolve_ha_target(message: str, room_context: dict | None = None) -> dict | None:
+    """
+    HassTurnOn/HassTurnOff target from the entity map.
+
+    A uniquely matching friendly name wins ({"name": ...}); otherwise a
+    domain word plus the area from the message or the device's room
+    ({"area": ..., "domain": [...]}). None if the target is ambiguous.
+    """
+    from integrations.homeassistant import DOMAIN_TRANSLATIONS, HomeAssistantClient
+
+    entity_map = await HomeAssistantClient().get_entity_map()
+    text = normalize(message)
+
+    by_name: dict[str, list[dict]] = {}
+    for entry in entity_map:
+        name = (entry.get("friendly_name") or "").lower()
+        if _mentions(text, name):
+            by_name.setdefault(name, []).append(entry)
+    if by_name:
+        matches = by_name[max(by_name, key=len)]
+        return {"name": matches[0]["friendly_name"]} if len(matches) == 1 else None
+
+    domain = next(
+        (
+            d for d in _SWITCHABLE_DOMAINS
+            if any(re.search(rf"\b{re.escape(word)}\w*", text) for word in [d, *DOMAIN_TRANSLATIONS.get(d, [])])
+        ),
+        None,
+    )
+    if domain is None:
+        return None
+
+    rooms = {entry["room"] for entry in entity_map if entry.get("room")}
+    mentioned = [room for room in rooms if _mentions(text, room.lower())]
+    area = max(mentioned, key=len) if mentioned else (room_context or {}).get("room_name")
+    if not area:
+        return None
+    if not any(e.get("domain") == domain and (e.get("room") or "").lower() == area.lower() for e in entity_map):
+        return None
+    return {"area": area, "domain": [domain]}
+
+
+# Global instance
+_intent_classifier: IntentClassifier | None = None
+
+
+def get_intent_classifier() -> IntentClassifier:
+    """Get or create the global intent classifier instance."""
+    global _intent_classifier
+    if _intent_classifier is None:
+        _intent_classifier = IntentClassifier()
+    return _intent_classifier
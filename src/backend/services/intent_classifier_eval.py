@@ -0,0 +1,170 @@
+"""
+Offline evaluation of the intent fast path against logged conversations.
+
+Replays successful turns (user message → assistant intent with
+action_success) through IntentClassifier.predict(). The index is built from
+registry examples, seeds, corrections and the older turns; the newest
+--test-fraction of the turns is held out as test set, so no test message is
+its own nearest neighbour.
+
+Reports precision/recall per intent, coverage (share answered without the
+LLM) and decision latency (embedding + lookup). HA target resolution needs a
+live entity map and is not part of the evaluation.
+
+Usage (in the backend container):
+    python -m services.intent_classifier_eval
+    python -m services.intent_classifier_eval --threshold 0.9 --margin 0.08
+    python -m services.intent_classifier_eval --limit 20000 --json
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from services.intent_classifier import (
+    IntentClassifier,
+    collect_examples,
+    load_message_rows,
+    successful_turns,
+)
+from utils.config import settings
+
+
+@dataclass
+class EvalReport:
+    """Fast path results on the held-out turns."""
+    total: int = 0
+    hits: int = 0
+    correct: int = 0
+    expected: Counter = field(default_factory=Counter)    # Ground truth per intent
+    predicted: Counter = field(default_factory=Counter)   # Fast path answers per intent
+    true_positives: Counter = field(default_factory=Counter)
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: list[tuple[str, str, str]] = field(default_factory=list)  # (message, expected, predicted)
+
+    def add(self, expected: str, predicted: str | None, latency_ms: float, message: str) -> None:
+        self.total += 1
+        self.expected[expected] += 1
+        self.latencies_ms.append(latency_ms)
+        if predicted is None:
+            return
+        self.hits += 1
+        self.predicted[predicted] += 1
+        if predicted == expected:
+            self.correct += 1
+            self.true_positives[predicted] += 1
+        else:
+            self.errors.append((message, expected, predicted))
+
+    @property
+    def precision(self) -> float:
+        return self.correct / self.hits if self.hits else 0.0
+
+    @property
+    def coverage(self) -> float:
+        return self.hits / self.total if self.total else 0.0
+
+    def per_intent(self) -> dict[str, dict]:
+        return {
+            intent: {
+                "support": self.expected[intent],
+                "predicted": self.predicted[intent],
+                "precision": self.true_positives[intent] / self.predicted[intent] if self.predicted[intent] else 0.0,
+                "recall": self.true_positives[intent] / self.expected[intent] if self.expected[intent] else 0.0,
+            }
+            for intent in sorted(set(self.expected) | set(self.predicted))
+        }
+
+    def to_dict(self) -> dict:
+        latencies = np.asarray(self.latencies_ms or [0.0])
+        return {
+            "total": self.total,
+            "hits": self.hits,
+            "coverage": round(self.coverage, 4),
+            "precision": round(self.precision, 4),
+            "recall": round(self.correct / self.total, 4) if self.total else 0.0,
+            "latency_ms": {
+                "p50": round(float(np.percentile(latencies, 50)), 2),
+                "p95": round(float(np.percentile(latencies, 95)), 2),
+            },
+            "intents": self.per_intent(),
+            "errors": [
+                {"message": m, "expected": e, "predicted": p} for m, e, p in self.errors
+            ],
+        }
+
+    def format(self) -> str:
+        data = self.to_dict()
+        lines = [
+            f"Turns: {data['total']}  Fast path: {data['hits']} ({data['coverage']:.1%})",
+            f"Precision: {data['precision']:.1%}  Recall: {data['recall']:.1%}",
+            f"Latency: p50 {data['latency_ms']['p50']:.1f} ms  p95 {data['latency_ms']['p95']:.1f} ms",
+            "",
+            f"{'Intent':<45} {'Support':>8} {'Pred':>6} {'Prec':>7} {'Recall':>7}",
+        ]
+        for intent, stats in data["intents"].items():
+            lines.append(
+                f"{intent:<45} {stats['support']:>8} {stats['predicted']:>6} "
+                f"{stats['precision']:>7.1%} {stats['recall']:>7.1%}"
+            )
+        if self.errors:
+            lines += ["", "Wrong fast path answers:"]
+            lines += [
+                f"  {message!r:<40} → {predicted} (expected {expected})"
+                for message, expected, predicted in self.errors[:20]
+            ]
+        return "\n".join(lines)
+
+
+async def evaluate(
+    classifier: IntentClassifier,
+    turns: list[tuple[str, str]],
+    threshold: float | None = None,
+    margin: float | None = None,
+) -> EvalReport:
+    """Run *turns* through the fast path and compare with the logged intents."""
+    report = EvalReport()
+    for message, expected in turns:
+        start = time.perf_counter()
+        prediction = await classifier.predict(message, threshold=threshold, margin=margin)
+        latency_ms = (time.perf_counter() - start) * 1000
+        report.add(expected, prediction[0] if prediction else None, latency_ms, message)
+    return report
+
+
+async def run(limit: int, test_fraction: float, threshold: float | None, margin: float | None) -> EvalReport:
+    """Build a train index from the database and evaluate on the newest turns."""
+    from services.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db_session:
+        turns = successful_turns(await load_message_rows(db_session, limit))
+        # MCP tools are not registered outside the app, so every logged intent counts
+        examples = await collect_examples(db_session, history_limit=0, is_available=lambda _: True)
+
+    split = len(turns) - max(1, int(len(turns) * test_fraction)) if turns else 0
+    classifier = IntentClassifier()
+    await classifier.load_examples(examples + turns[:split])
+    return await evaluate(classifier, turns[split:], threshold, margin)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate the intent fast path against logged conversations")
+    parser.add_argument("--limit", type=int, default=10000, help="Most recent messages to load (default: 10000)")
+    parser.add_argument("--test-fraction", type=float, default=0.2, help="Newest share of turns held out (default: 0.2)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"Similarity threshold (default: {settings.intent_fastpath_threshold})")
+    parser.add_argument("--margin", type=float, default=None,
+                        help=f"Margin over competing intents (default: {settings.intent_fastpath_margin})")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.limit, args.test_fraction, args.threshold, args.margin))
+    print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
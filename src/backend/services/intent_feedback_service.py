@@ -17,6 +17,8 @@ from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.database import IntentCorrection
+from services.embedding_service import get_embedding_service
+from services.vector_search import cosine_distance, cosine_similarity, prepare_vector_query, to_pgvector
 from utils.config import settings
 from utils.llm_client import get_embed_client
 
@@ -46,11 +48,9 @@ class IntentFeedbackService:
     async def _get_embedding(self, text: str) -> list[float]:
         """Generate embedding using Ollama (nomic-embed-text, 768 dims)."""
         client = await self._get_ollama_client()
-        response = await client.embeddings(
-            model=settings.ollama_embed_model,
-            prompt=text
+        return await get_embedding_service().embed(
+            text, model=settings.ollama_embed_model, client=client,
         )
-        return response.embedding
 
     async def _has_corrections(self, feedback_type: str) -> bool:
         """Quick check if any corrections exist (cached for performance)."""
@@ -113,6 +113,11 @@ class IntentFeedbackService:
         # Invalidate count cache
         IntentFeedbackService._count_cache.pop(feedback_type, None)
 
+        if feedback_type == "intent" and embedding is not None:
+            from services.intent_classifier import get_intent_classifier
+
+            get_intent_classifier().add_example(message_text, corrected_value, embedding)
+
         logger.info(
             f"📝 Correction saved: {feedback_type} "
             f"'{original_value}' → '{corrected_value}' "
@@ -153,25 +158,25 @@ class IntentFeedbackService:
             logger.warning(f"⚠️ Could not generate query embedding: {e}")
             return []
 
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
+        await prepare_vector_query(self.db, limit=limit, filtered=True)
 
-        sql = text("""
+        sql = text(f"""
             SELECT
                 id,
                 message_text,
                 original_value,
                 corrected_value,
                 context,
-                1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                {cosine_similarity()} as similarity
             FROM intent_corrections
             WHERE feedback_type = :feedback_type
               AND embedding IS NOT NULL
-            ORDER BY embedding <=> CAST(:embedding AS vector)
+            ORDER BY {cosine_distance()}
             LIMIT :limit
         """)
 
         result = await self.db.execute(sql, {
-            "embedding": embedding_str,
+            "embedding": to_pgvector(query_embedding),
             "feedback_type": feedback_type,
             "limit": limit,
         })
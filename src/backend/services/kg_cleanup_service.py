@@ -5,9 +5,11 @@ Provides admin-only operations to scan and clean up invalid entities,
 find duplicate clusters via string similarity, and auto-merge them.
 All destructive operations support dry_run mode.
 """
+import asyncio
 import difflib
-from collections import defaultdict
+from collections import Counter, defaultdict
 
+import numpy as np
 from loguru import logger
 from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,6 +21,12 @@ from services.knowledge_graph_service import KnowledgeGraphService
 _STRIP_PREFIXES = ("herr ", "frau ", "dr. ", "dr ", "prof. ", "prof ")
 # Suffixes stripped for organizations (lowercase)
 _STRIP_ORG_SUFFIXES = (" gmbh", " ag", " e.v.", " mbh", " ohg", " kg", " ug", " gbr")
+# Upper bounds per candidate block (trigram postings / count cells) — caps memory at ~100 MB
+_BLOCK_POSTINGS = 4_000_000
+_BLOCK_CELLS = 4_000_000
+# Lowest similarity threshold for the duplicate search: below it trigram blocking
+# loses pairs and only an all-pairs comparison is exact (checked with services.kg_duplicate_bench)
+MIN_DUPLICATE_THRESHOLD = 0.82
 
 
 def _normalize_name(name: str, entity_type: str = "") -> str:
@@ -38,6 +46,132 @@ def _normalize_name(name: str, entity_type: str = "") -> str:
     return n.strip()
 
 
+def _trigrams(name: str) -> set[str]:
+    """Character trigrams of a name, padded like pg_trgm."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _blocking_jaccard(threshold: float) -> float:
+    """
+    Trigram Jaccard lower bound used for candidate generation.
+
+    SequenceMatcher ratio and trigram Jaccard are not strictly related, so
+    the bound is deliberately loose: 0.26 at the default threshold 0.82,
+    where true pairs share at least ~0.4 of their trigrams. Below that the
+    ratio also matches names without enough common trigrams, hence
+    MIN_DUPLICATE_THRESHOLD.
+    """
+    return max(0.1, 0.8 * (threshold - 0.5))
+
+
+def _similar_pairs(names: list[str], threshold: float) -> list[tuple[int, int, float]]:
+    """
+    Find all index pairs (i < j) whose SequenceMatcher ratio >= threshold.
+
+    Candidate pairs come from trigram blocking instead of comparing all
+    pairs: prefix filtering on the rarest trigrams of each name, a length
+    window (ratio <= 2·min/(len_a+len_b)) and a trigram overlap bound,
+    counted with numpy per block of names. Survivors pass the character
+    multiset bound (quick_ratio, vectorized) before the exact ratio.
+
+    CPU-bound — callers run it in a worker thread.
+
+    Raises:
+        ValueError: threshold below MIN_DUPLICATE_THRESHOLD, where blocking
+            is not exact and all pairs would have to be compared
+    """
+    if threshold < MIN_DUPLICATE_THRESHOLD:
+        raise ValueError(f"Duplicate threshold {threshold} below {MIN_DUPLICATE_THRESHOLD}")
+
+    # Sorted by length, so the length window of a name is a contiguous range
+    idx = sorted((i for i, name in enumerate(names) if name), key=lambda i: len(names[i]))
+    n = len(idx)
+    if n < 2:
+        return []
+    strings = [names[i] for i in idx]
+    str_len = np.fromiter((len(s) for s in strings), dtype=np.int64, count=n)
+
+    # Partners: longer names (higher index) within the length window
+    window_end = np.searchsorted(
+        str_len, np.floor(str_len * (2 - threshold) / threshold + 1e-9), side="right"
+    )
+
+    alphabet = {c: k for k, c in enumerate(sorted(set("".join(strings))))}
+    char_counts = np.zeros((n, len(alphabet)), dtype=np.int32)
+    for i, s in enumerate(strings):
+        for c in s:
+            char_counts[i, alphabet[c]] += 1
+
+    gram_sets = [_trigrams(s) for s in strings]
+
+    # Global trigram order: rarest first, so prefixes consist of selective trigrams
+    df = Counter(g for grams in gram_sets for g in grams)
+    rank = {g: r for r, g in enumerate(sorted(df, key=lambda g: (df[g], g)))}
+    ranked = [sorted(rank[g] for g in grams) for grams in gram_sets]
+
+    gram_len = np.fromiter((len(r) for r in ranked), dtype=np.int64, count=n)
+    grams = np.fromiter((g for r in ranked for g in r), dtype=np.int64, count=int(gram_len.sum()))
+    owner = np.repeat(np.arange(n, dtype=np.int64), gram_len)
+
+    # Inverted index as sorted (trigram, name) keys — postings ranges via searchsorted
+    post_key = np.sort(grams * n + owner)
+    post_name = post_key % n
+
+    # Prefix filter: Jaccard >= j requires a shared trigram among the first
+    # len - ceil(j·len) + 1 trigrams of each name
+    jaccard = _blocking_jaccard(threshold)
+    prefix_len = gram_len - np.ceil(jaccard * gram_len - 1e-9).astype(np.int64) + 1
+    position = np.arange(len(grams)) - np.repeat(np.cumsum(gram_len) - gram_len, gram_len)
+    in_prefix = position < np.repeat(prefix_len, gram_len)
+    probe_name, probe_gram = owner[in_prefix], grams[in_prefix]
+
+    probe_lo = np.searchsorted(post_key, probe_gram * n + probe_name + 1)
+    probe_hi = np.searchsorted(post_key, probe_gram * n + window_end[probe_name])
+    probe_count = probe_hi - probe_lo
+    probe_start = np.searchsorted(probe_name, np.arange(n + 1))
+    postings_done = np.cumsum(np.bincount(probe_name, weights=probe_count, minlength=n))
+    overlap_ratio = jaccard / (1 + jaccard)
+
+    pairs: list[tuple[int, int, float]] = []
+    first = 0
+    while first < n:
+        # Block of names bounded by postings and count-matrix size
+        cells = np.arange(1, n - first + 1) * (window_end[first:] - first)
+        last = first + int(np.searchsorted(cells, _BLOCK_CELLS, side="right"))
+        done = postings_done[first - 1] if first else 0
+        last = min(last, int(np.searchsorted(postings_done, done + _BLOCK_POSTINGS, side="right")))
+        last = max(last, first + 1)
+
+        lo, hi = probe_start[first], probe_start[last]
+        counts = probe_count[lo:hi]
+        total = int(counts.sum())
+        offsets = np.repeat(probe_lo[lo:hi] - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        partner = post_name[offsets]
+        probe = np.repeat(probe_name[lo:hi], counts)
+        width = int(window_end[last - 1]) - first
+        shared = np.bincount((probe - first) * width + (partner - first), minlength=(last - first) * width)
+        cell = np.flatnonzero(shared)
+        a, b, shared = cell // width + first, cell % width + first, shared[cell]
+
+        # Overlap bound: beyond the prefix only len - prefix_len more trigrams can match
+        needed = np.ceil(overlap_ratio * (gram_len[a] + gram_len[b]) - 1e-9) - (gram_len[a] - prefix_len[a])
+        a, b = a[shared >= needed], b[shared >= needed]
+
+        # quick_ratio: matches <= size of the character multiset intersection
+        common = np.minimum(char_counts[a], char_counts[b]).sum(axis=1)
+        keep = 2 * common >= threshold * (str_len[a] + str_len[b])
+
+        for x, y in zip(a[keep].tolist(), b[keep].tolist(), strict=True):
+            i, j = sorted((idx[x], idx[y]))
+            ratio = difflib.SequenceMatcher(None, names[i], names[j]).ratio()
+            if ratio >= threshold:
+                pairs.append((i, j, ratio))
+        first = last
+
+    return pairs
+
+
 class KGCleanupService:
     """Bulk cleanup operations for the knowledge graph."""
 
@@ -130,11 +264,14 @@ class KGCleanupService:
         Find clusters of likely-duplicate entities via string similarity.
 
         Uses normalized Levenshtein ratio (difflib.SequenceMatcher) to detect
-        OCR variants and typos. Returns clusters sorted by size, each with
-        a canonical entity (highest mention_count) and its duplicates.
+        OCR variants and typos. Only candidate pairs from trigram blocking
+        are compared (see _similar_pairs), so thresholds start at
+        MIN_DUPLICATE_THRESHOLD, which is also the default. Returns clusters
+        sorted by size, each with a canonical entity (highest mention_count)
+        and its duplicates.
         """
         if threshold is None:
-            threshold = 0.82
+            threshold = MIN_DUPLICATE_THRESHOLD
 
         # Fetch all active entities
         query = (
@@ -171,51 +308,27 @@ class KGCleanupService:
                 parent[rx] = ry
 
         for etype, entities in by_type.items():
-            # Pre-compute normalized names
-            normed = [(e, _normalize_name(e.name, etype)) for e in entities]
-            n = len(normed)
-
-            for i in range(n):
-                a_entity, a_name = normed[i]
-                if not a_name:
-                    continue
-
-                for j in range(i + 1, n):
-                    b_entity, b_name = normed[j]
-                    if not b_name:
-                        continue
-
-                    # Quick length filter — OCR variants have similar length
-                    len_a, len_b = len(a_name), len(b_name)
-                    if min(len_a, len_b) / max(len_a, len_b) < 0.5:
-                        continue
-
-                    # SequenceMatcher with quick_ratio pre-filter
-                    sm = difflib.SequenceMatcher(None, a_name, b_name)
-                    if sm.quick_ratio() < threshold:
-                        continue
-                    if sm.real_quick_ratio() < threshold:
-                        continue
-
-                    ratio = sm.ratio()
-                    if ratio < threshold:
-                        continue
-
-                    # Record match
-                    for e in (a_entity, b_entity):
-                        entity_info[e.id] = {
-                            "id": e.id,
-                            "name": e.name,
-                            "mention_count": e.mention_count or 1,
-                            "entity_type": e.entity_type,
-                        }
-
-                    parent.setdefault(a_entity.id, a_entity.id)
-                    parent.setdefault(b_entity.id, b_entity.id)
-                    union(a_entity.id, b_entity.id)
-
-                    key = (min(a_entity.id, b_entity.id), max(a_entity.id, b_entity.id))
-                    pair_similarity[key] = round(ratio, 3)
+            names = [_normalize_name(e.name, etype) for e in entities]
+            pairs = await asyncio.to_thread(_similar_pairs, names, threshold)
+
+            for i, j, ratio in pairs:
+                a_entity, b_entity = entities[i], entities[j]
+
+                # Record match
+                for e in (a_entity, b_entity):
+                    entity_info[e.id] = {
+                        "id": e.id,
+                        "name": e.name,
+                        "mention_count": e.mention_count or 1,
+                        "entity_type": e.entity_type,
+                    }
+
+                parent.setdefault(a_entity.id, a_entity.id)
+                parent.setdefault(b_entity.id, b_entity.id)
+                union(a_entity.id, b_entity.id)
+
+                key = (min(a_entity.id, b_entity.id), max(a_entity.id, b_entity.id))
+                pair_similarity[key] = round(ratio, 3)
 
         # Group by cluster root
         clusters_map: dict[int, list[int]] = defaultdict(list)
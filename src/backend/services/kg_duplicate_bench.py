@@ -0,0 +1,193 @@
+"""
+Benchmark for the KG duplicate search (KGCleanupService.find_duplicate_clusters).
+
+Times the trigram-blocked pair search (_similar_pairs) on synthetic entity
+names — German person names, organizations and places with ~5% injected
+OCR variants and typos — or on the active entities of the database.
+Recall is measured against the exhaustive all-pairs SequenceMatcher
+comparison on a sample, since that is quadratic.
+
+Usage (in the backend container):
+    python -m services.kg_duplicate_bench
+    python -m services.kg_duplicate_bench --entities 100000 --threshold 0.9
+    python -m services.kg_duplicate_bench --db --sample 5000 --json
+"""
+import argparse
+import asyncio
+import difflib
+import json
+import random
+import time
+from collections import defaultdict
+
+from services.kg_cleanup_service import MIN_DUPLICATE_THRESHOLD, _normalize_name, _similar_pairs
+
+_FIRST_NAMES = [
+    "Anna", "Bernd", "Carla", "Dieter", "Emil", "Frieda", "Gerd", "Hanna", "Ingo", "Jana", "Klaus", "Lena",
+    "Markus", "Nina", "Otto", "Paula", "Ralf", "Sabine", "Tobias", "Ute", "Volker", "Wiebke", "Yvonne",
+    "Zoe", "Jürgen", "Jutta", "Eduard", "Stefan", "Thomas", "Andrea", "Michael", "Petra", "Wolfgang",
+    "Sandra", "Heike", "Uwe", "Monika", "Frank", "Karin", "Jörg",
+]
+_NAME_PARTS = [
+    "ber", "berg", "brand", "busch", "dorf", "eck", "feld", "fisch", "hahn", "hau", "hof", "horst", "kamp",
+    "kirch", "klein", "kraus", "lang", "mann", "mei", "meier", "mül", "ner", "ott", "schmidt", "schnei",
+    "schulz", "stein", "wag", "weber", "wolf", "zim", "ler", "ke", "ger", "bach", "born", "haus", "lind",
+    "brück",
+]
+_ONSETS = [
+    "b", "br", "ch", "d", "dr", "f", "fr", "g", "gr", "h", "j", "k", "kl", "kr", "l", "m", "n", "p", "pf",
+    "r", "s", "sch", "schl", "schm", "schw", "st", "str", "t", "tr", "w", "z",
+]
+_VOWELS = ["a", "e", "i", "o", "u", "ä", "ö", "ü", "ei", "au", "ie", "eu"]
+_CODAS = ["", "", "n", "r", "l", "s", "t", "ck", "ng", "nd", "rt", "ld", "tz", "ch", "rg", "mm", "ss"]
+_ORG_WORDS = ["GmbH", "AG", "e.V.", "KG", "Verein", "Stadtwerke", "Versicherung", "Praxis", "Bank", "Schule"]
+_PLACE_SUFFIXES = ["", "", "straße", "weg", "platz", "heim"]
+_OCR_CONFUSIONS = [("rn", "m"), ("m", "rn"), ("l", "1"), ("o", "0"), ("ü", "ue"), ("ä", "ae"), ("ß", "ss")]
+_ENTITY_TYPES = ["person"] * 5 + ["organization"] * 2 + ["location"] * 2 + ["thing"]
+
+
+def _word(rng: random.Random, syllables: int | None = None) -> str:
+    syllables = syllables or rng.choice([2, 2, 3])
+    if rng.random() < 0.3:
+        return "".join(rng.choice(_NAME_PARTS) for _ in range(syllables)).capitalize()
+    return "".join(
+        rng.choice(_ONSETS) + rng.choice(_VOWELS) + rng.choice(_CODAS) for _ in range(syllables)
+    ).capitalize()
+
+
+def _name(rng: random.Random, entity_type: str) -> str:
+    if entity_type == "person":
+        return f"{rng.choice(_FIRST_NAMES)} {_word(rng)}" if rng.random() < 0.8 else _word(rng)
+    if entity_type == "organization":
+        if rng.random() < 0.7:
+            return f"{_word(rng)} {rng.choice(_ORG_WORDS)}"
+        return f"{rng.choice(_ORG_WORDS)} {_word(rng)}"
+    if entity_type == "location":
+        return _word(rng) + rng.choice(_PLACE_SUFFIXES)
+    return f"{_word(rng)} {_word(rng, 1)}"
+
+
+def _variant(rng: random.Random, name: str) -> str:
+    """OCR confusion, substitution, deletion, insertion or transposition."""
+    op = rng.random()
+    confusions = [c for c in _OCR_CONFUSIONS if c[0] in name]
+    if op < 0.3 and confusions:
+        wrong, right = rng.choice(confusions)
+        return name.replace(wrong, right, 1)
+    i = rng.randrange(len(name))
+    if op < 0.55:
+        return name[:i] + rng.choice("abcdefghiklmnorstu") + name[i + 1:]
+    if op < 0.75:
+        return name[:i] + name[i + 1:]
+    if op < 0.9:
+        return name[:i] + rng.choice("aeinrst") + name[i:]
+    return name[:i] + name[i + 1:i + 2] + name[i] + name[i + 2:]
+
+
+def synthetic_entities(count: int, variant_rate: float = 0.05, seed: int = 42) -> list[tuple[str, str]]:
+    """Generate *count* (name, entity_type) tuples."""
+    rng = random.Random(seed)
+    entities: list[tuple[str, str]] = []
+    while len(entities) < count:
+        entity_type = rng.choice(_ENTITY_TYPES)
+        name = _name(rng, entity_type)
+        entities.append((name, entity_type))
+        if rng.random() < variant_rate and len(entities) < count:
+            entities.append((_variant(rng, name), entity_type))
+    return entities
+
+
+async def load_entities() -> list[tuple[str, str]]:
+    """Active (name, entity_type) tuples from the database."""
+    from sqlalchemy import select
+
+    from models.database import KGEntity
+    from services.database import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db_session:
+        result = await db_session.execute(
+            select(KGEntity.name, KGEntity.entity_type).where(KGEntity.is_active == True)  # noqa: E712
+        )
+        return [(row.name, row.entity_type) for row in result.fetchall()]
+
+
+def exhaustive_pairs(names: list[str], threshold: float) -> set[tuple[int, int]]:
+    """Reference: compare all pairs (the search before trigram blocking)."""
+    pairs = set()
+    for i in range(len(names)):
+        if not names[i]:
+            continue
+        for j in range(i + 1, len(names)):
+            if not names[j]:
+                continue
+            sm = difflib.SequenceMatcher(None, names[i], names[j])
+            if sm.real_quick_ratio() >= threshold and sm.quick_ratio() >= threshold and sm.ratio() >= threshold:
+                pairs.add((i, j))
+    return pairs
+
+
+def _by_type(entities: list[tuple[str, str]]) -> dict[str, list[str]]:
+    by_type: dict[str, list[str]] = defaultdict(list)
+    for name, entity_type in entities:
+        by_type[entity_type].append(_normalize_name(name, entity_type))
+    return by_type
+
+
+def run(entities: list[tuple[str, str]], threshold: float, sample: int) -> dict:
+    """Time the blocked search on all entities, measure recall on the first *sample*."""
+    start = time.perf_counter()
+    pair_count = sum(len(_similar_pairs(names, threshold)) for names in _by_type(entities).values())
+    seconds = time.perf_counter() - start
+
+    expected = found = 0
+    sample_start = time.perf_counter()
+    for names in _by_type(entities[:sample]).values():
+        reference = exhaustive_pairs(names, threshold)
+        blocked = {(i, j) for i, j, _ in _similar_pairs(names, threshold)}
+        expected += len(reference)
+        found += len(reference & blocked)
+    exhaustive_seconds = time.perf_counter() - sample_start
+
+    return {
+        "entities": len(entities),
+        "threshold": threshold,
+        "pairs": pair_count,
+        "seconds": round(seconds, 2),
+        "sample": min(sample, len(entities)),
+        "sample_pairs": expected,
+        "recall": round(found / expected, 4) if expected else 1.0,
+        "exhaustive_seconds": round(exhaustive_seconds, 2),
+    }
+
+
+def format_report(data: dict) -> str:
+    return "\n".join([
+        f"Entities: {data['entities']}  Threshold: {data['threshold']}",
+        f"Blocked search: {data['pairs']} pairs in {data['seconds']:.2f} s",
+        f"Recall vs. all pairs on {data['sample']} entities: {data['recall']:.2%} "
+        f"({data['sample_pairs']} pairs, exhaustive {data['exhaustive_seconds']:.1f} s)",
+    ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the KG duplicate search")
+    parser.add_argument("--entities", type=int, default=50000, help="Synthetic entities (default: 50000)")
+    parser.add_argument("--threshold", type=float, default=MIN_DUPLICATE_THRESHOLD,
+                        help=f"Similarity threshold, at least {MIN_DUPLICATE_THRESHOLD} (default: {MIN_DUPLICATE_THRESHOLD})")
+    parser.add_argument("--sample", type=int, default=3000,
+                        help="Entities for the exhaustive recall check (default: 3000)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic names (default: 42)")
+    parser.add_argument("--db", action="store_true", help="Use the active entities of the database")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    if args.db:
+        entities = asyncio.run(load_entities())
+    else:
+        entities = synthetic_entities(args.entities, seed=args.seed)
+    report = run(entities, args.threshold, args.sample)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ provides context retrieval for LLM prompt injection.
 Pattern follows ConversationMemoryService for embedding generation and
 cosine similarity search via raw SQL (pgvector).
 """
+import asyncio
 import json
 import re
 from datetime import UTC, datetime
@@ -17,6 +18,8 @@ from sqlalchemy import func, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.database import KG_ENTITY_TYPES, KG_SCOPE_PERSONAL, KGEntity, KGRelation
+from services.embedding_service import get_embedding_service
+from services.vector_search import cosine_distance, cosine_similarity, prepare_vector_query, to_pgvector
 from utils.config import settings
 from utils.llm_client import get_embed_client
 
@@ -118,11 +121,20 @@ class KnowledgeGraphService:
     async def _get_embedding(self, text_input: str) -> list[float]:
         """Generate embedding using Ollama."""
         client = await self._get_ollama_client()
-        response = await client.embeddings(
-            model=settings.ollama_embed_model,
-            prompt=text_input,
+        return await get_embedding_service().embed(
+            text_input, model=settings.ollama_embed_model, client=client,
         )
-        return response.embedding
+
+    async def _prefetch_embeddings(self, texts: list[str]) -> None:
+        """
+        Embed *texts* concurrently so the EmbeddingService sends them as one batch.
+
+        resolve_entity() embeds names one at a time between DB lookups; after
+        this call those lookups are embedding cache hits.
+        """
+        if len(texts) < 2 or not settings.embedding_cache_enabled:
+            return
+        await asyncio.gather(*(self._get_embedding(t) for t in texts), return_exceptions=True)
 
     async def _extract_query_entities(self, query: str, lang: str = "de") -> list[str]:
         """
@@ -423,7 +435,7 @@ class KnowledgeGraphService:
             accessible_scopes: List of custom scope names accessible to the user (None = skip)
         """
         threshold = settings.kg_similarity_threshold
-        embedding_str = f"[{','.join(map(str, embedding))}]"
+        embedding_str = to_pgvector(embedding)
 
         if accessible_scopes:
             # Search in accessible custom scopes only
@@ -439,14 +451,16 @@ class KnowledgeGraphService:
             user_filter = ""
             params = {"embedding": embedding_str}
 
+        await prepare_vector_query(self.db, limit=1, filtered=True)
+
         sql = text(f"""
             SELECT id,
-                   1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                   {cosine_similarity()} as similarity
             FROM kg_entities
             WHERE is_active = true
               AND embedding IS NOT NULL
               {user_filter}
-            ORDER BY embedding <=> CAST(:embedding AS vector)
+            ORDER BY {cosine_distance()}
             LIMIT 1
         """)
 
@@ -583,6 +597,7 @@ class KnowledgeGraphService:
         entity_map: dict[str, KGEntity] = {}  # name -> entity
         saved_entities = []
         rejected_count = 0
+        valid_entities = []
         for ent in entities_data:
             name = ent.get("name", "").strip()
             etype = ent.get("type", "thing").strip().lower()
@@ -595,6 +610,11 @@ class KnowledgeGraphService:
                 rejected_count += 1
                 continue
 
+            valid_entities.append((name, etype, desc))
+
+        await self._prefetch_embeddings([name for name, _, _ in valid_entities])
+
+        for name, etype, desc in valid_entities:
             entity = await self.resolve_entity(name, etype, user_id, user_role, desc)
             entity_map[name.lower()] = entity
             saved_entities.append(entity)
@@ -703,6 +723,7 @@ class KnowledgeGraphService:
         entity_map: dict[str, KGEntity] = {}
         saved_entities = []
         rejected_count = 0
+        valid_entities = []
         for ent in entities_data:
             name = ent.get("name", "").strip()
             etype = ent.get("type", "thing").strip().lower()
@@ -715,6 +736,11 @@ class KnowledgeGraphService:
                 rejected_count += 1
                 continue
 
+            valid_entities.append((name, etype, desc))
+
+        await self._prefetch_embeddings([name for name, _, _ in valid_entities])
+
+        for name, etype, desc in valid_entities:
             entity = await self.resolve_entity(name, etype, user_id, user_role, desc)
             entity_map[name.lower()] = entity
             saved_entities.append(entity)
@@ -886,27 +912,31 @@ class KnowledgeGraphService:
         relevant_ids: list[int] = []
         seen_ids: set[int] = set()
 
-        for search_text in search_texts:
-            try:
-                embedding = await self._get_embedding(search_text)
-            except Exception as e:
-                logger.warning(f"KG: Could not embed '{search_text}': {e}")
+        # Embed all search texts concurrently (one batched request)
+        embeddings = await asyncio.gather(
+            *(self._get_embedding(t) for t in search_texts), return_exceptions=True,
+        )
+
+        for search_text, embedding in zip(search_texts, embeddings, strict=True):
+            if isinstance(embedding, BaseException):
+                logger.warning(f"KG: Could not embed '{search_text}': {embedding}")
                 continue
 
             if not embedding:
                 continue
 
-            embedding_str = f"[{','.join(map(str, embedding))}]"
-            params = {**base_params, "embedding": embedding_str}
+            params = {**base_params, "embedding": to_pgvector(embedding)}
+
+            await prepare_vector_query(self.db, limit=10, filtered=True)
 
             sql = text(f"""
                 SELECT e.id, e.name, e.entity_type,
-                       1 - (e.embedding <=> CAST(:embedding AS vector)) as similarity
+                       {cosine_similarity("e.embedding")} as similarity
                 FROM kg_entities e
                 WHERE e.is_active = true
                   AND e.embedding IS NOT NULL
                   {user_filter}
-                ORDER BY e.embedding <=> CAST(:embedding AS vector)
+                ORDER BY {cosine_distance("e.embedding")}
                 LIMIT 10
             """)
 
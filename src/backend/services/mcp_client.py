@@ -18,7 +18,8 @@ import os
 import random
 import re
 import time
-from contextlib import AsyncExitStack
+from collections import OrderedDict
+from contextlib import AsyncExitStack, nullcontext
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
@@ -28,6 +29,7 @@ import httpx
 import yaml
 from loguru import logger
 
+from services.mcp_result_cache import MCPCachePolicy, MCPResultCache, make_cache_key, parse_cache_policies
 from utils.config import settings
 
 # Optional jsonschema import (graceful degradation if not installed)
@@ -141,6 +143,11 @@ class ExponentialBackoff:
 # === Geocode HTTP client singleton ===
 _geocode_client: Any = None
 
+# Successful geocoding results: lowercased place name → (expires_at, result)
+GEOCODE_CACHE_TTL = 24 * 3600
+GEOCODE_CACHE_SIZE = 256
+_geocode_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
 
 def _get_geocode_client() -> Any:
     global _geocode_client
@@ -157,6 +164,12 @@ async def close_geocode_client() -> None:
         _geocode_client = None
 
 
+def _read_only_hint(tool: Any) -> bool | None:
+    """readOnlyHint from the MCP tool annotations, if the server declares it."""
+    hint = getattr(getattr(tool, "annotations", None), "readOnlyHint", None)
+    return hint if isinstance(hint, bool) else None
+
+
 class MCPValidationError(Exception):
     """Raised when MCP tool input validation fails."""
     pass
@@ -353,7 +366,42 @@ async def _geocode_location_arguments(arguments: dict, input_schema: dict) -> di
     if not (has_lat and has_lon and isinstance(location_value, str)):
         return arguments
 
-    # Geocode using Open-Meteo API (free, no key) with retry
+    geo = await _geocode(location_value)
+    if geo is None:
+        return arguments
+
+    coerced = {k: v for k, v in arguments.items() if k != "location"}
+    coerced["latitude"] = geo["latitude"]
+    coerced["longitude"] = geo["longitude"]
+
+    # Default: include current weather + basic daily forecast if nothing specified
+    if "current_weather" in properties and "current_weather" not in coerced:
+        coerced["current_weather"] = True
+    if "daily" in properties and "daily" not in coerced:
+        coerced["daily"] = [
+            "temperature_2m_max", "temperature_2m_min",
+            "precipitation_sum", "weather_code",
+        ]
+    if "timezone" in properties and "timezone" not in coerced:
+        coerced["timezone"] = geo.get("timezone", "auto")
+    if "forecast_days" in properties and "forecast_days" not in coerced:
+        coerced["forecast_days"] = 3
+    return coerced
+
+
+async def _geocode(location_value: str) -> dict | None:
+    """
+    Resolve a place name via Open-Meteo (free, no key) with retry.
+
+    Successful lookups are kept for GEOCODE_CACHE_TTL — coordinates of a
+    place do not change, and weather questions repeat the same few names.
+    """
+    cache_key = location_value.lower().strip()
+    cached = _geocode_cache.get(cache_key)
+    if cached is not None and time.monotonic() < cached[0]:
+        _geocode_cache.move_to_end(cache_key)
+        return cached[1]
+
     client = _get_geocode_client()
 
     for attempt in range(2):
@@ -375,7 +423,7 @@ async def _geocode_location_arguments(arguments: dict, input_schema: dict) -> di
                 # A partial substring match ("york" in "new york") is not
                 # sufficient — the result name should START with or EQUAL
                 # the query, or vice versa.
-                query_lower = location_value.lower().strip()
+                query_lower = cache_key
                 geo_name_lower = geo.get("name", "").lower()
                 is_good_match = (
                     query_lower == geo_name_lower
@@ -393,32 +441,20 @@ async def _geocode_location_arguments(arguments: dict, input_schema: dict) -> di
                         retry_best = max(retry_results, key=lambda r: r.get("population", 0))
                         if retry_best.get("population", 0) > geo.get("population", 0):
                             geo = retry_best
-                    coerced = {k: v for k, v in arguments.items() if k != "location"}
-                    coerced["latitude"] = geo["latitude"]
-                    coerced["longitude"] = geo["longitude"]
-
-                    # Default: include current weather + basic daily forecast if nothing specified
-                    if "current_weather" in properties and "current_weather" not in coerced:
-                        coerced["current_weather"] = True
-                    if "daily" in properties and "daily" not in coerced:
-                        coerced["daily"] = [
-                            "temperature_2m_max", "temperature_2m_min",
-                            "precipitation_sum", "weather_code",
-                        ]
-                    if "timezone" in properties and "timezone" not in coerced:
-                        coerced["timezone"] = geo.get("timezone", "auto")
-                    if "forecast_days" in properties and "forecast_days" not in coerced:
-                        coerced["forecast_days"] = 3
 
-                    logger.info(
-                        f"🌍 Geocoded '{location_value}' → "
-                        f"lat={geo['latitude']}, lon={geo['longitude']} "
-                        f"({geo.get('name', '')}, {geo.get('country', '')})"
-                    )
-                    return coerced
-                else:
-                    logger.warning(f"🌍 Geocoding failed: no results for '{location_value}'")
-                    break  # No point retrying if API returned empty results
+                logger.info(
+                    f"🌍 Geocoded '{location_value}' → "
+                    f"lat={geo['latitude']}, lon={geo['longitude']} "
+                    f"({geo.get('name', '')}, {geo.get('country', '')})"
+                )
+                _geocode_cache[cache_key] = (time.monotonic() + GEOCODE_CACHE_TTL, geo)
+                _geocode_cache.move_to_end(cache_key)
+                while len(_geocode_cache) > GEOCODE_CACHE_SIZE:
+                    _geocode_cache.popitem(last=False)
+                return geo
+            else:
+                logger.warning(f"🌍 Geocoding failed: no results for '{location_value}'")
+                break  # No point retrying if API returned empty results
         except Exception as e:
             logger.warning(
                 f"🌍 Geocoding error for '{location_value}' "
@@ -427,7 +463,7 @@ async def _geocode_location_arguments(arguments: dict, input_schema: dict) -> di
             if attempt == 0:
                 await asyncio.sleep(0.5)  # Brief pause before retry
 
-    return arguments
+    return None
 
 
 def _validate_tool_input(arguments: dict, input_schema: dict) -> None:
@@ -606,6 +642,8 @@ class MCPServerConfig:
     permissions: list[str] = field(default_factory=list)  # e.g. ["mcp.calendar.read", "mcp.calendar.manage"]
     tool_permissions: dict[str, str] = field(default_factory=dict)  # e.g. {"list_events": "mcp.calendar.read"}
     notifications: dict | None = None  # {"enabled": true, "poll_interval": 900, "tool": "get_pending_notifications"}
+    max_concurrent_calls: int | None = None  # Concurrent tool calls (None = settings.mcp_max_concurrent_calls)
+    cache: dict[str, MCPCachePolicy] = field(default_factory=dict)  # Result cache policies of read-only tools
 
 
 @dataclass
@@ -616,6 +654,7 @@ class MCPToolInfo:
     namespaced_name: str  # "mcp.<server>.<tool>"
     description: str
     input_schema: dict = field(default_factory=dict)
+    read_only_hint: bool | None = None  # MCP tool annotation readOnlyHint (None = not declared)
 
 
 @dataclass
@@ -630,6 +669,7 @@ class MCPServerState:
     exit_stack: AsyncExitStack | None = None
     rate_limiter: TokenBucketRateLimiter | None = None
     backoff: ExponentialBackoff | None = None  # Reconnection backoff tracker
+    call_semaphore: asyncio.Semaphore | None = None  # Limits concurrent tool calls
 
 
 def _substitute_env_vars(value: str) -> str:
@@ -696,6 +736,8 @@ class MCPManager:
         self._servers: dict[str, MCPServerState] = {}
         self._tool_index: dict[str, MCPToolInfo] = {}  # namespaced_name -> MCPToolInfo
         self._tool_overrides: dict[str, list[str] | None] = {}  # DB overrides per server
+        self.tools_version = 0  # Bumped when _tool_index changes (invalidates cached tool prompts)
+        self._result_cache = MCPResultCache()
         self._refresh_task: asyncio.Task | None = None
 
     def load_config(self, path: str) -> None:
@@ -764,13 +806,18 @@ class MCPManager:
                     permissions=entry.get("permissions", []),
                     tool_permissions=entry.get("tool_permissions", {}),
                     notifications=_parse_notifications(entry.get("notifications")),
+                    max_concurrent_calls=(
+                        int(_resolve_value(entry["max_concurrent_calls"]))
+                        if entry.get("max_concurrent_calls") is not None else None
+                    ),
+                    cache=parse_cache_policies(entry.get("cache")),
                 )
 
                 if not config.enabled:
                     logger.info(f"MCP server '{config.name}' is disabled, skipping")
                     continue
 
-                # Initialize server state with rate limiter and backoff tracker
+                # Initialize server state with rate limiter, concurrency limit and backoff tracker
                 rate_limiter = TokenBucketRateLimiter(
                     rate_per_minute=DEFAULT_RATE_LIMIT_PER_MINUTE
                 )
@@ -778,6 +825,9 @@ class MCPManager:
                 self._servers[config.name] = MCPServerState(
                     config=config,
                     rate_limiter=rate_limiter,
+                    call_semaphore=asyncio.Semaphore(
+                        max(1, config.max_concurrent_calls or settings.mcp_max_concurrent_calls)
+                    ),
                     backoff=backoff,
                 )
                 logger.info(f"MCP server configured: {config.name} ({config.transport.value})")
@@ -797,6 +847,7 @@ class MCPManager:
             for state in self._servers.values()
         ]
         await asyncio.gather(*tasks, return_exceptions=True)
+        self.tools_version += 1
 
         connected = sum(1 for s in self._servers.values() if s.connected)
         total_tools = len(self._tool_index)
@@ -909,6 +960,7 @@ class MCPManager:
                     namespaced_name=namespaced,
                     description=description,
                     input_schema=tool.inputSchema if hasattr(tool, "inputSchema") else {},
+                    read_only_hint=_read_only_hint(tool),
                 )
                 all_tools.append(info)
 
@@ -1032,6 +1084,7 @@ class MCPManager:
         Includes:
         - Permission checking (if user_permissions provided)
         - Input validation against JSON schema
+        - Result cache for read-only tools with a cache policy
         - Rate limiting per server
         - Response truncation for large outputs
 
@@ -1096,6 +1149,37 @@ class MCPManager:
                 "data": None,
             }
 
+        # === Result Cache (read-only tools with a cache policy) ===
+        policy = self._get_cache_policy(tool_info, state)
+        if policy is not None:
+            key = make_cache_key(namespaced_name, arguments, policy, user_id)
+            return await self._result_cache.get_or_call(
+                namespaced_name, key, policy.ttl,
+                lambda: self._call_tool(state, tool_info, arguments, user_id),
+            )
+        return await self._call_tool(state, tool_info, arguments, user_id)
+
+    def _get_cache_policy(self, tool_info: MCPToolInfo, state: MCPServerState) -> MCPCachePolicy | None:
+        """Cache policy of a tool; never for tools the server declares as not read-only."""
+        if not settings.mcp_cache_enabled:
+            return None
+        policy = state.config.cache.get(tool_info.original_name)
+        if policy is not None and tool_info.read_only_hint is False:
+            logger.warning(f"MCP cache policy for '{tool_info.namespaced_name}' ignored: server marks tool as mutating")
+            state.config.cache.pop(tool_info.original_name, None)
+            return None
+        return policy
+
+    async def _call_tool(
+        self,
+        state: MCPServerState,
+        tool_info: MCPToolInfo,
+        arguments: dict,
+        user_id: int | None = None,
+    ) -> dict:
+        """Rate limit, prepare arguments and call the tool on its server."""
+        namespaced_name = tool_info.namespaced_name
+
         # === Rate Limiting ===
         if state.rate_limiter:
             if not await state.rate_limiter.acquire():
@@ -1126,10 +1210,11 @@ class MCPManager:
         try:
             user_info = f" (user_id={user_id})" if user_id is not None else ""
             logger.debug(f"MCP call: {namespaced_name}{user_info}")
-            result = await asyncio.wait_for(
-                state.session.call_tool(tool_info.original_name, arguments),
-                timeout=settings.mcp_call_timeout,
-            )
+            async with state.call_semaphore or nullcontext():
+                result = await asyncio.wait_for(
+                    state.session.call_tool(tool_info.original_name, arguments),
+                    timeout=settings.mcp_call_timeout,
+                )
 
             # Convert CallToolResult to our format
             is_error = getattr(result, "isError", False)
@@ -1255,10 +1340,12 @@ class MCPManager:
             "enabled": True,
             "total_tools": len(self._tool_index),
             "servers": servers,
+            "cache": self._result_cache.get_stats(),
         }
 
     async def refresh_tools(self) -> None:
         """Refresh tool lists from all connected servers and reconnect failed ones."""
+        previous_index = dict(self._tool_index)
         for state in self._servers.values():
             if state.connected and state.session:
                 try:
@@ -1280,6 +1367,7 @@ class MCPManager:
                             namespaced_name=namespaced,
                             description=tool.description or "",
                             input_schema=tool.inputSchema if hasattr(tool, "inputSchema") else {},
+                            read_only_hint=_read_only_hint(tool),
                         )
                         state.all_discovered_tools.append(info)
 
@@ -1314,6 +1402,9 @@ class MCPManager:
                 )
                 await self._connect_server(state)
 
+        if self._tool_index != previous_index:
+            self.tools_version += 1
+
     def _refilter_server(self, server_name: str) -> None:
         """Re-build state.tools + _tool_index from all_discovered_tools using current filter."""
         state = self._servers.get(server_name)
@@ -1331,6 +1422,7 @@ class MCPManager:
                 continue
             state.tools.append(tool)
             self._tool_index[tool.namespaced_name] = tool
+        self.tools_version += 1
 
     async def load_tool_overrides(self, db) -> None:
         """Load per-server tool activation overrides from SystemSetting."""
@@ -1422,4 +1514,5 @@ class MCPManager:
             state.exit_stack = None
 
         self._tool_index.clear()
+        self.tools_version += 1
         logger.info("MCP manager shut down")
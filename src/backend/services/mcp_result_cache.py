@@ -0,0 +1,223 @@
+"""
+MCP Result Cache — TTL/LRU cache for read-only MCP tool calls.
+
+Weather lookups, document searches and HA state queries are often repeated
+with identical arguments within seconds (agent retries, parallel calls,
+follow-up questions). Tools opt in per server in mcp_servers.yaml:
+
+    cache:
+      get_weather:
+        read_only: true      # Required — tools without it are never cached
+        ttl: 600             # Seconds
+        key_fields: [location, latitude, longitude]  # Optional, default: all arguments
+        per_user: false      # Optional, include the user id in the key
+
+Only successful results are stored. Concurrent identical calls share one
+in-flight request. With MCP_CACHE_REDIS=true entries are also written to
+Redis so they survive restarts and are shared between backend workers.
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from loguru import logger
+
+from utils.config import settings
+
+REDIS_KEY_PREFIX = "renfield:mcp_cache:"
+_METRIC_LABELS = {"hits": "hit", "misses": "miss", "coalesced": "coalesced"}
+
+
+@dataclass
+class MCPCachePolicy:
+    """Cache policy of one MCP tool."""
+    ttl: float
+    key_fields: list[str] | None = None  # None = all arguments
+    per_user: bool = False
+
+
+def parse_cache_policies(raw: dict | None) -> dict[str, MCPCachePolicy]:
+    """
+    Parse the per-tool ``cache`` section of a server entry.
+
+    Entries without ``read_only: true`` or with a TTL <= 0 are skipped, so a
+    mutating tool cannot be cached by a typo.
+    """
+    policies: dict[str, MCPCachePolicy] = {}
+    if not isinstance(raw, dict):
+        return policies
+    for tool_name, entry in raw.items():
+        if not isinstance(entry, dict):
+            continue
+        if entry.get("read_only") is not True:
+            logger.warning(f"MCP cache policy for '{tool_name}' ignored: read_only: true is required")
+            continue
+        ttl = float(entry.get("ttl", 0))
+        if ttl <= 0:
+            continue
+        key_fields = entry.get("key_fields")
+        policies[tool_name] = MCPCachePolicy(
+            ttl=ttl,
+            key_fields=[str(f) for f in key_fields] if isinstance(key_fields, list) else None,
+            per_user=bool(entry.get("per_user", False)),
+        )
+    return policies
+
+
+def make_cache_key(tool: str, arguments: dict, policy: MCPCachePolicy, user_id: int | None = None) -> str:
+    """Stable key from the tool name and the (selected) arguments."""
+    if policy.key_fields is not None:
+        arguments = {k: arguments[k] for k in policy.key_fields if k in arguments}
+    payload = json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=str)
+    user = f"|user={user_id}" if policy.per_user else ""
+    return f"{tool}{user}|{payload}"
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    """Mark a failed call retrieved so an error nobody awaited is not logged."""
+    if not task.cancelled():
+        task.exception()
+
+
+class MCPResultCache:
+    """Bounded LRU of tool results with per-entry TTL and in-flight coalescing."""
+
+    def __init__(self, max_entries: int | None = None, use_redis: bool | None = None):
+        self.max_entries = max_entries if max_entries is not None else settings.mcp_cache_size
+        self.use_redis = use_redis if use_redis is not None else settings.mcp_cache_redis
+        self._cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()  # key → (expires_at, result)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._redis = None
+        self._stats: dict[str, dict[str, int]] = {}  # tool → hits/misses/coalesced
+
+    async def get_or_call(
+        self,
+        tool: str,
+        key: str,
+        ttl: float,
+        call: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Return the cached result for *key* or run *call* (once for concurrent callers)."""
+        cached = self._get_local(key)
+        if cached is not None:
+            self._count(tool, "hits")
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._count(tool, "coalesced")
+            return dict(await asyncio.shield(pending))
+
+        # The call runs in its own task: cancelling the caller that started
+        # it must not cancel the callers coalesced onto it.
+        task = asyncio.create_task(self._call_and_store(tool, key, ttl, call))
+        task.add_done_callback(_consume_exception)
+        self._inflight[key] = task
+        return dict(await asyncio.shield(task))
+
+    async def _call_and_store(
+        self,
+        tool: str,
+        key: str,
+        ttl: float,
+        call: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """Look up Redis or run *call* for one miss; shared by all coalesced callers."""
+        try:
+            result = await self._get_redis(key, ttl)
+            if result is not None:
+                self._count(tool, "hits")
+            else:
+                self._count(tool, "misses")
+                result = await call()
+                if result.get("success"):
+                    self._put_local(key, result, ttl)
+                    await self._put_redis(key, result, ttl)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    def _get_local(self, key: str) -> dict | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return dict(result)
+
+    def _put_local(self, key: str, result: dict, ttl: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._cache[key] = (time.monotonic() + ttl, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _get_redis_client(self):
+        if self._redis is None:
+            import redis.asyncio as aioredis
+
+            self._redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+        return self._redis
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return REDIS_KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+    async def _get_redis(self, key: str, ttl: float) -> dict | None:
+        if not self.use_redis:
+            return None
+        try:
+            raw = await self._get_redis_client().get(self._redis_key(key))
+        except Exception as e:
+            logger.debug(f"MCP cache Redis lookup failed: {e}")
+            return None
+        if raw is None:
+            return None
+        result = json.loads(raw)
+        self._put_local(key, result, ttl)
+        return result
+
+    async def _put_redis(self, key: str, result: dict, ttl: float) -> None:
+        if not self.use_redis:
+            return
+        try:
+            payload = json.dumps(result, ensure_ascii=False, default=str)
+            await self._get_redis_client().set(self._redis_key(key), payload, ex=max(1, int(ttl)))
+        except Exception as e:
+            logger.debug(f"MCP cache Redis write failed: {e}")
+
+    def _count(self, tool: str, result: str) -> None:
+        from utils.metrics import record_mcp_cache
+
+        stats = self._stats.setdefault(tool, {"hits": 0, "misses": 0, "coalesced": 0})
+        stats[result] += 1
+        record_mcp_cache(_METRIC_LABELS[result])
+
+    def get_stats(self) -> dict:
+        """Hit ratios overall and per tool for MCPManager.get_status()."""
+        def ratio(stats: dict) -> float:
+            lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+            return round((stats["hits"] + stats["coalesced"]) / lookups, 3) if lookups else 0.0
+
+        total = {"hits": 0, "misses": 0, "coalesced": 0}
+        tools = {}
+        for tool, stats in sorted(self._stats.items()):
+            for name, value in stats.items():
+                total[name] += value
+            tools[tool] = {**stats, "hit_ratio": ratio(stats)}
+        return {
+            "size": len(self._cache),
+            "max_entries": self.max_entries,
+            "redis": self.use_redis,
+            **total,
+            "hit_ratio": ratio(total),
+            "tools": tools,
+        }
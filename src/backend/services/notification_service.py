@@ -27,6 +27,7 @@ from models.database import (
     Room,
     SystemSetting,
 )
+from services.vector_search import cosine_distance, cosine_similarity, prepare_vector_query, to_pgvector
 from utils.config import settings
 
 
@@ -114,15 +115,10 @@ class NotificationService:
     # ------------------------------------------------------------------
 
     async def _get_embedding(self, text_input: str) -> list[float]:
-        """Generate embedding via Ollama (same pattern as IntentFeedbackService)."""
-        from utils.llm_client import get_embed_client
+        """Generate embedding via the shared embedding cache (same pattern as IntentFeedbackService)."""
+        from services.embedding_service import get_embedding_service
 
-        client = get_embed_client()
-        response = await client.embeddings(
-            model=settings.ollama_embed_model,
-            prompt=text_input,
-        )
-        return response.embedding
+        return await get_embedding_service().embed(text_input, model=settings.ollama_embed_model)
 
     # ------------------------------------------------------------------
     # Semantic Deduplication (Phase 2b)
@@ -140,17 +136,18 @@ class NotificationService:
         since = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=window)
 
         try:
+            await prepare_vector_query(self.db, limit=1, filtered=True)
             result = await self.db.execute(
-                text("""
+                text(f"""
                     SELECT id,
-                           1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                           {cosine_similarity()} as similarity
                     FROM notifications
                     WHERE embedding IS NOT NULL
                       AND created_at >= :since
-                    ORDER BY embedding <=> CAST(:embedding AS vector)
+                    ORDER BY {cosine_distance()}
                     LIMIT 1
                 """),
-                {"embedding": str(embedding), "since": since},
+                {"embedding": to_pgvector(embedding), "since": since},
             )
             row = result.first()
             if row and row.similarity >= threshold:
@@ -296,17 +293,18 @@ class NotificationService:
         if embedding:
             threshold = settings.proactive_feedback_similarity_threshold
             try:
+                await prepare_vector_query(self.db, limit=1, filtered=True)
                 result = await self.db.execute(
-                    text("""
+                    text(f"""
                         SELECT id,
-                               1 - (embedding <=> CAST(:embedding AS vector)) as similarity
+                               {cosine_similarity()} as similarity
                         FROM notification_suppressions
                         WHERE is_active = true
                           AND embedding IS NOT NULL
-                        ORDER BY embedding <=> CAST(:embedding AS vector)
+                        ORDER BY {cosine_distance()}
                         LIMIT 1
                     """),
-                    {"embedding": str(embedding)},
+                    {"embedding": to_pgvector(embedding)},
                 )
                 row = result.first()
                 if row and row.similarity >= threshold:
@@ -611,9 +609,9 @@ class NotificationService:
     async def _deliver_tts(self, notification: Notification) -> bool:
         """Generate TTS and route to best audio output device for the room."""
         try:
-            from services.piper_service import PiperService
+            from services.piper_service import get_piper_service
 
-            piper = PiperService()
+            piper = get_piper_service()
             tts_audio = await piper.synthesize_to_bytes(notification.message)
 
             if not tts_audio:
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from services.embedding_service import get_embedding_service
 from services.prompt_manager import prompt_manager
 from utils.circuit_breaker import llm_circuit_breaker
 from utils.config import settings
@@ -227,6 +228,17 @@ WICHTIGE REGELN FÜR ANTWORTEN:
         lang = lang or self.default_lang
         message = _sanitize_user_input(message)
 
+        # Fast path: nearest labelled example instead of an LLM call
+        if settings.intent_fastpath_enabled:
+            from services.intent_classifier import get_intent_classifier
+
+            try:
+                fast_intent = await get_intent_classifier().resolve(message, room_context)
+                if fast_intent:
+                    return fast_intent
+            except Exception as e:
+                logger.warning(f"⚠️ Intent fast path failed, using LLM: {e}")
+
         # Build dynamic intent types from IntentRegistry
         from services.intent_registry import intent_registry
 
@@ -875,12 +887,9 @@ WICHTIGE REGELN FÜR ANTWORTEN:
             Liste von Floats (768 Dimensionen für nomic-embed-text)
         """
         try:
-            response = await self.embed_client.embeddings(
-                model=self.embed_model,
-                prompt=text
+            return await get_embedding_service().embed(
+                text, model=self.embed_model, client=self.embed_client,
             )
-            # ollama>=0.4.0 uses Pydantic models
-            return response.embedding
         except Exception as e:
             logger.error(f"Embedding Fehler: {e}")
             raise
@@ -241,8 +241,11 @@ class OutputRoutingService:
         - off → OFF
         - unavailable, unknown → UNAVAILABLE
         """
+        from integrations.ha_state_mirror import get_ha_state_mirror
+
         try:
-            state = await self.ha_client.get_state(entity_id)
+            mirror = get_ha_state_mirror()
+            state = mirror.get_state(entity_id) if mirror.is_ready else await self.ha_client.get_state(entity_id)
 
             if not state:
                 return DeviceAvailability.UNAVAILABLE
@@ -18,9 +18,11 @@ from datetime import UTC, datetime
 from difflib import SequenceMatcher
 from uuid import uuid4
 
-from sqlalchemy import func, select
+import numpy as np
+from sqlalchemy import func, or_, select, update
 
 from utils.config import settings
+from utils.minhash import NUM_PERM, minhash_signature, near_duplicate_pairs
 
 logger = logging.getLogger(__name__)
 
@@ -352,6 +354,7 @@ class PaperlessAuditService:
             content, doc.get("page_count")
         )
         content_hash = hashlib.md5(content[:1000].encode()).hexdigest() if content else None
+        content_minhash = minhash_signature(content)
 
         # 3. Call LLM for analysis
         analysis = await self._llm_analyze(doc, available_metadata)
@@ -411,6 +414,7 @@ class PaperlessAuditService:
                 content_completeness=content_completeness,
                 completeness_issues=completeness_issues,
                 content_hash=content_hash,
+                content_minhash=content_minhash,
                 confidence=analysis.get("confidence", 0.0) if analysis else None,
                 changes_needed=changes_needed,
                 reasoning=analysis.get("reasoning") if analysis else None,
@@ -839,94 +843,133 @@ class PaperlessAuditService:
             }
 
     async def run_duplicate_detection(self) -> dict:
-        """Post-audit pass: detect duplicate documents by content hash grouping.
-
-        Groups documents by (correspondent, document_type, date), then compares
-        content hashes within groups. Sets duplicate_group_id on matches.
+        """Post-audit pass: detect duplicate documents across the whole archive.
+
+        Looks up the content MinHash signatures in LSH buckets and keeps pairs
+        with an estimated similarity >= PAPERLESS_AUDIT_DUPLICATE_THRESHOLD.
+        Results without a signature (audited before signatures were stored)
+        only match on identical content_hash. Linked documents are split into
+        groups around a representative (see _duplicate_groups), so templated
+        documents such as monthly statements do not chain into one group.
+        Replaces the groups of the previous run.
         """
         from models.database import PaperlessAuditResult
 
         async with self._db_factory() as db:
-            stmt = select(PaperlessAuditResult).where(
-                PaperlessAuditResult.content_hash.isnot(None)
+            stmt = select(
+                PaperlessAuditResult.id,
+                PaperlessAuditResult.content_hash,
+                PaperlessAuditResult.content_minhash,
+            ).where(
+                or_(
+                    PaperlessAuditResult.content_hash.isnot(None),
+                    PaperlessAuditResult.content_minhash.isnot(None),
+                )
             )
-            results = (await db.execute(stmt)).scalars().all()
-
-        if not results:
-            return {"groups_found": 0, "documents_flagged": 0}
+            rows = (await db.execute(stmt)).all()
 
-        # Group by (correspondent, document_type, date)
-        groups: dict[tuple, list] = {}
-        for r in results:
-            key = (
-                r.current_correspondent or "",
-                r.current_document_type or "",
-                r.current_date or "",
-            )
-            groups.setdefault(key, []).append(r)
+        groups = await asyncio.to_thread(
+            self._duplicate_groups, rows, settings.paperless_audit_duplicate_threshold
+        )
 
-        groups_found = 0
-        documents_flagged = 0
+        updates = []
+        for members in groups:
+            group_id = str(uuid4())[:8]
+            updates += [
+                {"id": doc, "duplicate_group_id": group_id, "duplicate_score": round(score, 3)}
+                for doc, score in members.items()
+            ]
 
         async with self._db_factory() as db:
-            for _key, group in groups.items():
-                if len(group) < 2:
-                    continue
-
-                # Compare content hashes within the group
-                hash_clusters: dict[str, list] = {}
-                for r in group:
-                    hash_clusters.setdefault(r.content_hash, []).append(r)
-
-                for _content_hash, cluster in hash_clusters.items():
-                    if len(cluster) < 2:
-                        continue
-
-                    group_id = str(uuid4())[:8]
-                    groups_found += 1
-
-                    for r in cluster:
-                        stmt = select(PaperlessAuditResult).where(
-                            PaperlessAuditResult.id == r.id
-                        )
-                        db_result = (await db.execute(stmt)).scalar_one_or_none()
-                        if db_result:
-                            db_result.duplicate_group_id = group_id
-                            db_result.duplicate_score = 1.0  # Exact hash match
-                            documents_flagged += 1
-
-                # Also check for near-duplicates via SequenceMatcher within group
-                for i in range(len(group)):
-                    for j in range(i + 1, len(group)):
-                        a, b = group[i], group[j]
-                        # Skip if already in a duplicate group
-                        if a.duplicate_group_id and b.duplicate_group_id:
-                            continue
-                        if a.content_hash == b.content_hash:
-                            continue  # Already handled above
-
-                        # Compare titles as a lightweight proxy
-                        title_a = (a.current_title or "").lower()
-                        title_b = (b.current_title or "").lower()
-                        if title_a and title_b:
-                            ratio = SequenceMatcher(None, title_a, title_b).ratio()
-                            if ratio >= 0.8:
-                                group_id = a.duplicate_group_id or str(uuid4())[:8]
-                                groups_found += 1
-
-                                for r in [a, b]:
-                                    stmt = select(PaperlessAuditResult).where(
-                                        PaperlessAuditResult.id == r.id
-                                    )
-                                    db_result = (await db.execute(stmt)).scalar_one_or_none()
-                                    if db_result and not db_result.duplicate_group_id:
-                                        db_result.duplicate_group_id = group_id
-                                        db_result.duplicate_score = ratio
-                                        documents_flagged += 1
-
+            await db.execute(
+                update(PaperlessAuditResult)
+                .where(PaperlessAuditResult.duplicate_group_id.isnot(None))
+                .values(duplicate_group_id=None, duplicate_score=None)
+            )
+            if updates:
+                # Bulk UPDATE by primary key
+                await db.execute(update(PaperlessAuditResult), updates)
             await db.commit()
 
-        return {"groups_found": groups_found, "documents_flagged": documents_flagged}
+        logger.info(
+            f"Duplicate detection: {len(groups)} groups, {len(updates)} documents "
+            f"from {len(rows)} audit results"
+        )
+        return {"groups_found": len(groups), "documents_flagged": len(updates)}
+
+    @staticmethod
+    def _duplicate_groups(rows, threshold: float) -> list[dict[int, float]]:
+        """Duplicate groups as {result id: similarity to the group's representative}.
+
+        LSH pairs only link documents (a chain of 0.8 matches says nothing
+        about its ends), so each linked set is split again: the member with
+        the most links becomes representative, every member with an
+        estimated similarity >= threshold to it (or the same content_hash)
+        joins its group, and the rest are grouped the same way. The
+        representative's score is its best match. CPU-bound.
+        """
+        signatures = {
+            r.id: r.content_minhash for r in rows if r.content_minhash and len(r.content_minhash) == NUM_PERM
+        }
+        content_hashes = {r.id: r.content_hash for r in rows}
+        pairs = near_duplicate_pairs(signatures, threshold)
+
+        # Exact content_hash matches involving a result without signature
+        hash_clusters: dict[str, list[int]] = {}
+        for r in rows:
+            if r.content_hash:
+                hash_clusters.setdefault(r.content_hash, []).append(r.id)
+        for ids in hash_clusters.values():
+            pairs += [
+                (a, b, 1.0)
+                for i, a in enumerate(ids)
+                for b in ids[i + 1:]
+                if a not in signatures or b not in signatures
+            ]
+
+        parent: dict[int, int] = {}
+
+        def find(x: int) -> int:
+            while parent.get(x, x) != x:
+                parent[x] = parent.get(parent[x], parent[x])
+                x = parent[x]
+            return x
+
+        links: dict[int, int] = {}
+        for a, b, _ in pairs:
+            ra, rb = find(a), find(b)
+            if ra != rb:
+                parent[ra] = rb
+            for doc in (a, b):
+                links[doc] = links.get(doc, 0) + 1
+
+        linked: dict[int, list[int]] = {}
+        for doc in sorted(links, key=lambda d: (-links[d], d)):
+            linked.setdefault(find(doc), []).append(doc)
+
+        groups: list[dict[int, float]] = []
+        for members in linked.values():
+            has_signature = np.array([doc in signatures for doc in members])
+            matrix = np.asarray(
+                [signatures.get(doc, [0] * NUM_PERM) for doc in members], dtype=np.uint32
+            )
+            hashes = np.array([content_hashes.get(doc) for doc in members], dtype=object)
+            remaining = np.arange(len(members))
+            while len(remaining) > 1:
+                representative, rest = remaining[0], remaining[1:]
+                scores = np.zeros(len(rest))
+                if has_signature[representative]:
+                    estimate = (matrix[rest] == matrix[representative]).mean(axis=1)
+                    scores = np.where(has_signature[rest], estimate, 0.0)
+                if hashes[representative] is not None:
+                    scores[hashes[rest] == hashes[representative]] = 1.0
+                hit = scores >= threshold
+                if hit.any():
+                    group = {members[i]: float(score) for i, score in zip(rest[hit], scores[hit], strict=True)}
+                    group[members[representative]] = float(scores[hit].max())
+                    groups.append(group)
+                remaining = rest[~hit]
+        return groups
 
     async def run_correspondent_normalization(self, threshold: float = 0.82) -> dict:
         """Post-audit pass: find similar correspondent names that may be duplicates.
@@ -4,15 +4,212 @@ Piper Service - Text to Speech
 Supports multiple voices based on language.
 Configuration via PIPER_VOICES environment variable:
   PIPER_VOICES=de:de_DE-thorsten-high,en:en_US-amy-medium
+
+Each voice runs in a long-lived piper process (PiperWorker) that keeps the
+ONNX model loaded. The process reads one utterance per stdin line and writes
+one WAV file per line into its output directory, printing the file path.
+synthesize_stream() splits a response - or a live LLM token stream - into
+sentences and yields one WAV per sentence as soon as it is ready, so playback
+can start before the whole response has been generated and synthesized.
 """
+import asyncio
+import re
+import shutil
 import subprocess
 import tempfile
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator
 from pathlib import Path
 
 from loguru import logger
 
 from utils.config import settings
 
+# Sentence boundaries: terminal punctuation followed by whitespace, or line breaks
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+|\s*\n+\s*")
+
+# Fragments shorter than this are merged into the next sentence ("Dr.", "1.", "Ok.")
+MIN_SENTENCE_CHARS = 20
+
+
+class SentenceSplitter:
+    """
+    Incrementally cut a text stream (e.g. LLM tokens) into sentences.
+
+    feed() returns the sentences completed by the new text; flush() returns
+    the rest once the stream has ended. Short fragments are merged with the
+    following sentence so that abbreviations and list numbers don't produce
+    tiny audio chunks.
+    """
+
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""   # Text after the last boundary (sentence still growing)
+        self._short = ""    # Completed fragments below min_chars
+
+    def feed(self, text: str) -> list[str]:
+        self._buffer += text
+        *parts, self._buffer = _SENTENCE_BOUNDARY.split(self._buffer)
+        sentences = []
+        for part in parts:
+            part = part.strip()
+            if not part:
+                continue
+            self._short = f"{self._short} {part}" if self._short else part
+            if len(self._short) >= self.min_chars:
+                sentences.append(self._short)
+                self._short = ""
+        return sentences
+
+    def flush(self) -> list[str]:
+        rest = " ".join(p for p in (self._short, self._buffer.strip()) if p)
+        self._buffer = self._short = ""
+        return [rest] if rest else []
+
+
+def split_sentences(text: str, min_chars: int = MIN_SENTENCE_CHARS) -> list[str]:
+    """Split complete text into sentences; a short tail joins the last sentence."""
+    splitter = SentenceSplitter(min_chars)
+    sentences = splitter.feed(text)
+    for rest in splitter.flush():
+        if sentences and len(rest) < min_chars:
+            sentences[-1] = f"{sentences[-1]} {rest}"
+        else:
+            sentences.append(rest)
+    return sentences
+
+
+class PiperError(Exception):
+    """Raised when the piper process fails or returns no audio."""
+    pass
+
+
+class PiperWorker:
+    """
+    Long-lived piper process for one voice.
+
+    Requests are pipelined: each utterance is written as one stdin line and
+    a future is queued; the stdout reader resolves futures in FIFO order with
+    the WAV path piper prints. A crashed process fails all pending requests
+    and is restarted on the next call.
+    """
+
+    def __init__(self, voice: str, model_path: str, timeout: float):
+        self.voice = voice
+        self.model_path = model_path
+        self.timeout = timeout
+        self._process: asyncio.subprocess.Process | None = None
+        self._output_dir: str | None = None
+        self._pending: deque[asyncio.Future] = deque()
+        self._lock = asyncio.Lock()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def _start(self) -> None:
+        if self._output_dir is None:
+            self._output_dir = tempfile.mkdtemp(prefix=f"piper-{self.voice}-")
+        self._process = await asyncio.create_subprocess_exec(
+            "piper",
+            "--model", self.model_path,
+            "--output_dir", self._output_dir,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._tasks = [
+            asyncio.create_task(self._read_output(self._process)),
+            asyncio.create_task(self._drain_stderr(self._process)),
+        ]
+        logger.info(f"🗣️ Piper worker started ({self.voice}, pid {self._process.pid})")
+
+    async def _read_output(self, process: asyncio.subprocess.Process) -> None:
+        """Resolve pending requests with the WAV paths printed by piper."""
+        try:
+            while line := await process.stdout.readline():
+                path = line.decode("utf-8", errors="replace").strip()
+                if not path.endswith(".wav"):
+                    continue
+                if self._pending:
+                    future = self._pending.popleft()
+                    if not future.done():
+                        future.set_result(path)
+                        continue
+                # Request was cancelled or timed out
+                Path(path).unlink(missing_ok=True)
+        finally:
+            if process is self._process:
+                logger.warning(f"⚠️ Piper worker exited ({self.voice}, code {process.returncode})")
+                self._fail_pending(PiperError(f"Piper process for {self.voice} exited"))
+
+    async def _drain_stderr(self, process: asyncio.subprocess.Process) -> None:
+        while line := await process.stderr.readline():
+            logger.debug(f"piper[{self.voice}]: {line.decode('utf-8', errors='replace').rstrip()}")
+
+    def _fail_pending(self, error: Exception) -> None:
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+
+    async def _read_wav(self, path: str) -> bytes:
+        """
+        Read a finished WAV file.
+
+        piper prints the path right before it closes the file, so the tail
+        may still be in its write buffer. The RIFF header carries the final
+        size; wait briefly until the file is complete.
+        """
+        file = Path(path)
+        try:
+            for _ in range(50):
+                data = file.read_bytes()
+                if len(data) >= 8 and len(data) >= int.from_bytes(data[4:8], "little") + 8:
+                    return data
+                await asyncio.sleep(0.01)
+            raise PiperError(f"Incomplete WAV from piper: {path}")
+        finally:
+            file.unlink(missing_ok=True)
+
+    async def synthesize(self, text: str) -> bytes:
+        """Synthesize one utterance and return it as WAV bytes."""
+        line = " ".join(text.split())
+        if not line:
+            return b""
+
+        future = asyncio.get_running_loop().create_future()
+        async with self._lock:
+            if not self.running:
+                await self._start()
+            self._pending.append(future)
+            self._process.stdin.write(line.encode("utf-8") + b"\n")
+            await self._process.stdin.drain()
+
+        try:
+            path = await asyncio.wait_for(future, timeout=self.timeout)
+        except TimeoutError:
+            # Output is out of sync with the request queue: start over
+            logger.error(f"❌ Piper timeout after {self.timeout}s ({self.voice}), restarting worker")
+            await self.stop()
+            raise PiperError(f"Piper synthesis timed out ({self.voice})") from None
+        return await self._read_wav(path)
+
+    async def stop(self) -> None:
+        """Terminate the piper process and fail pending requests."""
+        process, self._process = self._process, None
+        self._fail_pending(PiperError(f"Piper worker for {self.voice} stopped"))
+        if process and process.returncode is None:
+            process.kill()
+            await process.wait()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._output_dir:
+            shutil.rmtree(self._output_dir, ignore_errors=True)
+            self._output_dir = None
+
 
 class PiperService:
     """Service für Text-to-Speech mit Piper"""
@@ -21,7 +218,9 @@ class PiperService:
         self.default_voice = settings.piper_voice
         self.voice_map = settings.piper_voice_map
         self.default_language = settings.default_language
+        self.timeout = settings.piper_timeout
         self.available = self._check_piper_available()
+        self._workers: dict[str, PiperWorker] = {}
 
         # Log available voices
         if self.available:
@@ -44,6 +243,15 @@ class PiperService:
         """Get the model path for a given voice."""
         return f"/usr/share/piper/voices/{voice}.onnx"
 
+    def _get_worker(self, language: str = None) -> PiperWorker:
+        """Get or create the persistent worker for the language's voice."""
+        voice = self._get_voice_for_language(language)
+        worker = self._workers.get(voice)
+        if worker is None:
+            worker = PiperWorker(voice, self._get_model_path(voice), self.timeout)
+            self._workers[voice] = worker
+        return worker
+
     def _check_piper_available(self) -> bool:
         """Prüfe ob Piper verfügbar ist"""
         try:
@@ -80,41 +288,12 @@ class PiperService:
             output_path: Path for output audio file
             language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
         """
-        if not self.available:
-            logger.warning("Piper nicht verfügbar, TTS übersprungen")
-            return False
-
-        # Get voice for the requested language
-        voice = self._get_voice_for_language(language)
-        model_path = self._get_model_path(voice)
-
-        try:
-            # Piper CLI aufrufen
-            cmd = [
-                "piper",
-                "--model", model_path,
-                "--output_file", output_path
-            ]
-
-            # Text über stdin übergeben
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-
-            _stdout, stderr = process.communicate(input=text.encode('utf-8'))
-
-            if process.returncode == 0:
-                logger.info(f"✅ TTS erfolgreich ({voice}): {output_path}")
-                return True
-            else:
-                logger.error(f"❌ Piper Fehler ({voice}): {stderr.decode()}")
-                return False
-        except Exception as e:
-            logger.error(f"❌ TTS Fehler: {e}")
+        audio = await self.synthesize_to_bytes(text, language=language)
+        if not audio:
             return False
+        await asyncio.to_thread(Path(output_path).write_bytes, audio)
+        logger.info(f"✅ TTS erfolgreich: {output_path}")
+        return True
 
     async def synthesize_to_bytes(self, text: str, language: str = None) -> bytes:
         """
@@ -128,17 +307,106 @@ class PiperService:
             logger.warning("Piper nicht verfügbar, TTS übersprungen")
             return b""
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
-
         try:
-            success = await self.synthesize_to_file(text, tmp_path, language=language)
-            if success:
-                with open(tmp_path, "rb") as f:
-                    return f.read()
+            return await self._get_worker(language).synthesize(text)
+        except Exception as e:
+            logger.error(f"❌ TTS Fehler: {e}")
             return b""
+
+    async def synthesize_stream(
+        self,
+        text: str | AsyncIterable[str],
+        language: str = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize text sentence by sentence.
+
+        Yields one self-contained WAV per sentence as soon as it is ready.
+        *text* may be a string or an async stream of text chunks (LLM
+        tokens): sentences are then synthesized while the stream is still
+        being generated. A text stream is always consumed completely, even
+        when synthesis fails or piper is unavailable; closing the generator
+        early (barge-in) stops both.
+
+        Args:
+            text: Text or async iterable of text chunks
+            language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
+        """
+        sentences: asyncio.Queue[str | None] = asyncio.Queue()
+        producer: asyncio.Task | None = None
+
+        if isinstance(text, str):
+            for sentence in split_sentences(text):
+                sentences.put_nowait(sentence)
+            sentences.put_nowait(None)
+        else:
+            async def produce():
+                splitter = SentenceSplitter()
+                try:
+                    async for chunk in text:
+                        for sentence in splitter.feed(chunk):
+                            sentences.put_nowait(sentence)
+                    for sentence in splitter.flush():
+                        sentences.put_nowait(sentence)
+                finally:
+                    sentences.put_nowait(None)
+
+            producer = asyncio.create_task(produce())
+
+        try:
+            if self.available:
+                async for audio in self._synthesize_sentences(self._get_worker(language), sentences):
+                    yield audio
+            else:
+                logger.warning("Piper nicht verfügbar, TTS übersprungen")
+            if producer:
+                await producer  # Finish the text stream, propagate its errors
         finally:
-            Path(tmp_path).unlink(missing_ok=True)
+            if producer and not producer.done():
+                producer.cancel()
+
+    async def _synthesize_sentences(self, worker: PiperWorker, sentences: asyncio.Queue) -> AsyncIterator[bytes]:
+        """
+        Synthesize queued sentences in order until the None terminator.
+
+        Keeps up to two sentences in flight so piper never idles between
+        sentences, without queueing so much that requests hit the timeout.
+        Stops on the first error.
+        """
+        in_flight: deque[asyncio.Task] = deque()
+        done = False
+        try:
+            while True:
+                while not done and len(in_flight) < 2:
+                    if in_flight:
+                        try:
+                            sentence = sentences.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break  # Don't wait for more text while audio is pending
+                    else:
+                        sentence = await sentences.get()
+                    if sentence is None:
+                        done = True
+                    else:
+                        in_flight.append(asyncio.ensure_future(worker.synthesize(sentence)))
+                if not in_flight:
+                    return
+                try:
+                    audio = await in_flight.popleft()
+                except Exception as e:
+                    logger.error(f"❌ TTS Fehler: {e}")
+                    return
+                if audio:
+                    yield audio
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def shutdown(self) -> None:
+        """Stop all piper worker processes."""
+        for worker in self._workers.values():
+            await worker.stop()
+        self._workers.clear()
 
 
 _piper_instance: PiperService | None = None
@@ -5,8 +5,10 @@ Handles document ingestion, embedding generation, similarity search,
 and context preparation for LLM queries.
 """
 import asyncio
+import hashlib
 import os
 from collections import defaultdict
+from collections.abc import Awaitable, Callable
 from datetime import UTC, datetime
 from typing import Any
 
@@ -22,6 +24,7 @@ from sqlalchemy.orm import selectinload
 from models.database import (
     DOC_STATUS_COMPLETED,
     DOC_STATUS_FAILED,
+    DOC_STATUS_PENDING,
     DOC_STATUS_PROCESSING,
     EMBEDDING_DIMENSION,
     Document,
@@ -29,10 +32,22 @@ from models.database import (
     KnowledgeBase,
 )
 from services.document_processor import DocumentProcessor
+from services.embedding_service import get_embedding_service
+from services.vector_search import cosine_distance, cosine_similarity, prepare_vector_query, to_pgvector
 from utils.config import settings
 from utils.llm_client import get_embed_client
 
 
+def chunk_content_hash(content: str) -> str:
+    """SHA-256 (hex) eines Chunk-Texts — Identität beim inkrementellen Re-Indexieren."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def current_embedding_model() -> tuple[str, str]:
+    """(model, version), mit der neue Embeddings erzeugt werden."""
+    return settings.ollama_embed_model, settings.embedding_model_version
+
+
 class RAGService:
     """
     RAG Service für Dokument-basierte Anfragen.
@@ -65,24 +80,25 @@ class RAGService:
     # Embedding Generation
     # ==========================================================================
 
-    async def get_embedding(self, text: str) -> list[float]:
+    async def get_embedding(self, text: str, cache: bool = True) -> list[float]:
         """
         Generiert Embedding für Text mit Ollama.
 
+        Gleichzeitige Aufrufe werden vom EmbeddingService zu Batches
+        zusammengefasst (ein /api/embed Request pro Batch).
+
         Args:
             text: Text für Embedding
+            cache: False für Dokument-Chunks (verdrängen sonst Chat-Embeddings)
 
         Returns:
             Liste von Floats (768 Dimensionen für nomic-embed-text)
         """
         try:
             client = await self._get_ollama_client()
-            response = await client.embeddings(
-                model=settings.ollama_embed_model,
-                prompt=text
+            return await get_embedding_service().embed(
+                text, model=settings.ollama_embed_model, client=client, cache=cache,
             )
-            # ollama>=0.4.0 uses Pydantic models with .embedding attribute
-            return response.embedding
         except Exception as e:
             logger.error(f"Fehler beim Generieren des Embeddings: {e}")
             raise
@@ -91,6 +107,29 @@ class RAGService:
     # Document Ingestion
     # ==========================================================================
 
+    async def create_document(
+        self,
+        file_path: str,
+        knowledge_base_id: int | None = None,
+        filename: str | None = None,
+        file_hash: str | None = None,
+        status: str = DOC_STATUS_PENDING,
+    ) -> Document:
+        """Legt den Document-Eintrag an (vor der Verarbeitung)."""
+        doc = Document(
+            file_path=file_path,
+            filename=filename or os.path.basename(file_path),
+            knowledge_base_id=knowledge_base_id,
+            file_hash=file_hash,
+            status=status
+        )
+        self.db.add(doc)
+        await self.db.commit()
+        await self.db.refresh(doc)
+
+        logger.info(f"Dokument erstellt: ID={doc.id}, Datei={doc.filename}")
+        return doc
+
     async def ingest_document(
         self,
         file_path: str,
@@ -117,25 +156,46 @@ class RAGService:
         Returns:
             Document-Objekt mit Status
         """
-        actual_filename = filename or os.path.basename(file_path)
-
-        # Document-Eintrag erstellen
-        doc = Document(
-            file_path=file_path,
-            filename=actual_filename,
-            knowledge_base_id=knowledge_base_id,
-            file_hash=file_hash,
-            status=DOC_STATUS_PROCESSING
+        doc = await self.create_document(
+            file_path, knowledge_base_id, filename, file_hash, status=DOC_STATUS_PROCESSING
         )
-        self.db.add(doc)
-        await self.db.commit()
-        await self.db.refresh(doc)
+        return await self.index_document(doc, user_id=user_id, force_ocr=force_ocr)
 
-        logger.info(f"Dokument erstellt: ID={doc.id}, Datei={actual_filename}")
+    async def index_document(
+        self,
+        doc: Document,
+        user_id: int | None = None,
+        force_ocr: bool = False,
+        convert: Callable[[str, bool], Awaitable[dict[str, Any]]] | None = None,
+        progress: Callable[[str, float], Awaitable[None]] | None = None,
+    ) -> Document:
+        """
+        Parst, chunked und embedded ein angelegtes Dokument.
+
+        Args:
+            doc: Document-Eintrag (create_document)
+            convert: Ersatz für processor.process_document(file_path, force_ocr),
+                z.B. Ausführung in einem Ingestion-Worker-Prozess
+            progress: Wird mit (stage, fraction) aufgerufen: converting,
+                embedding (Anteil eingebetteter Chunks), saving. Eine
+                Exception daraus bricht die Verarbeitung ab.
+
+        Returns:
+            Document-Objekt mit Status
+        """
+        if doc.status != DOC_STATUS_PROCESSING:
+            doc.status = DOC_STATUS_PROCESSING
+            doc.error_message = None
+            await self.db.commit()
 
         try:
             # 1. Dokument verarbeiten
-            result = await self.processor.process_document(file_path, force_ocr=force_ocr)
+            if progress:
+                await progress("converting", 0.0)
+            if convert is None:
+                result = await self.processor.process_document(doc.file_path, force_ocr=force_ocr)
+            else:
+                result = await convert(doc.file_path, force_ocr)
 
             if result["status"] == "failed":
                 doc.status = DOC_STATUS_FAILED
@@ -152,45 +212,70 @@ class RAGService:
             doc.file_size = metadata.get("file_size")
             doc.page_count = metadata.get("page_count")
 
-            # 3. Chunks mit Embeddings erstellen (parallel, batch insert)
-            chunks = result["chunks"]
-            sem = asyncio.Semaphore(5)
-
-            async def _embed_chunk(chunk_data):
-                text_content = chunk_data["text"]
-                if not text_content or not text_content.strip():
+            # 3. Mit gespeicherten Chunks abgleichen: unveränderte Texte (gleicher
+            #    Hash, aktuelles Embedding-Modell) behalten ihr Embedding, nur neue
+            #    oder geänderte Chunks werden embedded (batched via EmbeddingService)
+            chunks = [cd for cd in result["chunks"] if cd["text"] and cd["text"].strip()]
+            existing = await self._get_chunks(doc.id)
+            reusable = self._reusable_chunks(existing)
+            kept: list[DocumentChunk] = []
+            to_embed: list[tuple[str, dict]] = []
+            for chunk_data in chunks:
+                content_hash = chunk_content_hash(chunk_data["text"])
+                candidates = reusable.get(content_hash)
+                if candidates:
+                    chunk = candidates.pop()
+                    self._apply_chunk_data(chunk, chunk_data)
+                    kept.append(chunk)
+                else:
+                    to_embed.append((content_hash, chunk_data))
+
+            embed_model, embed_version = current_embedding_model()
+            embedded = 0
+            if progress:
+                await progress("embedding", 0.0)
+
+            async def _embed_chunk(content_hash: str, chunk_data: dict):
+                nonlocal embedded
+                try:
+                    embedding = await self.get_embedding(chunk_data["text"], cache=False)
+                except Exception as e:
+                    logger.warning(f"Embedding-Fehler für Chunk {chunk_data['chunk_index']}: {e}")
                     return None
-                async with sem:
-                    try:
-                        embedding = await self.get_embedding(text_content)
-                    except Exception as e:
-                        logger.warning(f"Embedding-Fehler für Chunk {chunk_data['chunk_index']}: {e}")
-                        return None
-                return DocumentChunk(
+                embedded += 1
+                if progress:
+                    await progress("embedding", embedded / len(to_embed))
+                chunk = DocumentChunk(
                     document_id=doc.id,
-                    content=text_content,
+                    content=chunk_data["text"],
                     embedding=embedding,
-                    chunk_index=chunk_data["chunk_index"],
-                    page_number=chunk_data["metadata"].get("page_number"),
-                    section_title=", ".join(chunk_data["metadata"].get("headings", [])) or None,
-                    chunk_type=chunk_data["metadata"].get("chunk_type", "paragraph"),
-                    chunk_metadata=chunk_data["metadata"]
+                    content_hash=content_hash,
+                    embedding_model=embed_model,
+                    embedding_version=embed_version,
                 )
+                self._apply_chunk_data(chunk, chunk_data)
+                return chunk
 
-            embed_results = await asyncio.gather(*[_embed_chunk(cd) for cd in chunks])
+            embed_results = await asyncio.gather(*[_embed_chunk(h, cd) for h, cd in to_embed])
             chunk_objects = [r for r in embed_results if r is not None]
 
-            chunk_count = len(chunk_objects)
+            # 4. Bulk-Delete veralteter + Bulk-Insert neuer Chunks in einer Transaktion
+            if progress:
+                await progress("saving", 0.0)
+            kept_ids = {chunk.id for chunk in kept}
+            stale_ids = [chunk.id for chunk in existing if chunk.id not in kept_ids]
+            if stale_ids:
+                await self.db.execute(delete(DocumentChunk).where(DocumentChunk.id.in_(stale_ids)))
             if chunk_objects:
                 self.db.add_all(chunk_objects)
 
+            chunk_count = len(kept) + len(chunk_objects)
             doc.chunk_count = chunk_count
             doc.status = DOC_STATUS_COMPLETED
             doc.processed_at = datetime.now(UTC).replace(tzinfo=None)
+            await self.db.flush()
 
-            await self.db.commit()
-
-            # Populate search_vector for Full-Text Search (bulk update)
+            # Populate search_vector for Full-Text Search (new chunks only)
             fts_config = settings.rag_hybrid_fts_config
             await self.db.execute(
                 text("""
@@ -211,6 +296,7 @@ class RAGService:
             # repetitive "field = value. field = value." text that confuses the
             # LLM and produces hallucinated entities. Entity-rich information
             # (names, addresses, organisations) is in text/paragraph chunks.
+            # Only new/changed chunks — unchanged ones were extracted before.
             _KG_SKIP_TYPES = {"table", "code", "formula"}
             kg_chunks = [
                 co.content for co in chunk_objects
@@ -227,7 +313,10 @@ class RAGService:
                 _background_tasks.add(_task)
                 _task.add_done_callback(_background_tasks.discard)
 
-            logger.info(f"Dokument indexiert: ID={doc.id}, Chunks={chunk_count}")
+            logger.info(
+                f"Dokument indexiert: ID={doc.id}, Chunks={chunk_count} "
+                f"(neu embedded: {len(chunk_objects)}, unverändert: {len(kept)}, entfernt: {len(stale_ids)})"
+            )
             return doc
 
         except Exception as e:
@@ -237,6 +326,38 @@ class RAGService:
             logger.error(f"Fehler beim Indexieren: {e}")
             raise
 
+    async def _get_chunks(self, document_id: int) -> list[DocumentChunk]:
+        """Gespeicherte Chunks eines Dokuments (leer bei Erst-Indexierung)."""
+        result = await self.db.execute(
+            select(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _reusable_chunks(existing: list[DocumentChunk]) -> dict[str, list[DocumentChunk]]:
+        """Chunks mit Embedding des aktuellen Modells, gruppiert nach content_hash."""
+        embed_model, embed_version = current_embedding_model()
+        reusable: dict[str, list[DocumentChunk]] = defaultdict(list)
+        for chunk in existing:
+            if (
+                chunk.embedding is None
+                or chunk.embedding_model != embed_model
+                or chunk.embedding_version != embed_version
+            ):
+                continue
+            reusable[chunk.content_hash or chunk_content_hash(chunk.content)].append(chunk)
+        return reusable
+
+    @staticmethod
+    def _apply_chunk_data(chunk: DocumentChunk, chunk_data: dict) -> None:
+        """Position und Metadaten aus dem DocumentProcessor-Chunk übernehmen."""
+        metadata = chunk_data["metadata"]
+        chunk.chunk_index = chunk_data["chunk_index"]
+        chunk.page_number = metadata.get("page_number")
+        chunk.section_title = ", ".join(metadata.get("headings", [])) or None
+        chunk.chunk_type = metadata.get("chunk_type", "paragraph")
+        chunk.chunk_metadata = metadata
+
     # ==========================================================================
     # Similarity Search
     # ==========================================================================
@@ -314,6 +435,10 @@ class RAGService:
         """
         Dense vector search using pgvector cosine distance.
 
+        Orders by the halfvec expression of idx_document_chunks_embedding_hnsw
+        so the HNSW index is used; the status/KB filters run as iterative
+        index scan instead of post-filtering the first ef_search candidates.
+
         Args:
             query_embedding: Pre-computed query embedding
             top_k: Number of results
@@ -323,9 +448,10 @@ class RAGService:
         Returns:
             List of {chunk, document, similarity}
         """
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
         kb_filter = "AND d.knowledge_base_id = :kb_id" if knowledge_base_id else ""
 
+        await prepare_vector_query(self.db, limit=top_k, filtered=True)
+
         sql = text(f"""
             SELECT
                 dc.id,
@@ -338,17 +464,27 @@ class RAGService:
                 dc.chunk_metadata,
                 d.filename,
                 d.title as doc_title,
-                1 - (dc.embedding <=> CAST(:embedding AS vector)) as similarity
+                {cosine_similarity("dc.embedding")} as similarity
             FROM document_chunks dc
             JOIN documents d ON dc.document_id = d.id
             WHERE d.status = 'completed'
             AND dc.embedding IS NOT NULL
+            AND dc.embedding_model = :embed_model
+            AND dc.embedding_version = :embed_version
             {kb_filter}
-            ORDER BY dc.embedding <=> CAST(:embedding AS vector)
+            ORDER BY {cosine_distance("dc.embedding")}
             LIMIT :limit
         """)
 
-        params = {"embedding": embedding_str, "limit": top_k}
+        # Chunks eines anderen Embedding-Modells sind nicht vergleichbar — sie
+        # bleiben bis zum Re-Embedding (ChunkReembedder) nur über BM25 auffindbar
+        embed_model, embed_version = current_embedding_model()
+        params = {
+            "embedding": to_pgvector(query_embedding),
+            "limit": top_k,
+            "embed_model": embed_model,
+            "embed_version": embed_version,
+        }
         if knowledge_base_id:
             params["kb_id"] = knowledge_base_id
 
@@ -917,23 +1053,16 @@ class RAGService:
 
     async def reindex_document(self, document_id: int) -> Document:
         """
-        Re-indexiert ein Dokument (löscht alte Chunks und erstellt neue).
+        Re-indexiert ein Dokument inkrementell.
+
+        Unveränderte Chunks behalten ihr Embedding, nur neue oder geänderte
+        Chunks werden embedded, entfallene gelöscht (siehe index_document).
         """
         doc = await self.get_document(document_id)
         if not doc:
             raise ValueError(f"Dokument {document_id} nicht gefunden")
 
-        # Alte Chunks löschen
-        stmt = delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
-        await self.db.execute(stmt)
-        await self.db.commit()
-
-        # Neu indexieren
-        return await self.ingest_document(
-            doc.file_path,
-            doc.knowledge_base_id,
-            doc.filename
-        )
+        return await self.index_document(doc)
 
     async def search_by_document(
         self,
@@ -945,9 +1074,10 @@ class RAGService:
         Sucht nur innerhalb eines bestimmten Dokuments.
         """
         query_embedding = await self.get_embedding(query)
-        embedding_str = f"[{','.join(map(str, query_embedding))}]"
 
-        sql = text("""
+        await prepare_vector_query(self.db, limit=top_k, filtered=True)
+
+        sql = text(f"""
             SELECT
                 dc.id,
                 dc.content,
@@ -955,20 +1085,24 @@ class RAGService:
                 dc.page_number,
                 dc.section_title,
                 dc.chunk_type,
-                1 - (dc.embedding <=> CAST(:embedding AS vector)) as similarity
+                {cosine_similarity("dc.embedding")} as similarity
             FROM document_chunks dc
             WHERE dc.document_id = :doc_id
             AND dc.embedding IS NOT NULL
-            ORDER BY dc.embedding <=> CAST(:embedding AS vector)
+            AND dc.embedding_model = :embed_model
+            AND dc.embedding_version = :embed_version
+            ORDER BY {cosine_distance("dc.embedding")}
             LIMIT :limit
         """)
 
         result = await self.db.execute(
             sql,
             {
-                "embedding": embedding_str,
+                "embedding": to_pgvector(query_embedding),
                 "doc_id": document_id,
-                "limit": top_k
+                "limit": top_k,
+                "embed_model": settings.ollama_embed_model,
+                "embed_version": settings.embedding_model_version,
             }
         )
         rows = result.fetchall()
@@ -10,6 +10,7 @@ Features:
 - First-speaker-wins for same-room conflicts
 - Audio buffer management for streaming
 - Message size limits and buffer protection
+- Binary audio frames with optional Opus (protocol 1.1, see audio_frames)
 """
 
 import asyncio
@@ -23,6 +24,18 @@ from typing import Any
 from fastapi import WebSocket
 from loguru import logger
 
+from services.audio_frames import (
+    CODEC_OPUS,
+    CODEC_WAV,
+    FRAME_TTS,
+    MIC_SAMPLE_RATE,
+    AudioFrame,
+    AudioTransport,
+    OpusStreamDecoder,
+    encode_frame,
+    encode_tts_opus,
+    negotiate_audio_transport,
+)
 from utils.config import settings
 
 
@@ -42,6 +55,9 @@ class SatelliteCapabilities:
     speaker: bool = True
     led_count: int = 3
     button: bool = True
+    tts_streaming: bool = False  # Plays consecutive tts_audio chunks in order
+    binary_audio: bool = False  # Understands binary audio frames (protocol 1.1)
+    audio_codecs: list[str] = field(default_factory=lambda: ["pcm"])
 
 
 @dataclass
@@ -50,6 +66,7 @@ class SatelliteMetrics:
     audio_rms: float | None = None
     audio_db: float | None = None
     is_speech: bool | None = None
+    audio_cpu_percent: dict[str, float] | None = None  # CPU per audio analysis stage
     cpu_percent: float | None = None
     memory_percent: float | None = None
     temperature: float | None = None
@@ -87,6 +104,7 @@ class SatelliteInfo:
     update_stage: str | None = None  # downloading, verifying, backing_up, etc.
     update_progress: int = 0  # 0-100
     update_error: str | None = None
+    audio_transport: AudioTransport | None = None  # None = JSON/base64 audio (protocol 1.0)
 
 
 @dataclass
@@ -101,6 +119,8 @@ class SatelliteSession:
     started_at: float = field(default_factory=time.time)
     transcription: str | None = None
     response_text: str | None = None
+    opus_decoder: OpusStreamDecoder | None = None  # Created on the first Opus microphone frame
+    tts_sequence: int = 0
 
     # Timeout settings
     max_duration_seconds: float = 30.0
@@ -170,7 +190,10 @@ class SatelliteManager:
                 local_wakeword=capabilities.get("local_wakeword", True),
                 speaker=capabilities.get("speaker", True),
                 led_count=capabilities.get("led_count", 3),
-                button=capabilities.get("button", True)
+                button=capabilities.get("button", True),
+                tts_streaming=capabilities.get("tts_streaming", False),
+                binary_audio=capabilities.get("binary_audio", False),
+                audio_codecs=capabilities.get("audio_codecs") or ["pcm"],
             )
 
             # Register satellite
@@ -180,11 +203,18 @@ class SatelliteManager:
                 websocket=websocket,
                 capabilities=caps,
                 language=language,
-                version=version
+                version=version,
+                audio_transport=negotiate_audio_transport(
+                    capabilities,
+                    binary_enabled=settings.ws_binary_audio_enabled,
+                    opus_enabled=settings.ws_opus_enabled,
+                ),
             )
+            transport = self.satellites[satellite_id].audio_transport
 
             logger.info(f"✅ Satellite registered: {satellite_id} in {room} (v{version})")
             logger.info(f"   Capabilities: wakeword={caps.local_wakeword}, speaker={caps.speaker}, leds={caps.led_count}")
+            logger.info(f"   Audio transport: {f'binary/{transport.codec}' if transport else 'json/base64'}")
 
             # Track event
             self._add_event(satellite_id, "connected", {
@@ -301,10 +331,41 @@ class SatelliteManager:
             logger.error(f"❌ Failed to decode audio chunk: {e}")
             return False, "Invalid base64 encoding"
 
+        return self._append_audio(session, audio_bytes, sequence)
+
+    def buffer_audio_frame(self, frame: AudioFrame) -> tuple[bool, str]:
+        """
+        Buffer a binary microphone audio frame (protocol 1.1).
+
+        Opus payloads are decoded to 16 kHz PCM with a per-session decoder.
+
+        Returns:
+            Tuple of (success: bool, error_message: str)
+        """
+        session = self.sessions.get(frame.session_id)
+        if session is None:
+            logger.warning(f"⚠️ Audio for unknown session: {frame.session_id}")
+            return False, "Unknown session"
+
+        audio_bytes = frame.payload
+        if frame.codec == CODEC_OPUS:
+            try:
+                if session.opus_decoder is None:
+                    session.opus_decoder = OpusStreamDecoder(MIC_SAMPLE_RATE)
+                audio_bytes = session.opus_decoder.decode(frame.payload)
+            except Exception as e:
+                logger.error(f"❌ Failed to decode Opus audio: {e}")
+                return False, "Invalid Opus audio"
+        elif frame.codec == CODEC_WAV:
+            return False, "WAV is not supported for microphone audio"
+
+        return self._append_audio(session, audio_bytes, frame.sequence)
+
+    def _append_audio(self, session: SatelliteSession, audio_bytes: bytes, sequence: int) -> tuple[bool, str]:
         # Check buffer size limit
         current_size = sum(len(c) for c in session.audio_chunks)
         if current_size + len(audio_bytes) > settings.ws_max_audio_buffer_size:
-            logger.warning(f"⚠️ Audio buffer full for session {session_id}: {current_size} bytes")
+            logger.warning(f"⚠️ Audio buffer full for session {session.session_id}: {current_size} bytes")
             return False, f"Audio buffer full (max: {settings.ws_max_audio_buffer_size} bytes)"
 
         # Buffer chunk
@@ -383,6 +444,37 @@ class SatelliteManager:
             except Exception as e:
                 logger.error(f"❌ Failed to send transcription: {e}")
 
+    async def send_partial_transcription(
+        self,
+        session_id: str,
+        text: str,
+        stable_text: str = ""
+    ):
+        """
+        Send an interim transcript while the user is still speaking.
+
+        Args:
+            session_id: Target session
+            text: Current best transcript (may still change)
+            stable_text: Prefix of text that will not change anymore
+        """
+        if session_id not in self.sessions:
+            return
+
+        session = self.sessions[session_id]
+
+        if session.satellite_id in self.satellites:
+            sat = self.satellites[session.satellite_id]
+            try:
+                await sat.websocket.send_json({
+                    "type": "partial_transcription",
+                    "session_id": session_id,
+                    "text": text,
+                    "stable_text": stable_text
+                })
+            except Exception as e:
+                logger.error(f"❌ Failed to send partial transcription: {e}")
+
     async def send_action_result(
         self,
         session_id: str,
@@ -434,21 +526,47 @@ class SatelliteManager:
                 await self.set_session_state(session_id, SatelliteState.SPEAKING)
 
             try:
-                # Encode audio as base64
-                audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-
-                await sat.websocket.send_json({
-                    "type": "tts_audio",
-                    "session_id": session_id,
-                    "audio": audio_b64,
-                    "is_final": is_final
-                })
+                if sat.audio_transport:
+                    await self._send_tts_frame(sat, session, audio_bytes, is_final)
+                else:
+                    # Encode audio as base64
+                    audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
+
+                    await sat.websocket.send_json({
+                        "type": "tts_audio",
+                        "session_id": session_id,
+                        "audio": audio_b64,
+                        "is_final": is_final
+                    })
 
                 logger.info(f"🔊 Sent TTS audio to {sat.satellite_id} ({len(audio_bytes)} bytes)")
 
             except Exception as e:
                 logger.error(f"❌ Failed to send TTS audio: {e}")
 
+    async def _send_tts_frame(
+        self,
+        sat: SatelliteInfo,
+        session: SatelliteSession,
+        audio_bytes: bytes,
+        is_final: bool
+    ):
+        """Send TTS audio as a binary frame, Opus-encoded if negotiated."""
+        codec, payload = CODEC_WAV, audio_bytes
+        if sat.audio_transport.tts_codec == "opus" and audio_bytes:
+            codec = CODEC_OPUS
+            payload = await asyncio.to_thread(encode_tts_opus, audio_bytes)
+
+        session.tts_sequence += 1
+        await sat.websocket.send_bytes(encode_frame(AudioFrame(
+            frame_type=FRAME_TTS,
+            codec=codec,
+            session_id=session.session_id,
+            sequence=session.tts_sequence,
+            payload=payload,
+            is_final=is_final,
+        )))
+
     async def end_session(self, session_id: str, reason: str = "completed"):
         """
         End an active session.
@@ -524,6 +642,7 @@ class SatelliteManager:
                     "audio_rms": metrics.get("audio_rms"),
                     "audio_db": metrics.get("audio_db"),
                     "is_speech": metrics.get("is_speech"),
+                    "audio_cpu_percent": metrics.get("audio_cpu_percent"),
                     "cpu_percent": metrics.get("cpu_percent"),
                     "memory_percent": metrics.get("memory_percent"),
                     "temperature": metrics.get("temperature"),
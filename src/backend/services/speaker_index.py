@@ -0,0 +1,220 @@
+"""
+Speaker Index — Process-wide in-memory speaker centroid matrix.
+
+Speaker identification used to load every speaker with all embeddings from
+the database on each voice request, decode them and average them in Python.
+SpeakerIndex loads the embeddings once and keeps one L2-normalized centroid
+per speaker (mean of the most recent MAX_EMBEDDINGS_PER_SPEAKER samples) as
+rows of a contiguous float32 matrix. Identification is a single
+matrix-vector product.
+
+The index is updated incrementally:
+- add_embedding()    — enrollment, auto-enrollment, continuous learning
+- update_speaker()   — rename / new alias
+- remove_speaker()   — speaker deleted
+- invalidate()       — bulk changes (merge, embedding deleted): reload on next use
+"""
+import asyncio
+from collections import deque
+
+import numpy as np
+from loguru import logger
+
+# Centroid = mean of the most recent samples per speaker
+MAX_EMBEDDINGS_PER_SPEAKER = 10
+
+
+class SpeakerIndex:
+    """In-memory centroid index over all enrolled speakers."""
+
+    def __init__(self, max_embeddings_per_speaker: int = MAX_EMBEDDINGS_PER_SPEAKER):
+        self.max_embeddings_per_speaker = max_embeddings_per_speaker
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self._clear()
+
+    def _clear(self) -> None:
+        self._ids: list[int] = []
+        self._rows: dict[int, int] = {}
+        self._meta: dict[int, tuple[str, str | None]] = {}
+        self._samples: dict[int, deque] = {}
+        self._matrix: np.ndarray | None = None
+        self.dim: int | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    async def ensure_loaded(self, db_session) -> None:
+        """Load all speaker embeddings from the database (once)."""
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+
+            from sqlalchemy import select
+
+            from models.database import Speaker, SpeakerEmbedding
+
+            result = await db_session.execute(
+                select(
+                    SpeakerEmbedding.speaker_id,
+                    Speaker.name,
+                    Speaker.alias,
+                    SpeakerEmbedding.embedding,
+                )
+                .join(Speaker, Speaker.id == SpeakerEmbedding.speaker_id)
+                .order_by(SpeakerEmbedding.speaker_id, SpeakerEmbedding.created_at, SpeakerEmbedding.id)
+            )
+            self.load(result.all())
+
+    def load(self, rows) -> None:
+        """
+        Rebuild the index from (speaker_id, name, alias, embedding_bytes) rows.
+
+        Rows must be ordered oldest first per speaker; only the most recent
+        samples are kept.
+        """
+        self._clear()
+        for speaker_id, name, alias, data in rows:
+            embedding = np.frombuffer(data, dtype=np.float32)
+            if not self._accepts(embedding, speaker_id):
+                continue
+            if speaker_id not in self._samples:
+                self._samples[speaker_id] = deque(maxlen=self.max_embeddings_per_speaker)
+                self._meta[speaker_id] = (name, alias)
+            self._samples[speaker_id].append(embedding)
+
+        self._ids = list(self._samples)
+        self._rows = {speaker_id: row for row, speaker_id in enumerate(self._ids)}
+        if self._ids:
+            self._matrix = np.vstack([self._centroid(speaker_id) for speaker_id in self._ids])
+        self._loaded = True
+        logger.info(f"🎤 Speaker index loaded: {len(self._ids)} speakers")
+
+    def invalidate(self) -> None:
+        """Drop the index; it is reloaded from the database on next use."""
+        self._loaded = False
+        self._clear()
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def _accepts(self, embedding: np.ndarray, speaker_id: int) -> bool:
+        if self.dim is None:
+            self.dim = embedding.shape[0]
+        if embedding.shape[0] != self.dim:
+            logger.warning(
+                f"Skipping speaker {speaker_id} embedding with {embedding.shape[0]} dims (index: {self.dim})"
+            )
+            return False
+        return True
+
+    def _centroid(self, speaker_id: int) -> np.ndarray:
+        centroid = np.mean(self._samples[speaker_id], axis=0)
+        norm = np.linalg.norm(centroid)
+        return (centroid / norm if norm > 0 else centroid).astype(np.float32)
+
+    def add_embedding(self, speaker_id: int, name: str | None, alias: str | None, embedding: np.ndarray) -> None:
+        """
+        Add a new sample for a speaker and update its centroid row.
+
+        *name*/*alias* of None keep the indexed values of a known speaker.
+        """
+        if not self._loaded:
+            return  # Picked up by the next full load
+        if name is None and speaker_id not in self._meta:
+            self.invalidate()  # Unknown speaker without metadata: reload from the database
+            return
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
+        if not self._accepts(embedding, speaker_id):
+            return
+
+        if name is not None:
+            self._meta[speaker_id] = (name, alias)
+        row = self._rows.get(speaker_id)
+        if row is None:
+            self._samples[speaker_id] = deque([embedding], maxlen=self.max_embeddings_per_speaker)
+            centroid = self._centroid(speaker_id)[np.newaxis, :]
+            self._matrix = centroid if self._matrix is None else np.vstack([self._matrix, centroid])
+            self._rows[speaker_id] = len(self._ids)
+            self._ids.append(speaker_id)
+        else:
+            self._samples[speaker_id].append(embedding)
+            self._matrix[row] = self._centroid(speaker_id)
+
+    def update_speaker(self, speaker_id: int, name: str, alias: str | None) -> None:
+        """Update name/alias of an indexed speaker."""
+        if speaker_id in self._meta:
+            self._meta[speaker_id] = (name, alias)
+
+    def remove_speaker(self, speaker_id: int) -> None:
+        """Remove a speaker and its centroid row."""
+        row = self._rows.pop(speaker_id, None)
+        if row is None:
+            return
+        self._samples.pop(speaker_id, None)
+        self._meta.pop(speaker_id, None)
+        self._ids.pop(row)
+        self._matrix = np.delete(self._matrix, row, axis=0) if self._ids else None
+        self._rows = {sid: i for i, sid in enumerate(self._ids)}
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def identify(self, query_embedding: np.ndarray, threshold: float) -> tuple[int, str, str | None, float] | None:
+        """
+        Find the closest speaker centroid.
+
+        Returns:
+            (speaker_id, speaker_name, speaker_alias, confidence) or None if
+            no speaker reaches *threshold*
+        """
+        if self._matrix is None:
+            return None
+
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape[0] != self.dim:
+            return None
+
+        scores = self._matrix @ (query / norm)
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        speaker_id = self._ids[best]
+        name, alias = self._meta[speaker_id]
+
+        logger.debug(f"Best match: {name} with score {score:.3f}")
+        if score < threshold:
+            logger.debug(f"No match above threshold {threshold}")
+            return None
+        return speaker_id, name, alias, score
+
+    def known_speakers(self) -> list[tuple[int, str, np.ndarray]]:
+        """(speaker_id, speaker_name, centroid) for SpeakerService.identify_speaker()."""
+        return [
+            (speaker_id, self._meta[speaker_id][0], self._matrix[row])
+            for speaker_id, row in self._rows.items()
+        ]
+
+
+# Global instance
+_speaker_index: SpeakerIndex | None = None
+
+
+def get_speaker_index() -> SpeakerIndex:
+    """Get or create the global speaker index instance."""
+    global _speaker_index
+    if _speaker_index is None:
+        _speaker_index = SpeakerIndex()
+    return _speaker_index
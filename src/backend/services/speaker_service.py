@@ -227,17 +227,21 @@ class SpeakerService:
         if not known_speakers:
             return None
 
-        best_match_id = None
-        best_match_name = None
-        best_score = -1.0
-
-        for speaker_id, speaker_name, known_embedding in known_speakers:
-            score = self.compute_similarity(query_embedding, known_embedding)
+        # One matrix-vector product instead of a Python loop over speakers
+        matrix = np.vstack([np.asarray(emb, dtype=np.float32).ravel() for _, _, emb in known_speakers])
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        query_norm = np.linalg.norm(query)
+        row_norms = np.linalg.norm(matrix, axis=1)
+
+        if query_norm == 0:
+            scores = np.zeros(len(known_speakers), dtype=np.float32)
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores = np.where(row_norms > 0, (matrix @ query) / (row_norms * query_norm), 0.0)
 
-            if score > best_score:
-                best_score = score
-                best_match_id = speaker_id
-                best_match_name = speaker_name
+        best = int(np.argmax(scores))
+        best_match_id, best_match_name, _ = known_speakers[best]
+        best_score = float(scores[best])
 
         logger.debug(f"Best match: {best_match_name} with score {best_score:.3f}")
 
@@ -277,6 +281,16 @@ class SpeakerService:
         is_verified = avg_score >= self.similarity_threshold
         return (is_verified, avg_score)
 
+    @staticmethod
+    def embedding_to_bytes(embedding: np.ndarray) -> bytes:
+        """Serialize embedding to raw float32 bytes for database storage"""
+        return np.asarray(embedding, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def embedding_from_bytes(data: bytes) -> np.ndarray:
+        """Deserialize embedding from raw float32 bytes"""
+        return np.frombuffer(data, dtype=np.float32)
+
     @staticmethod
     def embedding_to_base64(embedding: np.ndarray) -> str:
         """Serialize embedding to base64 string for database storage"""
@@ -0,0 +1,218 @@
+"""
+Streaming STT — incremental Whisper transcription while the user is speaking.
+
+Satellites stream 16 kHz PCM in small chunks. Instead of waiting for
+``audio_end`` and decoding the whole utterance, StreamingTranscriber decodes
+the not-yet-committed audio every STT_STREAMING_INTERVAL seconds and applies
+local agreement on Whisper's segments:
+
+- A segment that appears with the same text (and roughly the same end time)
+  in two consecutive decodes, and ends at least STT_STREAMING_COMMIT_MARGIN
+  seconds before the end of the buffer, is committed.
+- Committed audio is never decoded again; its text is passed to Whisper as
+  prompt so the next window keeps the context.
+
+At ``audio_end`` only the uncommitted tail (usually the last 1-2 seconds)
+has to be decoded, so the final transcript arrives within a few hundred ms
+regardless of utterance length. Partial decodes use greedy decoding; the
+final tail uses the same beam search as WhisperService.transcribe_file().
+
+Decodes run on the STT worker pool (services/stt_executor.py): partials
+with PARTIAL priority, the final tail with VOICE priority.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import numpy as np
+from loguru import logger
+
+from services.stt_executor import STTPriority, get_stt_executor
+from utils.config import settings
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # 16-bit PCM
+
+# Whisper decodes 30 s windows; commit early enough that the tail always fits
+MAX_UNCOMMITTED_SECONDS = 25.0
+
+# Tolerance for "same segment" across consecutive decodes
+SEGMENT_END_TOLERANCE = 0.5
+
+# Prompt context passed to Whisper (characters of committed text)
+MAX_PROMPT_CHARS = 200
+
+PartialCallback = Callable[[str, str], Awaitable[None]]
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcriber for one satellite session.
+
+    Usage:
+        transcriber = StreamingTranscriber(whisper, language="de")
+        # for every audio chunk:
+        if transcriber.feed(pcm_bytes):
+            transcriber.start_partial(send_partial)
+        # on audio_end:
+        text = await transcriber.finalize()
+    """
+
+    def __init__(
+        self,
+        whisper_service,
+        language: str | None = None,
+        interval: float | None = None,
+        min_audio: float | None = None,
+        commit_margin: float | None = None,
+    ):
+        self.whisper = whisper_service
+        self.language = language
+        self.interval = interval if interval is not None else settings.stt_streaming_interval
+        self.min_audio = min_audio if min_audio is not None else settings.stt_streaming_min_audio
+        self.commit_margin = commit_margin if commit_margin is not None else settings.stt_streaming_commit_margin
+
+        self._pcm = bytearray()
+        self._commit_sample = 0            # Audio before this sample is committed
+        self._committed: list[str] = []     # Committed segment texts
+        self._pending: list[dict] = []      # Uncommitted segments of the last decode (absolute times)
+        self._last_decode_sample = 0
+        self._decode_task: asyncio.Task | None = None
+        self.partial_text = ""
+        self.decode_count = 0
+
+    # ------------------------------------------------------------------
+    # Audio input
+    # ------------------------------------------------------------------
+
+    @property
+    def total_samples(self) -> int:
+        return len(self._pcm) // BYTES_PER_SAMPLE
+
+    @property
+    def committed_text(self) -> str:
+        return " ".join(self._committed)
+
+    def feed(self, pcm: bytes) -> bool:
+        """
+        Append 16-bit PCM audio.
+
+        Returns:
+            True if a partial decode is due (enough new audio, no decode running)
+        """
+        self._pcm.extend(pcm)
+        if self._decode_task is not None and not self._decode_task.done():
+            return False
+        samples = self.total_samples
+        if samples < self.min_audio * SAMPLE_RATE:
+            return False
+        return samples - self._last_decode_sample >= self.interval * SAMPLE_RATE
+
+    def start_partial(self, on_partial: PartialCallback | None = None) -> None:
+        """Decode the uncommitted audio in the background and report the partial transcript."""
+        self._last_decode_sample = self.total_samples
+        self._decode_task = asyncio.create_task(self._run_partial(on_partial))
+
+    # ------------------------------------------------------------------
+    # Decoding
+    # ------------------------------------------------------------------
+
+    def _window(self, end_sample: int) -> np.ndarray:
+        """Uncommitted audio up to *end_sample* as float32 [-1, 1]."""
+        start = self._commit_sample * BYTES_PER_SAMPLE
+        end = end_sample * BYTES_PER_SAMPLE
+        return np.frombuffer(bytes(self._pcm[start:end]), dtype=np.int16).astype(np.float32) / 32768.0
+
+    def _prompt(self) -> str | None:
+        text = self.committed_text
+        return text[-MAX_PROMPT_CHARS:] if text else None
+
+    async def _decode(self, end_sample: int, fast: bool) -> list[dict]:
+        """Run Whisper on the uncommitted window; segment times become absolute seconds."""
+        offset = self._commit_sample / SAMPLE_RATE
+        segments = await get_stt_executor().run(
+            self.whisper.transcribe_segments,
+            self._window(end_sample),
+            language=self.language,
+            prompt=self._prompt(),
+            fast=fast,
+            preprocess=not fast,
+            priority=STTPriority.PARTIAL if fast else STTPriority.VOICE,
+        )
+        self.decode_count += 1
+        return [
+            {"start": seg["start"] + offset, "end": seg["end"] + offset, "text": seg["text"]}
+            for seg in segments
+        ]
+
+    async def _run_partial(self, on_partial: PartialCallback | None) -> None:
+        end_sample = self.total_samples
+        try:
+            segments = await self._decode(end_sample, fast=True)
+        except Exception as e:
+            logger.warning(f"⚠️ Streaming STT partial decode failed: {e}")
+            return
+
+        self._commit(segments, end_sample / SAMPLE_RATE)
+        self.partial_text = " ".join([*self._committed, *(seg["text"] for seg in self._pending)])
+
+        if on_partial and self.partial_text:
+            try:
+                await on_partial(self.partial_text, self.committed_text)
+            except Exception as e:
+                logger.debug(f"Partial transcript callback failed: {e}")
+
+    def _commit(self, segments: list[dict], buffer_end: float) -> None:
+        """Commit the prefix of *segments* that agrees with the previous decode."""
+        previous = self._pending
+        committed = 0
+        for i, seg in enumerate(segments):
+            if seg["end"] > buffer_end - self.commit_margin:
+                break
+            if i >= len(previous):
+                break
+            prev = previous[i]
+            if prev["text"] != seg["text"] or abs(prev["end"] - seg["end"]) > SEGMENT_END_TOLERANCE:
+                break
+            committed += 1
+
+        # Whisper cannot look past 30 s: force-commit all but the last segment
+        uncommitted = buffer_end - self._commit_sample / SAMPLE_RATE
+        if committed == 0 and uncommitted > MAX_UNCOMMITTED_SECONDS and len(segments) > 1:
+            committed = len(segments) - 1
+
+        if committed:
+            for seg in segments[:committed]:
+                self._committed.append(seg["text"])
+            self._commit_sample = min(int(segments[committed - 1]["end"] * SAMPLE_RATE), self.total_samples)
+
+        self._pending = segments[committed:]
+
+    async def finalize(self) -> str:
+        """
+        Finish the utterance: wait for a running partial decode, then decode
+        only the uncommitted tail with full beam search.
+
+        Returns:
+            Complete transcript
+        """
+        if self._decode_task is not None and not self._decode_task.done():
+            await asyncio.gather(self._decode_task, return_exceptions=True)
+
+        end_sample = self.total_samples
+        tail = ""
+        # Skip tails too short to contain speech (< 100 ms)
+        if end_sample - self._commit_sample >= SAMPLE_RATE // 10:
+            segments = await self._decode(end_sample, fast=False)
+            tail = " ".join(seg["text"] for seg in segments)
+
+        text = " ".join(t for t in (self.committed_text, tail) if t).strip()
+        logger.info(
+            f"✅ Streaming STT final: {len(text)} Zeichen, {self.decode_count} Decodes, "
+            f"{(end_sample - self._commit_sample) / SAMPLE_RATE:.1f}s Tail"
+        )
+        return text
+
+    def cancel(self) -> None:
+        """Drop a pending partial decode (session ended without audio_end)."""
+        if self._decode_task is not None and not self._decode_task.done():
+            self._decode_task.cancel()
@@ -0,0 +1,204 @@
+"""
+STT Executor — Bounded, prioritized worker pool for Whisper inference.
+
+Whisper decoding is CPU-bound and takes from a few hundred milliseconds to
+several seconds. Running it on the event loop freezes every websocket,
+heartbeat and Home Assistant call for that time, so all Whisper work goes
+through this executor instead:
+
+- Dedicated worker threads (STT_WORKERS). Each worker beyond the first loads
+  its own Whisper model copy, because a model instance must not decode two
+  inputs at once (decoding installs per-call kv-cache hooks on the model).
+- Priority queue: satellite/device voice ahead of streaming partials ahead
+  of REST uploads. Jobs with the same priority run in submission order.
+- Backpressure: when STT_QUEUE_MAX jobs are already waiting, submit()
+  raises STTQueueFullError instead of letting latency grow without bound.
+- Queue depth, queue wait and inference time via utils.metrics.
+
+Cancelling the awaiting coroutine drops a job that has not started yet.
+
+Configuration:
+    STT_WORKERS   — Parallel Whisper jobs (default: 1)
+    STT_QUEUE_MAX — Max waiting jobs, 0 = unbounded (default: 16)
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any
+
+from loguru import logger
+
+from utils.config import settings
+from utils.metrics import record_stt_job, record_stt_queue_depth, record_stt_rejected
+
+
+class STTPriority(IntEnum):
+    """Job priority (lower runs first)."""
+    VOICE = 0    # Final transcript of a satellite/device utterance
+    PARTIAL = 1  # Streaming partial hypotheses
+    UPLOAD = 2   # REST uploads (/api/voice/stt, voice-chat)
+
+
+class STTQueueFullError(Exception):
+    """Raised when the STT queue is full and a job is rejected."""
+    pass
+
+
+_worker_local = threading.local()
+
+
+def current_worker_index() -> int | None:
+    """Index of the STT worker running the current thread, None outside the pool."""
+    return getattr(_worker_local, "index", None)
+
+
+class STTExecutor:
+    """
+    Prioritized thread pool for blocking STT calls.
+
+    Usage:
+        text = await get_stt_executor().run(model_call, path, priority=STTPriority.VOICE)
+    """
+
+    def __init__(self, workers: int | None = None, max_queue: int | None = None):
+        self.workers = workers if workers is not None else settings.stt_workers
+        self.max_queue = max_queue if max_queue is not None else settings.stt_queue_max
+
+        self._heap: list[tuple] = []
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._threads: list[threading.Thread] = []
+        self._shutdown = False
+
+        # Stats
+        self.completed = 0
+        self.rejected = 0
+
+    def _ensure_started(self) -> None:
+        """Start the worker threads on first use (called with the lock held)."""
+        if self._threads:
+            return
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, args=(index,), name=f"stt-worker-{index}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"🎙️ STT Executor gestartet ({self.workers} Worker, Queue max {self.max_queue or '∞'})")
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._heap)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: STTPriority = STTPriority.UPLOAD,
+        **kwargs: Any,
+    ) -> Future:
+        """
+        Queue a blocking call.
+
+        Raises:
+            STTQueueFullError: If STT_QUEUE_MAX jobs are already waiting
+        """
+        priority = STTPriority(priority)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("STT executor is shut down")
+            if self.max_queue and len(self._heap) >= self.max_queue:
+                self.rejected += 1
+                record_stt_rejected(priority.name.lower())
+                raise STTQueueFullError(
+                    f"STT queue full ({len(self._heap)} jobs waiting)"
+                )
+            self._ensure_started()
+            future: Future = Future()
+            heapq.heappush(
+                self._heap,
+                (int(priority), next(self._seq), time.monotonic(), future, fn, args, kwargs),
+            )
+            depth = len(self._heap)
+            self._cond.notify()
+        record_stt_queue_depth(depth)
+        return future
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        priority: STTPriority = STTPriority.UPLOAD,
+        **kwargs: Any,
+    ) -> Any:
+        """Run a blocking call on an STT worker and await its result."""
+        future = self.submit(fn, *args, priority=priority, **kwargs)
+        return await asyncio.wrap_future(future)
+
+    def _worker(self, index: int) -> None:
+        _worker_local.index = index
+        while True:
+            with self._cond:
+                while not self._heap and not self._shutdown:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                priority, _, enqueued_at, future, fn, args, kwargs = heapq.heappop(self._heap)
+                depth = len(self._heap)
+            record_stt_queue_depth(depth)
+
+            # Skip jobs whose caller was cancelled while waiting
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            started_at = time.monotonic()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+            self.completed += 1
+            record_stt_job(
+                STTPriority(priority).name.lower(),
+                wait=started_at - enqueued_at,
+                duration=time.monotonic() - started_at,
+            )
+
+    def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Cancel waiting jobs and stop the workers after their current job."""
+        with self._cond:
+            self._shutdown = True
+            pending, self._heap = self._heap, []
+            self._cond.notify_all()
+        for item in pending:
+            item[3].cancel()
+        if pending:
+            logger.info(f"🛑 STT Executor: {len(pending)} wartende Jobs abgebrochen")
+
+
+# Global instance
+_stt_executor: STTExecutor | None = None
+
+
+def get_stt_executor() -> STTExecutor:
+    """Get or create the global STT executor instance."""
+    global _stt_executor
+    if _stt_executor is None:
+        _stt_executor = STTExecutor()
+    return _stt_executor
@@ -16,8 +16,8 @@ class TaskQueue:
         self.redis_client = aioredis.from_url(settings.redis_url, decode_responses=True)
         self.queue_name = "renfield:tasks"
 
-    async def enqueue(self, task_type: str, parameters: dict) -> str:
-        """Task in Queue einreihen"""
+    async def enqueue(self, task_type: str, parameters: dict, queue_name: str | None = None) -> str:
+        """Task in Queue einreihen (queue_name: andere Liste als renfield:tasks)"""
         try:
             task_id = f"task:{task_type}:{await self.redis_client.incr('task:counter')}"
 
@@ -29,7 +29,7 @@ class TaskQueue:
             }
 
             # In Redis speichern
-            await self.redis_client.lpush(self.queue_name, json.dumps(task_data))
+            await self.redis_client.lpush(queue_name or self.queue_name, json.dumps(task_data))
             await self.redis_client.set(task_id, json.dumps(task_data))
 
             logger.info(f"Task {task_id} eingefuegt")
@@ -0,0 +1,149 @@
+"""
+Vector Search — shared pgvector query building for all embedding lookups.
+
+All embedding columns are indexed with HNSW on the expression
+``(embedding::halfvec(N)) halfvec_cosine_ops`` because plain ``vector`` HNSW
+indexes are limited to 2000 dimensions. PostgreSQL only uses an expression
+index when the query repeats that exact expression, so a hand-written
+``embedding <=> CAST(:embedding AS vector)`` always ends in a sequential scan.
+Services therefore build their distance/similarity expressions here.
+
+Per-query HNSW tuning (pgvector >= 0.8):
+- hnsw.ef_search: size of the candidate list (recall vs. latency knob)
+- hnsw.iterative_scan: filtered queries (KB, user, feedback type, ...) keep
+  walking the index until LIMIT rows pass the filter, instead of
+  post-filtering the first ef_search candidates and returning too few rows
+
+Usage:
+    await prepare_vector_query(db, limit=top_k, filtered=True)
+    sql = text(f'''
+        SELECT id, {cosine_similarity("dc.embedding")} AS similarity
+        FROM document_chunks dc
+        WHERE ...
+        ORDER BY {cosine_distance("dc.embedding")}
+        LIMIT :limit
+    ''')
+    await db.execute(sql, {"embedding": to_pgvector(query_embedding), ...})
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.database import EMBEDDING_DIMENSION
+from utils.config import settings
+
+# Bind parameter name used by cosine_distance()/cosine_similarity()
+EMBEDDING_PARAM = "embedding"
+
+# Valid values for hnsw.iterative_scan
+ITERATIVE_SCAN_MODES = ("off", "strict_order", "relaxed_order")
+
+_HALFVEC_TYPE = f"halfvec({EMBEDDING_DIMENSION})"
+
+
+def to_pgvector(embedding: list[float]) -> str:
+    """Serialize an embedding as pgvector text literal ('[0.1,0.2,...]')."""
+    return f"[{','.join(map(str, embedding))}]"
+
+
+def cosine_distance(column: str = "embedding") -> str:
+    """
+    Cosine distance expression matching the halfvec HNSW expression indexes.
+
+    Use this (and only this) in ORDER BY so the planner can pick the index.
+
+    Args:
+        column: Embedding column, optionally table-qualified (e.g. "dc.embedding")
+    """
+    return f"({column}::{_HALFVEC_TYPE} <=> CAST(:{EMBEDDING_PARAM} AS {_HALFVEC_TYPE}))"
+
+
+def cosine_similarity(column: str = "embedding") -> str:
+    """Cosine similarity (1 - distance) for the SELECT list."""
+    return f"(1 - {cosine_distance(column)})"
+
+
+def _is_postgres(db: AsyncSession) -> bool:
+    """True if the session is bound to PostgreSQL (HNSW settings exist only there)."""
+    bind = getattr(db, "bind", None)
+    dialect = getattr(bind, "dialect", None)
+    return getattr(dialect, "name", None) == "postgresql"
+
+
+async def embedding_dimension_mismatches(db: AsyncSession) -> list[str]:
+    """
+    Embedding columns and HNSW indexes whose dimension differs from EMBEDDING_DIMENSION.
+
+    Queries cast to halfvec(EMBEDDING_DIMENSION): against a column of another
+    dimension they fail, against an index of another dimension they fall
+    back to a sequential scan. Empty list on non-PostgreSQL sessions.
+    """
+    if not _is_postgres(db):
+        return []
+
+    columns = await db.execute(text("""
+        SELECT c.relname, a.atttypmod
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attname = 'embedding' AND t.typname = 'vector'
+          AND c.relkind = 'r' AND NOT a.attisdropped AND pg_table_is_visible(c.oid)
+    """))
+    problems = [
+        f"{table}.embedding is vector({dimension})"
+        for table, dimension in columns.all()
+        if dimension > 0 and dimension != EMBEDDING_DIMENSION
+    ]
+
+    indexes = await db.execute(text("""
+        SELECT indexname, indexdef FROM pg_indexes
+        WHERE indexname LIKE '%embedding_hnsw' AND indexdef LIKE '%halfvec%'
+    """))
+    problems += [
+        f"{name} is not on {_HALFVEC_TYPE}"
+        for name, indexdef in indexes.all()
+        if _HALFVEC_TYPE not in indexdef
+    ]
+    return problems
+
+
+async def prepare_vector_query(
+    db: AsyncSession,
+    limit: int,
+    filtered: bool = False,
+    ef_search: int | None = None,
+) -> None:
+    """
+    Apply HNSW settings for the next nearest-neighbour query.
+
+    Settings are transaction-local (set_config(..., true)), so they never leak
+    into other requests sharing the pooled connection. No-op on non-PostgreSQL
+    sessions (SQLite in tests).
+
+    Args:
+        db: Session that will run the vector query
+        limit: LIMIT of the query — ef_search is raised to at least this value,
+            otherwise HNSW cannot return enough rows
+        filtered: Query has WHERE filters besides "embedding IS NOT NULL";
+            enables iterative index scans (VECTOR_SEARCH_ITERATIVE_SCAN)
+        ef_search: Override for VECTOR_SEARCH_EF_SEARCH (higher = better recall, slower)
+    """
+    if not _is_postgres(db):
+        return
+
+    ef = max(ef_search or settings.vector_search_ef_search, limit)
+    mode = settings.vector_search_iterative_scan if filtered else "off"
+    if mode not in ITERATIVE_SCAN_MODES:
+        mode = "off"
+
+    await db.execute(
+        text("""
+            SELECT set_config('hnsw.ef_search', :ef_search, true),
+                   set_config('hnsw.iterative_scan', :iterative_scan, true),
+                   set_config('hnsw.max_scan_tuples', :max_scan_tuples, true)
+        """),
+        {
+            "ef_search": str(ef),
+            "iterative_scan": mode,
+            "max_scan_tuples": str(settings.vector_search_max_scan_tuples),
+        },
+    )
@@ -4,9 +4,13 @@ Whisper Service - Speech to Text
 Includes optional audio preprocessing for better transcription quality:
 - Noise reduction (removes background noise like fans, AC)
 - Audio normalization (consistent volume levels)
+
+Model calls and preprocessing are blocking; the async methods run them on
+the STT worker pool (services/stt_executor.py) so the event loop stays free.
 """
+import asyncio
 import tempfile
-from datetime import datetime
+import threading
 from pathlib import Path
 
 import whisper
@@ -24,6 +28,16 @@ except ImportError:
     logger.warning("librosa/soundfile not available - audio preprocessing disabled. Install with: pip install librosa soundfile")
 
 from services.audio_preprocessor import AudioPreprocessor
+from services.stt_executor import STTPriority, STTQueueFullError, current_worker_index, get_stt_executor
+
+# Speaker fields returned when no speaker could be identified
+_NO_SPEAKER = {
+    "speaker_id": None,
+    "speaker_name": None,
+    "speaker_alias": None,
+    "speaker_confidence": 0.0,
+    "is_new_speaker": False,
+}
 
 
 class WhisperService:
@@ -32,6 +46,8 @@ class WhisperService:
     def __init__(self):
         self.model_size = settings.whisper_model
         self.model = None
+        self._worker_models: dict[int, object] = {}  # Model copies for STT workers 1..n
+        self._load_lock = threading.Lock()
         self.language = settings.default_language
         self.initial_prompt = settings.whisper_initial_prompt or None
 
@@ -50,31 +66,87 @@ class WhisperService:
     def load_model(self):
         """Modell laden"""
         if self.model is None:
-            try:
-                logger.info(f"📥 Lade Whisper Modell '{self.model_size}'...")
+            with self._load_lock:
+                if self.model is not None:
+                    return
+                try:
+                    logger.info(f"📥 Lade Whisper Modell '{self.model_size}'...")
 
-                # OpenAI Whisper verwenden
-                self.model = whisper.load_model(self.model_size)
+                    # OpenAI Whisper verwenden
+                    self.model = whisper.load_model(self.model_size)
 
-                logger.info("✅ Whisper Modell geladen")
-            except Exception as e:
-                logger.error(f"❌ Fehler beim Laden des Whisper Modells: {e}")
-                raise
+                    logger.info("✅ Whisper Modell geladen")
+                except Exception as e:
+                    logger.error(f"❌ Fehler beim Laden des Whisper Modells: {e}")
+                    raise
+
+    def _get_model(self):
+        """
+        Model for the current thread.
 
-    async def transcribe_file(self, audio_path: str, language: str = None) -> str:
+        STT worker 0 (and callers outside the pool) use the shared model;
+        further workers lazily load their own copy, since one model instance
+        must not decode two inputs concurrently.
+        """
+        index = current_worker_index()
+        if not index:
+            if self.model is None:
+                self.load_model()
+            return self.model
+
+        model = self._worker_models.get(index)
+        if model is None:
+            logger.info(f"📥 Lade Whisper Modell '{self.model_size}' für STT-Worker {index}...")
+            model = whisper.load_model(self.model_size)
+            self._worker_models[index] = model
+        return model
+
+    async def transcribe_file(
+        self,
+        audio_path: str,
+        language: str = None,
+        priority: STTPriority = STTPriority.UPLOAD,
+    ) -> str:
         """
         Audio-Datei transkribieren mit optionalem Preprocessing.
 
         Args:
             audio_path: Path to the audio file
             language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
-        """
-        if self.model is None:
-            self.load_model()
+            priority: Queue priority on the STT worker pool
 
+        Raises:
+            STTQueueFullError: If the STT queue is full
+        """
         # Use provided language or fall back to default
         transcribe_language = language or self.language
 
+        try:
+            text, _ = await get_stt_executor().run(
+                self._transcribe_path, audio_path, transcribe_language, priority=priority
+            )
+            return text
+        except STTQueueFullError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Transkriptions-Fehler: {e}")
+            return ""
+
+    def _transcribe_path(self, audio_path: str, language: str, keep_preprocessed: bool = False) -> tuple[str, str | None]:
+        """
+        Preprocess and transcribe an audio file (blocking, runs on an STT worker).
+
+        Args:
+            audio_path: Path to the audio file
+            language: Language code
+            keep_preprocessed: Keep the preprocessed temp file for the caller
+                (speaker recognition) instead of deleting it
+
+        Returns:
+            (text, path of the kept preprocessed file or None)
+        """
+        model = self._get_model()
+
         processed_path = None
         try:
             # Optional: Preprocess audio for better quality
@@ -89,7 +161,7 @@ class WhisperService:
             # fp16=False verhindert die Warnung auf CPU-only Systemen
             # beam_size=5 und best_of=5 für bessere Genauigkeit
             transcribe_opts = {
-                "language": transcribe_language,
+                "language": language,
                 "fp16": False,
                 "beam_size": 5,
                 "best_of": 5,
@@ -97,15 +169,15 @@ class WhisperService:
             if self.initial_prompt:
                 transcribe_opts["initial_prompt"] = self.initial_prompt
 
-            result = self.model.transcribe(transcribe_path, **transcribe_opts)
+            result = model.transcribe(transcribe_path, **transcribe_opts)
 
-            text = result["text"]
+            text = result["text"].strip()
 
-            logger.info(f"✅ Transkription erfolgreich ({transcribe_language}): {len(text)} Zeichen")
-            return text.strip()
-        except Exception as e:
-            logger.error(f"❌ Transkriptions-Fehler: {e}")
-            return ""
+            logger.info(f"✅ Transkription erfolgreich ({language}): {len(text)} Zeichen")
+            if keep_preprocessed and processed_path:
+                kept, processed_path = processed_path, None
+                return text, kept
+            return text, None
         finally:
             # Cleanup preprocessed temp file
             if processed_path and processed_path != audio_path:
@@ -155,7 +227,66 @@ class WhisperService:
             logger.warning(f"⚠️ Preprocessing failed, using original audio: {e}")
             return None
 
-    async def transcribe_bytes(self, audio_bytes: bytes, filename: str = "audio.wav", language: str = None) -> str:
+    def transcribe_segments(
+        self,
+        audio,
+        language: str = None,
+        prompt: str | None = None,
+        fast: bool = False,
+        preprocess: bool = False,
+    ) -> list[dict]:
+        """
+        Transcribe an in-memory waveform and return Whisper's segments.
+
+        Blocking (CPU-bound) — run it on the STT executor. Used by the
+        streaming transcriber (services/streaming_stt.py), which needs segment
+        timestamps to commit stable text and only re-decode the audio after it.
+
+        Args:
+            audio: float32 numpy array, 16 kHz mono, range [-1, 1]
+            language: Optional language code. Falls back to default_language.
+            prompt: Preceding text, appended to the configured initial prompt
+            fast: Greedy decoding for partial results (beam search otherwise)
+            preprocess: Apply noise reduction/normalization (if enabled)
+
+        Returns:
+            List of {"start": float, "end": float, "text": str} (seconds, relative to audio)
+        """
+        model = self._get_model()
+
+        if preprocess and self.preprocess_enabled:
+            try:
+                audio = self.preprocessor.process(audio).astype("float32")
+            except Exception as e:
+                logger.warning(f"⚠️ Preprocessing failed, using original audio: {e}")
+
+        transcribe_opts = {
+            "language": language or self.language,
+            "fp16": False,
+            "condition_on_previous_text": False,
+        }
+        if not fast:
+            transcribe_opts["beam_size"] = 5
+            transcribe_opts["best_of"] = 5
+
+        initial_prompt = " ".join(p for p in (self.initial_prompt, prompt) if p)
+        if initial_prompt:
+            transcribe_opts["initial_prompt"] = initial_prompt
+
+        result = model.transcribe(audio, **transcribe_opts)
+        return [
+            {"start": float(seg["start"]), "end": float(seg["end"]), "text": seg["text"].strip()}
+            for seg in result.get("segments", [])
+            if seg["text"].strip()
+        ]
+
+    async def transcribe_bytes(
+        self,
+        audio_bytes: bytes,
+        filename: str = "audio.wav",
+        language: str = None,
+        priority: STTPriority = STTPriority.UPLOAD,
+    ) -> str:
         """
         Audio aus Bytes transkribieren.
 
@@ -163,6 +294,7 @@ class WhisperService:
             audio_bytes: Raw audio bytes
             filename: Original filename (used for extension)
             language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
+            priority: Queue priority on the STT worker pool
         """
         # Temporäre Datei erstellen
         with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp:
@@ -170,7 +302,7 @@ class WhisperService:
             tmp_path = tmp.name
 
         try:
-            return await self.transcribe_file(tmp_path, language=language)
+            return await self.transcribe_file(tmp_path, language=language, priority=priority)
         finally:
             # Temporäre Datei löschen
             Path(tmp_path).unlink(missing_ok=True)
@@ -179,7 +311,8 @@ class WhisperService:
         self,
         audio_path: str,
         db_session=None,
-        language: str = None
+        language: str = None,
+        priority: STTPriority = STTPriority.UPLOAD,
     ) -> dict:
         """
         Transcribe audio and identify speaker.
@@ -194,6 +327,7 @@ class WhisperService:
             audio_path: Path to audio file
             db_session: Optional async database session for speaker lookup
             language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
+            priority: Queue priority on the STT worker pool
 
         Returns:
             {
@@ -204,193 +338,161 @@ class WhisperService:
                 "speaker_confidence": float (0-1),
                 "is_new_speaker": bool
             }
-        """
-        if self.model is None:
-            self.load_model()
 
+        Raises:
+            STTQueueFullError: If the STT queue is full
+        """
         # Use provided language or fall back to default
         transcribe_language = language or self.language
 
         # Preprocess audio FIRST (for both transcription and speaker recognition)
         processed_path = None
-        transcribe_path = audio_path
-        if self.preprocess_enabled:
-            processed_path = self._preprocess_audio(audio_path)
-            if processed_path:
-                transcribe_path = processed_path
-                logger.info("📊 Using preprocessed audio for transcription and speaker recognition")
-
         try:
-            # Transcribe using preprocessed audio
-            transcribe_opts = {
-                "language": transcribe_language,
-                "fp16": False,
-                "beam_size": 5,
-                "best_of": 5,
-            }
-            if self.initial_prompt:
-                transcribe_opts["initial_prompt"] = self.initial_prompt
-
-            result = self.model.transcribe(transcribe_path, **transcribe_opts)
-            text = result["text"].strip()
-            logger.info(f"✅ Transkription erfolgreich ({transcribe_language}): {len(text)} Zeichen")
-
-            # Default speaker info
-            speaker_info = {
-                "speaker_id": None,
-                "speaker_name": None,
-                "speaker_alias": None,
-                "speaker_confidence": 0.0,
-                "is_new_speaker": False
-            }
+            text, processed_path = await get_stt_executor().run(
+                self._transcribe_path, audio_path, transcribe_language,
+                keep_preprocessed=True, priority=priority,
+            )
+            if processed_path:
+                logger.info("📊 Using preprocessed audio for speaker recognition")
 
             # Try to identify speaker if enabled and db_session provided
             if not settings.speaker_recognition_enabled or db_session is None:
-                return {"text": text, **speaker_info}
+                return {"text": text, **_NO_SPEAKER}
 
-            try:
-                import numpy as np
-                from sqlalchemy import select
-                from sqlalchemy.orm import selectinload
+            speaker_info = await self._identify_speaker(processed_path or audio_path, db_session)
+            return {"text": text, **speaker_info}
 
-                from models.database import Speaker, SpeakerEmbedding
-                from services.speaker_service import get_speaker_service
+        except STTQueueFullError:
+            raise
 
-                service = get_speaker_service()
+        except Exception as e:
+            logger.error(f"❌ Transkriptions-Fehler: {e}")
+            return {"text": "", **_NO_SPEAKER}
 
-                if not service.is_available():
-                    logger.debug("Speaker recognition not available")
-                    return {"text": text, **speaker_info}
+        finally:
+            # Cleanup preprocessed temp file
+            if processed_path and processed_path != audio_path:
+                try:
+                    Path(processed_path).unlink(missing_ok=True)
+                except Exception:
+                    pass
 
-                # Extract embedding from PREPROCESSED audio (better quality!)
-                embedding = service.extract_embedding(transcribe_path)
+    async def _identify_speaker(self, audio_path: str, db_session) -> dict:
+        """
+        Identify (or auto-enroll) the speaker of an audio file.
 
-                if embedding is None:
-                    logger.debug("Could not extract speaker embedding")
-                    return {"text": text, **speaker_info}
+        Matches against the in-memory speaker index (services/speaker_index.py),
+        which is loaded from the database once and updated incrementally.
 
-                # Load ALL speakers (including those without embeddings for counting)
-                result = await db_session.execute(
-                    select(Speaker).options(selectinload(Speaker.embeddings))
-                )
-                all_speakers = result.scalars().all()
-
-                # Build list of speakers WITH embeddings for identification
-                # Limit to most recent 10 embeddings per speaker to avoid loading
-                # unbounded data as continuous learning adds more embeddings over time
-                MAX_EMBEDDINGS_PER_SPEAKER = 10
-                known_speakers = []
-                speakers_with_embeddings = []
-                for speaker in all_speakers:
-                    if speaker.embeddings:
-                        speakers_with_embeddings.append(speaker)
-                        recent_embeddings = sorted(
-                            speaker.embeddings,
-                            key=lambda e: e.created_at or datetime.min,
-                            reverse=True
-                        )[:MAX_EMBEDDINGS_PER_SPEAKER]
-                        embeddings = [
-                            service.embedding_from_base64(emb.embedding)
-                            for emb in recent_embeddings
-                        ]
-                        if embeddings:
-                            averaged = np.mean(embeddings, axis=0)
-                            known_speakers.append((speaker.id, speaker.name, averaged))
-
-                # Try to identify speaker
-                identified_speaker = None
-                confidence = 0.0
-
-                if known_speakers:
-                    result = service.identify_speaker(embedding, known_speakers)
-                    if result:
-                        speaker_id, _speaker_name, confidence = result
-                        # Find the speaker object
-                        for speaker in speakers_with_embeddings:
-                            if speaker.id == speaker_id:
-                                identified_speaker = speaker
-                                break
-
-                # Case 1: Speaker identified
-                if identified_speaker:
-                    speaker_info = {
-                        "speaker_id": identified_speaker.id,
-                        "speaker_name": identified_speaker.name,
-                        "speaker_alias": identified_speaker.alias,
-                        "speaker_confidence": confidence,
-                        "is_new_speaker": False
-                    }
-                    logger.info(f"🎤 Speaker identified: {identified_speaker.name} ({confidence:.2f})")
-
-                    # Continuous learning: add embedding to known speaker
-                    if settings.speaker_continuous_learning:
-                        await self._add_embedding_to_speaker(
-                            db_session, identified_speaker.id, embedding, service
-                        )
-
-                # Case 2: No speaker identified - auto-enroll if enabled
-                elif settings.speaker_auto_enroll:
-                    # Count existing "Unbekannter Sprecher" entries
-                    unknown_count = sum(
-                        1 for s in all_speakers
-                        if s.name.startswith("Unbekannter Sprecher")
-                    )
-                    new_number = unknown_count + 1
+        Args:
+            audio_path: Path to (preprocessed) audio file
+            db_session: Async database session for speaker lookup
 
-                    # Create new unknown speaker
-                    new_speaker = Speaker(
-                        name=f"Unbekannter Sprecher #{new_number}",
-                        alias=f"unknown_{new_number}",
-                        is_admin=False
-                    )
-                    db_session.add(new_speaker)
-                    await db_session.flush()  # Get the ID
+        Returns:
+            Speaker fields of transcribe_with_speaker() (without "text")
+        """
+        speaker_info = dict(_NO_SPEAKER)
 
-                    # Add embedding
-                    embedding_record = SpeakerEmbedding(
-                        speaker_id=new_speaker.id,
-                        embedding=service.embedding_to_base64(embedding)
+        try:
+            from services.speaker_index import get_speaker_index
+            from services.speaker_service import get_speaker_service
+
+            service = get_speaker_service()
+
+            if not service.is_available():
+                logger.debug("Speaker recognition not available")
+                return speaker_info
+
+            # Extract embedding from PREPROCESSED audio (better quality!)
+            # Blocking model call — keep it off the event loop, but outside
+            # the STT pool so it can run alongside a Whisper decode
+            embedding = await asyncio.to_thread(service.extract_embedding, audio_path)
+
+            if embedding is None:
+                logger.debug("Could not extract speaker embedding")
+                return speaker_info
+
+            index = get_speaker_index()
+            await index.ensure_loaded(db_session)
+            match = index.identify(embedding, service.similarity_threshold)
+
+            # Case 1: Speaker identified
+            if match:
+                speaker_id, speaker_name, speaker_alias, confidence = match
+                speaker_info = {
+                    "speaker_id": speaker_id,
+                    "speaker_name": speaker_name,
+                    "speaker_alias": speaker_alias,
+                    "speaker_confidence": confidence,
+                    "is_new_speaker": False
+                }
+                logger.info(f"🎤 Speaker identified: {speaker_name} ({confidence:.2f})")
+
+                # Continuous learning: add embedding to known speaker
+                if settings.speaker_continuous_learning:
+                    await self._add_embedding_to_speaker(
+                        db_session, speaker_id, embedding, service,
+                        speaker_name=speaker_name, speaker_alias=speaker_alias,
                     )
-                    db_session.add(embedding_record)
-                    await db_session.commit()
 
-                    speaker_info = {
-                        "speaker_id": new_speaker.id,
-                        "speaker_name": new_speaker.name,
-                        "speaker_alias": new_speaker.alias,
-                        "speaker_confidence": 1.0,  # It's a new profile, 100% match to itself
-                        "is_new_speaker": True
-                    }
-                    logger.info(f"🆕 New unknown speaker created: {new_speaker.name} (ID: {new_speaker.id})")
+            # Case 2: No speaker identified - auto-enroll if enabled
+            elif settings.speaker_auto_enroll:
+                from sqlalchemy import func, select
 
-                else:
-                    logger.info("🎤 Speaker not recognized (auto-enroll disabled)")
+                from models.database import Speaker, SpeakerEmbedding
 
-            except Exception as e:
-                logger.warning(f"Speaker identification failed: {e}")
-                import traceback
-                logger.debug(traceback.format_exc())
+                # Count existing "Unbekannter Sprecher" entries
+                result = await db_session.execute(
+                    select(func.count(Speaker.id))
+                    .where(Speaker.name.startswith("Unbekannter Sprecher"))
+                )
+                new_number = (result.scalar() or 0) + 1
 
-            return {"text": text, **speaker_info}
+                # Create new unknown speaker
+                new_speaker = Speaker(
+                    name=f"Unbekannter Sprecher #{new_number}",
+                    alias=f"unknown_{new_number}",
+                    is_admin=False
+                )
+                db_session.add(new_speaker)
+                await db_session.flush()  # Get the ID
+
+                # Add embedding
+                embedding_record = SpeakerEmbedding(
+                    speaker_id=new_speaker.id,
+                    embedding=service.embedding_to_bytes(embedding)
+                )
+                db_session.add(embedding_record)
+                await db_session.commit()
+                index.add_embedding(new_speaker.id, new_speaker.name, new_speaker.alias, embedding)
+
+                speaker_info = {
+                    "speaker_id": new_speaker.id,
+                    "speaker_name": new_speaker.name,
+                    "speaker_alias": new_speaker.alias,
+                    "speaker_confidence": 1.0,  # It's a new profile, 100% match to itself
+                    "is_new_speaker": True
+                }
+                logger.info(f"🆕 New unknown speaker created: {new_speaker.name} (ID: {new_speaker.id})")
+
+            else:
+                logger.info("🎤 Speaker not recognized (auto-enroll disabled)")
 
         except Exception as e:
-            logger.error(f"❌ Transkriptions-Fehler: {e}")
-            return {"text": "", "speaker_id": None, "speaker_name": None, "speaker_alias": None, "speaker_confidence": 0.0, "is_new_speaker": False}
+            logger.warning(f"Speaker identification failed: {e}")
+            import traceback
+            logger.debug(traceback.format_exc())
 
-        finally:
-            # Cleanup preprocessed temp file
-            if processed_path and processed_path != audio_path:
-                try:
-                    Path(processed_path).unlink(missing_ok=True)
-                except Exception:
-                    pass
+        return speaker_info
 
     async def _add_embedding_to_speaker(
         self,
         db_session,
         speaker_id: int,
         embedding,
-        service
+        service,
+        speaker_name: str | None = None,
+        speaker_alias: str | None = None,
     ):
         """
         Add embedding to existing speaker for continuous learning.
@@ -401,6 +503,7 @@ class WhisperService:
             from sqlalchemy import func, select
 
             from models.database import SpeakerEmbedding
+            from services.speaker_index import get_speaker_index
 
             # Check current embedding count
             result = await db_session.execute(
@@ -417,10 +520,11 @@ class WhisperService:
             # Add new embedding
             embedding_record = SpeakerEmbedding(
                 speaker_id=speaker_id,
-                embedding=service.embedding_to_base64(embedding)
+                embedding=service.embedding_to_bytes(embedding)
             )
             db_session.add(embedding_record)
             await db_session.commit()
+            get_speaker_index().add_embedding(speaker_id, speaker_name, speaker_alias, embedding)
 
             logger.debug(f"📊 Added embedding to speaker {speaker_id} (now {count + 1} total)")
 
@@ -432,7 +536,8 @@ class WhisperService:
         audio_bytes: bytes,
         filename: str = "audio.wav",
         db_session=None,
-        language: str = None
+        language: str = None,
+        priority: STTPriority = STTPriority.UPLOAD,
     ) -> dict:
         """
         Transcribe audio bytes and identify speaker.
@@ -442,6 +547,7 @@ class WhisperService:
             filename: Original filename
             db_session: Optional async database session
             language: Optional language code (e.g., 'de', 'en'). Falls back to default_language.
+            priority: Queue priority on the STT worker pool
 
         Returns:
             Same as transcribe_with_speaker
@@ -451,6 +557,42 @@ class WhisperService:
             tmp_path = tmp.name
 
         try:
-            return await self.transcribe_with_speaker(tmp_path, db_session, language=language)
+            return await self.transcribe_with_speaker(tmp_path, db_session, language=language, priority=priority)
         finally:
             Path(tmp_path).unlink(missing_ok=True)
+
+    async def identify_speaker_bytes(
+        self,
+        audio_bytes: bytes,
+        filename: str = "audio.wav",
+        db_session=None,
+    ) -> dict:
+        """
+        Identify the speaker of audio bytes without transcribing them.
+
+        Used when the text comes from the streaming transcriber.
+
+        Args:
+            audio_bytes: Raw audio bytes
+            filename: Original filename
+            db_session: Async database session
+
+        Returns:
+            Speaker fields of transcribe_with_speaker() (without "text")
+        """
+        if not settings.speaker_recognition_enabled or db_session is None:
+            return dict(_NO_SPEAKER)
+
+        with tempfile.NamedTemporaryFile(suffix=Path(filename).suffix, delete=False) as tmp:
+            tmp.write(audio_bytes)
+            tmp_path = tmp.name
+
+        processed_path = None
+        try:
+            if self.preprocess_enabled:
+                processed_path = await asyncio.to_thread(self._preprocess_audio, tmp_path)
+            return await self._identify_speaker(processed_path or tmp_path, db_session)
+        finally:
+            Path(tmp_path).unlink(missing_ok=True)
+            if processed_path:
+                Path(processed_path).unlink(missing_ok=True)
@@ -46,6 +46,7 @@ class Settings(BaseSettings):
     # Home Assistant
     home_assistant_url: str | None = None
     home_assistant_token: SecretStr | None = None
+    ha_state_mirror_enabled: bool = True  # Keep entity/area/state mirror current via HA WebSocket events
 
     # n8n — field exists so .env can set N8N_API_URL for the n8n-mcp stdio subprocess
     n8n_api_url: str | None = None
@@ -66,6 +67,7 @@ class Settings(BaseSettings):
     whisper_initial_prompt: str = ""  # Leer = kein Kontext-Bias (Renfield ist ein offenes System)
     piper_voice: str = "de_DE-thorsten-high"  # Default voice (legacy)
     piper_voices: str = "de:de_DE-thorsten-high,en:en_US-amy-medium"  # Language:Voice mapping
+    piper_timeout: float = Field(default=30.0, ge=1.0, le=300.0)  # Max seconds per synthesized utterance (worker restarts on timeout)
 
     # Audio Preprocessing (for better STT quality)
     whisper_preprocess_enabled: bool = True       # Enable audio preprocessing before Whisper
@@ -73,6 +75,16 @@ class Settings(BaseSettings):
     whisper_preprocess_normalize: bool = True     # Enable audio normalization (consistent volume)
     whisper_preprocess_target_db: float = -20.0   # Target dB level for normalization
 
+    # Streaming STT (satellites, see services/streaming_stt.py)
+    stt_streaming_enabled: bool = True             # Decode while the user speaks, send partial transcripts
+    stt_streaming_interval: float = Field(default=1.0, ge=0.2, le=10.0)       # Seconds of new audio between partial decodes
+    stt_streaming_min_audio: float = Field(default=1.0, ge=0.0, le=10.0)      # Seconds of audio before the first partial decode
+    stt_streaming_commit_margin: float = Field(default=1.0, ge=0.0, le=10.0)  # Segments must end this far before the buffer end to be committed
+
+    # STT Worker Pool (Whisper inference off the event loop)
+    stt_workers: int = Field(default=1, ge=1, le=8)          # Parallel Whisper jobs (each extra worker loads its own model copy)
+    stt_queue_max: int = Field(default=16, ge=0, le=1000)    # Max waiting jobs before new ones are rejected (0 = unbounded)
+
     # Speaker Recognition
     speaker_recognition_enabled: bool = True      # Enable speaker recognition
     speaker_recognition_threshold: float = 0.25  # Minimum similarity for positive identification (0-1)
@@ -115,13 +127,41 @@ class Settings(BaseSettings):
     mcp_connect_timeout: float = 10.0     # Connection timeout per server (seconds)
     mcp_call_timeout: float = 30.0        # Tool call timeout (seconds)
     mcp_max_response_size: int = Field(default=10240, ge=1024, le=524288)  # 10KB max response
+    mcp_max_concurrent_calls: int = Field(default=4, ge=1, le=64)  # Concurrent tool calls per server (YAML: max_concurrent_calls)
+    mcp_cache_enabled: bool = True        # Result cache for read-only tools with a cache policy (YAML: cache)
+    mcp_cache_size: int = Field(default=1024, ge=0, le=100000)  # Max cached tool results (LRU)
+    mcp_cache_redis: bool = False         # Also store cached results in Redis (shared, survives restarts)
 
     # Agent Advanced
     agent_history_limit: int = Field(default=20, ge=1, le=100)       # Max history steps in agent loop
     agent_response_truncation: int = Field(default=2000, ge=100, le=50000)  # Max chars for tool response truncation
+    agent_max_parallel_tools: int = Field(default=4, ge=1, le=16)    # Max independent tool calls per agent step (run concurrently)
 
     # Embeddings
     embedding_dimension: int = Field(default=768, ge=128, le=4096)   # Embedding vector dimension
+    embedding_model_version: str = "1"       # Bump when the weights behind OLLAMA_EMBED_MODEL change (same name)
+    rag_reembed_enabled: bool = True         # Re-embed chunks of an older model/version in the background at startup
+    rag_reembed_batch_size: int = Field(default=50, ge=1, le=1000)   # Chunks per re-embed batch (one commit each)
+
+    # Embedding Cache & Batching (see services/embedding_service.py)
+    embedding_cache_enabled: bool = True
+    embedding_cache_size: int = Field(default=512, ge=0, le=100000)   # Max cached vectors (LRU)
+    embedding_cache_ttl: int = Field(default=300, ge=1, le=86400)     # Seconds a cached vector stays valid
+    embedding_batch_size: int = Field(default=32, ge=1, le=512)             # Max texts per /api/embed request
+    embedding_batch_max_tokens: int = Field(default=8192, ge=256, le=131072)  # Max estimated tokens per request
+    embedding_batch_linger_ms: float = Field(default=5.0, ge=0.0, le=1000.0)  # Wait for more texts before sending
+    embedding_batch_concurrency: int = Field(default=2, ge=1, le=32)          # Max batch requests in flight
+
+    # Intent Fast Path (embedding nearest neighbour, see services/intent_classifier.py)
+    intent_fastpath_enabled: bool = False  # Opt-in: check precision with services.intent_classifier_eval first
+    intent_fastpath_threshold: float = Field(default=0.88, ge=0.5, le=1.0)   # Min. cosine similarity of the nearest example
+    intent_fastpath_margin: float = Field(default=0.05, ge=0.0, le=1.0)      # Min. lead over the best competing intent
+    intent_fastpath_history_limit: int = Field(default=2000, ge=0, le=100000)  # Recent messages mined for successful intents
+
+    # Vector Search (pgvector HNSW, see services/vector_search.py)
+    vector_search_ef_search: int = Field(default=40, ge=1, le=1000)                 # HNSW candidate list: higher = better recall, slower
+    vector_search_iterative_scan: str = "strict_order"                              # off | strict_order | relaxed_order (pgvector >= 0.8)
+    vector_search_max_scan_tuples: int = Field(default=20000, ge=100, le=1000000)  # Upper bound for iterative scans on filtered queries
 
     # RAG (Retrieval-Augmented Generation)
     rag_enabled: bool = True
@@ -146,6 +186,12 @@ class Settings(BaseSettings):
     rag_ocr_auto_detect: bool = True          # Auto-detect garbled embedded text and re-run with OCR
     rag_ocr_space_threshold: float = 0.03    # Space ratio below this triggers auto OCR (default 3%)
 
+    # Ingestion Queue (Upload → Redis job → Docling worker processes)
+    rag_ingest_queue_enabled: bool = True                      # Upload returns 202 + job id (False = index inside the request)
+    rag_ingest_ocr_workers: int = Field(default=1, ge=1, le=8)   # Worker processes for PDFs, images and force_ocr
+    rag_ingest_text_workers: int = Field(default=1, ge=1, le=8)  # Worker processes for DOCX, TXT, MD, HTML, ...
+    rag_ingest_max_retries: int = Field(default=2, ge=0, le=10)  # Retries after errors (e.g. embedding service down)
+
     # Conversation Memory (Long-term)
     memory_enabled: bool = False                                             # Opt-in
     memory_retrieval_limit: int = Field(default=3, ge=1, le=10)              # Max memories per query
@@ -209,6 +255,7 @@ class Settings(BaseSettings):
     paperless_audit_confidence_threshold: float = 0.9
     paperless_audit_ocr_threshold: int = 2       # OCR <= 2 → suggest re-OCR
     paperless_audit_batch_delay: float = 2.0     # Seconds between documents
+    paperless_audit_duplicate_threshold: float = Field(default=0.8, ge=0.3, le=1.0)  # MinHash similarity for duplicates
 
     # Email MCP
     email_mcp_enabled: bool = False
@@ -279,7 +326,9 @@ class Settings(BaseSettings):
     ws_max_audio_buffer_size: int = 10_000_000  # 10MB max audio buffer per session
 
     # WebSocket Protocol
-    ws_protocol_version: str = "1.0"
+    ws_protocol_version: str = "1.1"
+    ws_binary_audio_enabled: bool = True  # Binary audio frames for satellites advertising binary_audio (protocol 1.1)
+    ws_opus_enabled: bool = True          # Opus-compress binary audio if satellite and server have libopus
 
     # Device/Session Timeouts
     device_session_timeout: float = 30.0  # Max voice session duration in seconds
@@ -18,6 +18,7 @@ Timeout & Fallback:
 """
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any, Protocol, runtime_checkable
 
 from loguru import logger
@@ -52,6 +53,8 @@ def is_thinking_model(model: str) -> bool:
 class LLMClient(Protocol):
     """Structural protocol for LLM clients (chat + embeddings).
 
+    ``embeddings()`` embeds one prompt, ``embed()`` accepts a list of inputs
+    and returns all vectors in one request (Ollama ``/api/embed``).
     ollama.AsyncClient satisfies this without any adapter.
     Ollama-specific methods (list, pull) stay on the concrete client.
     """
@@ -75,6 +78,15 @@ class LLMClient(Protocol):
         **kwargs: Any,
     ) -> Any: ...
 
+    async def embed(
+        self,
+        model: str = "",
+        input: str | Sequence[str] = "",
+        *,
+        options: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> Any: ...
+
 
 # ---------------------------------------------------------------------------
 # Client cache (keyed by normalized URL)
@@ -118,7 +130,7 @@ def create_llm_client(host: str) -> LLMClient:
 class _FallbackLLMClient:
     """Wraps a primary LLM client with transparent fallback on connect errors.
 
-    On the first ``chat()`` or ``embeddings()`` call, the primary is tried.
+    On the first ``chat()``, ``embeddings()`` or ``embed()`` call, the primary is tried.
     If a connection-level error is raised (host down / unreachable), the same
     call is retried on the fallback client and a warning is emitted.
     Subsequent calls always try the primary first so recovery is automatic
@@ -148,6 +160,9 @@ class _FallbackLLMClient:
     async def embeddings(self, *args: Any, **kwargs: Any) -> Any:  # noqa: D102
         return await self._call("embeddings", *args, **kwargs)
 
+    async def embed(self, *args: Any, **kwargs: Any) -> Any:  # noqa: D102
+        return await self._call("embed", *args, **kwargs)
+
 
 def _make_client_with_fallback(primary_url: str) -> LLMClient:
     """Return a client for *primary_url*, wrapped with fallback if configured."""
@@ -189,6 +204,35 @@ def get_agent_client(
     return _make_client_with_fallback(resolved), resolved
 
 
+async def embed_many(
+    client: LLMClient,
+    model: str,
+    texts: Sequence[str],
+    *,
+    options: dict[str, Any] | None = None,
+) -> list[list[float]]:
+    """Embed several texts with a single request.
+
+    Args:
+        client: LLM client (must support ``embed()``)
+        model: Embedding model name
+        texts: Texts to embed
+
+    Returns:
+        One vector per input text, in input order
+
+    Raises:
+        ValueError: If the server returned a different number of vectors
+    """
+    if not texts:
+        return []
+    response = await client.embed(model=model, input=list(texts), options=options)
+    embeddings = [list(vector) for vector in response.embeddings]
+    if len(embeddings) != len(texts):
+        raise ValueError(f"embed() returned {len(embeddings)} vectors for {len(texts)} inputs")
+    return embeddings
+
+
 def clear_client_cache() -> None:
     """Clear the client cache (useful in tests)."""
     _client_cache.clear()
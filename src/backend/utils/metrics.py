@@ -2,7 +2,8 @@
 Prometheus Metrics — Optional monitoring endpoint.
 
 Enabled via METRICS_ENABLED=true. Provides HTTP, WebSocket, LLM,
-and Circuit Breaker metrics in Prometheus exposition format.
+Embedding Cache, Intent Fast Path, Ingestion and Circuit Breaker metrics in
+Prometheus exposition format.
 
 Usage:
     # In main.py:
@@ -33,6 +34,18 @@ _circuit_breaker_state = None
 _circuit_breaker_failures_total = None
 _memory_total = None
 _memory_cleanup_total = None
+_embedding_cache_requests_total = None
+_embedding_batch_size = None
+_stt_queue_depth = None
+_stt_queue_wait_seconds = None
+_stt_inference_seconds = None
+_stt_rejected_total = None
+_intent_fastpath_total = None
+_agent_prompt_tokens_total = None
+_agent_prompt_eval_seconds = None
+_mcp_cache_requests_total = None
+_ingest_jobs_total = None
+_ingest_job_seconds = None
 
 
 def _init_metrics():
@@ -43,6 +56,10 @@ def _init_metrics():
     global _llm_call_duration_seconds, _agent_steps_total
     global _circuit_breaker_state, _circuit_breaker_failures_total
     global _memory_total, _memory_cleanup_total
+    global _embedding_cache_requests_total, _embedding_batch_size
+    global _stt_queue_depth, _stt_queue_wait_seconds, _stt_inference_seconds, _stt_rejected_total
+    global _intent_fastpath_total, _agent_prompt_tokens_total, _agent_prompt_eval_seconds
+    global _mcp_cache_requests_total, _ingest_jobs_total, _ingest_job_seconds
 
     if _metrics_initialized:
         return
@@ -82,6 +99,18 @@ def _init_metrics():
             buckets=(1, 2, 3, 5, 8, 12, 20),
         )
 
+        _agent_prompt_tokens_total = Counter(
+            "renfield_agent_prompt_tokens_total",
+            "Agent prompt tokens evaluated by Ollama vs. reused from its KV cache",
+            ["result"],
+        )
+
+        _agent_prompt_eval_seconds = Histogram(
+            "renfield_agent_prompt_eval_seconds",
+            "Prompt evaluation time per agent step",
+            buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+        )
+
         _circuit_breaker_state = Gauge(
             "renfield_circuit_breaker_state",
             "Circuit breaker state (0=closed, 1=open, 2=half_open)",
@@ -105,6 +134,68 @@ def _init_metrics():
             ["reason"],
         )
 
+        _embedding_cache_requests_total = Counter(
+            "renfield_embedding_cache_requests_total",
+            "Embedding lookups by cache result",
+            ["result"],
+        )
+
+        _embedding_batch_size = Histogram(
+            "renfield_embedding_batch_size",
+            "Texts per embedding request sent to Ollama",
+            buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+        )
+
+        _stt_queue_depth = Gauge(
+            "renfield_stt_queue_depth",
+            "STT jobs waiting for a Whisper worker",
+        )
+
+        _stt_queue_wait_seconds = Histogram(
+            "renfield_stt_queue_wait_seconds",
+            "Time STT jobs wait for a Whisper worker",
+            ["priority"],
+            buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+        )
+
+        _stt_inference_seconds = Histogram(
+            "renfield_stt_inference_seconds",
+            "Whisper job duration in seconds",
+            ["priority"],
+            buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+        )
+
+        _stt_rejected_total = Counter(
+            "renfield_stt_rejected_total",
+            "STT jobs rejected because the queue was full",
+            ["priority"],
+        )
+
+        _intent_fastpath_total = Counter(
+            "renfield_intent_fastpath_total",
+            "Intent fast path outcomes (hit, fallback to LLM, skipped)",
+            ["result"],
+        )
+
+        _mcp_cache_requests_total = Counter(
+            "renfield_mcp_cache_requests_total",
+            "Cacheable MCP tool calls by cache result",
+            ["result"],
+        )
+
+        _ingest_jobs_total = Counter(
+            "renfield_ingest_jobs_total",
+            "Document ingestion jobs by lane and result",
+            ["lane", "result"],
+        )
+
+        _ingest_job_seconds = Histogram(
+            "renfield_ingest_job_seconds",
+            "Processing time of document ingestion jobs",
+            ["lane"],
+            buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+        )
+
         _metrics_initialized = True
         logger.info("Prometheus metrics initialized")
 
@@ -151,6 +242,15 @@ def record_agent_steps(steps: int):
     _agent_steps_total.observe(steps)
 
 
+def record_agent_prompt_eval(evaluated: int, cached: int, duration: float):
+    """Record prompt tokens (evaluated / KV-cache reused) and prompt eval time of an agent step."""
+    if not _metrics_initialized:
+        return
+    _agent_prompt_tokens_total.labels(result="evaluated").inc(evaluated)
+    _agent_prompt_tokens_total.labels(result="cached").inc(cached)
+    _agent_prompt_eval_seconds.observe(duration)
+
+
 def record_circuit_breaker_state(name: str, state: str):
     """Record circuit breaker state change."""
     if not _metrics_initialized:
@@ -182,6 +282,64 @@ def set_memory_total(count: int):
     _memory_total.set(count)
 
 
+def record_embedding_cache(result: str):
+    """Record an embedding cache lookup (hit, miss, coalesced)."""
+    if not _metrics_initialized:
+        return
+    _embedding_cache_requests_total.labels(result=result).inc()
+
+
+def record_embedding_batch(size: int):
+    """Record the number of texts sent in one embedding request."""
+    if not _metrics_initialized:
+        return
+    _embedding_batch_size.observe(size)
+
+
+def record_stt_queue_depth(depth: int):
+    """Record the number of STT jobs waiting for a worker."""
+    if not _metrics_initialized:
+        return
+    _stt_queue_depth.set(depth)
+
+
+def record_stt_job(priority: str, wait: float, duration: float):
+    """Record queue wait and inference time of a finished STT job."""
+    if not _metrics_initialized:
+        return
+    _stt_queue_wait_seconds.labels(priority=priority).observe(wait)
+    _stt_inference_seconds.labels(priority=priority).observe(duration)
+
+
+def record_stt_rejected(priority: str):
+    """Record an STT job rejected by backpressure."""
+    if not _metrics_initialized:
+        return
+    _stt_rejected_total.labels(priority=priority).inc()
+
+
+def record_intent_fastpath(result: str):
+    """Record an intent fast path outcome (hit, fallback, skipped)."""
+    if not _metrics_initialized:
+        return
+    _intent_fastpath_total.labels(result=result).inc()
+
+
+def record_mcp_cache(result: str):
+    """Record an MCP result cache lookup (hit, miss, coalesced)."""
+    if not _metrics_initialized:
+        return
+    _mcp_cache_requests_total.labels(result=result).inc()
+
+
+def record_ingest_job(lane: str, result: str, duration: float):
+    """Record a finished ingestion job (completed / failed / cancelled / retried)."""
+    if not _metrics_initialized:
+        return
+    _ingest_jobs_total.labels(lane=lane, result=result).inc()
+    _ingest_job_seconds.labels(lane=lane).observe(duration)
+
+
 # === Middleware & Endpoint Setup ===
 
 
@@ -0,0 +1,140 @@
+"""
+MinHash — Near-duplicate detection for document texts.
+
+Text is lowercased, whitespace is collapsed and the result is cut into
+character 5-gram shingles: an OCR error only touches the five shingles
+around it, so re-scans of the same page stay similar. NUM_PERM
+multiply-shift hash functions are applied with numpy and the signature
+keeps the minimum per function. The share of equal signature positions
+estimates the Jaccard similarity of the two shingle sets.
+
+LSH: signatures are cut into bands of rows values; texts sharing a band
+land in the same bucket and become candidates. The shape is chosen per
+threshold — as many rows as possible while a pair at the threshold stays a
+candidate with LSH_RECALL: 21 bands of 6 at 0.8 (cut-off ~0.6), 42 of 3
+at 0.5. Candidates are verified on the signature while streaming through
+each bucket: up to MAX_CENTERS members (rotating per band) are compared
+with the members not yet matched, and matches are joined with union-find.
+A family of near-identical documents costs a few comparisons per document
+instead of one per pair, and only the linking pairs are kept.
+
+Usage:
+    from utils.minhash import minhash_signature, near_duplicate_pairs
+
+    signature = minhash_signature(text)            # list[int] (JSON-storable)
+    pairs = near_duplicate_pairs({doc_id: signature, ...}, threshold=0.8)
+"""
+
+import re
+
+import numpy as np
+
+NUM_PERM = 128
+LSH_RECALL = 0.99             # Candidate probability of a pair exactly at the threshold
+MAX_CENTERS = 8               # Members per bucket compared with the others
+SHINGLE_SIZE = 5
+MAX_CHARS = 100_000           # Longer texts are signed on their beginning
+
+_SHINGLE_PRIME = np.uint64(0x100000001B3)
+_CHUNK = 8192                 # Shingles per numpy block (128 x 8192 x 8 B = 8 MB)
+_WHITESPACE = re.compile(r"\s+")
+
+# Fixed seed — signatures are stored and must stay comparable across restarts
+_rng = np.random.default_rng(20240917)
+_A = _rng.integers(1, 2**63, size=NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """64-bit hashes of the distinct character shingles of normalized *text*."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    size = min(SHINGLE_SIZE, len(codes))
+    count = len(codes) - size + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        hashes = hashes * _SHINGLE_PRIME + codes[offset:offset + count]
+    # Spread the polynomial hash before the multiply-shift family
+    hashes ^= hashes >> np.uint64(29)
+    return np.unique(hashes)
+
+
+def minhash_signature(text: str | None) -> list[int] | None:
+    """MinHash signature of *text* (NUM_PERM ints < 2**32), None for empty text."""
+    normalized = _WHITESPACE.sub(" ", (text or "")[:MAX_CHARS]).strip().lower()
+    if not normalized:
+        return None
+
+    hashes = _shingle_hashes(normalized)
+    signature = np.full(NUM_PERM, np.iinfo(np.uint64).max, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for start in range(0, len(hashes), _CHUNK):
+            block = hashes[start:start + _CHUNK]
+            values = (_A[:, None] * block[None, :] + _B[:, None]) >> np.uint64(32)
+            np.minimum(signature, values.min(axis=1), out=signature)
+    return signature.tolist()
+
+
+def lsh_shape(threshold: float) -> tuple[int, int]:
+    """(bands, rows) with the most rows that keep LSH_RECALL at *threshold*."""
+    for rows in range(NUM_PERM, 1, -1):
+        bands = NUM_PERM // rows
+        if 1 - (1 - threshold ** rows) ** bands >= LSH_RECALL:
+            return bands, rows
+    return NUM_PERM, 1
+
+
+def near_duplicate_pairs(
+    signatures: dict[int, list[int]],
+    threshold: float,
+) -> list[tuple[int, int, float]]:
+    """
+    Find key pairs (a < b) with estimated similarity >= threshold that link
+    groups of near-duplicates.
+
+    Only pairs joining two groups are returned (at most len - 1), and each
+    bucket is compared against MAX_CENTERS of its members instead of all
+    pairs, so time and memory grow with the number of documents. A key
+    whose only near-duplicates share no bucket with it as a center can be
+    missed. Signatures of another length (e.g. from a different NUM_PERM)
+    are ignored.
+    """
+    keys = [k for k, sig in signatures.items() if sig and len(sig) == NUM_PERM]
+    if len(keys) < 2:
+        return []
+    matrix = np.asarray([signatures[k] for k in keys], dtype=np.uint32)
+    bands, rows = lsh_shape(threshold)
+
+    parent = list(range(len(keys)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    pairs: list[tuple[int, int, float]] = []
+    for band in range(bands):
+        _, bucket = np.unique(matrix[:, band * rows:(band + 1) * rows], axis=0, return_inverse=True)
+        bucket = bucket.ravel()
+        order = np.argsort(bucket, kind="stable")
+        bounds = np.flatnonzero(np.diff(bucket[order], prepend=-1, append=-1))
+        shared = np.flatnonzero(np.diff(bounds) > 1)  # Buckets with more than one member
+        for lo, hi in zip(bounds[shared].tolist(), bounds[shared + 1].tolist(), strict=True):
+            members = order[lo:hi]
+            # Members not yet matched are compared with each center in turn;
+            # the centers rotate so other bands try other members
+            unlinked = members
+            start = band * MAX_CENTERS % len(members)
+            for center in np.roll(members, -start)[:MAX_CENTERS].tolist():
+                rest = unlinked[unlinked != center]
+                if not len(rest):
+                    break
+                scores = (matrix[rest] == matrix[center]).mean(axis=1)
+                hit = scores >= threshold
+                for member, score in zip(rest[hit].tolist(), scores[hit].tolist(), strict=True):
+                    if find(member) != find(center):  # Not yet linked via another bucket
+                        parent[find(member)] = find(center)
+                        a, b = sorted((keys[center], keys[member]))
+                        pairs.append((a, b, float(score)))
+                unlinked = unlinked[~np.isin(unlinked, rest[hit])]
+    return pairs
@@ -93,6 +93,16 @@ export default function KnowledgePage() {
     loadAll();
   }, [loadDocuments, loadKnowledgeBases, loadStats]);
 
+  // Poll an ingestion job (upload answered 202) until it is finished
+  const waitForIngestion = async (jobId, filename) => {
+    for (;;) {
+      await new Promise((resolve) => setTimeout(resolve, 2000));
+      const { data: job } = await apiClient.get(`/api/knowledge/jobs/${encodeURIComponent(jobId)}`);
+      if (['completed', 'failed', 'cancelled'].includes(job.status)) return job;
+      setUploadProgress(t('knowledge.indexing', { filename, percent: Math.round(job.progress * 100) }));
+    }
+  };
+
   // File upload handler
   const handleUpload = async (event) => {
     const file = event.target.files[0];
@@ -109,11 +119,22 @@ export default function KnowledgePage() {
         ? { knowledge_base_id: selectedKnowledgeBase }
         : {};
 
-      await apiClient.post('/api/knowledge/upload', formData, {
+      const response = await apiClient.post('/api/knowledge/upload', formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
         params
       });
 
+      if (response.status === 202) {
+        await loadDocuments();
+        const job = await waitForIngestion(response.data.job_id, file.name);
+        if (job.status !== 'completed') {
+          setUploadProgress(`${t('knowledge.errorLabel')}: ${job.error || t('knowledge.uploadFailed')}`);
+          await loadDocuments();
+          setTimeout(() => setUploadProgress(null), 5000);
+          return;
+        }
+      }
+
       setUploadProgress(t('knowledge.uploadSuccess'));
       await loadDocuments();
       await loadStats();
@@ -570,6 +570,17 @@ class AudioCapture:
         if self._beamformer:
             self._beamformer.set_steering_angle(angle_degrees)
 
+    def steer_to_talker(self) -> Optional[float]:
+        """
+        Steer the beamformer towards the direction of the most recent audio.
+
+        Returns:
+            New steering angle in degrees, or None (no beamformer or silence)
+        """
+        if self._beamformer:
+            return self._beamformer.steer_to_talker()
+        return None
+
     def get_beamformer_stats(self) -> Optional[dict]:
         """Get beamformer statistics (if enabled)"""
         if self._beamformer:
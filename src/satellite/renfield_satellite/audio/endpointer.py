@@ -0,0 +1,130 @@
+"""
+Streaming Endpointer for Renfield Satellite
+
+Decides when the user has finished speaking. Consumes the per-frame speech
+probabilities and levels from VoiceActivityDetector.process_chunk and
+keeps state across chunks:
+
+- Onset: speech counts only after onset_ms of consecutive speech frames,
+  so a click or a single noisy frame doesn't restart the silence.
+- Hysteresis: once in speech, frames stay speech down to 70% of the VAD
+  threshold.
+- Hangover: the first hangover_ms after speech never count as silence
+  (pauses between words, plosives).
+- Adaptive noise floor: a frame is speech only if it is snr_margin_db
+  above the background level, which follows the quietest frames (fast
+  down, slow up). In a noisy room the RMS backend alone would report
+  speech forever.
+
+Silence after the hangover adds evidence, weighted by how clearly it is
+silence (full weight at the noise floor, less for audible frames the more
+speech-like they are; half weight before any speech). The end-of-utterance probability 1 - exp(-evidence / tau)
+reaches 0.95 after silence_duration_ms of clear silence following speech.
+"""
+
+import math
+from typing import Optional, Sequence
+
+HYSTERESIS = 0.7  # Speech continues down to this fraction of the threshold
+LEADING_SILENCE_WEIGHT = 0.5  # Silence before any speech counts half (user may still be thinking)
+NOISE_FALL_MS = 100.0  # Noise floor time constant when the level drops
+NOISE_RISE_MS = 3000.0  # Noise floor time constant when the level rises
+
+
+class Endpointer:
+    """Frame-level end-of-utterance detection with hangover and noise floor"""
+
+    def __init__(
+        self,
+        silence_duration_ms: float = 1500.0,
+        hangover_ms: float = 300.0,
+        threshold: float = 0.5,
+        onset_ms: float = 90.0,
+        snr_margin_db: float = 6.0,
+    ):
+        """
+        Initialize endpointer.
+
+        Args:
+            silence_duration_ms: Clear silence after speech until the
+                end-of-utterance probability reaches 0.95 (includes hangover)
+            hangover_ms: Silence after speech that is never counted
+            threshold: VAD speech probability threshold
+            onset_ms: Consecutive speech needed to count as speech
+            snr_margin_db: Speech must be this much above the noise floor
+        """
+        self.hangover_ms = hangover_ms
+        self.threshold = threshold
+        self.onset_ms = onset_ms
+        self.snr_margin_db = snr_margin_db
+        # 1 - exp(-3) = 0.95 after the counted part of silence_duration_ms
+        self._tau_ms = max(silence_duration_ms - hangover_ms, 1.0) / 3.0
+
+        self.noise_floor_db: Optional[float] = None  # Kept across utterances
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance (the noise floor is kept)"""
+        self.in_speech = False
+        self.speech_heard = False
+        self._onset_ms = 0.0
+        self._silence_ms = 0.0
+        self._evidence_ms = 0.0
+
+    @property
+    def end_of_utterance_probability(self) -> float:
+        """Probability (0-1) that the user has finished speaking"""
+        return 1.0 - math.exp(-self._evidence_ms / self._tau_ms)
+
+    def track_noise(self, level_db: float, duration_ms: float):
+        """Follow the background level: fast when it drops, slow when it rises"""
+        if self.noise_floor_db is None:
+            self.noise_floor_db = level_db
+            return
+        tau_ms = NOISE_FALL_MS if level_db < self.noise_floor_db else NOISE_RISE_MS
+        self.noise_floor_db += (level_db - self.noise_floor_db) * (1.0 - math.exp(-duration_ms / tau_ms))
+
+    def update(self, probabilities: Sequence[float], levels_db: Sequence[float], frame_ms: float) -> float:
+        """
+        Process the VAD frames of one chunk.
+
+        Args:
+            probabilities: Speech probability per frame
+            levels_db: Level per frame in dBFS
+            frame_ms: Frame duration in milliseconds
+
+        Returns:
+            End-of-utterance probability after these frames
+        """
+        for probability, level_db in zip(probabilities, levels_db, strict=True):
+            probability = float(probability)
+            level_db = float(level_db)
+            self.track_noise(level_db, frame_ms)
+            loud = level_db >= self.noise_floor_db + self.snr_margin_db
+
+            threshold = self.threshold * HYSTERESIS if self.in_speech else self.threshold
+            if probability >= threshold and loud:
+                self._onset_ms += frame_ms
+                if self.in_speech or self._onset_ms >= self.onset_ms:
+                    self.in_speech = True
+                    self.speech_heard = True
+                    self._silence_ms = 0.0
+                    self._evidence_ms = 0.0
+                continue
+
+            self._onset_ms = 0.0
+            self._silence_ms += frame_ms
+            if self._silence_ms <= self.hangover_ms:
+                continue
+            self.in_speech = False
+
+            # Background level counts fully (whatever the RMS backend says);
+            # audible frames count less, the more speech-like they are
+            weight = 1.0
+            if loud:
+                weight = 0.5 * (1.0 - min(probability / self.threshold, 1.0) * 0.5) if self.threshold else 0.5
+            if not self.speech_heard:
+                weight *= LEADING_SILENCE_WEIGHT
+            self._evidence_ms += weight * frame_ms
+
+        return self.end_of_utterance_probability
@@ -0,0 +1,90 @@
+"""
+Frame Analysis for Renfield Satellite
+
+Every microphone chunk is decoded once into an AnalyzedChunk: a float32 view
+of the samples plus RMS and dB level. Level metering, VAD, wake word
+detection and normalization all read from the same chunk instead of each
+converting the raw bytes again; results computed by one consumer (VAD
+probability, micro-frontend features) are stored on the chunk for the
+others.
+
+StageTimer accumulates the CPU time of the audio thread per analysis stage
+and is reported with the heartbeat metrics.
+"""
+
+import math
+import time
+from functools import cached_property
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+
+class AnalyzedChunk:
+    """One chunk of 16-bit mono PCM audio, decoded once"""
+
+    def __init__(self, pcm: bytes):
+        """
+        Decode chunk and compute its level.
+
+        Args:
+            pcm: Raw PCM audio bytes (16-bit, mono); a trailing odd byte is ignored
+        """
+        self.pcm = pcm
+        self.int16 = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+        self.samples = self.int16.astype(np.float32)
+
+        if self.samples.size:
+            self.rms = math.sqrt(float(np.dot(self.samples, self.samples)) / self.samples.size)
+        else:
+            self.rms = 0.0
+        self.db = 20 * math.log10(max(self.rms, 1.0) / 32768.0)
+
+        # Filled in by consumers
+        self.speech_probability: Optional[float] = None
+        self.is_speech: Optional[bool] = None
+        self.frame_probabilities: Optional[np.ndarray] = None  # Per VAD frame
+        self.frame_db: Optional[np.ndarray] = None  # Level per VAD frame
+        self.features: Optional[List[np.ndarray]] = None  # Micro-frontend features
+
+    @cached_property
+    def normalized(self) -> np.ndarray:
+        """Samples scaled to [-1, 1] (Silero VAD, pyopen-wakeword)"""
+        return self.samples * (1.0 / 32768.0)
+
+    def __len__(self) -> int:
+        return len(self.pcm)
+
+
+class StageTimer:
+    """CPU time of the audio thread per analysis stage"""
+
+    def __init__(self):
+        self._cpu: Dict[str, float] = {}
+        self._since = time.monotonic()
+
+    def run(self, stage: str, func: Callable[..., Any], *args) -> Any:
+        """Call func(*args) and add its CPU time to *stage*"""
+        started = time.thread_time()
+        try:
+            return func(*args)
+        finally:
+            self._cpu[stage] = self._cpu.get(stage, 0.0) + time.thread_time() - started
+
+    def cpu_seconds(self) -> Dict[str, float]:
+        """CPU seconds per stage since the last snapshot"""
+        return dict(self._cpu)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        CPU usage per stage since the last snapshot, then reset.
+
+        Returns:
+            Dict of stage -> percent of one CPU core
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._since, 1e-6)
+        usage = {stage: round(cpu / elapsed * 100, 2) for stage, cpu in self._cpu.items()}
+        self._cpu = {}
+        self._since = now
+        return usage
@@ -8,6 +8,8 @@ speech recognition quality before sending audio to the backend.
 import numpy as np
 from typing import Optional
 
+from .frame_analysis import AnalyzedChunk
+
 # Try to import noisereduce (optional dependency)
 NOISEREDUCE_AVAILABLE = False
 try:
@@ -120,6 +122,23 @@ class AudioPreprocessor:
         normalized = self._normalize(audio, target_db)
         return normalized.clip(-32768, 32767).astype(np.int16).tobytes()
 
+    def normalize_chunk(self, chunk: AnalyzedChunk, target_db: Optional[float] = None) -> bytes:
+        """
+        Apply only normalization to an analyzed chunk.
+
+        Reuses the chunk's decoded samples and RMS instead of converting
+        the bytes again.
+
+        Args:
+            chunk: Chunk from the frame analysis stage
+            target_db: Target RMS level in dB (default: self.target_db)
+
+        Returns:
+            Normalized audio bytes
+        """
+        normalized = self._normalize(chunk.samples, target_db, rms=chunk.rms)
+        return normalized.clip(-32768, 32767).astype(np.int16).tobytes()
+
     def _reduce_noise(self, audio: np.ndarray) -> np.ndarray:
         """
         Internal noise reduction using spectral gating.
@@ -146,13 +165,19 @@ class AudioPreprocessor:
             print(f"Noise reduction error: {e}")
             return audio
 
-    def _normalize(self, audio: np.ndarray, target_db: Optional[float] = None) -> np.ndarray:
+    def _normalize(
+        self,
+        audio: np.ndarray,
+        target_db: Optional[float] = None,
+        rms: Optional[float] = None,
+    ) -> np.ndarray:
         """
         Normalize audio to target RMS level.
 
         Args:
-            audio: Float32 audio array
+            audio: Float32 audio array (not modified)
             target_db: Target RMS level in dB
+            rms: Precomputed RMS of audio (computed if None)
 
         Returns:
             Normalized audio array
@@ -161,7 +186,8 @@ class AudioPreprocessor:
             target_db = self.target_db
 
         # Calculate current RMS
-        rms = np.sqrt(np.mean(audio ** 2))
+        if rms is None:
+            rms = np.sqrt(np.mean(audio ** 2))
 
         if rms < 1.0:  # Avoid division by zero for silence
             return audio
@@ -0,0 +1,55 @@
+"""
+PCM Ring Buffer for Renfield Satellite
+
+Fixed-size byte ring that always holds the most recent microphone audio.
+Used as pre-roll: on wake word detection the audio of the last few hundred
+milliseconds is streamed together with the rest of the utterance, so speech
+right after the wake word is neither lost nor delayed.
+
+Positions are absolute byte offsets since start. The audio thread is the
+only writer and reads happen on the same thread, so no lock is needed —
+other threads only pass positions around.
+"""
+
+
+class PCMRingBuffer:
+    """Preallocated ring of the last *capacity* bytes of PCM audio."""
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Size in bytes (keep it a multiple of the sample width)
+        """
+        self.capacity = capacity
+        self._buffer = bytearray(capacity)
+        self.position = 0  # Total bytes written since start
+
+    def write(self, data: bytes):
+        """Append audio, overwriting the oldest bytes when full"""
+        size = len(data)
+        if self.capacity:
+            tail = data[-self.capacity:]
+            start = (self.position + size - len(tail)) % self.capacity
+            first = min(len(tail), self.capacity - start)
+            self._buffer[start:start + first] = tail[:first]
+            self._buffer[:len(tail) - first] = tail[first:]
+        self.position += size
+
+    def read_since(self, position: int) -> bytes:
+        """
+        Audio written since *position*.
+
+        Returns at most the last *capacity* bytes — older audio has already
+        been overwritten.
+        """
+        end = self.position
+        start = max(position, end - self.capacity, 0)
+        if start >= end:
+            return b""
+        offset = start % self.capacity
+        size = end - start
+        if offset + size <= self.capacity:
+            return bytes(self._buffer[offset:offset + size])
+        return bytes(self._buffer[offset:]) + bytes(self._buffer[:offset + size - self.capacity])
@@ -11,6 +11,8 @@ import numpy as np
 from typing import Optional, Literal
 from enum import Enum
 
+from .frame_analysis import AnalyzedChunk
+
 
 class VADBackend(str, Enum):
     """Available VAD backends"""
@@ -45,6 +47,17 @@ except ImportError:
 # Silero is available if either PyTorch or ONNX Runtime is installed
 SILERO_AVAILABLE = SILERO_TORCH_AVAILABLE or SILERO_ONNX_AVAILABLE
 
+SILERO_FRAME_SAMPLES = 512  # 32 ms at 16 kHz (model input size)
+FRAME_MS = 30  # Frame length for RMS and WebRTC (WebRTC accepts 10, 20 or 30 ms)
+
+
+def _pad_frames(audio: np.ndarray, size: int) -> np.ndarray:
+    """Split audio into frames of *size* samples, zero-padding the last one"""
+    count = -(-len(audio) // size)
+    padded = np.zeros(count * size, dtype=np.float32)
+    padded[:len(audio)] = audio
+    return padded.reshape(count, size)
+
 
 class VoiceActivityDetector:
     """
@@ -84,6 +97,10 @@ class VoiceActivityDetector:
         self._silero_onnx = None
         self._use_onnx = False
 
+        # Streaming state: samples of an incomplete frame wait for the next chunk
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._last_probability = 0.0
+
         # Initialize selected backend
         self._init_backend()
 
@@ -164,6 +181,95 @@ class VoiceActivityDetector:
         else:
             return self._rms_detect(audio_bytes)
 
+    @property
+    def frame_samples(self) -> int:
+        """Samples per VAD frame for the active backend"""
+        if self.backend == VADBackend.SILERO:
+            return SILERO_FRAME_SAMPLES
+        return self.sample_rate * FRAME_MS // 1000
+
+    @property
+    def frame_ms(self) -> float:
+        """Duration of one VAD frame in milliseconds"""
+        return self.frame_samples * 1000 / self.sample_rate
+
+    @property
+    def threshold(self) -> float:
+        """Probability at which a frame counts as speech"""
+        return self.silero_threshold if self.backend == VADBackend.SILERO else 0.5
+
+    def process_chunk(self, chunk: AnalyzedChunk) -> bool:
+        """
+        Detect speech in an analyzed chunk, frame by frame.
+
+        The chunk is cut into fixed frames (30 ms, Silero: 32 ms); samples of
+        an incomplete last frame are kept for the next chunk, so every frame
+        is evaluated exactly once. Stores frame_probabilities and frame_db
+        (for the endpointer) plus speech_probability (highest frame) and
+        is_speech on the chunk.
+
+        Args:
+            chunk: Chunk from the frame analysis stage
+
+        Returns:
+            True if speech detected, False if silence
+        """
+        frames = self._split_frames(chunk.samples)
+        energy = np.einsum("ij,ij->i", frames, frames) / frames.shape[1]
+        chunk.frame_db = 20 * np.log10(np.maximum(np.sqrt(energy), 1.0) / 32768.0)
+        chunk.frame_probabilities = self._frame_probabilities(frames, energy)
+
+        # A chunk shorter than a frame keeps the previous decision
+        if len(frames):
+            self._last_probability = float(chunk.frame_probabilities.max())
+        chunk.speech_probability = self._last_probability
+        chunk.is_speech = self._last_probability >= self.threshold
+        return chunk.is_speech
+
+    def _split_frames(self, samples: np.ndarray) -> np.ndarray:
+        """Complete frames of carry + samples, shape (frames, frame_samples)"""
+        if len(self._carry):
+            samples = np.concatenate((self._carry, samples))
+        size = self.frame_samples
+        usable = len(samples) // size * size
+        self._carry = samples[usable:].copy()
+        return samples[:usable].reshape(-1, size)
+
+    def _frame_probabilities(self, frames: np.ndarray, energy: np.ndarray) -> np.ndarray:
+        """Speech probability per frame (binary for RMS and WebRTC)"""
+        rms_decision = (np.sqrt(energy) >= self.rms_threshold).astype(np.float32)
+        if not len(frames):
+            return rms_decision
+
+        if self.backend == VADBackend.SILERO:
+            if self._use_onnx and self._silero_onnx is not None:
+                return self._silero_onnx.get_frame_probabilities(frames / 32768.0)
+            if self._silero_model is not None:
+                try:
+                    return self._silero_torch_probabilities(frames / 32768.0)
+                except Exception:
+                    return rms_decision
+
+        elif self.backend == VADBackend.WEBRTC and self._webrtc_vad is not None:
+            try:
+                pcm = frames.astype(np.int16)
+                return np.array(
+                    [self._webrtc_vad.is_speech(frame.tobytes(), self.sample_rate) for frame in pcm],
+                    dtype=np.float32,
+                )
+            except Exception:
+                return rms_decision
+
+        return rms_decision
+
+    def _silero_torch_probabilities(self, frames: np.ndarray) -> np.ndarray:
+        """Silero (PyTorch) probability per 512-sample frame"""
+        return np.array(
+            [self._silero_model(torch.from_numpy(np.ascontiguousarray(frame)), self.sample_rate).item()
+             for frame in frames],
+            dtype=np.float32,
+        )
+
     def _rms_detect(self, audio_bytes: bytes) -> bool:
         """RMS-based speech detection"""
         try:
@@ -188,13 +294,15 @@ class VoiceActivityDetector:
             if frame_size in (160, 320, 480):
                 return self._webrtc_vad.is_speech(audio_bytes, self.sample_rate)
 
-            # Otherwise, check multiple frames and vote
+            # Otherwise, check every complete frame and vote
             valid_sizes = [480, 320, 160]  # Prefer larger frames
             for size in valid_sizes:
                 if frame_size >= size:
-                    # Take the first complete frame
-                    frame = audio_bytes[:size * 2]
-                    return self._webrtc_vad.is_speech(frame, self.sample_rate)
+                    votes = [
+                        self._webrtc_vad.is_speech(audio_bytes[i:i + size * 2], self.sample_rate)
+                        for i in range(0, frame_size // size * size * 2, size * 2)
+                    ]
+                    return sum(votes) * 2 >= len(votes)
 
             # Frame too small, fall back to RMS
             return self._rms_detect(audio_bytes)
@@ -214,15 +322,11 @@ class VoiceActivityDetector:
             return self._rms_detect(audio_bytes)
 
         try:
-            # Convert to float tensor
-            audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
-            audio = audio / 32768.0  # Normalize to [-1, 1]
-
-            # Convert to torch tensor
-            audio_tensor = torch.from_numpy(audio)
-
-            # Get speech probability
-            speech_prob = self._silero_model(audio_tensor, self.sample_rate).item()
+            # Normalize to [-1, 1] and run the model on fixed 512-sample frames
+            audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+            if not len(audio):
+                return False
+            speech_prob = self._silero_torch_probabilities(_pad_frames(audio, SILERO_FRAME_SAMPLES)).max()
 
             return speech_prob >= self.silero_threshold
 
@@ -250,10 +354,9 @@ class VoiceActivityDetector:
             # PyTorch backend
             if self._silero_model is not None:
                 try:
-                    audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
-                    audio = audio / 32768.0
-                    audio_tensor = torch.from_numpy(audio)
-                    return self._silero_model(audio_tensor, self.sample_rate).item()
+                    audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+                    frames = _pad_frames(audio, SILERO_FRAME_SAMPLES)
+                    return float(self._silero_torch_probabilities(frames).max()) if len(frames) else 0.0
                 except Exception:
                     pass
 
@@ -262,6 +365,9 @@ class VoiceActivityDetector:
 
     def reset(self):
         """Reset VAD state (for backends that maintain state)"""
+        self._carry = np.zeros(0, dtype=np.float32)
+        self._last_probability = 0.0
+
         if self.backend == VADBackend.SILERO:
             # ONNX backend
             if self._use_onnx and self._silero_onnx is not None:
@@ -407,23 +513,48 @@ class SileroVADLite:
         if self._session is None:
             return 0.5  # Neutral if model not loaded
 
-        try:
-            # Convert to float32 array
-            audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32)
-            audio = audio / 32768.0  # Normalize to [-1, 1]
+        # Convert to float32 array, normalized to [-1, 1]
+        audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+        return self.get_samples_probability(audio)
+
+    def get_samples_probability(self, audio: np.ndarray) -> float:
+        """
+        Get speech probability of already decoded audio.
+
+        Args:
+            audio: Float32 samples normalized to [-1, 1]
+
+        Returns:
+            Speech probability (0-1)
+        """
+        if self._session is None:
+            return 0.5  # Neutral if model not loaded
+
+        # Silero VAD requires small chunks (max ~640 samples at 16kHz).
+        # Process in 512-sample frames (32ms), pad the last one with zeros
+        # and return the highest probability.
+        probabilities = self.get_frame_probabilities(_pad_frames(audio, SILERO_FRAME_SAMPLES))
+        return float(probabilities.max()) if len(probabilities) else 0.0
+
+    def get_frame_probabilities(self, frames: np.ndarray) -> np.ndarray:
+        """
+        Get speech probability per frame, carrying the model state across frames.
+
+        Args:
+            frames: Float32 array (frames, 512) normalized to [-1, 1]
 
-            # Silero VAD requires small chunks (max ~640 samples at 16kHz).
-            # Process in 512-sample frames (32ms) and return mean probability.
-            frame_size = 512
+        Returns:
+            Speech probability per frame (0.5 if the model is unavailable)
+        """
+        probabilities = np.full(len(frames), 0.5, dtype=np.float32)
+        if self._session is None:
+            return probabilities
+
+        try:
             sr_input = self._sr_input_scalar if self._use_new_format else self._sr_input_array
 
-            frame_probs = []
-            for i in range(0, len(audio), frame_size):
-                chunk = audio[i:i + frame_size]
-                if len(chunk) < frame_size:
-                    # Pad last chunk with zeros if too short
-                    chunk = np.pad(chunk, (0, frame_size - len(chunk)))
-                chunk = chunk.reshape(1, -1)
+            for i, frame in enumerate(frames):
+                chunk = np.ascontiguousarray(frame, dtype=np.float32).reshape(1, -1)
 
                 if self._use_new_format:
                     ort_inputs = {
@@ -441,13 +572,12 @@ class SileroVADLite:
                     }
                     output, self._h, self._c = self._session.run(None, ort_inputs)
 
-                frame_probs.append(float(output[0][0]))
+                probabilities[i] = float(output[0][0])
 
-            return max(frame_probs) if frame_probs else 0.0
+        except Exception:
+            pass  # Remaining frames stay neutral
 
-        except Exception as e:
-            # Return neutral on error
-            return 0.5
+        return probabilities
 
     def reset(self):
         """Reset hidden states"""
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Renfield Wake Word Benchmark
+
+Feeds audio through WakeWordDetector chunk by chunk, exactly like the
+satellite's audio thread, and reports the real-time factor (CPU time per
+second of audio; 0.10 = 10% of one core). With --compare every model is
+also measured alone, to show the cost of running several wake words and
+stop words at once against a single one.
+
+Usage:
+    renfield-wakeword-bench                                   # alexa, 60 s synthetic audio
+    renfield-wakeword-bench -k alexa hey_jarvis -s stop --compare
+    renfield-wakeword-bench --wav recording.wav --json
+"""
+
+import argparse
+import json
+import time
+import wave
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..audio.frame_analysis import AnalyzedChunk
+from ..wakeword.detector import WakeWordDetector
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_audio(seconds: float, seed: int = 7) -> bytes:
+    """Room noise with short speech-like bursts (16-bit mono PCM)"""
+    rng = np.random.default_rng(seed)
+    samples = int(seconds * SAMPLE_RATE)
+    audio = rng.normal(0, 300, samples)
+    t = np.arange(SAMPLE_RATE // 2) / SAMPLE_RATE
+    for start in range(SAMPLE_RATE, samples - len(t), 3 * SAMPLE_RATE):
+        pitch = rng.uniform(120, 240)
+        burst = np.sin(2 * np.pi * pitch * t) + 0.5 * np.sin(2 * np.pi * 2 * pitch * t)
+        audio[start:start + len(t)] += 4000 * burst * np.hanning(len(t))
+    return audio.clip(-32768, 32767).astype(np.int16).tobytes()
+
+
+def load_wav(path: str) -> bytes:
+    """16 kHz 16-bit PCM of a WAV file (first channel)"""
+    with wave.open(path, "rb") as wav:
+        if wav.getframerate() != SAMPLE_RATE or wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16 kHz 16-bit PCM")
+        audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        return audio[::wav.getnchannels()].tobytes()
+
+
+def run(detector: WakeWordDetector, audio: bytes, chunk_size: int = 1280) -> Dict:
+    """
+    Process *audio* in chunks and measure CPU time.
+
+    Returns:
+        Dict with audio seconds, CPU seconds, real-time factor and
+        CPU seconds per stage (features, wakeword)
+    """
+    chunk_bytes = chunk_size * 2
+    detector.stage_timer.snapshot()  # Drop earlier measurements
+    detections = 0
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for offset in range(0, len(audio) - chunk_bytes + 1, chunk_bytes):
+        chunk = AnalyzedChunk(audio[offset:offset + chunk_bytes])
+        if detector.process_audio(chunk):
+            detections += 1
+    cpu_seconds = time.process_time() - cpu_start
+    wall_seconds = time.perf_counter() - wall_start
+
+    audio_seconds = len(audio) / 2 / SAMPLE_RATE
+    stages = detector.stage_timer.cpu_seconds()
+    return {
+        "models": detector.active_keywords + detector.active_stop_words,
+        "audio_seconds": round(audio_seconds, 1),
+        "cpu_seconds": round(cpu_seconds, 3),
+        "real_time_factor": round(cpu_seconds / audio_seconds, 4) if audio_seconds else 0.0,
+        "wall_seconds": round(wall_seconds, 3),
+        "stage_cpu_seconds": {stage: round(seconds, 3) for stage, seconds in stages.items()},
+        "detections": detections,
+    }
+
+
+def _detector(models_path: str, keywords: List[str], stop_words: List[str]) -> Optional[WakeWordDetector]:
+    detector = WakeWordDetector(models_path=models_path, keywords=keywords, stop_words=stop_words)
+    if not detector.load():
+        return None
+    return detector
+
+
+def format_report(results: List[Dict]) -> str:
+    lines = [f"{'Models':<40} {'RTF':>8} {'CPU s':>8} {'features':>9} {'wakeword':>9}"]
+    for data in results:
+        stages = data["stage_cpu_seconds"]
+        lines.append(
+            f"{', '.join(data['models']):<40} {data['real_time_factor']:>8.4f} {data['cpu_seconds']:>8.2f} "
+            f"{stages.get('features', 0.0):>9.2f} {stages.get('wakeword', 0.0):>9.2f}"
+        )
+    if results:
+        lines.append(f"Audio: {results[0]['audio_seconds']} s — RTF = CPU time / audio time (lower is better)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark wake word detection (real-time factor)")
+    parser.add_argument("-k", "--keywords", nargs="+", default=["alexa"], help="Wake words (default: alexa)")
+    parser.add_argument("-s", "--stop-words", nargs="*", default=[], help="Stop words")
+    parser.add_argument("--models-path", default="/opt/renfield-satellite/models", help="Model directory")
+    parser.add_argument("--wav", help="16 kHz 16-bit WAV file instead of synthetic audio")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Synthetic audio length (default: 60)")
+    parser.add_argument("--chunk-size", type=int, default=1280, help="Samples per chunk (default: 1280)")
+    parser.add_argument("--compare", action="store_true", help="Also measure every model alone")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    audio = load_wav(args.wav) if args.wav else synthetic_audio(args.seconds)
+
+    setups = [(args.keywords, args.stop_words)]
+    if args.compare:
+        setups += [([keyword], []) for keyword in args.keywords]
+        setups += [([args.keywords[0]], [stop_word]) for stop_word in args.stop_words]
+
+    results = []
+    for keywords, stop_words in setups:
+        detector = _detector(args.models_path, keywords, stop_words)
+        if detector is None:
+            print(f"No wake word model could be loaded for {keywords + stop_words}")
+            continue
+        results.append(run(detector, audio, args.chunk_size))
+
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+
+if __name__ == "__main__":
+    main()
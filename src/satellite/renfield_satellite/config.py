@@ -44,6 +44,7 @@ class BeamformingConfig:
     enabled: bool = False
     mic_spacing: float = 0.058  # ReSpeaker 2-Mics: 58mm
     steering_angle: float = 0.0  # 0 = front-facing
+    auto_steer: bool = True  # Steer to the talker (GCC-PHAT) after wake word detection
 
 
 @dataclass
@@ -55,6 +56,7 @@ class AudioConfig:
     use_arecord: bool = False  # Use arecord subprocess (required for AC108 4-mic + onnxruntime)
     device: str = "plughw:1,0"  # ReSpeaker default
     playback_device: str = "plughw:1,0"
+    preroll_ms: int = 300  # Audio before wake word detection sent with the utterance (0 = off)
     beamforming: BeamformingConfig = field(default_factory=BeamformingConfig)
 
 
@@ -74,6 +76,8 @@ class VADConfig:
     backend: str = "rms"  # "rms", "webrtc", or "silero"
     silence_threshold: int = 500  # RMS threshold (for RMS backend)
     silence_duration_ms: int = 1500  # ms of silence to end recording
+    hangover_ms: int = 300  # Pause after speech that never counts as silence
+    end_of_utterance_threshold: float = 0.95  # End-of-utterance probability that ends recording
     min_listening_seconds: float = 2.0  # Grace period before silence detection starts
     max_recording_seconds: float = 15.0  # Maximum recording length
     webrtc_aggressiveness: int = 2  # WebRTC VAD aggressiveness (0-3)
@@ -185,6 +189,7 @@ def load_config(config_path: Optional[str] = None) -> Config:
         config.audio.use_arecord = aud.get("use_arecord", config.audio.use_arecord)
         config.audio.device = aud.get("device", config.audio.device)
         config.audio.playback_device = aud.get("playback_device", config.audio.playback_device)
+        config.audio.preroll_ms = aud.get("preroll_ms", config.audio.preroll_ms)
 
         # Beamforming config
         if "beamforming" in aud:
@@ -192,6 +197,7 @@ def load_config(config_path: Optional[str] = None) -> Config:
             config.audio.beamforming.enabled = bf.get("enabled", config.audio.beamforming.enabled)
             config.audio.beamforming.mic_spacing = bf.get("mic_spacing", config.audio.beamforming.mic_spacing)
             config.audio.beamforming.steering_angle = bf.get("steering_angle", config.audio.beamforming.steering_angle)
+            config.audio.beamforming.auto_steer = bf.get("auto_steer", config.audio.beamforming.auto_steer)
 
     if "wakeword" in config_data:
         ww = config_data["wakeword"]
@@ -207,6 +213,10 @@ def load_config(config_path: Optional[str] = None) -> Config:
         config.vad.backend = vad.get("backend", config.vad.backend)
         config.vad.silence_threshold = vad.get("silence_threshold", config.vad.silence_threshold)
         config.vad.silence_duration_ms = vad.get("silence_duration_ms", config.vad.silence_duration_ms)
+        config.vad.hangover_ms = vad.get("hangover_ms", config.vad.hangover_ms)
+        config.vad.end_of_utterance_threshold = vad.get(
+            "end_of_utterance_threshold", config.vad.end_of_utterance_threshold
+        )
         config.vad.min_listening_seconds = vad.get("min_listening_seconds", config.vad.min_listening_seconds)
         config.vad.max_recording_seconds = vad.get("max_recording_seconds", config.vad.max_recording_seconds)
         config.vad.webrtc_aggressiveness = vad.get("webrtc_aggressiveness", config.vad.webrtc_aggressiveness)
@@ -0,0 +1,158 @@
+"""
+Binary audio frames for the server WebSocket (protocol 1.1).
+
+Mirror of the server's services/audio_frames.py:
+
+    offset  size  field
+    0       1     frame type  (1 = microphone audio, 2 = TTS audio)
+    1       1     codec       (0 = PCM s16le, 1 = Opus, 2 = WAV)
+    2       1     flags       (bit 0: final TTS chunk)
+    3       1     session id length N
+    4       4     sequence    (uint32, little endian)
+    8       N     session id  (UTF-8)
+    8+N     ...   payload
+
+Opus payloads are 20 ms packets, each prefixed with its uint16 length.
+Microphone audio is 16 kHz mono, Opus TTS 24 kHz mono.
+"""
+
+import io
+import struct
+import wave
+from dataclasses import dataclass
+from typing import List
+
+# Optional: opuslib (needs libopus0)
+try:
+    import opuslib
+    OPUS_AVAILABLE = True
+except Exception:  # ImportError, or libopus missing
+    opuslib = None
+    OPUS_AVAILABLE = False
+
+FRAME_AUDIO = 1
+FRAME_TTS = 2
+
+CODEC_PCM = 0
+CODEC_OPUS = 1
+CODEC_WAV = 2
+CODECS = {"pcm": CODEC_PCM, "opus": CODEC_OPUS, "wav": CODEC_WAV}
+
+FLAG_FINAL = 0x01
+
+_HEADER = struct.Struct("<BBBBI")
+
+MIC_SAMPLE_RATE = 16000
+TTS_OPUS_SAMPLE_RATE = 24000
+OPUS_FRAME_MS = 20
+
+
+class AudioFrameError(Exception):
+    """Raised for malformed binary audio frames"""
+    pass
+
+
+@dataclass
+class AudioFrame:
+    """One binary audio frame"""
+    frame_type: int
+    codec: int
+    session_id: str
+    sequence: int
+    payload: bytes
+    is_final: bool = False
+
+
+def encode_frame(frame: AudioFrame) -> bytes:
+    """Serialize a frame"""
+    session = frame.session_id.encode("utf-8")
+    if len(session) > 255:
+        raise AudioFrameError("Session ID too long")
+    flags = FLAG_FINAL if frame.is_final else 0
+    header = _HEADER.pack(frame.frame_type, frame.codec, flags, len(session), frame.sequence & 0xFFFFFFFF)
+    return header + session + frame.payload
+
+
+def decode_frame(data: bytes) -> AudioFrame:
+    """Parse a frame; raises AudioFrameError if it is malformed"""
+    if len(data) < _HEADER.size:
+        raise AudioFrameError(f"Frame too short ({len(data)} bytes)")
+    frame_type, codec, flags, session_len, sequence = _HEADER.unpack_from(data)
+    if codec not in CODECS.values():
+        raise AudioFrameError(f"Unknown codec {codec}")
+    end = _HEADER.size + session_len
+    if len(data) < end:
+        raise AudioFrameError("Truncated session ID")
+    try:
+        session_id = data[_HEADER.size:end].decode("utf-8")
+    except UnicodeDecodeError as e:
+        raise AudioFrameError("Invalid session ID") from e
+    return AudioFrame(
+        frame_type=frame_type,
+        codec=codec,
+        session_id=session_id,
+        sequence=sequence,
+        payload=data[end:],
+        is_final=bool(flags & FLAG_FINAL),
+    )
+
+
+def pack_opus_packets(packets: List[bytes]) -> bytes:
+    return b"".join(struct.pack("<H", len(packet)) + packet for packet in packets)
+
+
+def unpack_opus_packets(payload: bytes) -> List[bytes]:
+    packets = []
+    offset = 0
+    while offset < len(payload):
+        if offset + 2 > len(payload):
+            raise AudioFrameError("Truncated Opus packet length")
+        (length,) = struct.unpack_from("<H", payload, offset)
+        offset += 2
+        if offset + length > len(payload):
+            raise AudioFrameError("Truncated Opus packet")
+        packets.append(payload[offset:offset + length])
+        offset += length
+    return packets
+
+
+class OpusStreamEncoder:
+    """Encode a stream of 16-bit mono PCM into 20 ms Opus packets"""
+
+    def __init__(self, sample_rate: int = MIC_SAMPLE_RATE, application: str = "voip"):
+        self.frame_samples = sample_rate * OPUS_FRAME_MS // 1000
+        self._encoder = opuslib.Encoder(sample_rate, 1, application)
+        self._pending = b""
+
+    def encode(self, pcm: bytes) -> bytes:
+        """Encode all complete frames; the remainder waits for more audio"""
+        self._pending += pcm
+        frame_bytes = self.frame_samples * 2
+        packets = []
+        while len(self._pending) >= frame_bytes:
+            packets.append(self._encoder.encode(self._pending[:frame_bytes], self.frame_samples))
+            self._pending = self._pending[frame_bytes:]
+        return pack_opus_packets(packets)
+
+    def flush(self) -> bytes:
+        """Encode the remainder, padded with silence"""
+        if not self._pending:
+            return b""
+        pcm = self._pending.ljust(self.frame_samples * 2, b"\x00")
+        self._pending = b""
+        return pack_opus_packets([self._encoder.encode(pcm, self.frame_samples)])
+
+
+def decode_tts_opus(payload: bytes) -> bytes:
+    """Decode packed Opus TTS packets into a 24 kHz WAV for playback"""
+    decoder = opuslib.Decoder(TTS_OPUS_SAMPLE_RATE, 1)
+    frame_samples = TTS_OPUS_SAMPLE_RATE * OPUS_FRAME_MS // 1000
+    pcm = b"".join(decoder.decode(packet, frame_samples) for packet in unpack_opus_packets(payload))
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(TTS_OPUS_SAMPLE_RATE)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
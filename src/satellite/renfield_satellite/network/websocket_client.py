@@ -15,6 +15,19 @@ from enum import Enum
 from typing import Any, Callable, Dict, List, Optional
 
 from renfield_satellite import __version__
+from renfield_satellite.network.audio_frames import (
+    CODEC_OPUS,
+    CODEC_PCM,
+    FRAME_AUDIO,
+    FRAME_TTS,
+    OPUS_AVAILABLE,
+    AudioFrame,
+    AudioFrameError,
+    OpusStreamEncoder,
+    decode_frame,
+    decode_tts_opus,
+    encode_frame,
+)
 
 try:
     import websockets
@@ -47,6 +60,7 @@ class ServerConfig:
     cooldown_ms: int = 2000
     protocol_version: str = "1.0"
     room_id: Optional[int] = None
+    audio_transport: Optional[Dict[str, Any]] = None  # Binary audio (protocol 1.1), None = JSON/base64
 
 
 class WebSocketClient:
@@ -99,7 +113,7 @@ class WebSocketClient:
         self._verify_tls: bool = True
 
         # Protocol version
-        self._protocol_version: str = "1.0"
+        self._protocol_version: str = "1.1"
 
         # Callbacks
         self._on_state_change: Optional[Callable[[str], None]] = None
@@ -122,6 +136,8 @@ class WebSocketClient:
         # Session tracking
         self._current_session_id: Optional[str] = None
         self._audio_sequence: int = 0
+        self._opus_encoder: Optional[OpusStreamEncoder] = None
+        self._opus_session_id: Optional[str] = None
         self._start_time: float = time.time()
 
     @property
@@ -320,6 +336,9 @@ class WebSocketClient:
                 "speaker": True,
                 "led_count": 3,
                 "button": True,
+                "tts_streaming": True,
+                "binary_audio": True,
+                "audio_codecs": ["pcm", "opus"] if OPUS_AVAILABLE else ["pcm"],
             },
             "protocol_version": self._protocol_version
         }
@@ -341,9 +360,12 @@ class WebSocketClient:
                     threshold=config.get("threshold", 0.5),
                     cooldown_ms=config.get("cooldown_ms", 2000),
                     protocol_version=server_protocol,
-                    room_id=room_id
+                    room_id=room_id,
+                    audio_transport=data.get("audio_transport"),
                 )
                 print(f"Registered successfully. Server protocol: {server_protocol}")
+                transport = self._server_config.audio_transport
+                print(f"Audio transport: {'binary/' + transport.get('codec', 'pcm') if transport else 'json/base64'}")
                 print(f"Config: wake_words={self._server_config.wake_words}, threshold={self._server_config.threshold}")
 
                 if self._on_connected:
@@ -402,6 +424,9 @@ class WebSocketClient:
             while self._running and self._ws:
                 try:
                     message = await self._ws.recv()
+                    if isinstance(message, bytes):
+                        self._handle_binary_message(message)
+                        continue
                     data = json.loads(message)
                     await self._handle_message(data)
 
@@ -421,6 +446,29 @@ class WebSocketClient:
                 if self._on_disconnected:
                     self._on_disconnected()
 
+    def _handle_binary_message(self, message: bytes):
+        """Handle a binary TTS audio frame (protocol 1.1)"""
+        if len(message) > MAX_AUDIO_PAYLOAD_BYTES:
+            print(f"⚠️ TTS audio frame too large ({len(message)} bytes), skipping playback")
+            return
+        try:
+            frame = decode_frame(message)
+        except AudioFrameError as e:
+            print(f"Invalid audio frame received: {e}")
+            return
+        if frame.frame_type != FRAME_TTS:
+            return
+
+        audio_bytes = frame.payload
+        if frame.codec == CODEC_OPUS and audio_bytes:
+            try:
+                audio_bytes = decode_tts_opus(audio_bytes)
+            except Exception as e:
+                print(f"⚠️ Failed to decode Opus TTS audio: {e}")
+                audio_bytes = b""  # Still deliver is_final so the state machine doesn't hang
+        if self._on_tts_audio:
+            self._on_tts_audio(frame.session_id, audio_bytes, frame.is_final)
+
     async def _handle_message(self, data: Dict[str, Any]):
         """Handle incoming message from server"""
         msg_type = data.get("type", "")
@@ -494,6 +542,7 @@ class WebSocketClient:
                 cooldown_ms=config_data.get("cooldown_ms", self._server_config.cooldown_ms if self._server_config else 2000),
                 protocol_version=self._server_config.protocol_version if self._server_config else "1.0",
                 room_id=self._server_config.room_id if self._server_config else None,
+                audio_transport=self._server_config.audio_transport if self._server_config else None,
             )
             self._server_config = new_config
             print(f"Config update received: wake_words={new_config.wake_words}, threshold={new_config.threshold}")
@@ -614,12 +663,36 @@ class WebSocketClient:
 
         self._audio_sequence += 1
 
-        await self._send({
-            "type": "audio",
-            "session_id": session_id,
-            "chunk": base64.b64encode(audio_bytes).decode("utf-8"),
-            "sequence": self._audio_sequence
-        })
+        transport = self._server_config.audio_transport if self._server_config else None
+        if not transport:
+            await self._send({
+                "type": "audio",
+                "session_id": session_id,
+                "chunk": base64.b64encode(audio_bytes).decode("utf-8"),
+                "sequence": self._audio_sequence
+            })
+            return
+
+        codec, payload = CODEC_PCM, audio_bytes
+        if transport.get("codec") == "opus" and OPUS_AVAILABLE:
+            if self._opus_session_id != session_id:
+                self._opus_encoder = OpusStreamEncoder()
+                self._opus_session_id = session_id
+            codec, payload = CODEC_OPUS, self._opus_encoder.encode(audio_bytes)
+            if not payload:
+                return  # Less than one Opus frame buffered
+        await self._send_frame(session_id, codec, payload)
+
+    async def _send_frame(self, session_id: str, codec: int, payload: bytes):
+        """Send a binary microphone audio frame"""
+        if self._ws:
+            await self._ws.send(encode_frame(AudioFrame(
+                frame_type=FRAME_AUDIO,
+                codec=codec,
+                session_id=session_id,
+                sequence=self._audio_sequence,
+                payload=payload,
+            )))
 
     async def send_audio_end(
         self,
@@ -636,6 +709,15 @@ class WebSocketClient:
         if not self.is_connected:
             return
 
+        # Send the Opus encoder's remainder before ending the stream
+        if self._opus_encoder and self._opus_session_id == session_id:
+            remainder = self._opus_encoder.flush()
+            self._opus_encoder = None
+            self._opus_session_id = None
+            if remainder and reason != "canceled":
+                self._audio_sequence += 1
+                await self._send_frame(session_id, CODEC_OPUS, remainder)
+
         await self._send({
             "type": "audio_end",
             "session_id": session_id,
@@ -10,16 +10,17 @@ Orchestrates all satellite components:
 """
 
 import asyncio
-import math
-import struct
 import time
 from enum import Enum
 from typing import Optional, Dict, Any
 
 from .config import Config
 from .audio.capture import AudioCapture
+from .audio.endpointer import Endpointer
+from .audio.frame_analysis import AnalyzedChunk, StageTimer
 from .audio.playback import AudioPlayback, AudioPlaybackAsync
 from .audio.preprocessor import AudioPreprocessor
+from .audio.ring_buffer import PCMRingBuffer
 from .audio.vad import VoiceActivityDetector, VADBackend
 from .wakeword.detector import WakeWordDetector, Detection
 from .hardware.led import LEDController, LEDPattern
@@ -37,6 +38,9 @@ from .update import UpdateManager, UpdateStage
 # Maximum audio buffer chunks to prevent unbounded memory growth (~40s at 12.5 chunks/sec)
 MAX_AUDIO_BUFFER_CHUNKS = 500
 
+# Pre-roll ring keeps this much audio beyond preroll_ms — covers the wake word handshake
+PREROLL_SLACK_SECONDS = 2.0
+
 
 class SatelliteState(str, Enum):
     """Satellite operational states"""
@@ -71,12 +75,22 @@ class Satellite:
         # Current session
         self._session_id: Optional[str] = None
         self._audio_buffer: list = []
-        self._silence_chunks: int = 0  # Consecutive non-speech chunks (for audio-time silence detection)
         self._listening_start: Optional[float] = None  # When listening state began
         self._processing_start: Optional[float] = None  # Track when processing started
         self._processing_timeout: float = 30.0  # Max time to wait for server response
         self._reconnecting: bool = False  # Prevent duplicate reconnection attempts
         self._wakeword_pending: bool = False  # Prevent duplicate wakeword processing
+        self._tts_lock: Optional[asyncio.Lock] = None  # Plays streamed TTS chunks one after another
+        self._tts_pending: int = 0  # TTS chunks received but not yet played
+        self._idle_after_tts: bool = False  # Server ended the session while TTS was still queued
+        self._canceled_session_id: Optional[str] = None  # Barge-in: drop further TTS of this session
+
+        # Pre-roll: the audio thread always writes into the ring; a new session
+        # streams from _stream_from (ring position) on its first LISTENING chunk
+        sample_rate = config.audio.sample_rate
+        self._preroll_bytes = int(config.audio.preroll_ms * sample_rate / 1000) * 2
+        self._preroll = PCMRingBuffer(self._preroll_bytes + int(PREROLL_SLACK_SECONDS * sample_rate) * 2)
+        self._stream_from: Optional[int] = None
 
         # Metrics tracking
         self._last_wakeword: Optional[Dict[str, Any]] = None
@@ -88,6 +102,16 @@ class Satellite:
         self._current_audio_db: float = -96.0
         self._current_is_speech: bool = False
 
+        # CPU time per audio analysis stage (reported with the heartbeat)
+        self._stage_timer = StageTimer()
+
+        # End-of-speech detection on VAD frames (audio time, immune to CPU lag);
+        # the threshold is taken from the VAD in _init_components
+        self._endpointer = Endpointer(
+            silence_duration_ms=config.vad.silence_duration_ms,
+            hangover_ms=config.vad.hangover_ms,
+        )
+
         # Initialize components
         self._init_components()
 
@@ -136,6 +160,9 @@ class Satellite:
             silero_threshold=self.config.vad.silero_threshold,
         )
 
+        # Endpoint on the threshold of the backend the VAD actually runs (after fallback)
+        self._endpointer.threshold = self.vad.threshold
+
         # Wake word detector
         self.wakeword = WakeWordDetector(
             models_path=self.config.wakeword.models_path,
@@ -143,6 +170,7 @@ class Satellite:
             threshold=self.config.wakeword.threshold,
             stop_words=self.config.wakeword.stop_words,
             refractory_seconds=self.config.wakeword.refractory_seconds,
+            stage_timer=self._stage_timer,
         )
 
         # LED controller
@@ -464,31 +492,35 @@ class Satellite:
 
     def _on_audio_chunk(self, audio_bytes: bytes):
         """Handle incoming audio chunk from microphone (called from audio thread)"""
-        # Calculate audio levels for monitoring (runs on every chunk)
-        try:
-            if len(audio_bytes) >= 2:
-                samples = struct.unpack(f"<{len(audio_bytes)//2}h", audio_bytes)
-                if samples:
-                    rms = (sum(s * s for s in samples) / len(samples)) ** 0.5
-                    self._current_audio_rms = round(rms, 1)
-                    self._current_audio_db = round(20 * math.log10(max(rms, 1) / 32768.0), 1)
-                    # Simple VAD: speech if RMS > threshold
-                    self._current_is_speech = rms > 500
-        except Exception:
-            pass
+        # Decode once; levels, VAD, wake word and normalization share the chunk
+        chunk = self._stage_timer.run("decode", AnalyzedChunk, audio_bytes)
+        self._current_audio_rms = round(chunk.rms, 1)
+        self._current_audio_db = round(chunk.db, 1)
+        # Simple VAD for monitoring: speech if RMS > threshold (the real VAD runs while listening)
+        self._current_is_speech = chunk.rms > 500
+
+        self._preroll.write(audio_bytes)
+        if self._state != SatelliteState.LISTENING:
+            # Background level for the endpointer's noise floor (VAD frames update it while listening)
+            self._endpointer.track_noise(chunk.db, len(chunk.samples) * 1000 / self.config.audio.sample_rate)
 
         # Process for wake word in IDLE state
         if self._state == SatelliteState.IDLE and not self._wakeword_pending:
-            detection = self.wakeword.process_audio(audio_bytes)
+            detection = self.wakeword.process_audio(chunk)
             if detection and not detection.is_stop_word:
                 # Set flag immediately to prevent duplicate detection
                 self._wakeword_pending = True
-                self._schedule_async(self._on_wakeword_detected(detection.keyword, detection.confidence))
+                # Until LISTENING, chunks only land in the ring — the session streams them from here
+                stream_from = max(0, self._preroll.position - self._preroll_bytes)
+                self._schedule_async(
+                    self._on_wakeword_detected(detection.keyword, detection.confidence, stream_from)
+                )
             return
 
-        # Check for stop words during LISTENING or PROCESSING (only if stop words configured)
-        if self._state in (SatelliteState.LISTENING, SatelliteState.PROCESSING) and self.wakeword.active_stop_words:
-            detection = self.wakeword.process_audio(audio_bytes)
+        # Check for stop words during LISTENING, PROCESSING or SPEAKING (barge-in, only if stop words configured)
+        if self._state in (SatelliteState.LISTENING, SatelliteState.PROCESSING, SatelliteState.SPEAKING) \
+                and self.wakeword.active_stop_words:
+            detection = self.wakeword.process_audio(chunk)
             if detection and detection.is_stop_word:
                 print(f"Stop word detected: {detection.keyword}")
                 self._schedule_async(self._cancel_interaction())
@@ -496,38 +528,61 @@ class Satellite:
 
         # Buffer and stream audio in LISTENING state
         if self._state == SatelliteState.LISTENING:
-            # Normalize audio for consistent volume (real-time, low latency)
-            normalized_audio = self.preprocessor.normalize(audio_bytes)
-            self._audio_buffer.append(normalized_audio)
-            if len(self._audio_buffer) > MAX_AUDIO_BUFFER_CHUNKS:
-                self._audio_buffer = self._audio_buffer[-MAX_AUDIO_BUFFER_CHUNKS:]
-
-            # Stream normalized audio to server
-            if self._session_id:
-                self._schedule_async(
-                    self.ws_client.send_audio_chunk(self._session_id, normalized_audio)
-                )
+            if self._stream_from is not None:
+                # First chunk of the session: pre-roll + audio captured during the handshake
+                pending = self._preroll.read_since(self._stream_from)
+                self._stream_from = None
+                chunk_bytes = self.config.audio.chunk_size * 2
+                for offset in range(0, len(pending), chunk_bytes):
+                    self._stream_audio(
+                        self._stage_timer.run("decode", AnalyzedChunk, pending[offset:offset + chunk_bytes])
+                    )
+            else:
+                self._stream_audio(chunk)
 
-            # Check for silence using VAD (chunk-counting, immune to CPU lag)
-            # Grace period and silence duration measured in audio chunks, not wall-clock
+            # Check for end of speech using VAD frames (audio time, immune to CPU lag)
+            # Grace period measured in audio chunks, not wall-clock
             chunk_duration_ms = self.config.audio.chunk_size / self.config.audio.sample_rate * 1000
             grace_chunks = int(self.config.vad.min_listening_seconds * 1000 / chunk_duration_ms)
-            silence_chunks_needed = int(self.config.vad.silence_duration_ms / chunk_duration_ms)
 
-            is_speech = self.vad.is_speech(audio_bytes)  # Use raw audio for VAD (normalizer would equalize levels)
-            if not is_speech and len(self._audio_buffer) >= grace_chunks:
-                self._silence_chunks += 1
-                if self._silence_chunks >= silence_chunks_needed:
-                    self._schedule_async(self._end_listening("silence"))
-            else:
-                self._silence_chunks = 0
+            # Use raw audio for VAD (normalizer would equalize levels)
+            end_probability = self._stage_timer.run("vad", self._end_of_utterance, chunk)
+            if len(self._audio_buffer) >= grace_chunks \
+                    and end_probability >= self.config.vad.end_of_utterance_threshold:
+                self._schedule_async(self._end_listening("silence"))
 
             # Check max recording length
             if len(self._audio_buffer) * self.config.audio.chunk_size / self.config.audio.sample_rate > self.config.vad.max_recording_seconds:
                 self._schedule_async(self._end_listening("timeout"))
 
-    async def _on_wakeword_detected(self, keyword: str, confidence: float):
-        """Handle wake word detection"""
+    def _end_of_utterance(self, chunk: AnalyzedChunk) -> float:
+        """Run VAD on every frame of the chunk and update the endpointer (audio thread)"""
+        self._current_is_speech = self.vad.process_chunk(chunk)
+        return self._endpointer.update(chunk.frame_probabilities, chunk.frame_db, self.vad.frame_ms)
+
+    def _stream_audio(self, chunk: AnalyzedChunk):
+        """Normalize, buffer and send one chunk of the current session (audio thread)"""
+        # Normalize audio for consistent volume (real-time, low latency)
+        normalized_audio = self._stage_timer.run("normalize", self.preprocessor.normalize_chunk, chunk)
+        self._audio_buffer.append(normalized_audio)
+        if len(self._audio_buffer) > MAX_AUDIO_BUFFER_CHUNKS:
+            self._audio_buffer = self._audio_buffer[-MAX_AUDIO_BUFFER_CHUNKS:]
+
+        # Stream normalized audio to server
+        if self._session_id:
+            self._schedule_async(
+                self.ws_client.send_audio_chunk(self._session_id, normalized_audio)
+            )
+
+    async def _on_wakeword_detected(self, keyword: str, confidence: float, stream_from: Optional[int] = None):
+        """
+        Handle wake word detection
+
+        Args:
+            keyword: Detected wake word
+            confidence: Detection confidence
+            stream_from: Pre-roll ring position to stream from (None = from now on)
+        """
         print(f"Wake word detected: {keyword} ({confidence:.2f})")
 
         # Track last wake word detection for metrics
@@ -554,18 +609,28 @@ class Satellite:
             return
 
         # Start listening - flag will be cleared in _reset_session when done
-        self._set_state(SatelliteState.LISTENING)
         self._audio_buffer.clear()
-        self._silence_chunks = 0
+        self._endpointer.reset()
+        self.vad.reset()
         self._listening_start = time.time()
 
-        # Notify server
+        # Point the beam at the talker (direction estimated from the wake word audio)
+        if self.config.audio.beamforming.enabled and self.config.audio.beamforming.auto_steer:
+            angle = self.audio_capture.steer_to_talker()
+            if angle is not None:
+                print(f"Beamformer steered to {angle:.0f}°")
+
+        # Notify server first — the session id is generated here, audio must follow the message
         self._session_id = await self.ws_client.send_wakeword_detected(keyword, confidence)
         print(f"Session started: {self._session_id}")
 
         # Reset wake word detector
         self.wakeword.reset()
 
+        # The audio thread flushes everything since stream_from with its next chunk
+        self._stream_from = self._preroll.position if stream_from is None else stream_from
+        self._set_state(SatelliteState.LISTENING)
+
     async def _end_listening(self, reason: str):
         """End the listening phase"""
         if self._state != SatelliteState.LISTENING:
@@ -589,11 +654,16 @@ class Satellite:
 
         # Clear session data
         self._session_id = None
+        self._stream_from = None
         self._audio_buffer.clear()
-        self._silence_chunks = 0
+        self._endpointer.reset()
         self._processing_start = None
         self._wakeword_pending = False  # Allow new wake word detection
 
+        # Listen for the next wake word in the configured direction again
+        if self.config.audio.beamforming.enabled and self.config.audio.beamforming.auto_steer:
+            self.audio_capture.set_steering_angle(self.config.audio.beamforming.steering_angle)
+
         # Reset wake word detector
         self.wakeword.reset()
 
@@ -604,6 +674,11 @@ class Satellite:
         """Cancel the current interaction (triggered by stop word)"""
         print("Canceling interaction...")
 
+        # Barge-in: stop the current sentence and drop queued/incoming TTS
+        self._canceled_session_id = self._session_id
+        self._idle_after_tts = False
+        self.audio_playback_async.stop()
+
         # Notify server that the session was canceled
         if self._session_id:
             try:
@@ -648,6 +723,12 @@ class Satellite:
 
         if state in state_map:
             new_state = state_map[state]
+
+            # Streamed TTS still queued: reset once the last chunk has played
+            if new_state == SatelliteState.IDLE and self._tts_pending:
+                self._idle_after_tts = True
+                return
+
             self._set_state(new_state)
 
             # If server tells us to go idle, do a full session reset
@@ -669,18 +750,36 @@ class Satellite:
 
     def _on_tts_audio(self, session_id: str, audio_bytes: bytes, is_final: bool):
         """Handle TTS audio from server"""
+        if session_id == self._canceled_session_id:
+            return  # Interrupted by stop word
         print(f"Playing TTS audio ({len(audio_bytes)} bytes)")
         self._set_state(SatelliteState.SPEAKING)
         self._processing_start = None  # Clear processing timeout
 
         # Play audio asynchronously to avoid blocking the event loop
-        self._schedule_async(self._play_tts_and_reset(audio_bytes, is_final))
+        self._tts_pending += 1
+        self._schedule_async(self._play_tts_and_reset(session_id, audio_bytes, is_final))
 
-    async def _play_tts_and_reset(self, audio_bytes: bytes, is_final: bool):
-        """Play TTS audio asynchronously and reset session when done"""
-        await self.audio_playback_async.play_wav(audio_bytes)
-        if is_final:
-            await self._reset_session("tts_complete")
+    async def _play_tts_and_reset(self, session_id: str, audio_bytes: bytes, is_final: bool):
+        """
+        Play TTS audio asynchronously and reset session when done.
+
+        The server streams one WAV per sentence; chunks are played in arrival
+        order (asyncio.Lock is FIFO), followed by an empty final chunk.
+        """
+        if self._tts_lock is None:
+            self._tts_lock = asyncio.Lock()
+        async with self._tts_lock:
+            try:
+                if audio_bytes and session_id != self._canceled_session_id:
+                    await self.audio_playback_async.play_wav(audio_bytes)
+            finally:
+                self._tts_pending -= 1
+            if session_id == self._canceled_session_id:
+                return
+            if is_final or (self._idle_after_tts and not self._tts_pending):
+                self._idle_after_tts = False
+                await self._reset_session("tts_complete")
 
     def _on_connected(self, config: ServerConfig):
         """Handle successful connection"""
@@ -715,7 +814,7 @@ class Satellite:
         # Clear session state
         self._session_id = None
         self._processing_start = None
-        self._silence_chunks = 0
+        self._endpointer.reset()
 
         # Start reconnection (only if not already reconnecting)
         if not self._reconnecting:
@@ -749,6 +848,8 @@ class Satellite:
         metrics["audio_rms"] = self._current_audio_rms
         metrics["audio_db"] = self._current_audio_db
         metrics["is_speech"] = self._current_is_speech
+        # CPU per audio analysis stage (percent of one core since the last heartbeat)
+        metrics["audio_cpu_percent"] = self._stage_timer.snapshot()
 
         # System metrics
         try:
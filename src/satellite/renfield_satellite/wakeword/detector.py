@@ -14,9 +14,12 @@ import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import numpy as np
 
+from ..audio.frame_analysis import AnalyzedChunk, StageTimer
+from .feature_ring import FeatureRing
+
 # Try to import wake word frameworks (prefer TFLite versions)
 MICRO_WAKEWORD_AVAILABLE = False
 OPEN_WAKEWORD_AVAILABLE = False
@@ -74,10 +77,9 @@ class WakeWordModel:
     model_type: str  # "micro", "micro_tflite", "open", "onnx"
     threshold: float
     model: object  # The actual model instance or tflite interpreter
-    features: object = None  # Feature extractor (for micro models)
     input_details: dict = None  # For tflite_runtime models
     output_details: dict = None  # For tflite_runtime models
-    feature_buffer: list = None  # Buffer for accumulating features
+    next_frame: int = 0  # Next feature frame to read from the shared ring (micro_tflite)
 
 
 @dataclass
@@ -107,6 +109,7 @@ class WakeWordDetector:
         stop_words: Optional[List[str]] = None,
         threshold: float = 0.5,
         refractory_seconds: float = 2.0,
+        stage_timer: Optional[StageTimer] = None,
     ):
         """
         Initialize wake word detector.
@@ -117,6 +120,7 @@ class WakeWordDetector:
             stop_words: List of stop words (cancel commands)
             threshold: Detection threshold 0.0-1.0
             refractory_seconds: Cooldown before re-triggering
+            stage_timer: Records CPU time of feature extraction and inference
         """
         self.models_path = Path(models_path)
         self.keywords = keywords or ["okay_nabu"]
@@ -132,9 +136,13 @@ class WakeWordDetector:
         # Refractory tracking
         self._last_detection_time: Dict[str, float] = {}
 
-        # Feature extractors for TFLite models
+        # Micro-frontend feature extractor, shared by all micro models:
+        # features are computed once per chunk into one ring, each model
+        # only keeps its read position
         self._micro_features = None
-        self._open_features = None
+        self._feature_ring = FeatureRing()
+        self._quantized: Dict[Tuple[float, int], np.ndarray] = {}  # Ring quantized per input quantization
+        self.stage_timer = stage_timer or StageTimer()
 
         print(f"Wake word frameworks available:")
         print(f"  - tflite-runtime: {TFLITE_RUNTIME_AVAILABLE}")
@@ -380,8 +388,8 @@ class WakeWordDetector:
                         input_details = interpreter.get_input_details()[0]
                         output_details = interpreter.get_output_details()[0]
 
-                        # Create feature extractor
-                        features = MicroWakeWordFeatures()
+                        if self._micro_features is None:
+                            self._micro_features = MicroWakeWordFeatures()
 
                         return WakeWordModel(
                             id=model_info["id"],
@@ -390,10 +398,9 @@ class WakeWordDetector:
                             model_type="micro_tflite",
                             threshold=threshold,
                             model=interpreter,
-                            features=features,
                             input_details=input_details,
                             output_details=output_details,
-                            feature_buffer=[],
+                            next_frame=self._feature_ring.count,
                         )
 
                 # Fall back to pymicro_wakeword's C library
@@ -404,7 +411,8 @@ class WakeWordDetector:
                         model = MicroWakeWord(model_path)
 
                     model.probability_cutoff = threshold
-                    features = MicroWakeWordFeatures()
+                    if self._micro_features is None:
+                        self._micro_features = MicroWakeWordFeatures()
 
                     return WakeWordModel(
                         id=model_info["id"],
@@ -413,7 +421,6 @@ class WakeWordDetector:
                         model_type="micro",
                         threshold=threshold,
                         model=model,
-                        features=features,
                     )
 
             elif model_type == "open" and OPEN_WAKEWORD_AVAILABLE:
@@ -459,12 +466,13 @@ class WakeWordDetector:
 
         return None
 
-    def process_audio(self, audio_bytes: bytes) -> Optional[Detection]:
+    def process_audio(self, audio: Union[bytes, AnalyzedChunk]) -> Optional[Detection]:
         """
         Process audio chunk for wake word detection.
 
         Args:
-            audio_bytes: Raw PCM audio (16-bit, 16kHz, mono)
+            audio: Raw PCM audio (16-bit, 16kHz, mono) or a chunk from the
+                frame analysis stage (reuses its decoded samples)
 
         Returns:
             Detection object if wake/stop word detected, None otherwise
@@ -472,16 +480,32 @@ class WakeWordDetector:
         if not self._loaded:
             return None
 
+        chunk = audio if isinstance(audio, AnalyzedChunk) else AnalyzedChunk(audio)
+        if self._micro_features is not None and chunk.features is None:
+            chunk.features = self.stage_timer.run("features", self._extract_features, chunk.pcm)
+
+        return self.stage_timer.run("wakeword", self._detect, chunk)
+
+    def _extract_features(self, audio_bytes: bytes) -> List[np.ndarray]:
+        """Micro-frontend features of one chunk (10 ms windows, streaming)"""
+        return list(self._micro_features.process_streaming(audio_bytes))
+
+    def _detect(self, chunk: AnalyzedChunk) -> Optional[Detection]:
+        """Run all wake word and stop word models on one chunk"""
         current_time = time.time()
+        if chunk.features:
+            self._feature_ring.extend(chunk.features)
+        self._quantized.clear()
 
         # Check wake words
         for keyword, model in self._wake_models.items():
-            # Check refractory period
+            # Check refractory period (the model skips these features)
             last_time = self._last_detection_time.get(keyword, 0)
             if current_time - last_time < self.refractory_seconds:
+                model.next_frame = self._feature_ring.count
                 continue
 
-            detected, confidence = self._run_detection(model, audio_bytes)
+            detected, confidence = self._run_detection(model, chunk)
             if detected:
                 self._last_detection_time[keyword] = current_time
                 print(f"Wake word detected in wakeword detector: {keyword} ({confidence:.2f})")
@@ -494,7 +518,7 @@ class WakeWordDetector:
 
         # Check stop words
         for stop_word, model in self._stop_models.items():
-            detected, confidence = self._run_detection(model, audio_bytes)
+            detected, confidence = self._run_detection(model, chunk)
             if detected:
                 print(f"Stop word detected: {stop_word} ({confidence:.2f})")
                 return Detection(
@@ -506,7 +530,20 @@ class WakeWordDetector:
 
         return None
 
-    def _run_detection(self, model: WakeWordModel, audio_bytes: bytes) -> Tuple[bool, float]:
+    def _quantized_frames(self, scale: float, zero_point: int) -> np.ndarray:
+        """
+        Feature ring quantized to int8, oldest frame first.
+
+        Computed once per chunk and input quantization; all models with the
+        same quantization (all micro-wakeword models) read windows from it.
+        """
+        frames = self._quantized.get((scale, zero_point))
+        if frames is None:
+            frames = np.round(self._feature_ring.ordered() / scale + zero_point).clip(-128, 127).astype(np.int8)
+            self._quantized[(scale, zero_point)] = frames
+        return frames
+
+    def _run_detection(self, model: WakeWordModel, chunk: AnalyzedChunk) -> Tuple[bool, float]:
         """
         Run detection on a single model.
 
@@ -516,67 +553,55 @@ class WakeWordDetector:
         try:
             if model.model_type == "micro_tflite":
                 # Using tflite_runtime directly (works better on ARM64)
-                STRIDE = 3  # Model expects [1, 3, 40] input
-                input_scale = model.input_details["quantization"][0]
-                input_zero = model.input_details["quantization"][1]
-                out_scale = model.output_details["quantization"][0]
-                out_zero = model.output_details["quantization"][1]
-
+                ring = self._feature_ring
+                input_shape = model.input_details["shape"]  # [1, 3, 40]: 3 feature frames per step
+                stride = int(input_shape[1])
+                input_scale, input_zero = model.input_details["quantization"]
+                out_scale, out_zero = model.output_details["quantization"]
+
+                # Frames overwritten since the last call are lost (ring overflow)
+                model.next_frame = max(model.next_frame, ring.oldest)
                 max_prob = 0.0
-                detected = False
-                feature_count = 0
-
-                for features in model.features.process_streaming(audio_bytes):
-                    model.feature_buffer.append(features)
-                    feature_count += 1
 
-                    if len(model.feature_buffer) >= STRIDE:
-                        # Concatenate features and quantize to int8
-                        concat = np.concatenate(model.feature_buffer[:STRIDE], axis=1)
-                        quant = np.round(concat / input_scale + input_zero).clip(-128, 127).astype(np.int8)
+                while ring.count - model.next_frame >= stride:
+                    # Window of the shared quantized ring — no per-model copy or quantization
+                    frames = self._quantized_frames(input_scale, input_zero)
+                    start = model.next_frame - ring.oldest
+                    window = frames[start:start + stride].reshape(input_shape)
+                    model.next_frame += stride
 
-                        # Run inference
-                        model.model.set_tensor(model.input_details["index"], quant)
-                        model.model.invoke()
-                        output = model.model.get_tensor(model.output_details["index"])
+                    # Run inference
+                    model.model.set_tensor(model.input_details["index"], window)
+                    model.model.invoke()
+                    output = model.model.get_tensor(model.output_details["index"])
 
-                        # Dequantize output
-                        prob = (float(output[0][0]) - out_zero) * out_scale
-                        if prob > max_prob:
-                            max_prob = prob
+                    # Dequantize output
+                    prob = (float(output[0][0]) - out_zero) * out_scale
+                    if prob > max_prob:
+                        max_prob = prob
 
-                        # Debug: print high probabilities
-                        if prob > 0.1:  # Only log if probability > 10%
-                            print(f"  [WW] {model.id}: prob={prob:.2%} (threshold={model.threshold:.0%})")
-
-                        if prob >= model.threshold:
-                            detected = True
-                            model.feature_buffer.clear()
-                            print(f"  [WW] DETECTED {model.id}: prob={prob:.2%}")
-                            return True, prob
-
-                        # Slide the buffer
-                        model.feature_buffer = model.feature_buffer[STRIDE:]
+                    if prob >= model.threshold:
+                        model.next_frame = ring.count
+                        print(f"  [WW] DETECTED {model.id}: prob={prob:.2%}")
+                        return True, prob
 
                 # Debug: log high probabilities
                 if max_prob > 0.1:
                     print(f"  [WW] {model.id}: prob={max_prob:.2%} (threshold={model.threshold:.0%})")
 
-                return detected, max_prob
+                return False, max_prob
 
             elif model.model_type == "micro":
                 # pymicro-wakeword uses streaming feature extraction (C library fallback)
                 # Audio must be 16-bit mono 16kHz, process in 10ms chunks
-                for features in model.features.process_streaming(audio_bytes):
+                for features in chunk.features:
                     if model.model.process_streaming(features):
                         return True, 1.0  # micro returns bool, not confidence
                 return False, 0.0
 
             elif model.model_type == "open":
                 # pyopen-wakeword - similar streaming API
-                audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
-                audio_float = audio_int16.astype(np.float32) / 32768.0
-                scores = model.model.process_audio(audio_float)
+                scores = model.model.process_audio(chunk.normalized)
                 if scores:
                     max_score = max(scores.values())
                     return max_score >= model.threshold, max_score
@@ -584,8 +609,7 @@ class WakeWordDetector:
 
             elif model.model_type == "onnx":
                 # openwakeword expects int16 audio, returns dict {model_name: score}
-                audio_int16 = np.frombuffer(audio_bytes, dtype=np.int16)
-                prediction = model.model.predict(audio_int16)
+                prediction = model.model.predict(chunk.int16)
 
                 # Find the best matching score
                 max_score = 0.0
@@ -616,9 +640,9 @@ class WakeWordDetector:
             # Reset ONNX models
             if model.model_type == "onnx" and hasattr(model.model, "reset"):
                 model.model.reset()
-            # Clear feature buffers for tflite models
-            if model.model_type == "micro_tflite" and model.feature_buffer is not None:
-                model.feature_buffer.clear()
+            # Skip buffered features for tflite models
+            if model.model_type == "micro_tflite":
+                model.next_frame = self._feature_ring.count
 
     def set_threshold(self, threshold: float, keyword: Optional[str] = None):
         """
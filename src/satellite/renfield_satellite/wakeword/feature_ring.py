@@ -0,0 +1,60 @@
+"""
+Feature Ring for Renfield Satellite
+
+Preallocated circular buffer of micro-frontend feature frames (one 40-value
+spectrogram slice per 10 ms of audio). Features are computed once per chunk
+and written here; every micro-wakeword model keeps only its own read
+position, so several wake words and stop words share one extraction.
+
+Positions are absolute frame indices since start, like PCMRingBuffer.
+"""
+
+from typing import Iterable
+
+import numpy as np
+
+DEFAULT_CAPACITY = 64  # Frames (640 ms) — chunks deliver ~8, models read 3 at a time
+
+
+class FeatureRing:
+    """Ring of the last *capacity* feature frames"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize feature ring.
+
+        Args:
+            capacity: Number of frames kept
+        """
+        self.capacity = capacity
+        self._frames: np.ndarray = np.zeros((0, 0), dtype=np.float32)  # Allocated on first write
+        self.count = 0  # Total frames written since start
+
+    @property
+    def oldest(self) -> int:
+        """Absolute index of the oldest frame still in the ring"""
+        return max(0, self.count - self.capacity)
+
+    def extend(self, features: Iterable[np.ndarray]):
+        """Append feature frames (any shape, flattened per frame)"""
+        frames = [np.asarray(f, dtype=np.float32).reshape(-1) for f in features]
+        if not frames:
+            return
+        block = np.stack(frames)[-self.capacity:]
+        if self._frames.shape[1] != block.shape[1]:
+            self._frames = np.zeros((self.capacity, block.shape[1]), dtype=np.float32)
+
+        skipped = len(frames) - len(block)
+        start = (self.count + skipped) % self.capacity
+        first = min(len(block), self.capacity - start)
+        self._frames[start:start + first] = block[:first]
+        self._frames[:len(block) - first] = block[first:]
+        self.count += len(frames)
+
+    def ordered(self) -> np.ndarray:
+        """Copy of the frames from oldest to newest, shape (frames, dims)"""
+        size = self.count - self.oldest
+        if size < self.capacity:
+            return self._frames[:size].copy()
+        split = self.count % self.capacity
+        return np.concatenate((self._frames[split:], self._frames[:split]))
@@ -23,6 +23,7 @@ setup(
         "console_scripts": [
             "renfield-satellite=renfield_satellite.main:run",
             "renfield-monitor=renfield_satellite.cli.monitor:main",
+            "renfield-wakeword-bench=renfield_satellite.cli.wakeword_bench:main",
         ],
     },
     classifiers=[
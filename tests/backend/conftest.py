@@ -77,6 +77,30 @@ async def db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+# ============================================================================
+# Global Service State
+# ============================================================================
+
+@pytest.fixture(autouse=True)
+def reset_embedding_cache():
+    """Isolate tests from the process-wide embedding cache"""
+    import services.embedding_service as embedding_module
+
+    embedding_module._embedding_service = None
+    yield
+    embedding_module._embedding_service = None
+
+
+@pytest.fixture(autouse=True)
+def reset_speaker_index():
+    """Isolate tests from the process-wide speaker index"""
+    import services.speaker_index as speaker_index_module
+
+    speaker_index_module._speaker_index = None
+    yield
+    speaker_index_module._speaker_index = None
+
+
 # ============================================================================
 # Sample Data Fixtures
 # ============================================================================
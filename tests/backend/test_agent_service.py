@@ -4,7 +4,8 @@ Tests for AgentService — ReAct Agent Loop for multi-step tool chaining.
 
 import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock
+from itertools import pairwise
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -12,6 +13,7 @@ from services.agent_service import (
     AgentContext,
     AgentService,
     AgentStep,
+    _agent_actions,
     _auto_attach_blobs,
     _extract_blobs,
     _parse_agent_json,
@@ -432,7 +434,7 @@ class TestStepToWsMessage:
 # Test AgentService.run() — Core Agent Loop
 # ============================================================================
 
-def _make_mock_mcp_manager():
+def _make_mock_mcp_manager(extra_tools: list[tuple[str, str]] | None = None):
     """Create a mock MCP manager with standard HA tools for agent tests."""
     mock_mcp = MagicMock()
     tools = []
@@ -441,6 +443,7 @@ def _make_mock_mcp_manager():
         ("mcp.homeassistant.turn_off", "Turn off a device"),
         ("mcp.homeassistant.get_state", "Get device state"),
         ("mcp.weather.get_current", "Get current weather"),
+        *(extra_tools or []),
     ]:
         mock_tool = MagicMock()
         mock_tool.namespaced_name = name
@@ -1476,3 +1479,295 @@ class TestExtractBlobsMeta:
         data = {"content_base64": "A" * 600}
         result = _extract_blobs(data, 2, blob_store)
         assert "$blob:step2_content_base64" in blob_store
+
+
+# ============================================================================
+# Test stable prompt prefix (Ollama KV-cache reuse)
+# ============================================================================
+
+class TestStablePromptPrefix:
+    """The prompt is built once per run; steps are appended as chat turns."""
+
+    def _response(self, content: str, prompt_eval_count: int | None = None):
+        resp = MagicMock()
+        resp.message = MagicMock()
+        resp.message.content = content
+        resp.prompt_eval_count = prompt_eval_count
+        resp.prompt_eval_duration = 40_000_000 if prompt_eval_count is not None else None
+        resp.eval_count = 12
+        resp.eval_duration = 200_000_000
+        return resp
+
+    async def _run(self, responses: list):
+        client = MagicMock()
+        client.chat = AsyncMock(side_effect=responses)
+        executor = AsyncMock()
+        executor.execute = AsyncMock(return_value={"success": True, "message": "22°C", "action_taken": True})
+        agent = AgentService(AgentToolRegistry(mcp_manager=_make_mock_mcp_manager()), max_steps=5)
+
+        with patch("services.agent_service.get_agent_client", return_value=(client, "http://ollama")), \
+             patch.object(agent, "_build_agent_prompt", AsyncMock(return_value="AGENT PROMPT")) as build, \
+             patch("utils.metrics.record_agent_prompt_eval") as record:
+            steps = await collect_steps(agent, message="Wie warm ist es?", ollama=MagicMock(), executor=executor)
+        return steps, [c.kwargs["messages"] for c in client.chat.await_args_list], build, record
+
+    @pytest.mark.unit
+    async def test_prompt_built_once_and_messages_append_only(self):
+        tool_call = '{"action": "mcp.homeassistant.get_state", "parameters": {"entity_id": "sensor.a"}, "reason": "a"}'
+        other_call = '{"action": "mcp.homeassistant.get_state", "parameters": {"entity_id": "sensor.b"}, "reason": "b"}'
+        steps, calls, build, _ = await self._run([
+            self._response(tool_call),
+            self._response(other_call),
+            self._response('{"action": "final_answer", "answer": "22°C", "reason": "done"}'),
+        ])
+
+        assert steps[-1].content == "22°C"
+        build.assert_awaited_once()
+        assert [len(m) for m in calls] == [2, 4, 6]
+        for previous, current in pairwise(calls):
+            assert current[:len(previous)] == previous  # Byte-identical prefix
+        assert calls[0][1] == {"role": "user", "content": "AGENT PROMPT"}
+        assert calls[1][2] == {"role": "assistant", "content": tool_call}
+        assert calls[1][3]["role"] == "user"
+        assert calls[1][3]["content"].startswith("Ergebnis: 22°C")
+        assert calls[1][3]["content"].endswith("Was ist der nächste Schritt?")
+
+    @pytest.mark.unit
+    async def test_prompt_eval_recorded_in_prometheus(self):
+        _, _, _, record = await self._run([
+            self._response('{"action": "final_answer", "answer": "Hallo", "reason": "done"}', prompt_eval_count=3),
+        ])
+
+        evaluated, cached, duration = record.call_args.args
+        assert evaluated == 3
+        assert cached > 0
+        assert duration == pytest.approx(0.04)
+
+    @pytest.mark.unit
+    def test_llm_stats_and_cache_rate(self):
+        ctx = AgentContext(original_message="test")
+        messages = [{"role": "user", "content": "wort " * 100}]
+
+        first = ctx.record_llm_stats(1, self._response("{}", prompt_eval_count=110), messages)
+        ctx.record_llm_stats(2, self._response("{}", prompt_eval_count=10), messages)
+        ctx.record_llm_stats(3, self._response("{}"), messages)  # No stats in response
+
+        assert first["prompt_eval_ms"] == pytest.approx(40.0)
+        assert first["eval_count"] == 12
+        assert first["cached_tokens"] == max(0, first["prompt_tokens"] - 110)
+        stats = ctx.get_prompt_cache_stats()
+        assert stats["steps"] == 2
+        assert stats["evaluated_tokens"] == 120
+        assert stats["cached_tokens"] == first["cached_tokens"] + first["prompt_tokens"] - 10
+        assert 0 < stats["cache_hit_rate"] < 1
+
+    @pytest.mark.unit
+    def test_message_window_keeps_prefix(self):
+        ctx = AgentContext(original_message="test")
+        ctx.MAX_HISTORY_STEPS = 4
+        ctx.start_messages("SYSTEM", "PROMPT")
+        for i in range(5):
+            ctx.add_turn(f"call {i}", AgentStep(step_number=i, step_type="tool_result", content=f"result {i}"))
+
+        messages = ctx.get_messages()
+
+        assert [m["content"] for m in messages[:2]] == ["SYSTEM", "PROMPT"]
+        assert [m["content"] for m in messages[2::2]] == ["call 3", "call 4"]
+        assert len(ctx.messages) == 12  # Full history is kept
+
+    @pytest.mark.unit
+    async def test_prompt_ingredients_memoized_per_run(self):
+        agent = AgentService(AgentToolRegistry(mcp_manager=_make_mock_mcp_manager()))
+        ctx = AgentContext(original_message="test")
+
+        with patch.object(agent, "_load_tool_corrections", AsyncMock(return_value="KORREKTUR")) as load, \
+             patch.object(agent.tool_registry, "build_tools_prompt", wraps=agent.tool_registry.build_tools_prompt) as build:
+            for _ in range(3):
+                prompt = await agent._build_agent_prompt("test", ctx)
+
+        load.assert_awaited_once()
+        build.assert_called_once()
+        assert "KORREKTUR" in prompt
+
+
+# ============================================================================
+# Test concurrent tool calls ("actions" list)
+# ============================================================================
+
+class TestParallelToolCalls:
+    """Independent tool calls of one step run concurrently, results keep call order."""
+
+    WEATHER_AND_LIGHT = json.dumps({"actions": [
+        {"action": "mcp.weather.get_current", "parameters": {"entity_id": "Berlin"}},
+        {"action": "mcp.weather.get_current", "parameters": {"entity_id": "Hamburg"}},
+        {"action": "mcp.homeassistant.turn_on", "parameters": {"entity_id": "light.buero"}},
+    ], "reason": "Unabhängige Aktionen"})
+
+    async def _run(self, responses: list[str], executor, extra_tools: list[tuple[str, str]] | None = None):
+        client = MagicMock()
+        client.chat = AsyncMock(side_effect=[
+            MagicMock(message=MagicMock(content=r), prompt_eval_count=None) for r in responses
+        ])
+        agent = AgentService(AgentToolRegistry(mcp_manager=_make_mock_mcp_manager(extra_tools)), max_steps=5)
+
+        with patch("services.agent_service.get_agent_client", return_value=(client, "http://ollama")), \
+             patch.object(agent, "_load_tool_corrections", AsyncMock(return_value="")):
+            steps = await collect_steps(agent, message="Wetter Berlin und Hamburg, Licht an", ollama=MagicMock(), executor=executor)
+        return steps, [c.kwargs["messages"] for c in client.chat.await_args_list]
+
+    def _slow_executor(self):
+        running = {"now": 0, "max": 0}
+
+        async def execute(intent_data, **kwargs):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return {"success": True, "message": f"ok {intent_data['parameters']['entity_id']}"}
+
+        executor = AsyncMock()
+        executor.execute = AsyncMock(side_effect=execute)
+        return executor, running
+
+    @pytest.mark.unit
+    def test_parse_action_list(self):
+        assert _parse_agent_json('[{"action": "a"}, {"action": "b"}]') == {"actions": [{"action": "a"}, {"action": "b"}]}
+        assert _agent_actions({"actions": [{"action": "a"}, "x"], "reason": "r"}) == [{"action": "a"}]
+        assert _agent_actions({"action": "a"}) == [{"action": "a"}]
+        assert _agent_actions({"actions": [], "action": "a"})[0]["action"] == "a"
+
+    @pytest.mark.unit
+    async def test_actions_run_concurrently_in_one_round_trip(self):
+        executor, running = self._slow_executor()
+
+        steps, calls = await self._run([
+            self.WEATHER_AND_LIGHT,
+            '{"action": "final_answer", "answer": "Erledigt", "reason": "done"}',
+        ], executor)
+
+        assert running["max"] == 3
+        assert len(calls) == 2  # One LLM round trip for all three tools
+        results = [s for s in steps if s.step_type == "tool_result"]
+        assert [s.content for s in results] == ["ok Berlin", "ok Hamburg", "ok light.buero"]
+        assert {s.step_number for s in results} == {1}
+        turn = calls[1][-1]["content"]
+        assert turn.index("ok Berlin") < turn.index("ok Hamburg") < turn.index("ok light.buero")
+        assert steps[-1].content == "Erledigt"
+
+    @pytest.mark.unit
+    async def test_invalid_tool_keeps_position(self):
+        executor, _ = self._slow_executor()
+        response = json.dumps({"actions": [
+            {"action": "mcp.unknown.tool", "parameters": {}},
+            {"action": "get_current", "parameters": {"entity_id": "Berlin"}},  # Short name
+        ]})
+
+        _, calls = await self._run([response, '{"action": "final_answer", "answer": "ok"}'], executor)
+
+        assert executor.execute.await_count == 1
+        assert executor.execute.await_args.args[0]["intent"] == "mcp.weather.get_current"
+        turn = calls[1][-1]["content"]
+        assert turn.startswith("[mcp.unknown.tool] Fehler: Unbekanntes Tool")
+        assert "[mcp.weather.get_current] Ergebnis: ok Berlin" in turn
+
+    @pytest.mark.unit
+    async def test_calls_beyond_limit_are_deferred(self):
+        executor, _ = self._slow_executor()
+
+        with patch("services.agent_service.settings.agent_max_parallel_tools", 2):
+            steps, _ = await self._run([
+                self.WEATHER_AND_LIGHT,
+                '{"action": "final_answer", "answer": "ok"}',
+            ], executor)
+
+        assert executor.execute.await_count == 2
+        errors = [s for s in steps if s.step_type == "error"]
+        assert len(errors) == 1
+        assert errors[0].tool == "mcp.homeassistant.turn_on"
+
+    @pytest.mark.unit
+    async def test_parallel_blobs_get_distinct_refs(self):
+        executor = AsyncMock()
+        executor.execute = AsyncMock(side_effect=[
+            {"success": True, "message": "", "data": {"filename": f"{n}.pdf", "content_base64": n * 600}}
+            for n in ("A", "B")
+        ])
+        agent = AgentService(AgentToolRegistry(mcp_manager=_make_mock_mcp_manager()))
+        ctx = AgentContext(original_message="test")
+
+        for call_num in range(2):
+            result = await agent._execute_tool(executor, "mcp.weather.get_current", {}, None, None, "de")
+            agent._build_tool_result_step(ctx, 1, f"1_{call_num}", "mcp.weather.get_current", result, "de")
+
+        assert set(ctx.blob_store) == {"$blob:step1_0_content_base64", "$blob:step1_1_content_base64"}
+        assert list(ctx.blob_meta) == ["1_0", "1_1"]
+
+    @pytest.mark.unit
+    async def test_parallel_downloads_keep_their_metadata(self):
+        async def execute(intent_data, **kwargs):
+            if intent_data["intent"].endswith("download_document"):
+                doc_id = intent_data["parameters"]["document_id"]
+                return {"success": True, "message": "", "data": {
+                    "filename": f"rechnung_{doc_id}.pdf",
+                    "mime_type": "application/pdf",
+                    "content_base64": str(doc_id) * 600,
+                }}
+            return {"success": True, "message": "gesendet"}
+
+        executor = AsyncMock()
+        executor.execute = AsyncMock(side_effect=execute)
+        downloads = json.dumps({"actions": [
+            {"action": "mcp.paperless.download_document", "parameters": {"document_id": 1}},
+            {"action": "mcp.paperless.download_document", "parameters": {"document_id": 2}},
+        ]})
+        send = json.dumps({"action": "mcp.email.send_email", "parameters": {"to": "a@b.com", "subject": "Rechnungen", "body": "Anbei"}})
+
+        steps, _ = await self._run(
+            [downloads, send, '{"action": "final_answer", "answer": "Gesendet"}'],
+            executor,
+            extra_tools=[
+                ("mcp.paperless.download_document", "Download a document"),
+                ("mcp.email.send_email", "Send an email"),
+            ],
+        )
+
+        summaries = [s.content for s in steps if s.step_type == "tool_result" and s.step_number == 1]
+        assert "rechnung_1.pdf" in summaries[0]
+        assert "rechnung_2.pdf" in summaries[1]
+        email_call = executor.execute.await_args_list[-1].args[0]
+        attachments = email_call["parameters"]["attachments"]
+        assert [a["filename"] for a in attachments] == ["rechnung_1.pdf", "rechnung_2.pdf"]
+        assert attachments[1]["content_base64"] == "2" * 600
+
+    @pytest.mark.unit
+    async def test_several_final_answers_use_the_first(self):
+        executor, _ = self._slow_executor()
+        response = json.dumps({"actions": [
+            {"action": "final_answer", "answer": "Erste"},
+            {"action": "final_answer", "answer": "Zweite"},
+        ]})
+
+        steps, calls = await self._run([response], executor)
+
+        assert len(calls) == 1
+        assert steps[-1].step_type == "final_answer"
+        assert steps[-1].content == "Erste"
+        executor.execute.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_final_answer_next_to_tool_calls_is_rejected(self):
+        executor, _ = self._slow_executor()
+        response = json.dumps({"actions": [
+            {"action": "mcp.weather.get_current", "parameters": {"entity_id": "Berlin"}},
+            {"action": "final_answer", "answer": "Zu früh"},
+        ]})
+
+        steps, calls = await self._run([response, '{"action": "final_answer", "answer": "Sonnig"}'], executor)
+
+        assert executor.execute.await_count == 1
+        errors = [s for s in steps if s.step_type == "error"]
+        assert len(errors) == 1
+        assert errors[0].tool == "final_answer"
+        turn = calls[1][-1]["content"]
+        assert turn.index("ok Berlin") < turn.index("final_answer ignoriert")
+        assert steps[-1].content == "Sonnig"
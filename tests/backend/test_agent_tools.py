@@ -9,6 +9,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from services.agent_tools import AgentToolRegistry, ToolDefinition
+from services.mcp_client import MCPManager, MCPServerConfig, MCPServerState, MCPToolInfo
 
 
 class TestToolDefinition:
@@ -358,3 +359,51 @@ class TestSelectRelevantTools:
         assert any(n.startswith("mcp.paperless") for n in names)
         assert any(n.startswith("mcp.email") for n in names)
         assert any(n.startswith("mcp.homeassistant") for n in names)
+
+
+class TestToolsPromptCache:
+    """build_tools_prompt() is cached per process until MCP tools change."""
+
+    def _manager(self) -> MCPManager:
+        manager = MCPManager()
+        tools = [
+            MCPToolInfo("srv", "t1", "mcp.srv.t1", "Tool 1"),
+            MCPToolInfo("srv", "t2", "mcp.srv.t2", "Tool 2"),
+        ]
+        state = MCPServerState(config=MCPServerConfig(name="srv"), connected=True)
+        state.all_discovered_tools = tools
+        manager._servers["srv"] = state
+        manager._refilter_server("srv")
+        return manager
+
+    @pytest.mark.unit
+    def test_registries_share_rendered_prompt(self):
+        manager = self._manager()
+
+        first = AgentToolRegistry(mcp_manager=manager).build_tools_prompt()
+        second = AgentToolRegistry(mcp_manager=manager).build_tools_prompt()
+
+        assert "mcp.srv.t2" in first
+        assert second is first
+
+    @pytest.mark.unit
+    def test_tool_override_invalidates(self):
+        manager = self._manager()
+        before = AgentToolRegistry(mcp_manager=manager).build_tools_prompt()
+
+        manager._tool_overrides["srv"] = ["t1"]
+        manager._refilter_server("srv")
+        after = AgentToolRegistry(mcp_manager=manager).build_tools_prompt()
+
+        assert "mcp.srv.t2" in before
+        assert "mcp.srv.t2" not in after
+
+    @pytest.mark.unit
+    def test_tools_added_after_construction(self):
+        manager = self._manager()
+        registry = AgentToolRegistry(mcp_manager=manager)
+        registry.build_tools_prompt()
+
+        registry._tools["plugin.tool"] = ToolDefinition(name="plugin.tool", description="Plugin")
+
+        assert "plugin.tool" in registry.build_tools_prompt()
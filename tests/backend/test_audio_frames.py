@@ -0,0 +1,229 @@
+"""
+Tests for binary satellite audio frames (services/audio_frames.py) and their
+use in SatelliteManager.
+"""
+import io
+import struct
+import wave
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.audio_frames import (
+    CODEC_OPUS,
+    CODEC_PCM,
+    CODEC_WAV,
+    FRAME_AUDIO,
+    FRAME_TTS,
+    OPUS_AVAILABLE,
+    AudioFrame,
+    AudioFrameError,
+    AudioTransport,
+    OpusStreamDecoder,
+    OpusStreamEncoder,
+    decode_frame,
+    encode_frame,
+    encode_tts_opus,
+    negotiate_audio_transport,
+    pack_opus_packets,
+    unpack_opus_packets,
+)
+from services.satellite_manager import SatelliteManager
+
+requires_opus = pytest.mark.skipif(not OPUS_AVAILABLE, reason="opuslib/libopus not installed")
+
+
+def _wav(samples: int = 2205, rate: int = 22050) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(b"\x10\x00" * samples)
+    return buffer.getvalue()
+
+
+class TestFraming:
+
+    @pytest.mark.unit
+    def test_roundtrip(self):
+        frame = AudioFrame(FRAME_TTS, CODEC_WAV, "sat-1-abc", 42, b"payload", is_final=True)
+
+        assert decode_frame(encode_frame(frame)) == frame
+
+    @pytest.mark.unit
+    def test_header_layout(self):
+        data = encode_frame(AudioFrame(FRAME_AUDIO, CODEC_PCM, "s", 7, b"\x01\x02"))
+
+        assert data == struct.pack("<BBBBI", FRAME_AUDIO, CODEC_PCM, 0, 1, 7) + b"s\x01\x02"
+
+    @pytest.mark.unit
+    def test_empty_payload(self):
+        frame = AudioFrame(FRAME_TTS, CODEC_WAV, "sess", 1, b"", is_final=True)
+
+        assert decode_frame(encode_frame(frame)).payload == b""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("data", [
+        b"\x01\x00",  # Shorter than the header
+        struct.pack("<BBBBI", FRAME_AUDIO, 9, 0, 0, 1),  # Unknown codec
+        struct.pack("<BBBBI", FRAME_AUDIO, CODEC_PCM, 0, 10, 1) + b"abc",  # Truncated session ID
+        struct.pack("<BBBBI", FRAME_AUDIO, CODEC_PCM, 0, 2, 1) + b"\xff\xfe",  # Invalid UTF-8
+    ])
+    def test_malformed_frames_raise(self, data):
+        with pytest.raises(AudioFrameError):
+            decode_frame(data)
+
+    @pytest.mark.unit
+    def test_session_id_too_long(self):
+        with pytest.raises(AudioFrameError):
+            encode_frame(AudioFrame(FRAME_AUDIO, CODEC_PCM, "x" * 256, 1, b""))
+
+    @pytest.mark.unit
+    def test_opus_packet_packing(self):
+        packets = [b"a", b"", b"xyz" * 100]
+
+        assert unpack_opus_packets(pack_opus_packets(packets)) == packets
+
+    @pytest.mark.unit
+    def test_truncated_opus_packet_raises(self):
+        with pytest.raises(AudioFrameError):
+            unpack_opus_packets(pack_opus_packets([b"abcdef"])[:-1])
+
+
+class TestNegotiation:
+
+    @pytest.mark.unit
+    def test_legacy_satellite_stays_on_json(self):
+        assert negotiate_audio_transport({"tts_streaming": True}, True, True) is None
+
+    @pytest.mark.unit
+    def test_disabled_on_server(self):
+        assert negotiate_audio_transport({"binary_audio": True}, False, True) is None
+
+    @pytest.mark.unit
+    def test_binary_pcm_without_opus(self):
+        transport = negotiate_audio_transport({"binary_audio": True, "audio_codecs": ["pcm"]}, True, True)
+
+        assert transport == AudioTransport(codec="pcm", tts_codec="wav")
+        assert transport.to_dict() == {"binary": True, "codec": "pcm", "tts_codec": "wav"}
+
+    @pytest.mark.unit
+    def test_opus_when_both_sides_support_it(self):
+        caps = {"binary_audio": True, "audio_codecs": ["pcm", "opus"]}
+
+        with patch("services.audio_frames.OPUS_AVAILABLE", True):
+            assert negotiate_audio_transport(caps, True, True) == AudioTransport("opus", "opus")
+            assert negotiate_audio_transport(caps, True, False) == AudioTransport("pcm", "wav")
+        with patch("services.audio_frames.OPUS_AVAILABLE", False):
+            assert negotiate_audio_transport(caps, True, True) == AudioTransport("pcm", "wav")
+
+
+class TestOpus:
+
+    @requires_opus
+    @pytest.mark.unit
+    def test_stream_roundtrip_keeps_length(self):
+        encoder = OpusStreamEncoder(16000)
+        decoder = OpusStreamDecoder(16000)
+        pcm = b"\x00\x01" * 1000  # 62.5 ms
+
+        payload = encoder.encode(pcm)
+        decoded = decoder.decode(payload) + decoder.decode(encoder.flush())
+
+        assert len(unpack_opus_packets(payload)) == 3
+        assert len(decoded) == 4 * 320 * 2
+
+    @requires_opus
+    @pytest.mark.unit
+    def test_encode_tts_resamples_to_24k(self):
+        payload = encode_tts_opus(_wav(samples=22050))  # 1 s
+
+        assert len(unpack_opus_packets(payload)) == 50
+
+
+class TestSatelliteManagerFrames:
+
+    @pytest.fixture
+    def manager(self):
+        return SatelliteManager()
+
+    async def _session(self, manager, capabilities: dict) -> tuple[AsyncMock, str]:
+        ws = AsyncMock()
+        await manager.register("sat-1", "Küche", ws, capabilities)
+        session_id = await manager.start_session("sat-1", "alexa", 0.9, session_id="sat-1-abc")
+        ws.reset_mock()
+        return ws, session_id
+
+    @pytest.mark.unit
+    async def test_register_negotiates_transport(self, manager):
+        await manager.register("sat-1", "Küche", AsyncMock(), {"binary_audio": True})
+        await manager.register("sat-2", "Bad", AsyncMock(), {})
+
+        assert manager.get_satellite("sat-1").audio_transport == AudioTransport()
+        assert manager.get_satellite("sat-2").audio_transport is None
+
+    @pytest.mark.unit
+    async def test_buffer_pcm_frame(self, manager):
+        _, session_id = await self._session(manager, {"binary_audio": True})
+
+        success, error = manager.buffer_audio_frame(AudioFrame(FRAME_AUDIO, CODEC_PCM, session_id, 3, b"\x00" * 320))
+
+        assert success, error
+        session = manager.get_session(session_id)
+        assert session.audio_chunks == [b"\x00" * 320]
+        assert session.audio_sequence == 3
+
+    @pytest.mark.unit
+    async def test_buffer_frame_unknown_session(self, manager):
+        success, error = manager.buffer_audio_frame(AudioFrame(FRAME_AUDIO, CODEC_PCM, "nope", 1, b"\x00"))
+
+        assert not success
+        assert error == "Unknown session"
+
+    @pytest.mark.unit
+    async def test_buffer_frame_respects_buffer_limit(self, manager):
+        _, session_id = await self._session(manager, {"binary_audio": True})
+
+        with patch("services.satellite_manager.settings") as mock_settings:
+            mock_settings.ws_max_audio_buffer_size = 100
+            success, error = manager.buffer_audio_frame(
+                AudioFrame(FRAME_AUDIO, CODEC_PCM, session_id, 1, b"\x00" * 200)
+            )
+
+        assert not success
+        assert "buffer full" in error.lower()
+
+    @pytest.mark.unit
+    async def test_tts_sent_as_binary_frame(self, manager):
+        ws, session_id = await self._session(manager, {"binary_audio": True})
+        wav = _wav()
+
+        await manager.send_tts_audio(session_id, wav, is_final=False)
+        await manager.send_tts_audio(session_id, b"", is_final=True)
+
+        first, last = (decode_frame(c.args[0]) for c in ws.send_bytes.await_args_list)
+        assert (first.frame_type, first.codec, first.payload, first.is_final) == (FRAME_TTS, CODEC_WAV, wav, False)
+        assert (last.sequence, last.payload, last.is_final) == (2, b"", True)
+        assert not any(c.args[0].get("type") == "tts_audio" for c in ws.send_json.await_args_list)
+
+    @pytest.mark.unit
+    async def test_tts_opus_frame(self, manager):
+        ws, session_id = await self._session(manager, {"binary_audio": True})
+        manager.get_satellite("sat-1").audio_transport = AudioTransport("opus", "opus")
+
+        with patch("services.satellite_manager.encode_tts_opus", return_value=b"opus") as encode:
+            await manager.send_tts_audio(session_id, _wav())
+
+        encode.assert_called_once()
+        frame = decode_frame(ws.send_bytes.await_args.args[0])
+        assert (frame.codec, frame.payload, frame.is_final) == (CODEC_OPUS, b"opus", True)
+
+    @pytest.mark.unit
+    async def test_legacy_satellite_gets_json(self, manager):
+        ws, session_id = await self._session(manager, {})
+
+        await manager.send_tts_audio(session_id, b"RIFF")
+
+        ws.send_bytes.assert_not_called()
+        assert any(c.args[0].get("type") == "tts_audio" for c in ws.send_json.await_args_list)
@@ -0,0 +1,164 @@
+"""
+Tests for incremental re-indexing (RAGService.index_document chunk diff)
+and the background re-embedder (services/chunk_reembedder.py).
+"""
+import hashlib
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from models.database import Document, DocumentChunk
+from services.chunk_reembedder import ChunkReembedder
+from services.rag_service import RAGService, chunk_content_hash, current_embedding_model
+
+
+def _chunk(id: int, content: str, model: str | None = None, version: str | None = None) -> DocumentChunk:
+    current_model, current_version = current_embedding_model()
+    return DocumentChunk(
+        id=id,
+        document_id=5,
+        content=content,
+        embedding=[0.5] * 3,
+        content_hash=chunk_content_hash(content),
+        embedding_model=model or current_model,
+        embedding_version=version or current_version,
+        chunk_index=id,
+    )
+
+
+def _db(rows: list) -> MagicMock:
+    """Session whose first execute() returns *rows*, later ones (DELETE/UPDATE) nothing."""
+    db = MagicMock()
+    db.commit = AsyncMock()
+    db.flush = AsyncMock()
+    db.refresh = AsyncMock()
+    db.rollback = AsyncMock()
+    select_result = MagicMock()
+    select_result.scalars.return_value.all.return_value = rows
+    db.execute = AsyncMock(side_effect=[select_result] + [MagicMock()] * 3)
+    return db
+
+
+def _converted(*texts: str) -> AsyncMock:
+    return AsyncMock(return_value={
+        "status": "completed",
+        "metadata": {"file_type": "md"},
+        "chunks": [{"text": t, "chunk_index": i, "metadata": {"page_number": 2}} for i, t in enumerate(texts)],
+    })
+
+
+class TestContentHash:
+
+    @pytest.mark.unit
+    def test_hash_is_sha256_of_utf8(self):
+        # Must match the migration backfill: encode(sha256(convert_to(content, 'UTF8')), 'hex')
+        assert chunk_content_hash("Grüße") == hashlib.sha256("Grüße".encode()).hexdigest()
+        assert chunk_content_hash("a") != chunk_content_hash("a ")
+
+
+class TestIncrementalIndex:
+
+    async def _index(self, existing: list[DocumentChunk], *texts: str):
+        db = _db(existing)
+        service = RAGService(db)
+        service.get_embedding = AsyncMock(return_value=[0.1] * 3)
+        doc = Document(id=5, filename="a.md", file_path="/uploads/a.md", status="completed")
+        result = await service.index_document(doc, convert=_converted(*texts))
+        return db, service, result
+
+    @pytest.mark.unit
+    async def test_only_changed_chunks_embedded(self):
+        unchanged = _chunk(1, "Absatz eins")
+        changed = _chunk(2, "Absatz zwei (alt)")
+
+        db, service, doc = await self._index([unchanged, changed], "Absatz eins", "Absatz zwei (neu)")
+
+        service.get_embedding.assert_awaited_once_with("Absatz zwei (neu)", cache=False)
+        added = db.add_all.call_args.args[0]
+        assert [c.content for c in added] == ["Absatz zwei (neu)"]
+        assert added[0].content_hash == chunk_content_hash("Absatz zwei (neu)")
+        assert (added[0].embedding_model, added[0].embedding_version) == current_embedding_model()
+        assert unchanged.embedding == [0.5] * 3
+        assert (unchanged.chunk_index, unchanged.page_number) == (0, 2)
+        assert doc.chunk_count == 2
+        assert doc.status == "completed"
+
+        delete_stmt = db.execute.await_args_list[1].args[0]
+        assert delete_stmt.compile().params["id_1"] == [2]
+        assert db.commit.await_count == 2  # Status "processing", then delete + insert + document together
+
+    @pytest.mark.unit
+    async def test_unchanged_document_embeds_nothing(self):
+        existing = [_chunk(1, "A"), _chunk(2, "B")]
+
+        db, service, doc = await self._index(existing, "B", "A")
+
+        service.get_embedding.assert_not_awaited()
+        db.add_all.assert_not_called()
+        assert doc.chunk_count == 2
+        assert [c.chunk_index for c in existing] == [1, 0]
+
+    @pytest.mark.unit
+    async def test_duplicate_texts_reuse_each_chunk_once(self):
+        existing = [_chunk(1, "Tabelle")]
+
+        _, service, doc = await self._index(existing, "Tabelle", "Tabelle")
+
+        service.get_embedding.assert_awaited_once()
+        assert doc.chunk_count == 2
+
+    @pytest.mark.unit
+    async def test_chunks_of_old_model_reembedded(self):
+        old = _chunk(1, "Absatz", model="nomic-embed-text", version="0")
+
+        db, service, _ = await self._index([old], "Absatz")
+
+        service.get_embedding.assert_awaited_once()
+        assert db.execute.await_args_list[1].args[0].compile().params["id_1"] == [1]
+
+
+class TestChunkReembedder:
+
+    @pytest.mark.unit
+    async def test_batch_reembeds_and_stamps_model(self):
+        ok = _chunk(3, "Absatz", model="nomic-embed-text", version="0")
+        broken = _chunk(4, "Kaputt", model="nomic-embed-text", version="0")
+        db = _db([ok, broken])
+        embeddings = MagicMock()
+        embeddings.embed_many = AsyncMock(return_value=[[0.9] * 3, RuntimeError("Ollama down")])
+
+        with patch("services.chunk_reembedder.get_embedding_service", return_value=embeddings), \
+             patch("services.chunk_reembedder.get_embed_client"):
+            last_id, reembedded, failed = await ChunkReembedder(batch_size=2).run_batch(db, after_id=0)
+
+        assert (last_id, reembedded, failed) == (4, 1, 1)
+        assert ok.embedding == [0.9] * 3
+        assert (ok.embedding_model, ok.embedding_version) == current_embedding_model()
+        assert (broken.embedding_model, broken.embedding_version) == ("nomic-embed-text", "0")
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_batch_query_resumes_after_id(self):
+        db = _db([])
+
+        assert await ChunkReembedder(batch_size=10).run_batch(db, after_id=42) == (None, 0, 0)
+
+        params = db.execute.await_args.args[0].compile().params
+        assert 42 in params.values()
+        assert 10 in params.values()
+
+    @pytest.mark.unit
+    async def test_run_continues_after_failed_batch(self):
+        reembedder = ChunkReembedder(batch_size=2)
+        reembedder.run_batch = AsyncMock(side_effect=[RuntimeError("deleted"), (9, 2, 0), (None, 0, 0)])
+        reembedder._skip_batch = AsyncMock(return_value=4)
+        session = MagicMock(rollback=AsyncMock())
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("services.database.AsyncSessionLocal", session_factory):
+            totals = await reembedder.run()
+
+        assert totals == {"reembedded": 2, "failed": 0}
+        assert [c.args[1] for c in reembedder.run_batch.await_args_list] == [0, 4, 9]
@@ -0,0 +1,350 @@
+"""
+Tests for the shared embedding cache and batcher (services/embedding_service.py).
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.embedding_service import EmbeddingBatcher, EmbeddingService, get_embedding_service
+from utils.config import settings
+
+
+def _client(vector: list[float] | None = None) -> MagicMock:
+    """Mock LLM client whose embeddings() returns *vector*."""
+    client = MagicMock()
+    response = MagicMock()
+    response.embedding = vector or [0.1, 0.2, 0.3]
+    client.embeddings = AsyncMock(return_value=response)
+    return client
+
+
+def _batch_client() -> MagicMock:
+    """Mock LLM client whose embed() returns [len(text)] per input."""
+    client = _client()
+
+    async def embed(model, input, options=None):
+        return MagicMock(embeddings=[[float(len(t))] for t in input])
+
+    client.embed = AsyncMock(side_effect=embed)
+    return client
+
+
+class TestEmbeddingCache:
+
+    @pytest.mark.unit
+    async def test_second_lookup_is_a_hit(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client([1.0, 2.0])
+
+        first = await service.embed("Schalte das Licht an", model="m", client=client)
+        second = await service.embed("Schalte das Licht an", model="m", client=client)
+
+        assert first == second == [1.0, 2.0]
+        assert client.embeddings.await_count == 1
+        assert service.hits == 1
+        assert service.misses == 1
+
+    @pytest.mark.unit
+    async def test_key_is_normalized(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client()
+
+        await service.embed("  Licht   im\nWohnzimmer ", model="m", client=client)
+        await service.embed("Licht im Wohnzimmer", model="m", client=client)
+
+        assert client.embeddings.await_count == 1
+
+    @pytest.mark.unit
+    async def test_model_is_part_of_key(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client()
+
+        await service.embed("Hallo", model="a", client=client)
+        await service.embed("Hallo", model="b", client=client)
+
+        assert client.embeddings.await_count == 2
+
+    @pytest.mark.unit
+    async def test_returned_vector_is_a_copy(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client([1.0, 2.0])
+
+        first = await service.embed("Hallo", model="m", client=client)
+        first.append(99.0)
+        second = await service.embed("Hallo", model="m", client=client)
+
+        assert second == [1.0, 2.0]
+
+    @pytest.mark.unit
+    async def test_ttl_expiry(self):
+        service = EmbeddingService(max_entries=10, ttl=5)
+        client = _client()
+
+        await service.embed("Hallo", model="m", client=client)
+        # Backdate the entry past its TTL
+        key = ("m", "Hallo")
+        stored_at, vector = service._cache[key]
+        service._cache[key] = (stored_at - 6, vector)
+        await service.embed("Hallo", model="m", client=client)
+
+        assert client.embeddings.await_count == 2
+
+    @pytest.mark.unit
+    async def test_lru_eviction(self):
+        service = EmbeddingService(max_entries=2, ttl=60)
+        client = _client()
+
+        await service.embed("a", model="m", client=client)
+        await service.embed("b", model="m", client=client)
+        await service.embed("a", model="m", client=client)  # a is now most recent
+        await service.embed("c", model="m", client=client)  # evicts b
+
+        assert service.get_stats()["size"] == 2
+        await service.embed("a", model="m", client=client)
+        assert client.embeddings.await_count == 3
+        await service.embed("b", model="m", client=client)
+        assert client.embeddings.await_count == 4
+
+    @pytest.mark.unit
+    async def test_size_zero_disables_storage(self):
+        service = EmbeddingService(max_entries=0, ttl=60)
+        client = _client()
+
+        await service.embed("Hallo", model="m", client=client)
+        await service.embed("Hallo", model="m", client=client)
+
+        assert client.embeddings.await_count == 2
+
+    @pytest.mark.unit
+    async def test_disabled_bypasses_cache(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client()
+
+        with patch.object(settings, "embedding_cache_enabled", False):
+            await service.embed("Hallo", model="m", client=client)
+            await service.embed("Hallo", model="m", client=client)
+
+        assert client.embeddings.await_count == 2
+        assert service.get_stats()["size"] == 0
+
+
+class TestCoalescing:
+
+    @pytest.mark.unit
+    async def test_concurrent_requests_share_one_call(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        release = asyncio.Event()
+        response = MagicMock()
+        response.embedding = [0.5, 0.5]
+
+        async def slow_embeddings(**kwargs):
+            await release.wait()
+            return response
+
+        client = MagicMock()
+        client.embeddings = AsyncMock(side_effect=slow_embeddings)
+
+        tasks = [
+            asyncio.create_task(service.embed("Hallo", model="m", client=client))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert all(r == [0.5, 0.5] for r in results)
+        assert client.embeddings.await_count == 1
+        assert service.misses == 1
+        assert service.coalesced == 4
+
+    @pytest.mark.unit
+    async def test_failure_propagates_and_is_not_cached(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        release = asyncio.Event()
+
+        async def failing_embeddings(**kwargs):
+            await release.wait()
+            raise ConnectionError("ollama down")
+
+        client = MagicMock()
+        client.embeddings = AsyncMock(side_effect=failing_embeddings)
+
+        tasks = [
+            asyncio.create_task(service.embed("Hallo", model="m", client=client))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert service.get_stats()["size"] == 0
+
+        # Next call retries against the client
+        client.embeddings = _client([1.0]).embeddings
+        assert await service.embed("Hallo", model="m", client=client) == [1.0]
+
+    @pytest.mark.unit
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        release = asyncio.Event()
+        response = MagicMock()
+        response.embedding = [0.5, 0.5]
+
+        async def slow_embeddings(**kwargs):
+            await release.wait()
+            return response
+
+        client = MagicMock()
+        client.embeddings = AsyncMock(side_effect=slow_embeddings)
+
+        leader = asyncio.create_task(service.embed("Hallo", model="m", client=client))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(service.embed("Hallo", model="m", client=client))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await waiter == [0.5, 0.5]
+        assert leader.cancelled()
+        assert service.coalesced == 1
+        assert client.embeddings.await_count == 1
+
+
+class TestBatching:
+
+    @pytest.mark.unit
+    async def test_concurrent_misses_share_one_request(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _batch_client()
+
+        vectors = await service.embed_many(["a", "bb", "ccc"], model="m", client=client)
+
+        assert vectors == [[1.0], [2.0], [3.0]]
+        client.embed.assert_awaited_once()
+        assert client.embed.await_args.kwargs["input"] == ["a", "bb", "ccc"]
+        client.embeddings.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_cached_texts_are_not_resent(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _batch_client()
+
+        await service.embed("a", model="m", client=client)
+        await service.embed_many(["a", "bb", "ccc"], model="m", client=client)
+
+        assert client.embed.await_args.kwargs["input"] == ["bb", "ccc"]
+
+    @pytest.mark.unit
+    async def test_single_text_uses_embeddings(self):
+        batcher = EmbeddingBatcher(linger_ms=0)
+        client = _batch_client()
+
+        assert await batcher.embed("Hallo", "m", client) == [0.1, 0.2, 0.3]
+        client.embed.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_batch_size_bound(self):
+        batcher = EmbeddingBatcher(max_batch_size=4, linger_ms=0)
+        client = _batch_client()
+
+        await asyncio.gather(*(batcher.embed(f"text {i}", "m", client) for i in range(10)))
+
+        sizes = [len(call.kwargs["input"]) for call in client.embed.await_args_list]
+        assert sizes == [4, 4, 2]
+        assert batcher.texts == 10
+
+    @pytest.mark.unit
+    async def test_token_bound(self):
+        batcher = EmbeddingBatcher(max_batch_size=100, max_batch_tokens=300, linger_ms=0)
+        client = _batch_client()
+        long_text = "wort " * 200  # ~250 estimated tokens
+
+        await asyncio.gather(*(batcher.embed(long_text + str(i), "m", client) for i in range(3)))
+
+        # Each text alone nearly fills the budget, so no two share a request
+        assert batcher.requests == 3
+        client.embed.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_models_are_batched_separately(self):
+        batcher = EmbeddingBatcher(linger_ms=0)
+        client = _batch_client()
+
+        await asyncio.gather(
+            batcher.embed("a", "m1", client), batcher.embed("b", "m1", client),
+            batcher.embed("c", "m2", client), batcher.embed("d", "m2", client),
+        )
+
+        models = sorted(call.kwargs["model"] for call in client.embed.await_args_list)
+        assert models == ["m1", "m2"]
+
+    @pytest.mark.unit
+    async def test_failed_batch_retries_individually(self):
+        batcher = EmbeddingBatcher(linger_ms=0)
+        client = _batch_client()
+        client.embed = AsyncMock(side_effect=ConnectionError("batch failed"))
+
+        async def embeddings(model, prompt):
+            if prompt == "bad":
+                raise ValueError("input too long")
+            return MagicMock(embedding=[1.0])
+
+        client.embeddings = AsyncMock(side_effect=embeddings)
+
+        results = await asyncio.gather(
+            batcher.embed("good", "m", client),
+            batcher.embed("bad", "m", client),
+            return_exceptions=True,
+        )
+
+        assert results[0] == [1.0]
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.unit
+    async def test_embed_many_return_exceptions(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _client()
+        client.embed = AsyncMock(side_effect=ConnectionError("down"))
+        client.embeddings = AsyncMock(side_effect=ConnectionError("down"))
+
+        results = await service.embed_many(["a", "b"], model="m", client=client, return_exceptions=True)
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+
+    @pytest.mark.unit
+    async def test_uncached_embed_many_leaves_cache_empty(self):
+        service = EmbeddingService(max_entries=10, ttl=60)
+        client = _batch_client()
+
+        await service.embed_many(["a", "b"], model="m", client=client, cache=False)
+
+        assert service.get_stats()["size"] == 0
+        assert service.get_stats()["batch_requests"] == 1
+
+
+class TestServiceIntegration:
+
+    @pytest.mark.unit
+    def test_global_instance_is_shared(self):
+        assert get_embedding_service() is get_embedding_service()
+
+    @pytest.mark.unit
+    async def test_services_share_one_embedding_per_message(self):
+        """RAG and memory retrieval for the same message hit Ollama once."""
+        from services.conversation_memory_service import ConversationMemoryService
+        from services.rag_service import RAGService
+
+        client = _client([0.1, 0.2])
+        rag = RAGService(MagicMock())
+        rag._ollama_client = client
+        memory = ConversationMemoryService(MagicMock())
+        memory._ollama_client = client
+
+        await rag.get_embedding("Wie ist das Wetter?")
+        await memory._get_embedding("Wie ist das Wetter?")
+
+        assert client.embeddings.await_count == 1
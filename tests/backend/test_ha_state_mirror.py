@@ -0,0 +1,322 @@
+"""
+Tests for the push-based Home Assistant state mirror (integrations/ha_state_mirror.py).
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from integrations.ha_state_mirror import HAStateMirror, get_ha_state_mirror
+
+
+def _state(entity_id: str, state: str = "on", name: str | None = None) -> dict:
+    return {
+        "entity_id": entity_id,
+        "state": state,
+        "attributes": {"friendly_name": name or entity_id.split(".", 1)[1].replace("_", " ").title()},
+    }
+
+
+AREAS = [{"area_id": "kitchen", "name": "Küche"}, {"area_id": "office", "name": "Arbeitszimmer"}]
+DEVICES = [{"id": "dev-1", "area_id": "kitchen"}]
+ENTITIES = [
+    {"entity_id": "light.ceiling", "device_id": "dev-1", "area_id": None},
+    {"entity_id": "media_player.speaker", "device_id": "dev-1", "area_id": "office"},  # Entity override
+]
+
+
+def _loaded() -> HAStateMirror:
+    mirror = HAStateMirror()
+    mirror.load(
+        states=[
+            _state("light.ceiling", name="Deckenlampe"),
+            _state("media_player.speaker", "idle", name="Lautsprecher"),
+            _state("sensor.outside_temperature", "12.5", name="Aussentemperatur"),
+            _state("automation.morning"),
+        ],
+        areas=AREAS,
+        devices=DEVICES,
+        entities=ENTITIES,
+    )
+    return mirror
+
+
+def _event(event_type: str, **data) -> dict:
+    return {"type": "event", "event": {"event_type": event_type, "data": data}}
+
+
+class _FakeWS:
+    """Records sent commands; the test answers them via _handle_message."""
+
+    def __init__(self, incoming: list[dict] | None = None):
+        self.sent: list[dict] = []
+        self._incoming = [json.dumps(m) for m in incoming or []]
+
+    async def send(self, raw: str):
+        self.sent.append(json.loads(raw))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self._incoming:
+            raise StopAsyncIteration
+        return self._incoming.pop(0)
+
+    def id_of(self, ws_type: str) -> int:
+        return [m["id"] for m in self.sent if m["type"] == ws_type][-1]
+
+
+def _result(msg_id: int, result) -> dict:
+    return {"type": "result", "id": msg_id, "success": True, "result": result}
+
+
+async def _synced(mirror: HAStateMirror, ws: _FakeWS, states: list[dict]) -> None:
+    await mirror._subscribe(ws)
+    await mirror._handle_message(ws, _result(ws.id_of("get_states"), states))
+    await mirror._handle_message(ws, _result(ws.id_of("config/area_registry/list"), AREAS))
+    await mirror._handle_message(ws, _result(ws.id_of("config/device_registry/list"), DEVICES))
+    await mirror._handle_message(ws, _result(ws.id_of("config/entity_registry/list"), ENTITIES))
+
+
+class TestLookups:
+
+    @pytest.mark.unit
+    def test_state_by_entity_id(self):
+        mirror = _loaded()
+
+        assert mirror.get_state("media_player.speaker")["state"] == "idle"
+        assert mirror.get_state("light.unknown") is None
+
+    @pytest.mark.unit
+    def test_states_by_domain(self):
+        mirror = _loaded()
+
+        assert [s["entity_id"] for s in mirror.get_states_in_domain("light")] == ["light.ceiling"]
+        assert mirror.get_states_in_domain("cover") == []
+
+    @pytest.mark.unit
+    def test_area_resolution_device_and_override(self):
+        mirror = _loaded()
+
+        assert [s["entity_id"] for s in mirror.get_states_in_area("kitchen")] == ["light.ceiling"]
+        assert [s["entity_id"] for s in mirror.get_states_in_area("arbeitszimmer")] == ["media_player.speaker"]
+        assert mirror.get_area("light.ceiling")["name"] == "Küche"
+        assert mirror.get_states_in_area("Garage") == []
+
+    @pytest.mark.unit
+    def test_entity_map_uses_area_names_and_relevant_domains(self):
+        mirror = _loaded()
+
+        entity_map = {e["entity_id"]: e for e in mirror.get_entity_map()}
+
+        assert set(entity_map) == {"light.ceiling", "media_player.speaker", "sensor.outside_temperature"}
+        assert entity_map["light.ceiling"] == {
+            "entity_id": "light.ceiling",
+            "friendly_name": "Deckenlampe",
+            "domain": "light",
+            "room": "Küche",
+            "state": "on",
+        }
+        assert entity_map["sensor.outside_temperature"]["room"] is None
+
+    @pytest.mark.unit
+    def test_keywords_include_names_and_areas(self):
+        keywords = _loaded().get_keywords()
+
+        assert {"deckenlampe", "licht", "küche", "arbeitszimmer", "automation"} <= keywords
+
+
+class TestUpdates:
+
+    @pytest.mark.unit
+    def test_state_change_updates_indexes(self):
+        mirror = _loaded()
+
+        mirror._set_state("media_player.speaker", _state("media_player.speaker", "playing", name="Lautsprecher"))
+
+        assert mirror.get_state("media_player.speaker")["state"] == "playing"
+        entry = next(e for e in mirror.get_entity_map() if e["entity_id"] == "media_player.speaker")
+        assert entry["state"] == "playing"
+
+    @pytest.mark.unit
+    def test_new_and_removed_entities(self):
+        mirror = _loaded()
+        keywords = mirror.get_keywords()
+
+        mirror._set_state("cover.rollo_kueche", _state("cover.rollo_kueche", "open", name="Rollo Küche"))
+        assert "rollo" in mirror.get_keywords()
+        assert mirror.get_keywords() is not keywords
+
+        mirror._set_state("cover.rollo_kueche", None)
+        assert mirror.get_state("cover.rollo_kueche") is None
+        assert mirror.get_states_in_domain("cover") == []
+        assert all(e["entity_id"] != "cover.rollo_kueche" for e in mirror.get_entity_map())
+
+    @pytest.mark.unit
+    def test_state_only_change_keeps_keyword_cache(self):
+        mirror = _loaded()
+        keywords = mirror.get_keywords()
+
+        mirror._set_state("light.ceiling", _state("light.ceiling", "off", name="Deckenlampe"))
+
+        assert mirror.get_keywords() is keywords
+
+
+class TestProtocol:
+
+    @pytest.mark.unit
+    async def test_subscribes_before_snapshot(self):
+        mirror = HAStateMirror()
+        ws = _FakeWS()
+
+        await mirror._subscribe(ws)
+
+        types = [m["type"] for m in ws.sent]
+        assert types[:4] == ["subscribe_events"] * 4
+        assert {m["event_type"] for m in ws.sent[:4]} == {
+            "state_changed", "area_registry_updated", "device_registry_updated", "entity_registry_updated",
+        }
+        assert types[4:] == [
+            "get_states",
+            "config/area_registry/list",
+            "config/device_registry/list",
+            "config/entity_registry/list",
+        ]
+        assert [m["id"] for m in ws.sent] == list(range(1, 9))
+
+    @pytest.mark.unit
+    async def test_ready_after_full_snapshot(self):
+        mirror = HAStateMirror()
+        ws = _FakeWS()
+        await mirror._subscribe(ws)
+
+        await mirror._handle_message(ws, _result(ws.id_of("get_states"), [_state("light.ceiling")]))
+        assert not mirror.is_ready
+
+        await _synced(mirror, ws, [_state("light.ceiling")])
+        assert mirror.is_ready
+        assert mirror.get_area("light.ceiling")["area_id"] == "kitchen"
+
+    @pytest.mark.unit
+    async def test_events_during_snapshot_are_applied_afterwards(self):
+        mirror = HAStateMirror()
+        ws = _FakeWS()
+        await mirror._subscribe(ws)
+
+        await mirror._handle_message(
+            ws, _event("state_changed", entity_id="light.ceiling", new_state=_state("light.ceiling", "off"))
+        )
+        await mirror._handle_message(ws, _result(ws.id_of("get_states"), [_state("light.ceiling", "on")]))
+        for command, result in (
+            ("config/area_registry/list", AREAS),
+            ("config/device_registry/list", DEVICES),
+            ("config/entity_registry/list", ENTITIES),
+        ):
+            await mirror._handle_message(ws, _result(ws.id_of(command), result))
+
+        assert mirror.get_state("light.ceiling")["state"] == "off"
+
+    @pytest.mark.unit
+    async def test_registry_event_refetches_list(self):
+        mirror = HAStateMirror()
+        ws = _FakeWS()
+        await _synced(mirror, ws, [_state("light.ceiling")])
+
+        await mirror._handle_message(ws, _event("entity_registry_updated", action="update", entity_id="light.ceiling"))
+        await mirror._handle_message(ws, _event("entity_registry_updated", action="update", entity_id="light.ceiling"))
+
+        refetches = [m for m in ws.sent if m["type"] == "config/entity_registry/list"]
+        assert len(refetches) == 2  # Snapshot + one refetch, second event is coalesced
+
+        moved = [{"entity_id": "light.ceiling", "area_id": "office", "device_id": "dev-1"}]
+        await mirror._handle_message(ws, _result(refetches[-1]["id"], moved))
+
+        assert mirror.get_area("light.ceiling")["name"] == "Arbeitszimmer"
+        assert len([m for m in ws.sent if m["type"] == "config/entity_registry/list"]) == 3  # Coalesced refetch
+
+    @pytest.mark.unit
+    async def test_failed_snapshot_raises(self):
+        mirror = HAStateMirror()
+        ws = _FakeWS()
+        await mirror._subscribe(ws)
+
+        with pytest.raises(ConnectionError):
+            await mirror._handle_message(
+                ws, {"type": "result", "id": ws.id_of("get_states"), "success": False, "error": {"code": "x"}}
+            )
+
+    @pytest.mark.unit
+    async def test_connection_loss_clears_ready(self):
+        mirror = HAStateMirror()
+
+        @asynccontextmanager
+        async def connect():
+            ws = _FakeWS()
+            await mirror._subscribe(ws)
+            # Snapshot answers arrive on the connection, then it closes
+            ws._incoming = [
+                json.dumps(_result(ws.id_of("get_states"), [_state("light.ceiling")])),
+                *(json.dumps(_result(ws.id_of(c), [])) for c in (
+                    "config/area_registry/list", "config/device_registry/list", "config/entity_registry/list",
+                )),
+            ]
+            mirror._subscribe = AsyncMock()  # Already subscribed above
+            yield ws
+
+        ready_states = []
+
+        async def fake_sleep(delay):
+            ready_states.append(mirror.is_ready)
+            raise asyncio.CancelledError
+
+        with patch.object(mirror._client, "ws_connect", connect), \
+             patch("integrations.ha_state_mirror.asyncio.sleep", fake_sleep), \
+             pytest.raises(asyncio.CancelledError):
+            await mirror._run()
+
+        assert ready_states == [False]
+        assert mirror.get_state("light.ceiling") is not None  # Last known data kept
+
+
+class TestClientIntegration:
+
+    @pytest.fixture
+    def ready_mirror(self):
+        mirror = _loaded()
+        mirror._ready = True
+        with patch("integrations.ha_state_mirror._ha_state_mirror", mirror):
+            yield mirror
+
+    @pytest.mark.unit
+    async def test_entity_map_and_keywords_skip_rest(self, ready_mirror):
+        from integrations.homeassistant import HomeAssistantClient
+
+        client = HomeAssistantClient()
+        with patch.object(client, "get_states", new_callable=AsyncMock) as get_states:
+            entity_map = await client.get_entity_map()
+            keywords = await client.get_keywords()
+            media_players = await client.get_entities_by_domain("media_player")
+
+        get_states.assert_not_called()
+        assert len(entity_map) == 3
+        assert "deckenlampe" in keywords
+        assert media_players == [
+            {"entity_id": "media_player.speaker", "friendly_name": "Lautsprecher", "state": "idle"}
+        ]
+
+    @pytest.mark.unit
+    async def test_output_routing_availability_from_mirror(self, ready_mirror):
+        from services.output_routing_service import DeviceAvailability, OutputRoutingService
+
+        service = OutputRoutingService(AsyncMock())
+        service.ha_client.get_state = AsyncMock()
+
+        assert await service._check_ha_device_availability("media_player.speaker") == DeviceAvailability.AVAILABLE
+        service.ha_client.get_state.assert_not_called()
+
+    @pytest.mark.unit
+    def test_global_instance_is_shared(self):
+        assert get_ha_state_mirror() is get_ha_state_mirror()
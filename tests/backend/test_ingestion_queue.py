@@ -0,0 +1,367 @@
+"""
+Tests for the document ingestion queue (services/ingestion_queue.py) and
+RAGService.index_document() progress/convert hooks.
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.ingestion_queue import (
+    JOB_CANCELLED,
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JOB_PROCESSING,
+    JOB_QUEUED,
+    LANE_OCR,
+    LANE_TEXT,
+    IngestionCancelled,
+    IngestionQueue,
+    IngestionWorker,
+    ingestion_lane,
+    job_to_response,
+)
+
+
+class FakeRedis:
+    """In-memory subset of redis.asyncio used by the ingestion queue."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.lists: dict[str, list[str]] = {}
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def blmove(self, source, destination, timeout, src, dest):
+        items = self.lists.get(source)
+        if not items:
+            return None
+        value = items.pop() if src == "RIGHT" else items.pop(0)
+        await (self.lpush if dest == "LEFT" else self.rpush)(destination, value)
+        return value
+
+    async def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        if value in items:
+            items.remove(value)
+            return 1
+        return 0
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+
+@pytest.fixture
+def queue():
+    redis = FakeRedis()
+    with patch("services.task_queue.aioredis.from_url", return_value=redis):
+        q = IngestionQueue()
+    return q
+
+
+async def _submit(queue, filename="scan.pdf", **kwargs) -> str:
+    return await queue.submit(7, f"/uploads/{filename}", filename, knowledge_base_id=1, user_id=3, **kwargs)
+
+
+class TestLanes:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("filename,force_ocr,lane", [
+        ("Rechnung.PDF", False, LANE_OCR),
+        ("foto.jpg", False, LANE_OCR),
+        ("notizen.md", False, LANE_TEXT),
+        ("bericht.docx", False, LANE_TEXT),
+        ("bericht.docx", True, LANE_OCR),
+    ])
+    def test_lane(self, filename, force_ocr, lane):
+        assert ingestion_lane(filename, force_ocr) == lane
+
+
+class TestQueue:
+
+    @pytest.mark.unit
+    async def test_submit_and_claim(self, queue):
+        job_id = await _submit(queue, "notizen.md")
+
+        assert await queue.queue_lengths() == {LANE_OCR: 0, LANE_TEXT: 1}
+        raw, job = await queue.claim(LANE_TEXT, timeout=0)
+
+        assert job["id"] == job_id
+        assert job["parameters"]["document_id"] == 7
+        assert await queue.redis_client.lrange(queue.processing_queue(LANE_TEXT), 0, -1) == [raw]
+        assert await queue.redis_client.exists(queue._heartbeat_key(job_id))
+
+        await queue.ack(LANE_TEXT, raw)
+        assert await queue.redis_client.llen(queue.processing_queue(LANE_TEXT)) == 0
+
+    @pytest.mark.unit
+    async def test_claim_in_submission_order(self, queue):
+        first = await _submit(queue)
+        second = await _submit(queue)
+
+        assert (await queue.claim(LANE_OCR, timeout=0))[1]["id"] == first
+        assert (await queue.claim(LANE_OCR, timeout=0))[1]["id"] == second
+        assert await queue.claim(LANE_OCR, timeout=0) is None
+
+    @pytest.mark.unit
+    async def test_recover_only_abandoned_jobs(self, queue):
+        abandoned = await _submit(queue)
+        running = await _submit(queue)
+        await queue.claim(LANE_OCR, timeout=0)
+        await queue.claim(LANE_OCR, timeout=0)
+        del queue.redis_client.values[queue._heartbeat_key(abandoned)]
+
+        assert await queue.recover(LANE_OCR) == 1
+
+        _, job = await queue.claim(LANE_OCR, timeout=0)
+        assert job["id"] == abandoned
+        assert running in {json.loads(r)["id"] for r in queue.redis_client.lists[queue.processing_queue(LANE_OCR)]}
+
+    @pytest.mark.unit
+    async def test_cancel_queued_and_running(self, queue):
+        queued = await _submit(queue)
+        running = await _submit(queue)
+        await queue.update_job(running, status=JOB_PROCESSING)
+
+        assert (await queue.cancel(queued))["status"] == JOB_CANCELLED
+        assert (await queue.cancel(running))["cancel_requested"] is True
+        assert await queue.is_cancelled(running)
+
+    @pytest.mark.unit
+    async def test_cancel_finished_job_is_noop(self, queue):
+        job_id = await _submit(queue)
+        await queue.update_job(job_id, status=JOB_COMPLETED)
+
+        assert (await queue.cancel(job_id))["status"] == JOB_COMPLETED
+        assert not await queue.is_cancelled(job_id)
+
+    @pytest.mark.unit
+    async def test_job_to_response(self, queue):
+        job_id = await _submit(queue)
+        await queue.update_job(job_id, status=JOB_PROCESSING, stage="embedding", progress=0.51234)
+
+        response = job_to_response(await queue.get_task_status(job_id))
+
+        assert response["status"] == JOB_PROCESSING
+        assert response["progress"] == 0.512
+        assert (response["lane"], response["document_id"], response["filename"]) == (LANE_OCR, 7, "scan.pdf")
+
+
+class TestWorker:
+
+    @pytest.fixture
+    def worker(self, queue):
+        worker = IngestionWorker(queue)
+        worker._discard = AsyncMock()
+        return worker
+
+    async def _claimed(self, queue) -> dict:
+        await _submit(queue)
+        return (await queue.claim(LANE_OCR, timeout=0))[1]
+
+    @pytest.mark.unit
+    async def test_completed(self, queue, worker):
+        job = await self._claimed(queue)
+        worker._index = AsyncMock(return_value=MagicMock(status="completed", chunk_count=12, error_message=None))
+
+        await worker.run_job(LANE_OCR, job)
+
+        stored = await queue.get_task_status(job["id"])
+        assert (stored["status"], stored["progress"], stored["chunk_count"]) == (JOB_COMPLETED, 1.0, 12)
+        assert stored["attempts"] == 1
+
+    @pytest.mark.unit
+    async def test_conversion_failure_is_not_retried(self, queue, worker):
+        job = await self._claimed(queue)
+        worker._index = AsyncMock(
+            return_value=MagicMock(status="failed", chunk_count=0, error_message="Dokumentkonvertierung fehlgeschlagen")
+        )
+
+        await worker.run_job(LANE_OCR, job)
+
+        stored = await queue.get_task_status(job["id"])
+        assert stored["status"] == JOB_FAILED
+        assert stored["error"] == "Dokumentkonvertierung fehlgeschlagen"
+        assert await queue.redis_client.llen(queue.lane_queue(LANE_OCR)) == 0
+
+    @pytest.mark.unit
+    async def test_errors_retried_then_failed(self, queue, worker):
+        job = await self._claimed(queue)
+        worker._index = AsyncMock(side_effect=ConnectionError("Ollama nicht erreichbar"))
+
+        with patch("services.ingestion_queue.settings.rag_ingest_max_retries", 1):
+            await worker.run_job(LANE_OCR, job)
+            assert (await queue.get_task_status(job["id"]))["status"] == JOB_QUEUED
+
+            _, retried = await queue.claim(LANE_OCR, timeout=0)
+            await worker.run_job(LANE_OCR, retried)
+
+        stored = await queue.get_task_status(job["id"])
+        assert (stored["status"], stored["attempts"]) == (JOB_FAILED, 2)
+        assert worker._index.await_args_list[1].kwargs == {"retry": True}
+
+    @pytest.mark.unit
+    async def test_cancelled_before_start(self, queue, worker):
+        job = await self._claimed(queue)
+        await queue.cancel(job["id"])
+        worker._index = AsyncMock()
+
+        await worker.run_job(LANE_OCR, job)
+
+        worker._index.assert_not_called()
+        worker._discard.assert_awaited_once_with(7)
+
+    @pytest.mark.unit
+    async def test_cancelled_while_running(self, queue, worker):
+        job = await self._claimed(queue)
+        worker._index = AsyncMock(side_effect=IngestionCancelled(job["id"]))
+
+        await worker.run_job(LANE_OCR, job)
+
+        assert (await queue.get_task_status(job["id"]))["status"] == JOB_CANCELLED
+        worker._discard.assert_awaited_once_with(7)
+
+    @pytest.mark.unit
+    async def test_restart_within_heartbeat_ttl_recovers_running_job(self, queue, worker):
+        job_id = await _submit(queue)
+        started = asyncio.Event()
+
+        async def index(*args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()  # Still converting when the backend stops
+
+        worker._index = index
+        worker._new_pool = MagicMock()
+        with patch("services.ingestion_queue.settings.rag_ingest_ocr_workers", 1), \
+                patch("services.ingestion_queue.settings.rag_ingest_text_workers", 0):
+            await worker.start()
+            await asyncio.wait_for(started.wait(), timeout=1)
+            await worker.stop()
+
+        # Next start, seconds later: the heartbeat must not keep the job in the processing list
+        assert not await queue.redis_client.exists(queue._heartbeat_key(job_id))
+        assert await queue.recover(LANE_OCR) == 1
+        assert (await queue.claim(LANE_OCR, timeout=0))[1]["id"] == job_id
+
+    @pytest.mark.unit
+    async def test_progress_reporter(self, queue, worker):
+        job = await self._claimed(queue)
+        report = worker._progress_reporter(job["id"])
+
+        await report("embedding", 0.5)
+        assert (await queue.get_task_status(job["id"]))["progress"] == pytest.approx(0.525)
+
+        await report("embedding", 0.52)  # Below the 5% step: no write
+        assert (await queue.get_task_status(job["id"]))["progress"] == pytest.approx(0.525)
+
+        await queue.cancel(job["id"])
+        with pytest.raises(IngestionCancelled):
+            await report("saving", 0.0)
+
+
+class TestIndexDocument:
+
+    @pytest.mark.unit
+    async def test_convert_and_progress_hooks(self):
+        from models.database import Document
+        from services.rag_service import RAGService
+
+        db = MagicMock()
+        db.commit = AsyncMock()
+        db.flush = AsyncMock()
+        db.execute = AsyncMock(return_value=MagicMock())
+        db.refresh = AsyncMock()
+        service = RAGService(db)
+        service.get_embedding = AsyncMock(return_value=[0.1] * 3)
+        doc = Document(id=5, filename="a.md", file_path="/uploads/a.md", status="pending")
+        convert = AsyncMock(return_value={
+            "status": "completed",
+            "metadata": {"file_type": "md"},
+            "chunks": [
+                {"text": f"Absatz {i}", "chunk_index": i, "metadata": {"chunk_type": "table"}} for i in range(2)
+            ],
+        })
+        progress = AsyncMock()
+
+        result = await service.index_document(doc, convert=convert, progress=progress)
+
+        convert.assert_awaited_once_with("/uploads/a.md", False)
+        assert result.status == "completed"
+        assert result.chunk_count == 2
+        assert [c.args for c in progress.await_args_list] == [
+            ("converting", 0.0), ("embedding", 0.0), ("embedding", 0.5), ("embedding", 1.0), ("saving", 0.0),
+        ]
+
+    @pytest.mark.unit
+    async def test_progress_exception_marks_failed(self):
+        from models.database import Document
+        from services.rag_service import RAGService
+
+        db = MagicMock()
+        db.commit = AsyncMock()
+        service = RAGService(db)
+        doc = Document(id=5, filename="a.md", file_path="/uploads/a.md", status="pending")
+
+        with pytest.raises(IngestionCancelled):
+            await service.index_document(doc, convert=AsyncMock(), progress=AsyncMock(side_effect=IngestionCancelled()))
+
+        assert doc.status == "failed"
+
+
+class TestUploadAPI:
+
+    @pytest.mark.unit
+    def test_upload_returns_202_with_job(self, tmp_path):
+        import io
+
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+
+        from api.routes import knowledge
+        from services.database import get_db
+
+        rag = MagicMock()
+        rag.db.execute = AsyncMock(return_value=MagicMock(scalar_one_or_none=MagicMock(return_value=None)))
+        rag.create_document = AsyncMock(return_value=MagicMock(id=9))
+        queue = MagicMock()
+        queue.submit = AsyncMock(return_value="task:ingest:1")
+        app = FastAPI()
+        app.include_router(knowledge.router, prefix="/api/knowledge")
+        app.dependency_overrides[knowledge.get_rag_service] = lambda: rag
+        app.dependency_overrides[get_db] = lambda: None
+
+        with patch("services.ingestion_queue.get_ingestion_queue", return_value=queue), \
+             patch.object(knowledge.settings, "upload_dir", str(tmp_path)), \
+             patch.object(knowledge.settings, "auth_enabled", False):
+            response = TestClient(app).post(
+                "/api/knowledge/upload", files={"file": ("notizen.md", io.BytesIO(b"# Notiz"), "text/markdown")}
+            )
+
+        assert response.status_code == 202
+        assert response.json()["job_id"] == "task:ingest:1"
+        assert (response.json()["document_id"], response.json()["lane"]) == (9, LANE_TEXT)
+        rag.ingest_document.assert_not_called()
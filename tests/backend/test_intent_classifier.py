@@ -0,0 +1,247 @@
+"""
+Tests for the embedding nearest-neighbour intent fast path
+(services/intent_classifier.py, services/intent_classifier_eval.py).
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+
+from services.intent_classifier import (
+    HASS_TURN_OFF,
+    HASS_TURN_ON,
+    IntentClassifier,
+    detect_polarity,
+    get_intent_classifier,
+    successful_turns,
+)
+from services.intent_classifier_eval import evaluate
+
+# Toy embedding space: device commands, small talk, knowledge questions
+LIGHT = [1.0, 0.0, 0.0]
+CHAT = [0.0, 1.0, 0.0]
+KNOWLEDGE = [0.0, 0.0, 1.0]
+
+EMBEDDINGS = {
+    "Licht im Büro aus": LIGHT,
+    "Mach das Licht an": LIGHT,
+    "Deckenlampe aus": LIGHT,
+    "Licht an und aus": LIGHT,
+    "Erzähl mir einen Witz": CHAT,
+    "Suche nach Rezepten": KNOWLEDGE,
+    "Irgendwas dazwischen": [0.7, 0.7, 0.0],
+}
+
+ENTITY_MAP = [
+    {"entity_id": "light.buero", "friendly_name": "Bürolicht", "domain": "light", "room": "Büro", "state": "on"},
+    {"entity_id": "light.decke", "friendly_name": "Deckenlampe", "domain": "light", "room": "Küche", "state": "on"},
+]
+
+
+def _loaded() -> IntentClassifier:
+    classifier = IntentClassifier()
+    classifier.load([
+        ("Schalte das Licht ein", HASS_TURN_ON, LIGHT),
+        ("Schalte das Licht aus", HASS_TURN_OFF, LIGHT),
+        ("Wie geht es dir?", "general.conversation", CHAT),
+        ("Suche nach Rezepten", "knowledge.search", KNOWLEDGE),
+    ])
+    return classifier
+
+
+@pytest.fixture
+def fast_path_env():
+    """Fake embeddings, entity map and registry for resolve()."""
+    embedding_service = MagicMock()
+    embedding_service.embed = AsyncMock(side_effect=lambda text, **kwargs: EMBEDDINGS[text])
+    ha_client = MagicMock()
+    ha_client.get_entity_map = AsyncMock(return_value=ENTITY_MAP)
+
+    with patch("services.embedding_service.get_embedding_service", return_value=embedding_service), \
+         patch("integrations.homeassistant.HomeAssistantClient", return_value=ha_client), \
+         patch("services.intent_registry.intent_registry.is_intent_available", return_value=True):
+        yield embedding_service
+
+
+class TestIndex:
+
+    @pytest.mark.unit
+    def test_classify_returns_nearest_intent(self):
+        match = _loaded().classify([0.1, 0.95, 0.0])
+
+        assert match.intent == "general.conversation"
+        assert match.example == "Wie geht es dir?"
+        assert match.score == pytest.approx(0.95 / np.linalg.norm([0.1, 0.95]))
+
+    @pytest.mark.unit
+    def test_on_and_off_share_one_vote(self):
+        match = _loaded().classify(LIGHT)
+
+        assert match.intent in (HASS_TURN_ON, HASS_TURN_OFF)
+        assert match.margin == pytest.approx(1.0)  # Competitors are chat/knowledge, not the opposite polarity
+
+    @pytest.mark.unit
+    def test_margin_against_other_intents(self):
+        match = _loaded().classify([0.7, 0.7, 0.0])
+
+        assert match.margin == pytest.approx(0.0, abs=1e-6)
+        assert not match.is_confident(threshold=0.5, margin=0.05)
+
+    @pytest.mark.unit
+    def test_duplicate_text_keeps_last_label(self):
+        classifier = IntentClassifier()
+        classifier.load([
+            ("Suche nach Rezepten", "knowledge.search", KNOWLEDGE),
+            ("suche nach rezepten!", "knowledge.ask", KNOWLEDGE),
+        ])
+
+        assert len(classifier) == 1
+        assert classifier.classify(KNOWLEDGE).intent == "knowledge.ask"
+
+    @pytest.mark.unit
+    def test_add_example_relabels_and_appends(self):
+        classifier = _loaded()
+
+        classifier.add_example("Wie geht es dir", "general.smalltalk", CHAT)
+        classifier.add_example("Wer ist zuhause?", "internal.get_all_presence", [0.0, 0.6, 0.8])
+
+        assert len(classifier) == 5
+        assert classifier.classify(CHAT).intent == "general.smalltalk"
+        assert classifier.classify([0.0, 0.6, 0.8]).intent == "internal.get_all_presence"
+
+    @pytest.mark.unit
+    def test_add_example_before_load_is_ignored(self):
+        classifier = IntentClassifier()
+
+        classifier.add_example("Licht an", HASS_TURN_ON, LIGHT)
+
+        assert len(classifier) == 0
+        assert classifier.classify(LIGHT) is None
+
+    @pytest.mark.unit
+    def test_global_instance_is_shared(self):
+        assert get_intent_classifier() is get_intent_classifier()
+
+
+class TestHelpers:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("message,expected", [
+        ("Mach das Licht im Büro an", True),
+        ("Schalte die Steckdose ein", True),
+        ("Licht aus", False),
+        ("Turn off the lights", False),
+        ("Schalte ein Licht aus", None),   # "ein" as article
+        ("Wie hell ist es?", None),
+    ])
+    def test_polarity(self, message, expected):
+        assert detect_polarity(message) is expected
+
+    @pytest.mark.unit
+    def test_successful_turns(self):
+        rows = [
+            (1, "user", "Licht an", None),
+            (1, "assistant", "Ok", {"intent": HASS_TURN_ON, "action_success": True}),
+            (1, "user", "Suche Rezepte", None),
+            (1, "assistant", "Nichts", {"intent": {"intent": "knowledge.search"}, "action_result": {"success": True}}),
+            (1, "user", "Rollo zu", None),
+            (1, "assistant", "Fehler", {"intent": "mcp.homeassistant.HassSetPosition", "action_success": False}),
+            (2, "user", "Hallo", None),
+            (3, "assistant", "Andere Konversation", {"intent": "general.conversation", "action_success": True}),
+        ]
+
+        assert successful_turns(rows) == [("Licht an", HASS_TURN_ON), ("Suche Rezepte", "knowledge.search")]
+
+
+class TestResolve:
+
+    @pytest.mark.unit
+    async def test_area_from_room_context(self, fast_path_env):
+        intent = await _loaded().resolve("Mach das Licht an", {"room_name": "Büro"})
+
+        assert intent == {
+            "intent": HASS_TURN_ON,
+            "parameters": {"area": "Büro", "domain": ["light"]},
+            "confidence": 1.0,
+        }
+
+    @pytest.mark.unit
+    async def test_area_from_message_and_polarity(self, fast_path_env):
+        intent = await _loaded().resolve("Licht im Büro aus", {"room_name": "Küche"})
+
+        assert intent["intent"] == HASS_TURN_OFF
+        assert intent["parameters"] == {"area": "Büro", "domain": ["light"]}
+
+    @pytest.mark.unit
+    async def test_friendly_name_wins(self, fast_path_env):
+        intent = await _loaded().resolve("Deckenlampe aus")
+
+        assert intent["parameters"] == {"name": "Deckenlampe"}
+
+    @pytest.mark.unit
+    async def test_unknown_target_falls_back(self, fast_path_env):
+        assert await _loaded().resolve("Mach das Licht an") is None  # No room, no name
+
+    @pytest.mark.unit
+    async def test_ambiguous_polarity_falls_back(self, fast_path_env):
+        assert await _loaded().resolve("Licht an und aus", {"room_name": "Büro"}) is None
+
+    @pytest.mark.unit
+    async def test_required_parameters_fall_back(self, fast_path_env):
+        assert await _loaded().resolve("Suche nach Rezepten") is None
+
+    @pytest.mark.unit
+    async def test_parameterless_intent(self, fast_path_env):
+        intent = await _loaded().resolve("Erzähl mir einen Witz")
+
+        assert intent == {"intent": "general.conversation", "parameters": {}, "confidence": 1.0}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("message", [
+        "Wenn es regnet, dann schließe die Fenster",
+        "Mach es aus",
+    ])
+    async def test_complex_and_reference_skip_embedding(self, fast_path_env, message):
+        assert await _loaded().resolve(message) is None
+        fast_path_env.embed.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_extract_intent_uses_fast_path(self, fast_path_env):
+        from services.ollama_service import OllamaService
+
+        service = OllamaService.__new__(OllamaService)
+        service.default_lang = "de"
+        service.client = MagicMock()
+        service.client.chat = AsyncMock()
+
+        with patch("services.ollama_service.settings.intent_fastpath_enabled", True), \
+             patch("services.intent_classifier._intent_classifier", _loaded()):
+            intent = await service.extract_intent("Licht im Büro aus")
+
+        assert intent["intent"] == HASS_TURN_OFF
+        service.client.chat.assert_not_called()
+
+
+class TestEvaluation:
+
+    @pytest.mark.unit
+    async def test_report(self, fast_path_env):
+        turns = [
+            ("Licht im Büro aus", HASS_TURN_OFF),
+            ("Mach das Licht an", HASS_TURN_ON),
+            ("Erzähl mir einen Witz", "knowledge.search"),  # Wrong fast path answer
+            ("Irgendwas dazwischen", "general.conversation"),  # Below margin → LLM
+        ]
+
+        report = await evaluate(_loaded(), turns)
+        data = report.to_dict()
+
+        assert (data["total"], data["hits"]) == (4, 3)
+        assert data["precision"] == pytest.approx(2 / 3, abs=1e-4)
+        assert data["recall"] == pytest.approx(0.5)
+        assert data["intents"][HASS_TURN_OFF] == {"support": 1, "predicted": 1, "precision": 1.0, "recall": 1.0}
+        assert data["intents"]["general.conversation"]["precision"] == 0.0
+        assert data["errors"] == [
+            {"message": "Erzähl mir einen Witz", "expected": "knowledge.search", "predicted": "general.conversation"}
+        ]
+        assert "Precision: 66.7%" in report.format()
@@ -0,0 +1,83 @@
+"""
+Tests for the trigram-blocked duplicate search (KGCleanupService.find_duplicate_clusters).
+"""
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services import kg_cleanup_service
+from services.kg_cleanup_service import KGCleanupService, _normalize_name, _similar_pairs
+from services.kg_duplicate_bench import exhaustive_pairs, synthetic_entities
+
+
+def _names(count: int, entity_type: str) -> list[str]:
+    return [_normalize_name(n, t) for n, t in synthetic_entities(count) if t == entity_type]
+
+
+class TestSimilarPairs:
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("entity_type", ["person", "location"])
+    def test_matches_exhaustive_comparison(self, entity_type):
+        names = _names(1500, entity_type)
+
+        pairs = _similar_pairs(names, 0.82)
+
+        assert {(i, j) for i, j, _ in pairs} == exhaustive_pairs(names, 0.82)
+        assert all(i < j and ratio >= 0.82 for i, j, ratio in pairs)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("threshold", [0.9, 0.95])
+    def test_higher_thresholds_match_exhaustive_comparison(self, threshold):
+        names = _names(600, "person")
+
+        pairs = _similar_pairs(names, threshold)
+
+        assert {(i, j) for i, j, _ in pairs} == exhaustive_pairs(names, threshold)
+
+    @pytest.mark.unit
+    def test_threshold_below_blocking_minimum_is_rejected(self):
+        with pytest.raises(ValueError):
+            _similar_pairs(["anna", "anne"], 0.6)
+
+    @pytest.mark.unit
+    def test_small_blocks_give_same_pairs(self):
+        names = _names(600, "person")
+        expected = sorted(_similar_pairs(names, 0.82))
+
+        with patch.object(kg_cleanup_service, "_BLOCK_POSTINGS", 50), \
+             patch.object(kg_cleanup_service, "_BLOCK_CELLS", 50):
+            assert sorted(_similar_pairs(names, 0.82)) == expected
+
+    @pytest.mark.unit
+    def test_empty_and_single_names(self):
+        assert _similar_pairs([], 0.82) == []
+        assert _similar_pairs(["", "", "anna"], 0.82) == []
+        assert _similar_pairs(["x", "x"], 0.82) == [(0, 1, 1.0)]
+
+
+class TestFindDuplicateClusters:
+
+    @pytest.mark.unit
+    async def test_clusters_ocr_variants_per_type(self):
+        rows = [
+            SimpleNamespace(id=1, name="Müller GmbH", mention_count=2, entity_type="organization"),
+            SimpleNamespace(id=2, name="Herr Thomas Müller", mention_count=9, entity_type="person"),
+            SimpleNamespace(id=3, name="Thomas Mueller", mention_count=1, entity_type="person"),
+            SimpleNamespace(id=4, name="Thomas Mül1er", mention_count=None, entity_type="person"),
+            SimpleNamespace(id=5, name="Sabine Schulz", mention_count=4, entity_type="person"),
+            SimpleNamespace(id=6, name="Muller", mention_count=1, entity_type="organization"),
+        ]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(fetchall=MagicMock(return_value=rows)))
+
+        clusters = await KGCleanupService(db).find_duplicate_clusters()
+
+        assert [c["cluster_size"] for c in clusters] == [3, 2]
+        person, org = clusters
+        assert person["canonical"]["id"] == 2
+        assert {d["id"] for d in person["duplicates"]} == {3, 4}
+        assert all(0.82 <= d["similarity"] <= 1.0 for d in person["duplicates"])
+        assert org["entity_type"] == "organization"
+        assert {org["canonical"]["id"], org["duplicates"][0]["id"]} == {1, 6}
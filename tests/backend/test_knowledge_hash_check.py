@@ -0,0 +1,64 @@
+"""
+Tests for POST /api/knowledge/documents/check-hashes (bulk import pre-check).
+"""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routes import knowledge
+from services.auth_service import get_optional_user
+from services.database import get_db
+
+KNOWN = "a" * 64
+NEW = "b" * 64
+
+
+def _client(rows: list, user=None) -> tuple[TestClient, MagicMock]:
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+    app = FastAPI()
+    app.include_router(knowledge.router, prefix="/api/knowledge")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_optional_user] = lambda: user
+    return TestClient(app), db
+
+
+class TestHashCheck:
+
+    @pytest.mark.unit
+    def test_existing_and_missing(self):
+        client, db = _client([(KNOWN, 12)])
+
+        with patch.object(knowledge.settings, "auth_enabled", False):
+            response = client.post(
+                "/api/knowledge/documents/check-hashes",
+                json={"hashes": [KNOWN, NEW.upper(), KNOWN], "knowledge_base_id": 3},
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {"existing": {KNOWN: 12}, "missing": [NEW]}
+        params = db.execute.await_args.args[0].compile().params
+        assert params["knowledge_base_id_1"] == 3
+
+    @pytest.mark.unit
+    def test_empty_and_oversized_lists_rejected(self):
+        client, _ = _client([])
+
+        with patch.object(knowledge.settings, "auth_enabled", False):
+            assert client.post("/api/knowledge/documents/check-hashes", json={"hashes": []}).status_code == 422
+            too_many = {"hashes": [NEW] * 1001}
+            assert client.post("/api/knowledge/documents/check-hashes", json=too_many).status_code == 422
+
+    @pytest.mark.unit
+    def test_requires_upload_permission(self):
+        user = MagicMock()
+        user.get_permissions.return_value = []
+        client, db = _client([], user=user)
+
+        with patch.object(knowledge.settings, "auth_enabled", True):
+            response = client.post("/api/knowledge/documents/check-hashes", json={"hashes": [KNOWN]})
+
+        assert response.status_code == 403
+        db.execute.assert_not_called()
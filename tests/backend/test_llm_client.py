@@ -5,6 +5,7 @@ Tests:
 - Protocol structural typing (positive + negative)
 - Factory: client creation, URL-based caching, cache clearing
 - Agent client: URL priority resolution (role → fallback → default)
+- embed_many(): batch embedding helper
 """
 import sys
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -22,6 +23,7 @@ from utils.llm_client import (
     LLMClient,
     clear_client_cache,
     create_llm_client,
+    embed_many,
     extract_response_content,
     get_agent_client,
     get_classification_chat_kwargs,
@@ -451,6 +453,57 @@ class TestFallbackLLMClient:
 
         assert result == "embed_result"
 
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_batch_embed_also_falls_back(self):
+        """embed() (batch endpoint) also uses fallback on connect error."""
+        import httpx
+
+        from utils.llm_client import _FallbackLLMClient
+
+        primary = AsyncMock()
+        fallback = AsyncMock()
+        primary.embed.side_effect = httpx.ConnectError("refused")
+        fallback.embed.return_value = "batch_result"
+
+        client = _FallbackLLMClient(primary, fallback, "http://fallback:11434")
+        result = await client.embed(model="test", input=["a", "b"])
+
+        assert result == "batch_result"
+
+
+# ============================================================================
+# Batch Embedding Tests
+# ============================================================================
+
+class TestEmbedMany:
+    """Tests for embed_many() batch helper."""
+
+    @pytest.mark.unit
+    async def test_returns_vectors_in_input_order(self):
+        client = AsyncMock()
+        client.embed.return_value = MagicMock(embeddings=[[0.1, 0.2], [0.3, 0.4]])
+
+        result = await embed_many(client, "nomic-embed-text", ["a", "b"])
+
+        assert result == [[0.1, 0.2], [0.3, 0.4]]
+        client.embed.assert_awaited_once_with(model="nomic-embed-text", input=["a", "b"], options=None)
+
+    @pytest.mark.unit
+    async def test_empty_input_makes_no_request(self):
+        client = AsyncMock()
+
+        assert await embed_many(client, "m", []) == []
+        client.embed.assert_not_called()
+
+    @pytest.mark.unit
+    async def test_count_mismatch_raises(self):
+        client = AsyncMock()
+        client.embed.return_value = MagicMock(embeddings=[[0.1]])
+
+        with pytest.raises(ValueError):
+            await embed_many(client, "m", ["a", "b"])
+
 
 # ============================================================================
 # Thinking Model Detection Tests (Option C)
@@ -20,12 +20,14 @@ from services.mcp_client import (
     MCPValidationError,
     TokenBucketRateLimiter,
     _coerce_arguments,
+    _geocode_location_arguments,
     _resolve_value,
     _sanitize_credentials,
     _substitute_env_vars,
     _truncate_response,
     _validate_tool_input,
 )
+from services.mcp_result_cache import parse_cache_policies
 
 # ============================================================================
 # Env-Var Substitution
@@ -1610,6 +1612,92 @@ class TestAllDiscoveredToolsAndRefilter:
         manager._refilter_server("nonexistent")  # Should not raise
 
 
+class TestConcurrencyLimit:
+    """Per-server limit on concurrent tool calls (agent runs independent calls in parallel)."""
+
+    @pytest.mark.unit
+    def test_limit_from_yaml(self, tmp_path):
+        config_file = tmp_path / "mcp_servers.yaml"
+        config_file.write_text("""
+servers:
+  - name: limited
+    url: "http://localhost:8080/mcp"
+    max_concurrent_calls: 2
+  - name: default
+    url: "http://localhost:8081/mcp"
+""")
+        manager = MCPManager()
+        manager.load_config(str(config_file))
+
+        assert manager._servers["limited"].call_semaphore._value == 2
+        assert manager._servers["default"].call_semaphore._value == 4
+
+    @pytest.mark.unit
+    async def test_calls_wait_for_free_slot(self):
+        manager = MCPManager()
+        running = {"now": 0, "max": 0}
+
+        async def call_tool(name, arguments):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return MagicMock(isError=False, content=[MagicMock(text="ok", type="text")])
+
+        session = MagicMock()
+        session.call_tool = call_tool
+        manager._tool_index["mcp.srv.t"] = MCPToolInfo("srv", "t", "mcp.srv.t", "Tool")
+        manager._servers["srv"] = MCPServerState(
+            config=MCPServerConfig(name="srv"), connected=True, session=session,
+            call_semaphore=asyncio.Semaphore(2),
+        )
+
+        results = await asyncio.gather(*(manager.execute_tool("mcp.srv.t", {}) for _ in range(5)))
+
+        assert all(r["success"] for r in results)
+        assert running["max"] == 2
+
+
+class TestToolsVersion:
+    """tools_version invalidates cached tool prompts when the tool index changes."""
+
+    def _manager(self, tools: list[MCPToolInfo]) -> tuple[MCPManager, MagicMock]:
+        manager = MCPManager()
+        session = MagicMock()
+        session.list_tools = AsyncMock(return_value=MagicMock(tools=tools))
+        state = MCPServerState(config=MCPServerConfig(name="srv"), connected=True, session=session)
+        manager._servers["srv"] = state
+        return manager, session
+
+    def _tool(self, name: str, description: str) -> MagicMock:
+        tool = MagicMock(inputSchema={})
+        tool.name = name
+        tool.description = description
+        return tool
+
+    @pytest.mark.unit
+    async def test_refresh_bumps_only_on_change(self):
+        manager, session = self._manager([self._tool("t1", "Tool 1")])
+
+        await manager.refresh_tools()
+        version = manager.tools_version
+        await manager.refresh_tools()
+        assert manager.tools_version == version  # Same tools, cache stays valid
+
+        session.list_tools.return_value = MagicMock(tools=[self._tool("t1", "Tool 1 (neu)")])
+        await manager.refresh_tools()
+        assert manager.tools_version == version + 1
+
+    @pytest.mark.unit
+    def test_refilter_bumps(self):
+        manager = MCPManager()
+        manager._servers["srv"] = MCPServerState(config=MCPServerConfig(name="srv"), connected=True)
+
+        manager._refilter_server("srv")
+
+        assert manager.tools_version == 1
+
+
 # ============================================================================
 # get_all_tools_with_status
 # ============================================================================
@@ -1787,3 +1875,105 @@ class TestGetStatusTotalToolCount:
         status = manager.get_status()
         assert status["servers"][0]["tool_count"] == 1
         assert status["servers"][0]["total_tool_count"] == 2
+
+
+class TestResultCache:
+    """Read-only tools with a cache policy are answered from the result cache."""
+
+    def _manager(self, cache: dict, read_only_hint: bool | None = None) -> tuple[MCPManager, AsyncMock]:
+        manager = MCPManager()
+        session = MagicMock()
+        session.call_tool = AsyncMock(
+            return_value=MagicMock(isError=False, content=[MagicMock(text="Sonnig", type="text")])
+        )
+        for tool in ("get_weather", "set_alarm"):
+            manager._tool_index[f"mcp.srv.{tool}"] = MCPToolInfo(
+                "srv", tool, f"mcp.srv.{tool}", "Tool", read_only_hint=read_only_hint
+            )
+        manager._servers["srv"] = MCPServerState(
+            config=MCPServerConfig(name="srv", cache=cache), connected=True, session=session,
+        )
+        return manager, session.call_tool
+
+    @pytest.mark.unit
+    def test_policy_from_yaml(self, tmp_path):
+        config_file = tmp_path / "mcp_servers.yaml"
+        config_file.write_text("""
+servers:
+  - name: weather
+    url: "http://localhost:8080/mcp"
+    cache:
+      get_weather:
+        read_only: true
+        ttl: 600
+      set_alarm:
+        ttl: 600
+""")
+        manager = MCPManager()
+        manager.load_config(str(config_file))
+
+        assert set(manager._servers["weather"].config.cache) == {"get_weather"}
+
+    @pytest.mark.unit
+    async def test_repeated_call_served_from_cache(self):
+        manager, call_tool = self._manager(parse_cache_policies({"get_weather": {"read_only": True, "ttl": 60}}))
+
+        first = await manager.execute_tool("mcp.srv.get_weather", {"location": "Berlin"})
+        second = await manager.execute_tool("mcp.srv.get_weather", {"location": "Berlin"})
+        await manager.execute_tool("mcp.srv.get_weather", {"location": "Hamburg"})
+
+        assert first == second
+        assert call_tool.await_count == 2
+        assert manager.get_status()["cache"]["hits"] == 1
+
+    @pytest.mark.unit
+    async def test_tools_without_policy_always_called(self):
+        manager, call_tool = self._manager(parse_cache_policies({"get_weather": {"read_only": True, "ttl": 60}}))
+
+        await manager.execute_tool("mcp.srv.set_alarm", {"time": "07:00"})
+        await manager.execute_tool("mcp.srv.set_alarm", {"time": "07:00"})
+
+        assert call_tool.await_count == 2
+
+    @pytest.mark.unit
+    async def test_mutating_hint_overrides_policy(self):
+        manager, call_tool = self._manager(
+            parse_cache_policies({"get_weather": {"read_only": True, "ttl": 60}}), read_only_hint=False
+        )
+
+        await manager.execute_tool("mcp.srv.get_weather", {})
+        await manager.execute_tool("mcp.srv.get_weather", {})
+
+        assert call_tool.await_count == 2
+
+    @pytest.mark.unit
+    async def test_disabled_by_setting(self):
+        manager, call_tool = self._manager(parse_cache_policies({"get_weather": {"read_only": True, "ttl": 60}}))
+
+        with patch("services.mcp_client.settings.mcp_cache_enabled", False):
+            await manager.execute_tool("mcp.srv.get_weather", {})
+            await manager.execute_tool("mcp.srv.get_weather", {})
+
+        assert call_tool.await_count == 2
+
+
+class TestGeocodeCache:
+    """Place names are geocoded once and reused."""
+
+    @pytest.mark.unit
+    async def test_repeated_location_geocoded_once(self):
+        response = MagicMock()
+        response.json.return_value = {"results": [
+            {"name": "Berlin", "latitude": 52.52, "longitude": 13.41, "population": 3_500_000, "timezone": "Europe/Berlin"},
+        ]}
+        client = MagicMock()
+        client.get = AsyncMock(return_value=response)
+        schema = {"properties": {"latitude": {}, "longitude": {}, "timezone": {}}}
+
+        with patch("services.mcp_client._get_geocode_client", return_value=client), \
+             patch.dict("services.mcp_client._geocode_cache", clear=True):
+            first = await _geocode_location_arguments({"location": "Berlin"}, schema)
+            second = await _geocode_location_arguments({"location": "berlin "}, schema)
+
+        assert first == second == {"latitude": 52.52, "longitude": 13.41, "timezone": "Europe/Berlin"}
+        client.get.assert_awaited_once()
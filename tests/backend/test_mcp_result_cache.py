@@ -0,0 +1,205 @@
+"""
+Tests for the MCP result cache (services/mcp_result_cache.py).
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.mcp_result_cache import (
+    MCPCachePolicy,
+    MCPResultCache,
+    make_cache_key,
+    parse_cache_policies,
+)
+
+OK = {"success": True, "message": "Sonnig, 21°C", "data": None}
+
+
+def _call(result: dict = OK) -> AsyncMock:
+    return AsyncMock(return_value=dict(result))
+
+
+class TestPolicies:
+
+    @pytest.mark.unit
+    def test_parse(self):
+        policies = parse_cache_policies({
+            "get_weather": {"read_only": True, "ttl": 600, "key_fields": ["location"]},
+            "search_documents": {"read_only": True, "ttl": 60, "per_user": True},
+        })
+
+        assert policies["get_weather"] == MCPCachePolicy(ttl=600.0, key_fields=["location"])
+        assert policies["search_documents"] == MCPCachePolicy(ttl=60.0, per_user=True)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("entry", [
+        {"ttl": 600},                          # read_only missing
+        {"read_only": "yes", "ttl": 600},      # Not a real boolean
+        {"read_only": True},                   # No TTL
+        {"read_only": True, "ttl": 0},
+        "get_weather",
+    ])
+    def test_invalid_entries_skipped(self, entry):
+        assert parse_cache_policies({"get_weather": entry}) == {}
+
+    @pytest.mark.unit
+    def test_missing_section(self):
+        assert parse_cache_policies(None) == {}
+
+    @pytest.mark.unit
+    def test_key_ignores_argument_order(self):
+        policy = MCPCachePolicy(ttl=60)
+
+        assert make_cache_key("t", {"a": 1, "b": 2}, policy) == make_cache_key("t", {"b": 2, "a": 1}, policy)
+        assert make_cache_key("t", {"a": 1}, policy) != make_cache_key("t", {"a": 2}, policy)
+
+    @pytest.mark.unit
+    def test_key_fields_and_per_user(self):
+        policy = MCPCachePolicy(ttl=60, key_fields=["location"], per_user=True)
+
+        key = make_cache_key("t", {"location": "Berlin", "request_id": "x1"}, policy, user_id=7)
+
+        assert key == make_cache_key("t", {"location": "Berlin", "request_id": "x2"}, policy, user_id=7)
+        assert key != make_cache_key("t", {"location": "Berlin"}, policy, user_id=8)
+
+
+class TestResultCache:
+
+    @pytest.mark.unit
+    async def test_hit_after_miss(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+        call = _call()
+
+        first = await cache.get_or_call("mcp.weather.get_weather", "k", 60, call)
+        second = await cache.get_or_call("mcp.weather.get_weather", "k", 60, call)
+
+        assert first == second == OK
+        call.assert_awaited_once()
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+        assert stats["tools"]["mcp.weather.get_weather"]["hit_ratio"] == 0.5
+
+    @pytest.mark.unit
+    async def test_returned_result_is_a_copy(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+
+        first = await cache.get_or_call("t", "k", 60, _call())
+        first["message"] = "verändert"
+
+        assert (await cache.get_or_call("t", "k", 60, _call()))["message"] == OK["message"]
+
+    @pytest.mark.unit
+    async def test_expired_entry_is_refetched(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+        call = _call()
+
+        with patch("services.mcp_result_cache.time.monotonic", return_value=100.0):
+            await cache.get_or_call("t", "k", 60, call)
+        with patch("services.mcp_result_cache.time.monotonic", return_value=161.0):
+            await cache.get_or_call("t", "k", 60, call)
+
+        assert call.await_count == 2
+
+    @pytest.mark.unit
+    async def test_lru_eviction(self):
+        cache = MCPResultCache(max_entries=2, use_redis=False)
+        call = _call()
+
+        for key in ("a", "b", "a", "c"):  # "a" was used recently, "b" is evicted
+            await cache.get_or_call("t", key, 60, call)
+        await cache.get_or_call("t", "a", 60, call)
+
+        assert call.await_count == 3
+        assert cache.get_stats()["size"] == 2
+
+    @pytest.mark.unit
+    async def test_failures_not_cached(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+        call = _call({"success": False, "message": "Timeout", "data": None})
+
+        await cache.get_or_call("t", "k", 60, call)
+        await cache.get_or_call("t", "k", 60, call)
+
+        assert call.await_count == 2
+        assert cache.get_stats()["size"] == 0
+
+    @pytest.mark.unit
+    async def test_concurrent_calls_coalesced(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return dict(OK)
+
+        results = await asyncio.gather(*(cache.get_or_call("t", "k", 60, call) for _ in range(3)))
+
+        assert calls == 1
+        assert results == [OK] * 3
+        assert cache.get_stats()["coalesced"] == 2
+
+    @pytest.mark.unit
+    async def test_exception_reaches_all_waiters(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            *(cache.get_or_call("t", "k", 60, call) for _ in range(2)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache._inflight == {}
+
+    @pytest.mark.unit
+    async def test_cancelled_leader_does_not_cancel_waiters(self):
+        cache = MCPResultCache(max_entries=10, use_redis=False)
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return dict(OK)
+
+        leader = asyncio.create_task(cache.get_or_call("t", "k", 60, call))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get_or_call("t", "k", 60, call))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await waiter == OK
+        assert leader.cancelled()
+        assert cache.get_stats()["coalesced"] == 1
+        assert cache._inflight == {}
+
+    @pytest.mark.unit
+    async def test_redis_hit_fills_local_cache(self):
+        cache = MCPResultCache(max_entries=10, use_redis=True)
+        redis = AsyncMock()
+        redis.get = AsyncMock(return_value='{"success": true, "message": "aus Redis", "data": null}')
+        cache._redis = redis
+        call = _call()
+
+        result = await cache.get_or_call("t", "k", 60, call)
+        await cache.get_or_call("t", "k", 60, call)
+
+        assert result["message"] == "aus Redis"
+        call.assert_not_awaited()
+        redis.get.assert_awaited_once()
+
+    @pytest.mark.unit
+    async def test_redis_errors_fall_back_to_call(self):
+        cache = MCPResultCache(max_entries=10, use_redis=True)
+        redis = AsyncMock()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache._redis = redis
+
+        assert await cache.get_or_call("t", "k", 60, _call()) == OK
@@ -0,0 +1,119 @@
+"""
+Tests for MinHash signatures and LSH near-duplicate search.
+"""
+
+import random
+
+import pytest
+
+from utils.minhash import NUM_PERM, lsh_shape, minhash_signature, near_duplicate_pairs
+
+
+def _letter(seed: int, words: int = 300) -> str:
+    rng = random.Random(seed)
+    vocabulary = ["Rechnung", "Betrag", "Konto", "Vertrag", "Kündigung", "Frist", "Zahlung", "Kunde",
+                  "Versicherung", "Monat", "Leistung", "Steuer", "Nummer", "Datum", "Anschrift", "Bank"]
+    return " ".join(f"{rng.choice(vocabulary)}{rng.randint(0, 999)}" for _ in range(words))
+
+
+def _ocr_noise(text: str, rate: float, seed: int = 0) -> str:
+    """Replace a share of characters like a worse OCR pass would."""
+    rng = random.Random(seed)
+    return "".join(rng.choice("il1o0rnm") if rng.random() < rate else c for c in text)
+
+
+# ============================================================================
+# Signatures
+# ============================================================================
+
+class TestMinhashSignature:
+    """Test minhash_signature()."""
+
+    @pytest.mark.unit
+    def test_deterministic_and_json_storable(self):
+        signature = minhash_signature(_letter(1))
+
+        assert signature == minhash_signature(_letter(1))
+        assert len(signature) == NUM_PERM
+        assert all(isinstance(v, int) and 0 <= v < 2**32 for v in signature)
+
+    @pytest.mark.unit
+    def test_normalizes_case_and_whitespace(self):
+        assert minhash_signature("Sehr geehrte  Damen\nund Herren") == \
+            minhash_signature("sehr geehrte damen und herren ")
+
+    @pytest.mark.unit
+    def test_empty_text(self):
+        assert minhash_signature("") is None
+        assert minhash_signature(None) is None
+        assert minhash_signature(" \n\t") is None
+        assert len(minhash_signature("ok")) == NUM_PERM
+
+
+# ============================================================================
+# LSH
+# ============================================================================
+
+class TestNearDuplicatePairs:
+    """Test near_duplicate_pairs()."""
+
+    @pytest.mark.unit
+    def test_finds_reocr_copy_among_unrelated(self):
+        signatures = {doc_id: minhash_signature(_letter(doc_id)) for doc_id in range(1, 200)}
+        signatures[500] = minhash_signature(_ocr_noise(_letter(7), rate=0.01))
+
+        pairs = near_duplicate_pairs(signatures, threshold=0.8)
+
+        assert [(a, b) for a, b, _ in pairs] == [(7, 500)]
+        assert 0.8 <= pairs[0][2] < 1.0
+
+    @pytest.mark.unit
+    def test_threshold_and_identical_copies(self):
+        original = _letter(3)
+        signatures = {
+            1: minhash_signature(original),
+            2: minhash_signature(original),
+            3: minhash_signature(_ocr_noise(original, rate=0.05)),
+        }
+
+        strict = near_duplicate_pairs(signatures, threshold=0.95)
+        loose = near_duplicate_pairs(signatures, threshold=0.3)
+
+        assert strict == [(1, 2, 1.0)]
+        # Spanning pairs only: 3 is linked to the group once, not to both copies
+        assert len(loose) == 2
+        assert (1, 2, 1.0) in loose
+        assert {a for a, _, _ in loose} | {b for _, b, _ in loose} == {1, 2, 3}
+
+    @pytest.mark.unit
+    def test_templated_family_stays_linear(self):
+        """Thousands of near-identical documents give one pair per document, not per pair."""
+        rng = random.Random(0)
+        templates = [minhash_signature(_letter(seed)) for seed in (1, 2)]
+        signatures = {}
+        for doc_id in range(3000):
+            signature = list(templates[doc_id % 2])
+            for position in rng.sample(range(NUM_PERM), 8):  # ~94% of positions shared
+                signature[position] = rng.randrange(2**32)
+            signatures[doc_id] = signature
+
+        pairs = near_duplicate_pairs(signatures, threshold=0.8)
+
+        assert len(pairs) == len(signatures) - 2
+        assert all(a % 2 == b % 2 and score >= 0.8 for a, b, score in pairs)
+
+    @pytest.mark.unit
+    def test_lsh_shape_follows_threshold(self):
+        assert lsh_shape(0.8) == (21, 6)
+        assert lsh_shape(0.5) == (42, 3)
+        for threshold in (0.3, 0.5, 0.8, 0.95):
+            bands, rows = lsh_shape(threshold)
+            assert bands * rows <= NUM_PERM
+            assert 1 - (1 - threshold ** rows) ** bands >= 0.99
+
+    @pytest.mark.unit
+    def test_ignores_missing_and_foreign_signatures(self):
+        signature = minhash_signature(_letter(1))
+
+        assert near_duplicate_pairs({1: signature, 2: None, 3: signature[:64]}, 0.8) == []
+        assert near_duplicate_pairs({}, 0.8) == []
@@ -340,12 +340,12 @@ class TestSpeakerModel:
         """Test: Speaker mit Embeddings Relationship"""
         embedding1 = SpeakerEmbedding(
             speaker_id=test_speaker.id,
-            embedding="base64_encoded_data_1",
+            embedding=b"\x00\x00\x80?" * 4,
             sample_duration=3000
         )
         embedding2 = SpeakerEmbedding(
             speaker_id=test_speaker.id,
-            embedding="base64_encoded_data_2",
+            embedding=b"\x00\x00\x00@" * 4,
             sample_duration=2500
         )
 
@@ -370,7 +370,7 @@ class TestSpeakerModel:
 
         embedding = SpeakerEmbedding(
             speaker_id=speaker.id,
-            embedding="to_be_deleted"
+            embedding=b"\x00\x00\x80?"
         )
         db_session.add(embedding)
         await db_session.commit()
@@ -1359,6 +1359,96 @@ class TestCheckContentCompleteness:
         assert "missing pages" not in issues.lower()
 
 
+# ============================================================================
+# Duplicate Detection
+# ============================================================================
+
+
+class TestDuplicateDetection:
+    """Test run_duplicate_detection method (MinHash/LSH + legacy content_hash)."""
+
+    @staticmethod
+    def _row(id, content_hash=None, text=None):
+        from utils.minhash import minhash_signature
+
+        return MagicMock(id=id, content_hash=content_hash, content_minhash=minhash_signature(text) if text else None)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_groups_near_duplicates_with_bulk_update(self, service, mock_db_factory):
+        """Re-OCR'd copy (different MD5) and legacy exact hash match are grouped."""
+        letter = " ".join(f"Vertrag {i} Kündigungsfrist drei Monate zum Quartalsende" for i in range(40))
+        rows = [
+            self._row(1, "h1", letter),
+            self._row(2, "h2", letter.replace("Quartalsende", "Ouartalsende", 3)),
+            self._row(3, "h3", "Ganz anderer Brief über die Stromabrechnung " * 20),
+            self._row(4, "legacy"),
+            self._row(5, "legacy"),
+        ]
+        mock_session = mock_db_factory._mock_session
+        mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+
+        result = await service.run_duplicate_detection()
+
+        assert result == {"groups_found": 2, "documents_flagged": 4}
+        updates = mock_session.execute.await_args_list[-1].args[1]
+        by_id = {u["id"]: u for u in updates}
+        assert set(by_id) == {1, 2, 4, 5}
+        assert by_id[1]["duplicate_group_id"] == by_id[2]["duplicate_group_id"]
+        assert by_id[4]["duplicate_group_id"] == by_id[5]["duplicate_group_id"] != by_id[1]["duplicate_group_id"]
+        assert 0.8 <= by_id[1]["duplicate_score"] < 1.0
+        assert by_id[4]["duplicate_score"] == 1.0
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_monthly_statements_do_not_chain_into_one_group(self, service, mock_db_factory):
+        """Consecutive statements match each other, but not the whole series one representative."""
+        import random
+
+        rng = random.Random(3)
+        bookings = [
+            f"{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}. Lastschrift "
+            f"{rng.choice(['REWE', 'Stadtwerke', 'Telekom', 'Aral', 'Miete'])} "
+            f"Ref {rng.randint(100000, 999999)} {rng.randint(1, 999)},{rng.randint(0, 99):02d} EUR"
+            for _ in range(24)
+        ]
+        # Each statement repeats most bookings of the previous one
+        rows = [
+            self._row(month, f"h{month}", "Sparkasse Kontoauszug Girokonto " + " ".join(bookings[month:month + 12]))
+            for month in range(12)
+        ]
+        mock_session = mock_db_factory._mock_session
+        mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+
+        result = await service.run_duplicate_detection()
+
+        updates = mock_session.execute.await_args_list[-1].args[1]
+        groups: dict[str, list[int]] = {}
+        for u in updates:
+            groups.setdefault(u["duplicate_group_id"], []).append(u["id"])
+            assert u["duplicate_score"] >= 0.8
+        assert result["groups_found"] == len(groups) > 1
+        # January and December are in different groups
+        january = next(g for g, members in groups.items() if 0 in members)
+        assert 11 not in groups[january]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_no_duplicates_clears_previous_groups(self, service, mock_db_factory):
+        """Without matches only the reset of old groups is executed."""
+        rows = [self._row(1, "h1", "Rechnung Januar " * 30), self._row(2, "h2", "Mahnung Stadtwerke " * 30)]
+        mock_session = mock_db_factory._mock_session
+        mock_session.execute.return_value = MagicMock(all=MagicMock(return_value=rows))
+
+        result = await service.run_duplicate_detection()
+
+        assert result == {"groups_found": 0, "documents_flagged": 0}
+        # SELECT + reset UPDATE, no bulk update
+        assert mock_session.execute.await_count == 2
+        mock_session.commit.assert_awaited_once()
+
+
 # ============================================================================
 # Correspondent Normalization
 # ============================================================================
@@ -16,11 +16,15 @@ for _mod in _missing_stubs:
     if _mod not in sys.modules:
         sys.modules[_mod] = MagicMock()
 
+import asyncio
+import io
+import wave
+from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from services.piper_service import PiperService
+from services.piper_service import PiperService, SentenceSplitter, split_sentences
 
 
 def _make_mock_settings(
@@ -32,6 +36,7 @@ def _make_mock_settings(
     s.piper_voice = piper_voice
     s.piper_voice_map = piper_voice_map or {"de": "de_DE-thorsten-high", "en": "en_US-amy-medium"}
     s.default_language = default_language
+    s.piper_timeout = 5.0
     return s
 
 
@@ -138,119 +143,348 @@ class TestVoiceSelection:
 # Synthesis Tests
 # ============================================================================
 
+def _wav(text: str) -> bytes:
+    """Small valid WAV whose length depends on the text."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(22050)
+        wf.writeframes(b"\x00\x01" * len(text))
+    return buf.getvalue()
+
+
+class _FakePiperProcess:
+    """Mimics `piper --output_dir`: one WAV file and one stdout path per stdin line."""
+
+    def __init__(self, cmd, respond=True):
+        self.cmd = cmd
+        self.output_dir = Path(cmd[cmd.index("--output_dir") + 1])
+        self.respond = respond
+        self.pid = 4242
+        self.returncode = None
+        self.lines = []
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.stdin = MagicMock()
+        self.stdin.write.side_effect = self._write
+        self.stdin.drain = AsyncMock()
+
+    def _write(self, data: bytes):
+        for line in data.decode().splitlines():
+            self.lines.append(line)
+            if self.respond:
+                path = self.output_dir / f"{len(self.lines)}.wav"
+                path.write_bytes(_wav(line))
+                self.stdout.feed_data(f"{path}\n".encode())
+
+    def exit(self, code=1):
+        self.returncode = code
+        self.stdout.feed_eof()
+        self.stderr.feed_eof()
+
+    def kill(self):
+        self.exit(-9)
+
+    async def wait(self):
+        return self.returncode
+
+
+class _PiperSpawner:
+    """Replacement for asyncio.create_subprocess_exec that records fake processes."""
+
+    def __init__(self):
+        self.processes: list[_FakePiperProcess] = []
+        self.respond = True
+
+    async def __call__(self, *cmd, **kwargs):
+        process = _FakePiperProcess(list(cmd), respond=self.respond)
+        self.processes.append(process)
+        return process
+
+
+@pytest.fixture
+def spawner():
+    spawner = _PiperSpawner()
+    with patch("services.piper_service.asyncio.create_subprocess_exec", new=spawner):
+        yield spawner
+
+
+@pytest.fixture
+async def piper(service, spawner):
+    yield service
+    await service.shutdown()
+
+
 @pytest.mark.unit
 class TestSynthesis:
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_file_success(self, service, tmp_path):
-        """Successful synthesis writes file and returns True."""
-        output_path = str(tmp_path / "output.wav")
+    async def test_synthesize_to_bytes_returns_wav(self, piper, spawner):
+        result = await piper.synthesize_to_bytes("Hallo Welt")
 
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate.return_value = (b"", b"")
+        assert result == _wav("Hallo Welt")
+        assert spawner.processes[0].lines == ["Hallo Welt"]
 
-        with patch("services.piper_service.subprocess.Popen", return_value=mock_proc) as mock_popen:
-            result = await service.synthesize_to_file("Hallo Welt", output_path)
+    async def test_worker_process_is_reused(self, piper, spawner):
+        """The voice model stays loaded: one process for consecutive requests."""
+        await piper.synthesize_to_bytes("Erster Satz")
+        await piper.synthesize_to_bytes("Zweiter Satz")
 
-        assert result is True
-        mock_popen.assert_called_once()
-        # Verify command includes model and output_file
-        call_args = mock_popen.call_args[0][0]
-        assert "piper" in call_args
-        assert "--model" in call_args
-        assert "--output_file" in call_args
+        assert len(spawner.processes) == 1
+        assert spawner.processes[0].lines == ["Erster Satz", "Zweiter Satz"]
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_file_failure(self, service, tmp_path):
-        """Failed synthesis returns False."""
-        output_path = str(tmp_path / "output.wav")
+    async def test_command_uses_voice_for_language(self, piper, spawner):
+        await piper.synthesize_to_bytes("Hello world", language="en")
 
-        mock_proc = MagicMock()
-        mock_proc.returncode = 1
-        mock_proc.communicate.return_value = (b"", b"Error: model not found")
+        cmd = spawner.processes[0].cmd
+        assert cmd[0] == "piper"
+        assert cmd[cmd.index("--model") + 1] == "/usr/share/piper/voices/en_US-amy-medium.onnx"
+        assert "--output_dir" in cmd
 
-        with patch("services.piper_service.subprocess.Popen", return_value=mock_proc):
-            result = await service.synthesize_to_file("Hallo", output_path)
+    async def test_one_worker_per_voice(self, piper, spawner):
+        await piper.synthesize_to_bytes("Hallo", language="de")
+        await piper.synthesize_to_bytes("Hello", language="en")
 
-        assert result is False
+        assert len(spawner.processes) == 2
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_file_exception(self, service, tmp_path):
-        """Exception during synthesis returns False."""
-        output_path = str(tmp_path / "output.wav")
+    async def test_text_is_sent_as_single_line(self, piper, spawner):
+        await piper.synthesize_to_bytes("Zeile eins\nZeile zwei")
 
-        with patch("services.piper_service.subprocess.Popen", side_effect=OSError("spawn failed")):
-            result = await service.synthesize_to_file("Hallo", output_path)
+        assert spawner.processes[0].lines == ["Zeile eins Zeile zwei"]
 
-        assert result is False
+    async def test_concurrent_requests_are_pipelined(self, piper, spawner):
+        results = await asyncio.gather(
+            piper.synthesize_to_bytes("a"),
+            piper.synthesize_to_bytes("bb"),
+            piper.synthesize_to_bytes("ccc"),
+        )
+
+        assert results == [_wav("a"), _wav("bb"), _wav("ccc")]
+
+    async def test_wav_files_are_removed(self, piper, spawner):
+        await piper.synthesize_to_bytes("Hallo")
+
+        assert list(spawner.processes[0].output_dir.iterdir()) == []
+
+    async def test_synthesize_to_file_success(self, piper, spawner, tmp_path):
+        output_path = tmp_path / "output.wav"
+
+        result = await piper.synthesize_to_file("Hallo Welt", str(output_path))
+
+        assert result is True
+        assert output_path.read_bytes() == _wav("Hallo Welt")
+
+    async def test_synthesize_to_file_empty_text_returns_false(self, piper, tmp_path):
+        assert await piper.synthesize_to_file("   ", str(tmp_path / "out.wav")) is False
 
-    @pytest.mark.asyncio
     async def test_synthesize_to_file_when_unavailable(self, service_unavailable, tmp_path):
         """Returns False immediately when piper is not available."""
         result = await service_unavailable.synthesize_to_file("Hello", str(tmp_path / "out.wav"))
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_file_uses_correct_voice_for_language(self, service, tmp_path):
-        """Correct voice model is used based on language parameter."""
-        output_path = str(tmp_path / "output.wav")
+    async def test_synthesize_to_bytes_when_unavailable(self, service_unavailable):
+        """Returns empty bytes when piper unavailable."""
+        result = await service_unavailable.synthesize_to_bytes("Hello")
+        assert result == b""
 
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate.return_value = (b"", b"")
+    async def test_spawn_failure_returns_empty(self, service):
+        with patch("services.piper_service.asyncio.create_subprocess_exec",
+                   side_effect=OSError("spawn failed")):
+            result = await service.synthesize_to_bytes("Hallo")
 
-        with patch("services.piper_service.subprocess.Popen", return_value=mock_proc) as mock_popen:
-            await service.synthesize_to_file("Hello world", output_path, language="en")
+        assert result == b""
 
-        call_args = mock_popen.call_args[0][0]
-        # Should use en_US-amy-medium model
-        assert "/usr/share/piper/voices/en_US-amy-medium.onnx" in call_args
+    async def test_crashed_worker_fails_pending_and_restarts(self, piper, spawner):
+        spawner.respond = False
+        pending = asyncio.ensure_future(piper.synthesize_to_bytes("Hallo"))
+        await asyncio.sleep(0)
+        spawner.processes[0].exit(1)
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_bytes_success(self, service, tmp_path):
-        """synthesize_to_bytes returns audio bytes on success."""
-        fake_wav = b"RIFF\x00\x00\x00\x00WAVEfmt "
+        assert await pending == b""
 
-        with patch.object(service, "synthesize_to_file", new_callable=AsyncMock) as mock_synth:
-            # Simulate synthesize_to_file writing content
-            async def write_and_return(text, path, language=None):
-                from pathlib import Path
-                Path(path).write_bytes(fake_wav)
-                return True
-            mock_synth.side_effect = write_and_return
+        spawner.respond = True
+        assert await piper.synthesize_to_bytes("Hallo") == _wav("Hallo")
+        assert len(spawner.processes) == 2
 
-            result = await service.synthesize_to_bytes("Hallo")
+    async def test_timeout_kills_worker(self, piper, spawner):
+        piper.timeout = 0.05
+        spawner.respond = False
 
-        assert result == fake_wav
+        assert await piper.synthesize_to_bytes("Hallo") == b""
+        assert spawner.processes[0].returncode == -9
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_bytes_failure_returns_empty(self, service):
-        """synthesize_to_bytes returns empty bytes on failure."""
-        with patch.object(service, "synthesize_to_file", new_callable=AsyncMock, return_value=False):
-            result = await service.synthesize_to_bytes("Hallo")
 
-        assert result == b""
+@pytest.mark.unit
+class TestStreaming:
 
-    @pytest.mark.asyncio
-    async def test_synthesize_to_bytes_when_unavailable(self, service_unavailable):
-        """Returns empty bytes when piper unavailable."""
-        result = await service_unavailable.synthesize_to_bytes("Hello")
-        assert result == b""
+    async def test_yields_one_wav_per_sentence(self, piper, spawner):
+        text = "Das Wetter ist heute sonnig. Morgen wird es regnen! Brauchst du sonst noch etwas?"
+
+        chunks = [chunk async for chunk in piper.synthesize_stream(text)]
+
+        assert chunks == [
+            _wav("Das Wetter ist heute sonnig."),
+            _wav("Morgen wird es regnen!"),
+            _wav("Brauchst du sonst noch etwas?"),
+        ]
+        assert len(spawner.processes) == 1
+
+    async def test_stream_when_unavailable_yields_nothing(self, service_unavailable):
+        assert [chunk async for chunk in service_unavailable.synthesize_stream("Hallo.")] == []
+
+    async def test_stream_stops_on_error(self, piper, spawner):
+        spawner.respond = False
+        piper.timeout = 0.05
 
-    @pytest.mark.asyncio
-    async def test_synthesize_sends_text_via_stdin(self, service, tmp_path):
-        """Text is passed to piper via stdin."""
-        output_path = str(tmp_path / "output.wav")
+        chunks = [chunk async for chunk in piper.synthesize_stream("Erster langer Satz hier. Zweiter langer Satz hier.")]
 
-        mock_proc = MagicMock()
-        mock_proc.returncode = 0
-        mock_proc.communicate.return_value = (b"", b"")
+        assert chunks == []
 
-        with patch("services.piper_service.subprocess.Popen", return_value=mock_proc):
-            await service.synthesize_to_file("Hallo Welt", output_path)
+    async def test_shutdown_stops_workers(self, service, spawner):
+        await service.synthesize_to_bytes("Hallo")
 
-        mock_proc.communicate.assert_called_once_with(input=b"Hallo Welt")
+        await service.shutdown()
+
+        assert spawner.processes[0].returncode == -9
+        assert not spawner.processes[0].output_dir.exists()
+
+
+async def _tokens(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.unit
+class TestTokenStreaming:
+
+    async def test_synthesizes_sentences_from_token_stream(self, piper, spawner):
+        tokens = _tokens("Das Wetter ", "ist heute sonnig. ", "Morgen wird ", "es regnen!")
+
+        chunks = [chunk async for chunk in piper.synthesize_stream(tokens)]
+
+        assert chunks == [_wav("Das Wetter ist heute sonnig."), _wav("Morgen wird es regnen!")]
+
+    async def test_first_sentence_is_ready_before_stream_ends(self, piper, spawner):
+        """Time-to-first-audio does not depend on the length of the response."""
+        stream_done = asyncio.Event()
+
+        async def tokens():
+            yield "Das ist der erste Satz. "
+            await asyncio.sleep(0.05)
+            yield "Und hier kommt der zweite."
+            stream_done.set()
+
+        stream = piper.synthesize_stream(tokens())
+        first = await stream.__anext__()
+
+        assert first == _wav("Das ist der erste Satz.")
+        assert not stream_done.is_set()
+        assert [chunk async for chunk in stream] == [_wav("Und hier kommt der zweite.")]
+
+    async def test_token_stream_is_drained_when_unavailable(self, service_unavailable):
+        consumed = []
+
+        async def tokens():
+            for chunk in ("Hallo ", "Welt."):
+                consumed.append(chunk)
+                yield chunk
+
+        assert [chunk async for chunk in service_unavailable.synthesize_stream(tokens())] == []
+        assert consumed == ["Hallo ", "Welt."]
+
+    async def test_token_stream_is_drained_after_tts_error(self, piper, spawner):
+        spawner.respond = False
+        piper.timeout = 0.05
+        consumed = []
+
+        async def tokens():
+            for chunk in ("Erster langer Satz hier. ", "Zweiter langer Satz hier."):
+                consumed.append(chunk)
+                yield chunk
+
+        assert [chunk async for chunk in piper.synthesize_stream(tokens())] == []
+        assert len(consumed) == 2
+
+    async def test_stream_errors_propagate(self, piper, spawner):
+        async def tokens():
+            yield "Ein Satz, der anfängt. "
+            raise RuntimeError("LLM down")
+
+        with pytest.raises(RuntimeError, match="LLM down"):
+            [chunk async for chunk in piper.synthesize_stream(tokens())]
+
+    async def test_closing_stream_stops_token_consumption(self, piper, spawner):
+        """Barge-in: closing the generator cancels the LLM stream."""
+        consumed = []
+
+        async def tokens():
+            for i in range(100):
+                consumed.append(i)
+                yield f"Das ist Satz Nummer {i}. "
+                await asyncio.sleep(0.01)
+
+        stream = piper.synthesize_stream(tokens())
+        await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+        assert len(consumed) < 100
+
+
+@pytest.mark.unit
+class TestSentenceSplitter:
+
+    def test_emits_sentences_as_they_complete(self):
+        splitter = SentenceSplitter()
+
+        assert splitter.feed("Das Licht im Wohnzimmer") == []
+        assert splitter.feed(" ist an. Die Heiz") == ["Das Licht im Wohnzimmer ist an."]
+        assert splitter.feed("ung steht auf 21 Grad!") == []
+        assert splitter.flush() == ["Die Heizung steht auf 21 Grad!"]
+
+    def test_short_fragments_wait_for_next_sentence(self):
+        splitter = SentenceSplitter()
+
+        assert splitter.feed("Ok. ") == []
+        assert splitter.feed("Ich habe das Licht ausgeschaltet. ") == ["Ok. Ich habe das Licht ausgeschaltet."]
+
+    def test_flush_resets(self):
+        splitter = SentenceSplitter()
+        splitter.feed("Hallo")
+
+        assert splitter.flush() == ["Hallo"]
+        assert splitter.flush() == []
+
+
+@pytest.mark.unit
+class TestSplitSentences:
+
+    def test_splits_on_terminal_punctuation(self):
+        text = "Das Licht im Wohnzimmer ist an. Die Heizung steht auf 21 Grad!"
+        assert split_sentences(text) == [
+            "Das Licht im Wohnzimmer ist an.",
+            "Die Heizung steht auf 21 Grad!",
+        ]
+
+    def test_merges_short_fragments(self):
+        assert split_sentences("Ok. Ich habe das Licht ausgeschaltet.") == [
+            "Ok. Ich habe das Licht ausgeschaltet.",
+        ]
+
+    def test_short_tail_is_appended(self):
+        assert split_sentences("Ich habe das Licht ausgeschaltet. Fertig.") == [
+            "Ich habe das Licht ausgeschaltet. Fertig.",
+        ]
+
+    def test_splits_on_line_breaks(self):
+        text = "Heute auf der Einkaufsliste:\n- Milch und Butter\n- Brot vom Bäcker"
+        assert split_sentences(text) == [
+            "Heute auf der Einkaufsliste:",
+            "- Milch und Butter - Brot vom Bäcker",
+        ]
+
+    def test_empty_text(self):
+        assert split_sentences("  \n ") == []
 
 
 # ============================================================================
@@ -410,6 +410,7 @@ class TestExtendedHeartbeat:
             "audio_rms": 2000.0,
             "audio_db": -15.5,
             "is_speech": False,
+            "audio_cpu_percent": {"decode": 0.4, "features": 2.1, "wakeword": 6.3},
             "cpu_percent": 35.0,
             "memory_percent": 45.0,
             "temperature": 48.0,
@@ -427,6 +428,7 @@ class TestExtendedHeartbeat:
         sat = manager.satellites["test-sat"]
         assert sat.metrics["audio_rms"] == 2000.0
         assert sat.metrics["is_speech"] is False
+        assert sat.metrics["audio_cpu_percent"]["wakeword"] == 6.3
         assert sat.metrics["last_wakeword"]["keyword"] == "hey_jarvis"
         assert sat.metrics["session_count_1h"] == 5
 
@@ -454,6 +454,39 @@ class TestSpeakerService:
 
         np.testing.assert_array_almost_equal(original, recovered)
 
+    @pytest.mark.unit
+    def test_embedding_bytes_roundtrip(self):
+        """Testet Speicherung als rohe float32 Bytes"""
+        from services.speaker_service import SpeakerService
+
+        original = np.array([0.1, 0.2, 0.3, 0.4])
+        data = SpeakerService.embedding_to_bytes(original)
+        recovered = SpeakerService.embedding_from_bytes(data)
+
+        assert len(data) == 4 * 4
+        assert recovered.dtype == np.float32
+        np.testing.assert_array_almost_equal(original, recovered)
+
+    @pytest.mark.unit
+    def test_identify_speaker_picks_best_match(self):
+        """Testet vektorisierte Sprecher-Identifikation"""
+        from services.speaker_service import SpeakerService
+
+        with patch('services.speaker_service.settings') as mock_settings:
+            mock_settings.speaker_recognition_device = 'cpu'
+            mock_settings.speaker_recognition_threshold = 0.25
+
+            service = SpeakerService()
+
+        known = [
+            (1, "Max", np.array([1.0, 0.0, 0.0])),
+            (2, "Anna", np.array([0.0, 1.0, 0.0])),
+            (3, "Leer", np.zeros(3)),
+        ]
+
+        assert service.identify_speaker(np.array([0.2, 0.9, 0.0]), known)[:2] == (2, "Anna")
+        assert service.identify_speaker(np.array([0.0, 0.0, 1.0]), known) is None
+
     @pytest.mark.unit
     def test_compute_similarity(self):
         """Testet Cosine Similarity Berechnung"""
@@ -0,0 +1,175 @@
+"""
+Tests for the in-memory speaker centroid index (services/speaker_index.py).
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from services.speaker_index import SpeakerIndex, get_speaker_index
+
+
+def _vec(*values: float) -> np.ndarray:
+    return np.array(values, dtype=np.float32)
+
+
+def _row(speaker_id: int, name: str, embedding: np.ndarray, alias: str | None = None) -> tuple:
+    return (speaker_id, name, alias, embedding.astype(np.float32).tobytes())
+
+
+def _loaded(*rows) -> SpeakerIndex:
+    index = SpeakerIndex()
+    index.load(rows)
+    return index
+
+
+class TestIdentify:
+
+    @pytest.mark.unit
+    def test_returns_closest_speaker(self):
+        index = _loaded(
+            _row(1, "Max", _vec(1, 0, 0), alias="max"),
+            _row(2, "Anna", _vec(0, 1, 0), alias="anna"),
+        )
+
+        match = index.identify(_vec(0.1, 0.9, 0), threshold=0.25)
+
+        assert match[:3] == (2, "Anna", "anna")
+        assert match[3] == pytest.approx(0.9 / np.linalg.norm([0.1, 0.9]))
+
+    @pytest.mark.unit
+    def test_below_threshold_returns_none(self):
+        index = _loaded(_row(1, "Max", _vec(1, 0, 0)))
+
+        assert index.identify(_vec(0, 1, 0), threshold=0.25) is None
+
+    @pytest.mark.unit
+    def test_empty_index_returns_none(self):
+        assert _loaded().identify(_vec(1, 0, 0), threshold=0.0) is None
+
+    @pytest.mark.unit
+    def test_zero_or_mismatched_query_returns_none(self):
+        index = _loaded(_row(1, "Max", _vec(1, 0, 0)))
+
+        assert index.identify(_vec(0, 0, 0), threshold=0.0) is None
+        assert index.identify(_vec(1, 0), threshold=0.0) is None
+
+    @pytest.mark.unit
+    def test_centroid_averages_samples(self):
+        index = _loaded(
+            _row(1, "Max", _vec(1, 0)),
+            _row(1, "Max", _vec(0, 1)),
+        )
+
+        match = index.identify(_vec(1, 1), threshold=0.99)
+
+        assert match[0] == 1
+        assert match[3] == pytest.approx(1.0)
+
+    @pytest.mark.unit
+    def test_only_recent_samples_count(self):
+        index = SpeakerIndex(max_embeddings_per_speaker=2)
+        index.load([
+            _row(1, "Max", _vec(0, 1)),  # Oldest, dropped
+            _row(1, "Max", _vec(1, 0)),
+            _row(1, "Max", _vec(1, 0)),
+        ])
+
+        assert index.identify(_vec(1, 0), threshold=0.99)[0] == 1
+
+
+class TestIncrementalUpdates:
+
+    @pytest.mark.unit
+    def test_add_embedding_for_new_speaker(self):
+        index = _loaded(_row(1, "Max", _vec(1, 0, 0)))
+
+        index.add_embedding(2, "Unbekannter Sprecher #1", "unknown_1", _vec(0, 0, 1))
+
+        assert len(index) == 2
+        assert index.identify(_vec(0, 0, 1), threshold=0.5)[:3] == (2, "Unbekannter Sprecher #1", "unknown_1")
+
+    @pytest.mark.unit
+    def test_add_embedding_moves_centroid(self):
+        index = _loaded(_row(1, "Max", _vec(1, 0)))
+        assert index.identify(_vec(0, 1), threshold=0.5) is None
+
+        index.add_embedding(1, None, None, _vec(0, 1))
+
+        match = index.identify(_vec(0, 1), threshold=0.5)
+        assert match[:2] == (1, "Max")
+
+    @pytest.mark.unit
+    def test_add_embedding_before_load_is_ignored(self):
+        index = SpeakerIndex()
+
+        index.add_embedding(1, "Max", "max", _vec(1, 0))
+
+        assert not index.is_loaded
+        assert len(index) == 0
+
+    @pytest.mark.unit
+    def test_remove_speaker_reindexes_rows(self):
+        index = _loaded(
+            _row(1, "Max", _vec(1, 0, 0)),
+            _row(2, "Anna", _vec(0, 1, 0)),
+            _row(3, "Tom", _vec(0, 0, 1)),
+        )
+
+        index.remove_speaker(2)
+
+        assert len(index) == 2
+        assert index.identify(_vec(0, 1, 0), threshold=0.5) is None
+        assert index.identify(_vec(0, 0, 1), threshold=0.5)[0] == 3
+
+    @pytest.mark.unit
+    def test_update_speaker_renames(self):
+        index = _loaded(_row(1, "Unbekannter Sprecher #1", _vec(1, 0), alias="unknown_1"))
+
+        index.update_speaker(1, "Max", "max")
+
+        assert index.identify(_vec(1, 0), threshold=0.5)[:3] == (1, "Max", "max")
+
+    @pytest.mark.unit
+    def test_known_speakers_exposes_centroids(self):
+        index = _loaded(_row(1, "Max", _vec(3, 4)))
+
+        [(speaker_id, name, centroid)] = index.known_speakers()
+
+        assert (speaker_id, name) == (1, "Max")
+        np.testing.assert_allclose(centroid, [0.6, 0.8], rtol=1e-6)
+
+
+class TestLoading:
+
+    @pytest.mark.unit
+    async def test_ensure_loaded_queries_once(self):
+        db = MagicMock()
+        result = MagicMock()
+        result.all.return_value = [_row(1, "Max", _vec(1, 0))]
+        db.execute = AsyncMock(return_value=result)
+        index = SpeakerIndex()
+
+        await index.ensure_loaded(db)
+        await index.ensure_loaded(db)
+
+        assert db.execute.await_count == 1
+        assert len(index) == 1
+
+    @pytest.mark.unit
+    async def test_invalidate_triggers_reload(self):
+        db = MagicMock()
+        result = MagicMock()
+        result.all.return_value = [_row(1, "Max", _vec(1, 0))]
+        db.execute = AsyncMock(return_value=result)
+        index = SpeakerIndex()
+
+        await index.ensure_loaded(db)
+        index.invalidate()
+        await index.ensure_loaded(db)
+
+        assert db.execute.await_count == 2
+
+    @pytest.mark.unit
+    def test_global_instance_is_shared(self):
+        assert get_speaker_index() is get_speaker_index()
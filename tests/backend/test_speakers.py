@@ -12,6 +12,7 @@ Testet:
 from io import BytesIO
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from httpx import AsyncClient
 from sqlalchemy import select
@@ -53,7 +54,7 @@ async def speaker_with_embeddings(db_session: AsyncSession) -> Speaker:
     for _i in range(3):
         embedding = SpeakerEmbedding(
             speaker_id=speaker.id,
-            embedding="base64encodedembedding==",
+            embedding=np.full(192, 0.1, dtype=np.float32).tobytes(),
             sample_duration=5000
         )
         db_session.add(embedding)
@@ -70,8 +71,8 @@ def mock_speaker_service():
         service.is_available.return_value = True
         service._model_loaded = True
         service.extract_embedding_from_bytes.return_value = [0.1] * 192
-        service.embedding_to_base64.return_value = "base64embedding=="
-        service.embedding_from_base64.return_value = [0.1] * 192
+        service.embedding_to_bytes.return_value = np.full(192, 0.1, dtype=np.float32).tobytes()
+        service.embedding_from_bytes.return_value = [0.1] * 192
         service.identify_speaker.return_value = (1, "Test Speaker", 0.85)
         service.verify_speaker.return_value = (True, 0.90)
         mock.return_value = service
@@ -128,7 +129,7 @@ class TestSpeakerEmbeddingModel:
         """Testet das Erstellen eines Embeddings"""
         embedding = SpeakerEmbedding(
             speaker_id=test_speaker.id,
-            embedding="testembedding==",
+            embedding=np.full(192, 0.2, dtype=np.float32).tobytes(),
             sample_duration=3000
         )
         db_session.add(embedding)
@@ -592,7 +593,7 @@ class TestSpeakerVerificationAPI:
             service = MagicMock()
             service.is_available.return_value = True
             service.extract_embedding_from_bytes.return_value = [0.9] * 192
-            service.embedding_from_base64.return_value = [0.1] * 192
+            service.embedding_from_bytes.return_value = [0.1] * 192
             service.verify_speaker.return_value = (False, 0.15)
             mock.return_value = service
 
@@ -657,7 +658,7 @@ class TestSpeakerMergeAPI:
         # Add embedding to source
         embedding = SpeakerEmbedding(
             speaker_id=source.id,
-            embedding="sourceembedding==",
+            embedding=np.full(192, 0.3, dtype=np.float32).tobytes(),
             sample_duration=3000
         )
         db_session.add(embedding)
@@ -0,0 +1,176 @@
+"""
+Tests for the incremental satellite transcriber (services/streaming_stt.py).
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from services.streaming_stt import SAMPLE_RATE, StreamingTranscriber
+
+
+def _pcm(seconds: float) -> bytes:
+    """Silent 16-bit PCM of the given length."""
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16).tobytes()
+
+
+class _ScriptedWhisper:
+    """Fake WhisperService returning one scripted segment list per decode."""
+
+    def __init__(self, *decodes: list[dict]):
+        self._decodes = list(decodes)
+        self.calls: list[dict] = []
+
+    def transcribe_segments(self, audio, language=None, prompt=None, fast=False, preprocess=False):
+        self.calls.append({
+            "seconds": len(audio) / SAMPLE_RATE,
+            "prompt": prompt,
+            "fast": fast,
+            "language": language,
+        })
+        return self._decodes.pop(0) if self._decodes else []
+
+
+def _seg(start: float, end: float, text: str) -> dict:
+    return {"start": start, "end": end, "text": text}
+
+
+class TestFeed:
+
+    @pytest.mark.unit
+    def test_no_decode_before_min_audio(self):
+        transcriber = StreamingTranscriber(_ScriptedWhisper(), interval=1.0, min_audio=1.0)
+        assert transcriber.feed(_pcm(0.5)) is False
+
+    @pytest.mark.unit
+    def test_decode_due_after_interval(self):
+        transcriber = StreamingTranscriber(_ScriptedWhisper(), interval=1.0, min_audio=1.0)
+        assert transcriber.feed(_pcm(0.5)) is False
+        assert transcriber.feed(_pcm(0.5)) is True
+
+    @pytest.mark.unit
+    async def test_no_decode_while_one_is_running(self):
+        transcriber = StreamingTranscriber(_ScriptedWhisper(), interval=0.5, min_audio=0.5)
+        transcriber.feed(_pcm(1.0))
+        transcriber.start_partial()
+
+        assert transcriber.feed(_pcm(1.0)) is False
+        await transcriber.finalize()
+
+
+class TestLocalAgreement:
+
+    @pytest.mark.unit
+    async def test_agreed_segments_are_committed(self):
+        whisper = _ScriptedWhisper(
+            [_seg(0.0, 1.0, "Schalte das"), _seg(1.0, 2.0, "Licht")],
+            [_seg(0.0, 1.0, "Schalte das"), _seg(1.0, 2.5, "Licht im Wohnzimmer")],
+        )
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0, commit_margin=1.0)
+
+        transcriber.feed(_pcm(2.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+        assert transcriber.committed_text == ""  # First hypothesis, nothing to agree with
+
+        transcriber.feed(_pcm(1.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+
+        assert transcriber.committed_text == "Schalte das"
+        assert transcriber.partial_text == "Schalte das Licht im Wohnzimmer"
+        assert transcriber._commit_sample == SAMPLE_RATE  # Committed up to 1.0 s
+
+    @pytest.mark.unit
+    async def test_segments_near_buffer_end_stay_pending(self):
+        whisper = _ScriptedWhisper(
+            [_seg(0.0, 1.8, "Hallo")],
+            [_seg(0.0, 1.8, "Hallo")],
+        )
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0, commit_margin=1.0)
+
+        transcriber.feed(_pcm(2.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+        transcriber.feed(_pcm(0.5))
+        transcriber.start_partial()
+        await transcriber._decode_task
+
+        # Ends 0.7 s before the 2.5 s buffer end — inside the commit margin
+        assert transcriber.committed_text == ""
+
+    @pytest.mark.unit
+    async def test_changed_text_is_not_committed(self):
+        whisper = _ScriptedWhisper(
+            [_seg(0.0, 1.0, "Schalte das")],
+            [_seg(0.0, 1.0, "Schalt dass")],
+        )
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0, commit_margin=0.5)
+
+        transcriber.feed(_pcm(2.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+        transcriber.feed(_pcm(1.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+
+        assert transcriber.committed_text == ""
+
+
+class TestFinalize:
+
+    @pytest.mark.unit
+    async def test_final_decodes_only_uncommitted_tail(self):
+        whisper = _ScriptedWhisper(
+            [_seg(0.0, 1.0, "Schalte das"), _seg(1.0, 2.0, "Licht")],
+            [_seg(0.0, 1.0, "Schalte das"), _seg(1.0, 2.5, "Licht im")],
+            [_seg(0.0, 2.0, "Licht im Wohnzimmer an")],  # Final tail, relative to 1.0 s
+        )
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0, commit_margin=1.0)
+
+        transcriber.feed(_pcm(2.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+        transcriber.feed(_pcm(1.0))
+        transcriber.start_partial()
+        await transcriber._decode_task
+
+        text = await transcriber.finalize()
+
+        assert text == "Schalte das Licht im Wohnzimmer an"
+        final_call = whisper.calls[-1]
+        assert final_call["fast"] is False
+        assert final_call["seconds"] == pytest.approx(2.0)  # 3.0 s total - 1.0 s committed
+        assert final_call["prompt"] == "Schalte das"
+
+    @pytest.mark.unit
+    async def test_finalize_without_partials_decodes_everything(self):
+        whisper = _ScriptedWhisper([_seg(0.0, 0.8, "Hallo")])
+        transcriber = StreamingTranscriber(whisper, language="de", interval=5.0, min_audio=5.0)
+
+        transcriber.feed(_pcm(0.8))
+        assert await transcriber.finalize() == "Hallo"
+        assert whisper.calls[0]["language"] == "de"
+
+    @pytest.mark.unit
+    async def test_partial_callback_receives_text(self):
+        whisper = _ScriptedWhisper([_seg(0.0, 1.0, "Hallo")])
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0)
+        callback = AsyncMock()
+
+        transcriber.feed(_pcm(1.5))
+        transcriber.start_partial(callback)
+        await transcriber._decode_task
+
+        callback.assert_awaited_once_with("Hallo", "")
+
+    @pytest.mark.unit
+    async def test_failed_partial_does_not_break_finalize(self):
+        whisper = MagicMock()
+        whisper.transcribe_segments = MagicMock(side_effect=[RuntimeError("decode"), [_seg(0.0, 1.0, "Hallo")]])
+        transcriber = StreamingTranscriber(whisper, interval=1.0, min_audio=1.0)
+
+        transcriber.feed(_pcm(1.5))
+        transcriber.start_partial()
+
+        assert await transcriber.finalize() == "Hallo"
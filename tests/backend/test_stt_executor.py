@@ -0,0 +1,115 @@
+"""
+Tests for the prioritized STT worker pool (services/stt_executor.py).
+"""
+import asyncio
+import threading
+
+import pytest
+
+from services.stt_executor import STTExecutor, STTPriority, STTQueueFullError, current_worker_index
+
+
+def _blocker(executor: STTExecutor) -> tuple[threading.Event, threading.Event]:
+    """Occupy the (single) worker until the returned release event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(timeout=5)
+
+    executor.submit(block, priority=STTPriority.VOICE)
+    assert started.wait(timeout=5)
+    return started, release
+
+
+class TestSTTExecutor:
+
+    @pytest.mark.unit
+    async def test_runs_off_the_event_loop_thread(self):
+        executor = STTExecutor(workers=1, max_queue=4)
+
+        thread_name, index = await executor.run(
+            lambda: (threading.current_thread().name, current_worker_index())
+        )
+
+        assert thread_name == "stt-worker-0"
+        assert index == 0
+        assert current_worker_index() is None
+        executor.shutdown()
+
+    @pytest.mark.unit
+    async def test_exceptions_propagate(self):
+        executor = STTExecutor(workers=1, max_queue=4)
+
+        def fail():
+            raise RuntimeError("decode error")
+
+        with pytest.raises(RuntimeError, match="decode error"):
+            await executor.run(fail)
+        executor.shutdown()
+
+    @pytest.mark.unit
+    async def test_higher_priority_runs_first(self):
+        executor = STTExecutor(workers=1, max_queue=10)
+        _, release = _blocker(executor)
+        order: list[str] = []
+
+        jobs = [
+            executor.run(order.append, "upload-1", priority=STTPriority.UPLOAD),
+            executor.run(order.append, "partial", priority=STTPriority.PARTIAL),
+            executor.run(order.append, "upload-2", priority=STTPriority.UPLOAD),
+            executor.run(order.append, "voice", priority=STTPriority.VOICE),
+        ]
+        tasks = [asyncio.ensure_future(job) for job in jobs]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["voice", "partial", "upload-1", "upload-2"]
+        executor.shutdown()
+
+    @pytest.mark.unit
+    async def test_full_queue_rejects(self):
+        executor = STTExecutor(workers=1, max_queue=2)
+        _, release = _blocker(executor)
+
+        executor.submit(lambda: None)
+        executor.submit(lambda: None)
+        with pytest.raises(STTQueueFullError):
+            executor.submit(lambda: None, priority=STTPriority.VOICE)
+
+        assert executor.get_stats()["rejected"] == 1
+        release.set()
+        executor.shutdown()
+
+    @pytest.mark.unit
+    async def test_cancelled_job_is_skipped(self):
+        executor = STTExecutor(workers=1, max_queue=4)
+        _, release = _blocker(executor)
+        ran: list[str] = []
+
+        task = asyncio.create_task(executor.run(ran.append, "cancelled"))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        release.set()
+        await executor.run(ran.append, "next")
+
+        assert ran == ["next"]
+        executor.shutdown()
+
+    @pytest.mark.unit
+    async def test_shutdown_cancels_waiting_jobs(self):
+        executor = STTExecutor(workers=1, max_queue=4)
+        _, release = _blocker(executor)
+
+        future = executor.submit(lambda: None)
+        executor.shutdown()
+        release.set()
+
+        assert future.cancelled()
+        with pytest.raises(RuntimeError):
+            executor.submit(lambda: None)
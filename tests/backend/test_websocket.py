@@ -11,6 +11,7 @@ Testet:
 
 import base64
 import json
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import pytest
 
@@ -704,3 +705,70 @@ class TestBuildActionSummary:
         assert "1 Ergebnisse" in summary
         assert "id=1" in summary
         assert "Regular item" in summary
+
+
+# ============================================================================
+# Streamed TTS Tests
+# ============================================================================
+
+class TestSendTTSStream:
+    """Tests für send_tts_stream() in shared."""
+
+    @staticmethod
+    def _piper(*chunks, error=None):
+        async def synthesize_stream(text, language=None):
+            for chunk in chunks:
+                yield chunk
+            if error:
+                raise error
+
+        piper = MagicMock()
+        piper.synthesize_stream = synthesize_stream
+        return piper
+
+    @pytest.mark.unit
+    async def test_sends_sentences_then_empty_final_chunk(self):
+        """Test: Each sentence is a non-final chunk, an empty chunk ends the response."""
+        from api.websocket.shared import send_tts_stream
+
+        manager = MagicMock()
+        manager.send_tts_audio = AsyncMock()
+
+        with patch("services.piper_service.get_piper_service", return_value=self._piper(b"wav1", b"wav2")):
+            sent = await send_tts_stream(manager, "sess-1", "Satz eins. Satz zwei.")
+
+        assert sent is True
+        assert manager.send_tts_audio.await_args_list == [
+            call("sess-1", b"wav1", is_final=False),
+            call("sess-1", b"wav2", is_final=False),
+            call("sess-1", b"", is_final=True),
+        ]
+
+    @pytest.mark.unit
+    async def test_nothing_synthesized_sends_nothing(self):
+        """Test: No audio → no final chunk, caller can fall back."""
+        from api.websocket.shared import send_tts_stream
+
+        manager = MagicMock()
+        manager.send_tts_audio = AsyncMock()
+
+        with patch("services.piper_service.get_piper_service", return_value=self._piper()):
+            sent = await send_tts_stream(manager, "sess-1", "")
+
+        assert sent is False
+        manager.send_tts_audio.assert_not_awaited()
+
+    @pytest.mark.unit
+    async def test_final_chunk_is_sent_when_stream_fails(self):
+        """Test: Client is released from the speaking state even if the LLM stream breaks."""
+        from api.websocket.shared import send_tts_stream
+
+        manager = MagicMock()
+        manager.send_tts_audio = AsyncMock()
+        piper = self._piper(b"wav1", error=RuntimeError("LLM down"))
+
+        with patch("services.piper_service.get_piper_service", return_value=piper), \
+                pytest.raises(RuntimeError):
+            await send_tts_stream(manager, "sess-1", "Satz eins.")
+
+        assert manager.send_tts_audio.await_args_list[-1] == call("sess-1", b"", is_final=True)
@@ -230,6 +230,35 @@ class TestTranscription:
         assert call_kwargs[1]["beam_size"] == 5
         assert call_kwargs[1]["best_of"] == 5
 
+    @pytest.mark.asyncio
+    async def test_transcribe_file_runs_on_stt_worker(self, service):
+        """Model call runs on an STT worker thread, not the event loop."""
+        import threading
+
+        threads = []
+        mock_model = MagicMock()
+        mock_model.transcribe.side_effect = lambda *a, **kw: threads.append(
+            threading.current_thread().name
+        ) or {"text": "Test"}
+        service.model = mock_model
+
+        await service.transcribe_file("/tmp/test.wav")
+
+        assert threads[0].startswith("stt-worker-")
+
+    @pytest.mark.asyncio
+    async def test_transcribe_file_propagates_queue_full(self, service):
+        """Backpressure is not swallowed as an empty transcription."""
+        from services.stt_executor import STTQueueFullError
+
+        executor = MagicMock()
+        executor.run = AsyncMock(side_effect=STTQueueFullError("full"))
+        service.model = MagicMock()
+
+        with patch("services.whisper_service.get_stt_executor", return_value=executor), \
+             pytest.raises(STTQueueFullError):
+            await service.transcribe_file("/tmp/test.wav")
+
 
 # ============================================================================
 # Transcribe Bytes Tests
@@ -0,0 +1,66 @@
+"""
+Generate the synthetic endpointing fixtures (16 kHz, 16-bit mono WAV).
+
+Speech is approximated by voiced "syllables" (harmonics with a syllable
+envelope) separated by short gaps; background is low-passed noise. Real
+recordings can be dropped into this directory and listed in cases.json.
+
+Usage:
+    python tests/satellite/fixtures/endpointing/generate.py
+"""
+
+import os
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _noise(rng: np.random.Generator, seconds: float, rms: float) -> np.ndarray:
+    white = rng.normal(0, 1, int(seconds * SAMPLE_RATE))
+    rumble = np.convolve(white, np.ones(8) / 8, mode="same")  # Fan/room-like, energy in the low band
+    return rumble / np.sqrt(np.mean(rumble ** 2)) * rms
+
+
+def _speech(rng: np.random.Generator, samples: int, rms: float) -> np.ndarray:
+    out = np.zeros(samples)
+    pos = 0
+    while pos < len(out):
+        length = int(rng.uniform(0.12, 0.28) * SAMPLE_RATE)
+        t = np.arange(min(length, len(out) - pos)) / SAMPLE_RATE
+        pitch = rng.uniform(110, 200)
+        voiced = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        out[pos:pos + len(t)] = voiced * np.hanning(len(t))
+        pos += len(t) + int(rng.uniform(0.03, 0.08) * SAMPLE_RATE)  # Gap between syllables
+    return out / np.sqrt(np.mean(out ** 2)) * rms
+
+
+def _write(name: str, audio: np.ndarray):
+    with wave.open(os.path.join(HERE, name), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(audio.clip(-32768, 32767).astype(np.int16).tobytes())
+
+
+def _utterance(seed: int, noise_rms: float, speech_rms: float, segments, total: float) -> np.ndarray:
+    """segments: [(start_s, end_s), ...] of speech on top of *total* seconds of noise"""
+    rng = np.random.default_rng(seed)
+    audio = _noise(rng, total, noise_rms)
+    for start, end in segments:
+        a, b = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        audio[a:b] += _speech(rng, b - a, speech_rms)
+    return audio
+
+
+def main():
+    _write("quiet_room.wav", _utterance(1, 30, 3000, [(0.8, 2.6)], 5.0))
+    # Background above the RMS backend threshold (500): a fixed RMS gate never hears silence
+    _write("noisy_room.wav", _utterance(2, 900, 6000, [(0.8, 2.6)], 5.0))
+    _write("mid_pause.wav", _utterance(3, 60, 3000, [(0.8, 1.8), (2.5, 3.4)], 6.0))
+
+
+if __name__ == "__main__":
+    main()
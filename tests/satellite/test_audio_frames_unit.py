@@ -0,0 +1,105 @@
+"""
+Binary Audio Frame Unit Tests (protocol 1.1)
+
+Tests for renfield_satellite.network.audio_frames and the binary paths of
+WebSocketClient:
+- Frame layout matches the server's services/audio_frames.py
+- Microphone audio is sent as binary frame once audio_transport is negotiated
+- Satellites without negotiated transport keep sending JSON/base64
+- Binary TTS frames are delivered to the tts_audio callback
+"""
+
+import json
+import struct
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from renfield_satellite.network.audio_frames import (
+    CODEC_PCM,
+    CODEC_WAV,
+    FRAME_AUDIO,
+    FRAME_TTS,
+    AudioFrame,
+    AudioFrameError,
+    decode_frame,
+    encode_frame,
+)
+from renfield_satellite.network.websocket_client import (
+    ConnectionState,
+    ServerConfig,
+    WebSocketClient,
+)
+
+
+def _client(audio_transport=None) -> WebSocketClient:
+    client = WebSocketClient("sat-test", "Küche", server_url="ws://server/ws/satellite")
+    client._ws = MagicMock()
+    client._ws.send = AsyncMock()
+    client._state = ConnectionState.CONNECTED
+    client._server_config = ServerConfig(wake_words=["alexa"], threshold=0.5, audio_transport=audio_transport)
+    return client
+
+
+class TestFraming:
+    """Frame encoding shared with the server."""
+
+    @pytest.mark.satellite
+    def test_header_layout(self):
+        data = encode_frame(AudioFrame(FRAME_AUDIO, CODEC_PCM, "s", 7, b"\x01\x02"))
+        assert data == struct.pack("<BBBBI", FRAME_AUDIO, CODEC_PCM, 0, 1, 7) + b"s\x01\x02"
+
+    @pytest.mark.satellite
+    def test_roundtrip_final_flag(self):
+        frame = AudioFrame(FRAME_TTS, CODEC_WAV, "sat-test-1", 3, b"RIFF", is_final=True)
+        assert decode_frame(encode_frame(frame)) == frame
+
+    @pytest.mark.satellite
+    def test_short_frame_raises(self):
+        with pytest.raises(AudioFrameError):
+            decode_frame(b"\x02")
+
+
+class TestWebSocketClientBinaryAudio:
+    """Binary audio paths of WebSocketClient."""
+
+    @pytest.mark.satellite
+    async def test_audio_chunk_sent_as_binary_frame(self):
+        client = _client({"binary": True, "codec": "pcm", "tts_codec": "wav"})
+
+        await client.send_audio_chunk("sess-1", b"\x00\x01" * 160)
+
+        frame = decode_frame(client._ws.send.await_args.args[0])
+        assert (frame.frame_type, frame.codec, frame.session_id) == (FRAME_AUDIO, CODEC_PCM, "sess-1")
+        assert frame.payload == b"\x00\x01" * 160
+
+    @pytest.mark.satellite
+    async def test_audio_chunk_json_without_transport(self):
+        client = _client(None)
+
+        await client.send_audio_chunk("sess-1", b"\x00\x01")
+
+        message = json.loads(client._ws.send.await_args.args[0])
+        assert message["type"] == "audio"
+        assert message["chunk"] == "AAE="
+
+    @pytest.mark.satellite
+    def test_binary_tts_frame_reaches_callback(self):
+        client = _client({"binary": True, "codec": "pcm", "tts_codec": "wav"})
+        received = []
+        client.on_tts_audio(lambda *args: received.append(args))
+
+        client._handle_binary_message(encode_frame(
+            AudioFrame(FRAME_TTS, CODEC_WAV, "sess-1", 1, b"RIFF", is_final=True)
+        ))
+
+        assert received == [("sess-1", b"RIFF", True)]
+
+    @pytest.mark.satellite
+    def test_malformed_tts_frame_ignored(self):
+        client = _client({"binary": True, "codec": "pcm", "tts_codec": "wav"})
+        received = []
+        client.on_tts_audio(lambda *args: received.append(args))
+
+        client._handle_binary_message(b"\x02\x09")
+
+        assert received == []
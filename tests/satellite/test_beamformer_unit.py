@@ -7,12 +7,46 @@ Tests for renfield_satellite.audio.beamformer.BeamformerDAS:
 - Zero steering angle (default) = simple averaging of channels
 - get_stats() returns dict with expected keys
 - get_effective_frequency_range() returns reasonable values for 58mm spacing
+- Streaming: chunked processing equals processing the whole signal
+- Fractional delays align a source from the steering direction
+- GCC-PHAT direction estimate and steer_to_talker()
+- Satellite steers to the talker on wake word, back to the configured angle on reset
 """
 
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import numpy as np
 import pytest
 
-from renfield_satellite.audio.beamformer import BeamformerDAS
+from renfield_satellite.audio.beamformer import BeamformerDAS, fractional_delay_taps
+from renfield_satellite.config import Config
+from renfield_satellite.satellite import Satellite, SatelliteState
+
+SAMPLE_RATE = 16000
+
+
+def _speech_band_noise(samples: int, seed: int = 0) -> np.ndarray:
+    """White noise limited to 100-3500 Hz"""
+    rng = np.random.default_rng(seed)
+    spectrum = np.fft.rfft(rng.normal(0, 0.1, samples))
+    freqs = np.fft.rfftfreq(samples, 1.0 / SAMPLE_RATE)
+    spectrum[(freqs < 100) | (freqs > 3500)] = 0
+    return np.fft.irfft(spectrum, samples)
+
+
+def _delay(signal: np.ndarray, samples: float) -> np.ndarray:
+    """Exact (circular) fractional delay in the frequency domain"""
+    freqs = np.fft.rfftfreq(len(signal), 1.0 / SAMPLE_RATE)
+    return np.fft.irfft(np.fft.rfft(signal) * np.exp(-2j * np.pi * freqs * samples / SAMPLE_RATE), len(signal))
+
+
+def _source_at(angle: float, samples: int = 32000, seed: int = 0) -> tuple:
+    """Stereo recording of a source at *angle* and the source as heard by the earlier mic"""
+    delay = BeamformerDAS()._calculate_delay(angle)
+    source = _speech_band_noise(samples, seed)
+    left, right = _delay(source, max(delay, 0.0)), _delay(source, max(-delay, 0.0))
+    return np.stack([left, right]).astype(np.float32), _delay(source, abs(delay))
 
 
 class TestBeamformerProcess:
@@ -94,8 +128,9 @@ class TestBeamformerZeroSteering:
         bf = BeamformerDAS(steering_angle=45.0, mic_spacing=0.058, sample_rate=16000)
         # For 45 degrees at 58mm spacing and 16kHz:
         # delay_seconds = 0.058 * sin(45) / 343 ~ 0.0001197s
-        # delay_samples = round(0.0001197 * 16000) ~ 2
+        # delay_samples = 0.0001197 * 16000 ~ 1.91
         assert bf._delay_samples != 0
+        assert bf._delay_samples == pytest.approx(1.91, abs=0.01)
 
 
 class TestBeamformerProcessBytes:
@@ -212,3 +247,156 @@ class TestBeamformerFrequencyRange:
 
         assert f_min_wide < f_min_narrow
         assert f_max_wide < f_max_narrow
+
+
+class TestBeamformerStreaming:
+    """Tests for the stateful fractional-delay path."""
+
+    @pytest.mark.satellite
+    def test_fractional_delay_taps_integer_delay_is_exact(self):
+        """Integer delays give a pure tap, fractional taps sum to 1."""
+        offset, taps = fractional_delay_taps(2.0)
+        assert offset + int(np.argmax(taps)) == 2
+        np.testing.assert_allclose(np.sort(taps), [0, 0, 0, 1], atol=1e-12)
+
+        _, taps = fractional_delay_taps(1.37)
+        assert taps.sum() == pytest.approx(1.0)
+
+    @pytest.mark.satellite
+    @pytest.mark.parametrize("angle", [-60.0, 0.0, 25.0, 75.0])
+    def test_chunked_equals_whole_signal(self, angle):
+        """Samples carried between chunks: chunk boundaries leave no trace."""
+        stereo, _ = _source_at(angle, samples=12800)
+
+        whole = BeamformerDAS(steering_angle=angle).process(stereo)
+        bf = BeamformerDAS(steering_angle=angle)
+        chunked = np.concatenate([bf.process(stereo[:, i:i + 1280]) for i in range(0, 12800, 1280)])
+
+        np.testing.assert_allclose(chunked, whole, atol=1e-6)
+
+    @pytest.mark.satellite
+    @pytest.mark.parametrize("angle", [-70.0, -10.0, 20.0, 45.0])
+    def test_steered_source_is_aligned(self, angle):
+        """A source from the steering direction adds up coherently (fractional delays)."""
+        stereo, aligned = _source_at(angle)
+        bf = BeamformerDAS(steering_angle=angle)
+
+        out = np.concatenate([bf.process(stereo[:, i:i + 1280]) for i in range(0, 32000, 1280)])
+
+        error = out[100:] - aligned[100:]
+        assert np.sqrt(np.mean(error ** 2)) < 0.03 * np.sqrt(np.mean(aligned ** 2))
+
+    @pytest.mark.satellite
+    def test_steering_towards_source_keeps_more_energy(self):
+        """Steering at the source beats steering at its mirror image."""
+        stereo, _ = _source_at(60.0)
+
+        towards = BeamformerDAS(steering_angle=60.0).process(stereo)
+        away = BeamformerDAS(steering_angle=-60.0).process(stereo)
+
+        assert np.mean(towards ** 2) > 1.2 * np.mean(away ** 2)
+
+
+class TestBeamformerDirection:
+    """Tests for GCC-PHAT direction of arrival estimation."""
+
+    @pytest.mark.satellite
+    @pytest.mark.parametrize("angle", [-60.0, -20.0, 0.0, 30.0, 50.0])
+    def test_estimate_direction(self, angle):
+        """GCC-PHAT finds the source angle within a few degrees."""
+        stereo, _ = _source_at(angle, samples=24000, seed=1)
+
+        estimate = BeamformerDAS().estimate_direction(stereo)
+
+        assert estimate == pytest.approx(angle, abs=4.0)
+
+    @pytest.mark.satellite
+    def test_estimate_direction_with_noise(self):
+        """Speech-like bursts dominate uncorrelated background noise."""
+        stereo, _ = _source_at(-35.0, samples=24000, seed=2)
+        envelope = np.repeat(np.arange(24000 // 2000) % 2, 2000)  # Bursts of 125ms
+        rng = np.random.default_rng(3)
+        noisy = stereo * envelope + rng.normal(0, 0.02, stereo.shape)
+
+        estimate = BeamformerDAS().estimate_direction(noisy.astype(np.float32))
+
+        assert estimate == pytest.approx(-35.0, abs=5.0)
+
+    @pytest.mark.satellite
+    def test_silence_has_no_direction(self):
+        """Silence and too little audio give None."""
+        bf = BeamformerDAS()
+
+        assert bf.estimate_direction() is None
+        assert bf.estimate_direction(np.zeros((2, 4096), dtype=np.float32)) is None
+
+    @pytest.mark.satellite
+    def test_steer_to_talker_uses_recent_audio(self):
+        """steer_to_talker() estimates from the audio that went through process()."""
+        stereo, _ = _source_at(40.0, samples=32000, seed=4)
+        bf = BeamformerDAS(doa_seconds=1.0)
+        for i in range(0, 32000, 1280):
+            bf.process(stereo[:, i:i + 1280])
+
+        angle = bf.steer_to_talker()
+
+        assert bf.recent_audio().shape == (2, 16000)
+        np.testing.assert_array_equal(bf.recent_audio(), stereo[:, -16000:])
+        assert angle == pytest.approx(40.0, abs=4.0)
+        assert bf.steering_angle == angle
+        assert bf._delay_samples == pytest.approx(bf._calculate_delay(40.0), abs=0.2)
+
+    @pytest.mark.satellite
+    def test_reset_drops_state(self):
+        """reset() clears carried samples and recent audio."""
+        bf = BeamformerDAS(steering_angle=45.0)
+        bf.process(np.ones((2, 1280), dtype=np.float32))
+
+        bf.reset()
+
+        assert bf.recent_audio().shape == (2, 0)
+        out = bf.process(np.zeros((2, 64), dtype=np.float32))
+        np.testing.assert_array_equal(out, 0)
+
+
+class TestSatelliteAutoSteer:
+    """Tests for auto-steering in the satellite session flow."""
+
+    def _satellite(self, auto_steer: bool) -> Satellite:
+        config = Config()
+        config.audio.beamforming.enabled = True
+        config.audio.beamforming.steering_angle = 10.0
+        config.audio.beamforming.auto_steer = auto_steer
+        with patch.object(Satellite, "_init_components"):
+            sat = Satellite(config)
+        sat._state = SatelliteState.IDLE
+        sat.audio_capture = MagicMock()
+        sat.audio_capture.steer_to_talker.return_value = -42.0
+        sat.vad = MagicMock()
+        sat.wakeword = MagicMock()
+        sat.leds = MagicMock()
+        sat.ws_client = MagicMock()
+        sat.ws_client.send_wakeword_detected = AsyncMock(return_value="sat-1-123")
+        return sat
+
+    @pytest.mark.satellite
+    def test_wakeword_steers_and_reset_restores(self):
+        """Wake word steers to the talker; the session reset restores the configured angle."""
+        sat = self._satellite(auto_steer=True)
+
+        asyncio.run(sat._on_wakeword_detected("alexa", 0.9))
+        sat.audio_capture.steer_to_talker.assert_called_once()
+
+        asyncio.run(sat._reset_session("test"))
+        sat.audio_capture.set_steering_angle.assert_called_once_with(10.0)
+
+    @pytest.mark.satellite
+    def test_auto_steer_disabled(self):
+        """With auto_steer off the beam stays where it was configured."""
+        sat = self._satellite(auto_steer=False)
+
+        asyncio.run(sat._on_wakeword_detected("alexa", 0.9))
+        asyncio.run(sat._reset_session("test"))
+
+        sat.audio_capture.steer_to_talker.assert_not_called()
+        sat.audio_capture.set_steering_angle.assert_not_called()
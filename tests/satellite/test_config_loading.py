@@ -127,6 +127,7 @@ audio:
     enabled: true
     mic_spacing: 0.065
     steering_angle: 15.0
+    auto_steer: false
 
 wakeword:
   model: "hey_mycroft"
@@ -187,6 +188,7 @@ button:
         assert config.audio.beamforming.enabled is True
         assert config.audio.beamforming.mic_spacing == 0.065
         assert config.audio.beamforming.steering_angle == 15.0
+        assert config.audio.beamforming.auto_steer is False
 
         # Wakeword section
         assert config.wakeword.model == "hey_mycroft"
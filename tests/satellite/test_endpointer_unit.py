@@ -0,0 +1,201 @@
+"""
+Endpointer Unit Tests
+
+Tests for renfield_satellite.audio.endpointer.Endpointer, the frame-level
+VAD in VoiceActivityDetector.process_chunk and a replay harness:
+- Every VAD frame is evaluated; incomplete frames carry over to the next chunk
+- Onset, hangover and hysteresis keep short pauses and clicks from
+  ending or restarting an utterance
+- The noise floor adapts, so a loud but steady background counts as silence
+- WAV fixtures (fixtures/endpointing/cases.json) are replayed through the
+  satellite's audio path; the recording must end after the speech and
+  within silence_duration_ms of it
+"""
+
+import asyncio
+import json
+import os
+import wave
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from renfield_satellite.audio.endpointer import Endpointer
+from renfield_satellite.audio.frame_analysis import AnalyzedChunk
+from renfield_satellite.audio.preprocessor import AudioPreprocessor
+from renfield_satellite.audio.vad import VADBackend, VoiceActivityDetector
+from renfield_satellite.config import Config
+from renfield_satellite.satellite import Satellite, SatelliteState
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "endpointing")
+FRAME_MS = 30.0
+
+
+def _feed(endpointer: Endpointer, probability: float, level_db: float, ms: float) -> float:
+    frames = int(ms / FRAME_MS)
+    return endpointer.update([probability] * frames, [level_db] * frames, FRAME_MS)
+
+
+class TestFrameVAD:
+    """Tests for VoiceActivityDetector.process_chunk frame handling."""
+
+    @pytest.mark.satellite
+    def test_every_frame_evaluated_with_carry(self):
+        vad = VoiceActivityDetector(backend=VADBackend.RMS, rms_threshold=350.0)
+        speech_at_end = np.r_[np.zeros(960), np.full(320, 1000)].astype(np.int16).tobytes()
+
+        first = AnalyzedChunk(speech_at_end)
+        assert vad.process_chunk(first) is False  # The speech frame is still incomplete
+        assert first.frame_probabilities.tolist() == [0.0, 0.0]
+
+        second = AnalyzedChunk(np.full(160, 1000, dtype=np.int16).tobytes())
+        assert vad.process_chunk(second) is True
+        assert second.frame_probabilities.tolist() == [1.0]
+        assert second.frame_db[0] == pytest.approx(20 * np.log10(1000 / 32768), abs=0.01)
+
+    @pytest.mark.satellite
+    def test_reset_drops_carry(self):
+        vad = VoiceActivityDetector(backend=VADBackend.RMS)
+        vad.process_chunk(AnalyzedChunk(np.full(400, 1000, dtype=np.int16).tobytes()))
+
+        vad.reset()
+        chunk = AnalyzedChunk(np.zeros(480, dtype=np.int16).tobytes())
+        vad.process_chunk(chunk)
+
+        assert chunk.frame_probabilities.tolist() == [0.0]
+
+
+class TestEndpointer:
+    """Tests for Endpointer state."""
+
+    @pytest.mark.satellite
+    def test_clear_silence_after_speech_reaches_threshold(self):
+        endpointer = Endpointer(silence_duration_ms=1500, hangover_ms=300)
+        _feed(endpointer, 0.0, -60, 300)  # Background
+        _feed(endpointer, 1.0, -20, 900)
+        assert endpointer.speech_heard
+
+        assert _feed(endpointer, 0.0, -60, 1200) < 0.95
+        assert _feed(endpointer, 0.0, -60, 330) >= 0.95
+
+    @pytest.mark.satellite
+    def test_short_pause_within_hangover_keeps_zero(self):
+        endpointer = Endpointer(hangover_ms=300)
+        _feed(endpointer, 0.0, -60, 300)
+        _feed(endpointer, 1.0, -20, 600)
+
+        assert _feed(endpointer, 0.0, -60, 270) == 0.0
+        _feed(endpointer, 1.0, -20, 30)  # Hysteresis: one frame continues the utterance
+        assert endpointer.in_speech
+
+    @pytest.mark.satellite
+    def test_click_does_not_reset_silence(self):
+        endpointer = Endpointer(onset_ms=90)
+        _feed(endpointer, 0.0, -60, 300)
+        _feed(endpointer, 1.0, -20, 900)
+        before = _feed(endpointer, 0.0, -60, 900)
+
+        after = _feed(endpointer, 1.0, -20, 30)  # Single loud frame, shorter than onset
+
+        assert after == pytest.approx(before)
+
+    @pytest.mark.satellite
+    def test_steady_noise_counts_as_silence(self):
+        endpointer = Endpointer(silence_duration_ms=1500)
+        _feed(endpointer, 1.0, -30, 600)  # RMS backend: loud fan is "speech"
+
+        assert not endpointer.speech_heard
+        assert endpointer.noise_floor_db == pytest.approx(-30)
+        assert endpointer.end_of_utterance_probability > 0.0
+
+    @pytest.mark.satellite
+    def test_leading_silence_counts_half(self):
+        leading = Endpointer(silence_duration_ms=1500, hangover_ms=300)
+        trailing = Endpointer(silence_duration_ms=1500, hangover_ms=300)
+        _feed(trailing, 0.0, -60, 300)
+        _feed(trailing, 1.0, -20, 300)
+
+        assert _feed(leading, 0.0, -60, 1500) < _feed(trailing, 0.0, -60, 1500)
+
+    @pytest.mark.satellite
+    def test_reset_keeps_noise_floor(self):
+        endpointer = Endpointer()
+        endpointer.track_noise(-45, 80)
+        _feed(endpointer, 1.0, -20, 300)
+
+        endpointer.reset()
+
+        assert not endpointer.speech_heard
+        assert endpointer.end_of_utterance_probability == 0.0
+        assert endpointer.noise_floor_db < -40
+
+
+def _cases() -> list:
+    with open(os.path.join(FIXTURES, "cases.json")) as f:
+        return json.load(f)
+
+
+def _read_wav(name: str) -> bytes:
+    with wave.open(os.path.join(FIXTURES, name), "rb") as wav:
+        assert (wav.getframerate(), wav.getsampwidth(), wav.getnchannels()) == (16000, 2, 1)
+        return wav.readframes(wav.getnframes())
+
+
+def replay(pcm: bytes, listen_from_ms: float, config: Config) -> Optional[float]:
+    """
+    Feed a recording through Satellite._on_audio_chunk.
+
+    IDLE until listen_from_ms (wake word), then LISTENING. Returns the
+    audio time in ms at which the recording was ended for silence, or None.
+    """
+    with patch.object(Satellite, "_init_components"):
+        sat = Satellite(config)
+    sat.preprocessor = AudioPreprocessor(noise_reduce_enabled=False)
+    sat.vad = VoiceActivityDetector(
+        backend=VADBackend(config.vad.backend), rms_threshold=config.vad.silence_threshold,
+    )
+    sat.wakeword = MagicMock(active_stop_words=[])
+    sat.wakeword.process_audio.return_value = None
+    sat.ws_client = MagicMock()
+    scheduled = []
+    sat._schedule_async = scheduled.append
+    sat._state = SatelliteState.IDLE
+
+    chunk_bytes = config.audio.chunk_size * 2
+    for offset in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes):
+        end_ms = (offset + chunk_bytes) / 2 / config.audio.sample_rate * 1000
+        if sat._state == SatelliteState.IDLE and end_ms > listen_from_ms:
+            sat._state = SatelliteState.LISTENING
+            sat._session_id = "replay"
+        sat._on_audio_chunk(pcm[offset:offset + chunk_bytes])
+
+        reasons = []
+        for coro in scheduled:
+            if not asyncio.iscoroutine(coro):
+                continue  # Mocked ws_client call
+            if coro.__name__ == "_end_listening":
+                reasons.append(coro.cr_frame.f_locals["reason"])
+            coro.close()
+        scheduled.clear()
+        if "silence" in reasons:
+            return end_ms
+    return None
+
+
+class TestReplay:
+    """Replay recorded utterances through the satellite audio path."""
+
+    @pytest.mark.satellite
+    @pytest.mark.parametrize("case", _cases(), ids=lambda case: case["wav"])
+    def test_recording_ends_after_speech(self, case):
+        config = Config()
+        config.vad.backend = case.get("backend", "rms")
+        config.vad.min_listening_seconds = 1.0
+        chunk_ms = config.audio.chunk_size / config.audio.sample_rate * 1000
+
+        end_ms = replay(_read_wav(case["wav"]), case["listen_from_ms"], config)
+
+        assert end_ms is not None, "recording never ended for silence"
+        assert end_ms >= case["speech_end_ms"] + config.vad.hangover_ms
+        assert end_ms <= case["speech_end_ms"] + config.vad.silence_duration_ms + 2 * chunk_ms
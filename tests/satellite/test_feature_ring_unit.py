@@ -0,0 +1,201 @@
+"""
+Feature Ring Unit Tests
+
+Tests for renfield_satellite.wakeword.feature_ring.FeatureRing and the
+shared micro-wakeword inference in WakeWordDetector:
+- Ring keeps the newest frames in order, wraps and clamps to capacity
+- All TFLite models read the same quantized windows; features and
+  quantization are computed once per chunk
+- Detection, refractory period and reset skip already buffered frames
+- Benchmark reports the real-time factor
+"""
+
+import numpy as np
+import pytest
+from renfield_satellite.audio.frame_analysis import AnalyzedChunk
+from renfield_satellite.cli.wakeword_bench import run, synthetic_audio
+from renfield_satellite.wakeword.detector import WakeWordDetector, WakeWordModel
+from renfield_satellite.wakeword.feature_ring import FeatureRing
+
+
+def _frames(start: int, count: int, dims: int = 4) -> list:
+    return [np.full((1, 1, dims), float(i)) for i in range(start, start + count)]
+
+
+class TestFeatureRing:
+    """Tests for FeatureRing."""
+
+    @pytest.mark.satellite
+    def test_ordered_before_wrap(self):
+        ring = FeatureRing(capacity=8)
+        ring.extend(_frames(0, 5))
+
+        assert ring.count == 5
+        assert ring.oldest == 0
+        assert ring.ordered()[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+    @pytest.mark.satellite
+    def test_wraps_and_keeps_newest(self):
+        ring = FeatureRing(capacity=4)
+        ring.extend(_frames(0, 3))
+        ring.extend(_frames(3, 3))
+
+        assert ring.oldest == 2
+        assert ring.ordered()[:, 0].tolist() == [2, 3, 4, 5]
+
+    @pytest.mark.satellite
+    def test_block_larger_than_capacity(self):
+        ring = FeatureRing(capacity=4)
+        ring.extend(_frames(0, 1))
+        ring.extend(_frames(1, 9))
+
+        assert ring.count == 10
+        assert ring.ordered()[:, 0].tolist() == [6, 7, 8, 9]
+        assert ring.ordered().shape == (4, 4)
+
+    @pytest.mark.satellite
+    def test_empty_extend(self):
+        ring = FeatureRing()
+        ring.extend([])
+
+        assert ring.count == 0
+        assert len(ring.ordered()) == 0
+
+
+class FakeInterpreter:
+    """TFLite interpreter stand-in; returns the scripted probabilities in order"""
+
+    def __init__(self, probabilities=()):
+        self.inputs = []
+        self._probabilities = list(probabilities)
+        self._output = np.array([[-128]], dtype=np.int8)
+
+    def set_tensor(self, index, value):
+        self.inputs.append(value.copy())
+
+    def invoke(self):
+        prob = self._probabilities.pop(0) if self._probabilities else 0.0
+        self._output = np.array([[round(prob * 256) - 128]], dtype=np.int8)
+
+    def get_tensor(self, index):
+        return self._output
+
+
+def _model(name: str, interpreter: FakeInterpreter) -> WakeWordModel:
+    return WakeWordModel(
+        id=name,
+        name=name,
+        path="builtin",
+        model_type="micro_tflite",
+        threshold=0.5,
+        model=interpreter,
+        input_details={"index": 0, "shape": np.array([1, 3, 4]), "quantization": (0.5, 0)},
+        output_details={"index": 1, "quantization": (1 / 256, -128)},
+    )
+
+
+class FakeFeatures:
+    """Micro frontend stand-in: 8 frames per chunk, counting upwards"""
+
+    def __init__(self):
+        self.calls = 0
+        self.frame = 0
+
+    def process_streaming(self, audio_bytes):
+        self.calls += 1
+        frames = _frames(self.frame, 8)
+        self.frame += 8
+        return iter(frames)
+
+
+def _detector(wake: dict, stop: dict = None) -> WakeWordDetector:
+    detector = WakeWordDetector(keywords=[], stop_words=[])
+    detector._micro_features = FakeFeatures()
+    detector._wake_models.update(wake)
+    detector._stop_models.update(stop or {})
+    detector._loaded = True
+    return detector
+
+
+_SILENCE = np.zeros(1280, dtype=np.int16).tobytes()
+
+
+class TestSharedInference:
+    """All TFLite models share features and quantized windows."""
+
+    @pytest.mark.satellite
+    def test_models_read_identical_windows(self):
+        a, b, stop = FakeInterpreter(), FakeInterpreter(), FakeInterpreter()
+        detector = _detector({"a": _model("a", a), "b": _model("b", b)}, {"stop": _model("stop", stop)})
+
+        detector.process_audio(_SILENCE)
+        detector.process_audio(_SILENCE)
+
+        assert detector._micro_features.calls == 2
+        # 16 frames -> 5 windows of 3 per model, 1 frame left over
+        for interpreter in (a, b, stop):
+            assert len(interpreter.inputs) == 5
+            assert interpreter.inputs[0].shape == (1, 3, 4)
+            assert interpreter.inputs[0].dtype == np.int8
+        assert a.inputs[4][0, :, 0].tolist() == [24, 26, 28]  # Frames 12-14 quantized with scale 0.5
+        assert all(np.array_equal(x, y) for x, y in zip(a.inputs, stop.inputs, strict=True))
+        assert detector._wake_models["a"].next_frame == 15
+
+    @pytest.mark.satellite
+    def test_detection_skips_buffered_frames(self):
+        hit = FakeInterpreter([0.2, 0.9])
+        detector = _detector({"a": _model("a", hit)})
+
+        detection = detector.process_audio(_SILENCE)
+
+        assert detection.keyword == "a"
+        assert detection.confidence == pytest.approx(0.9, abs=0.01)
+        assert len(hit.inputs) == 2
+        assert detector._wake_models["a"].next_frame == detector._feature_ring.count
+
+    @pytest.mark.satellite
+    def test_refractory_model_skips_chunk(self):
+        a = FakeInterpreter()
+        detector = _detector({"a": _model("a", a)})
+        detector._last_detection_time["a"] = 1e18  # Far in the future: always in refractory period
+
+        detector.process_audio(_SILENCE)
+
+        assert a.inputs == []
+        assert detector._wake_models["a"].next_frame == 8
+
+    @pytest.mark.satellite
+    def test_reset_drops_pending_frames(self):
+        a = FakeInterpreter()
+        detector = _detector({"a": _model("a", a)})
+        detector.process_audio(_SILENCE)
+
+        detector.reset()
+
+        assert detector._wake_models["a"].next_frame == detector._feature_ring.count
+
+
+class TestBenchmark:
+    """Tests for the wake word benchmark."""
+
+    @pytest.mark.satellite
+    def test_run_reports_real_time_factor(self):
+        detector = _detector({"a": _model("a", FakeInterpreter())})
+        audio = synthetic_audio(2.0)
+
+        report = run(detector, audio)
+
+        assert report["audio_seconds"] == 2.0
+        assert report["models"] == ["a"]
+        assert report["real_time_factor"] >= 0.0
+        assert set(report["stage_cpu_seconds"]) == {"features", "wakeword"}
+        assert detector._micro_features.calls == len(audio) // 2560
+
+    @pytest.mark.satellite
+    def test_chunk_is_analyzed_once(self):
+        chunk = AnalyzedChunk(_SILENCE)
+        detector = _detector({"a": _model("a", FakeInterpreter())})
+
+        detector.process_audio(chunk)
+
+        assert len(chunk.features) == 8
@@ -0,0 +1,155 @@
+"""
+Frame Analysis Unit Tests
+
+Tests for renfield_satellite.audio.frame_analysis and its consumers:
+- AnalyzedChunk levels match the per-consumer calculations they replace
+- StageTimer reports CPU usage per stage and resets on snapshot
+- VAD and normalization reuse the decoded chunk
+- Micro-frontend features are computed once per chunk for all models
+- Heartbeat metrics include the per-stage CPU usage
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from renfield_satellite.audio.frame_analysis import AnalyzedChunk, StageTimer
+from renfield_satellite.audio.preprocessor import AudioPreprocessor
+from renfield_satellite.audio.vad import VADBackend, VoiceActivityDetector
+from renfield_satellite.config import Config
+from renfield_satellite.satellite import Satellite, SatelliteState
+from renfield_satellite.wakeword.detector import WakeWordDetector, WakeWordModel
+
+
+def _pcm(values) -> bytes:
+    return np.asarray(values, dtype=np.int16).tobytes()
+
+
+class TestAnalyzedChunk:
+    """Tests for AnalyzedChunk."""
+
+    @pytest.mark.satellite
+    def test_levels_match_preprocessor(self):
+        rng = np.random.default_rng(1)
+        pcm = _pcm(rng.integers(-8000, 8000, 1280))
+        chunk = AnalyzedChunk(pcm)
+        pp = AudioPreprocessor(noise_reduce_enabled=False)
+
+        assert chunk.rms == pytest.approx(pp.get_rms(pcm), rel=1e-5)
+        assert chunk.db == pytest.approx(20 * np.log10(chunk.rms / 32768.0))
+        assert chunk.normalized.max() <= 1.0
+
+    @pytest.mark.satellite
+    def test_empty_and_odd_length(self):
+        assert AnalyzedChunk(b"").rms == 0.0
+        assert AnalyzedChunk(b"").db == pytest.approx(-90.3, abs=0.1)
+        assert len(AnalyzedChunk(_pcm([100, 100]) + b"\x01").samples) == 2
+
+
+class TestStageTimer:
+    """Tests for StageTimer."""
+
+    @pytest.mark.satellite
+    def test_run_returns_result_and_snapshot_resets(self):
+        timer = StageTimer()
+
+        assert timer.run("decode", sum, [1, 2, 3]) == 6
+        usage = timer.snapshot()
+
+        assert set(usage) == {"decode"}
+        assert usage["decode"] >= 0.0
+        assert timer.snapshot() == {}
+
+    @pytest.mark.satellite
+    def test_counts_time_on_exception(self):
+        timer = StageTimer()
+
+        with pytest.raises(ZeroDivisionError):
+            timer.run("vad", lambda: 1 / 0)
+
+        assert "vad" in timer.snapshot()
+
+
+class TestConsumers:
+    """VAD and normalization on an analyzed chunk."""
+
+    @pytest.mark.satellite
+    def test_vad_process_chunk_stores_result(self):
+        vad = VoiceActivityDetector(backend=VADBackend.RMS, rms_threshold=350.0)
+        loud = AnalyzedChunk(_pcm([1000] * 480))
+        quiet = AnalyzedChunk(_pcm([10] * 480))
+
+        assert vad.process_chunk(loud) is True
+        assert loud.speech_probability == 1.0
+        assert vad.process_chunk(quiet) is False
+        assert quiet.is_speech is False
+
+    @pytest.mark.satellite
+    def test_normalize_chunk_matches_normalize(self):
+        pp = AudioPreprocessor(noise_reduce_enabled=False, target_db=-20.0)
+        pcm = _pcm(np.linspace(-3000, 3000, 640))
+        chunk = AnalyzedChunk(pcm)
+
+        assert pp.normalize_chunk(chunk) == pp.normalize(pcm)
+        assert chunk.samples[0] == -3000.0  # Shared samples are not modified
+
+
+class TestSharedFeatures:
+    """Micro-frontend features are shared by all micro models."""
+
+    @staticmethod
+    def _detector(model_count: int) -> WakeWordDetector:
+        detector = WakeWordDetector(keywords=[], stop_words=[])
+        detector._micro_features = MagicMock()
+        detector._micro_features.process_streaming.side_effect = lambda audio: iter([np.zeros((1, 40))])
+        for i in range(model_count):
+            model = MagicMock()
+            model.process_streaming.return_value = False
+            detector._wake_models[f"kw{i}"] = WakeWordModel(
+                id=f"kw{i}", name=f"kw{i}", path="builtin", model_type="micro", threshold=0.5, model=model,
+            )
+        detector._loaded = True
+        return detector
+
+    @pytest.mark.satellite
+    def test_features_computed_once_per_chunk(self):
+        detector = self._detector(3)
+
+        assert detector.process_audio(_pcm([0] * 1280)) is None
+
+        detector._micro_features.process_streaming.assert_called_once()
+        for model in detector._wake_models.values():
+            model.model.process_streaming.assert_called_once()
+        assert set(detector.stage_timer.snapshot()) == {"features", "wakeword"}
+
+    @pytest.mark.satellite
+    def test_precomputed_features_reused(self):
+        detector = self._detector(1)
+        chunk = AnalyzedChunk(_pcm([0] * 1280))
+        chunk.features = [np.ones((1, 40))]
+
+        detector.process_audio(chunk)
+
+        detector._micro_features.process_streaming.assert_not_called()
+        detector._wake_models["kw0"].model.process_streaming.assert_called_once_with(chunk.features[0])
+
+
+class TestSatelliteMetrics:
+    """Audio chunk handling reports stage CPU usage."""
+
+    @pytest.mark.satellite
+    def test_heartbeat_reports_stage_cpu(self):
+        with patch.object(Satellite, "_init_components"):
+            sat = Satellite(Config())
+        sat._state = SatelliteState.IDLE
+        sat.wakeword = MagicMock()
+        sat.wakeword.process_audio.return_value = None
+
+        sat._on_audio_chunk(_pcm([1000] * 1280))
+        metrics = sat._get_metrics()
+
+        assert metrics["audio_rms"] == 1000.0
+        assert metrics["is_speech"] is True
+        assert "decode" in metrics["audio_cpu_percent"]
+        chunk = sat.wakeword.process_audio.call_args.args[0]
+        assert isinstance(chunk, AnalyzedChunk)
@@ -0,0 +1,137 @@
+"""
+Pre-roll Unit Tests
+
+Tests for renfield_satellite.audio.ring_buffer.PCMRingBuffer and the
+satellite pre-roll flow:
+- Ring keeps the most recent bytes, wraps around, clamps to capacity
+- Audio before the wake word detection and during the session handshake
+  is streamed with the new session, in order and without duplicates
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import numpy as np
+import pytest
+from renfield_satellite.audio.ring_buffer import PCMRingBuffer
+from renfield_satellite.audio.vad import VoiceActivityDetector
+from renfield_satellite.config import Config
+from renfield_satellite.satellite import Satellite, SatelliteState
+
+
+class TestPCMRingBuffer:
+    """Tests for PCMRingBuffer."""
+
+    @pytest.mark.satellite
+    def test_read_since_position(self):
+        ring = PCMRingBuffer(10)
+        ring.write(b"abcd")
+        mark = ring.position
+        ring.write(b"efg")
+
+        assert ring.read_since(mark) == b"efg"
+        assert ring.read_since(0) == b"abcdefg"
+        assert ring.read_since(ring.position) == b""
+
+    @pytest.mark.satellite
+    def test_wraps_and_clamps_to_capacity(self):
+        ring = PCMRingBuffer(6)
+        for chunk in (b"0123", b"4567", b"89"):
+            ring.write(chunk)
+
+        assert ring.position == 10
+        assert ring.read_since(0) == b"456789"
+        assert ring.read_since(7) == b"789"
+
+    @pytest.mark.satellite
+    def test_write_larger_than_capacity(self):
+        ring = PCMRingBuffer(4)
+        ring.write(b"x")
+        ring.write(b"abcdefgh")
+
+        assert ring.read_since(0) == b"efgh"
+
+    @pytest.mark.satellite
+    def test_zero_capacity(self):
+        ring = PCMRingBuffer(0)
+        ring.write(b"abcd")
+
+        assert ring.position == 4
+        assert ring.read_since(0) == b""
+
+
+def _chunk(value: int, samples: int = 1280) -> bytes:
+    return np.full(samples, value, dtype=np.int16).tobytes()
+
+
+@pytest.fixture
+def satellite():
+    """Satellite without hardware; scheduled coroutines are collected, not run."""
+    config = Config()
+    config.audio.preroll_ms = 160  # Two 80 ms chunks
+    with patch.object(Satellite, "_init_components"):
+        sat = Satellite(config)
+    sat._state = SatelliteState.IDLE
+    sat.leds = MagicMock()
+    sat.preprocessor = MagicMock(normalize_chunk=lambda chunk: chunk.pcm)
+    sat.vad = VoiceActivityDetector()
+    sat.wakeword = MagicMock(active_stop_words=[])
+    sat.wakeword.process_audio.return_value = None
+    sat.ws_client = MagicMock()
+    sat.ws_client.send_wakeword_detected = AsyncMock(return_value="sat-1-123")
+    sat.ws_client.send_audio_chunk = MagicMock(side_effect=lambda sid, audio: ("audio", sid, audio))
+    sat.scheduled = []
+    sat._schedule_async = sat.scheduled.append
+    return sat
+
+
+class TestSatellitePreroll:
+    """Tests for streaming pre-roll with a new session."""
+
+    @pytest.mark.satellite
+    def test_preroll_and_handshake_audio_streamed_in_order(self, satellite):
+        for value in (1, 2, 3):
+            satellite._on_audio_chunk(_chunk(value))
+
+        satellite.wakeword.process_audio.return_value = MagicMock(
+            keyword="hey_jarvis", confidence=0.9, is_stop_word=False
+        )
+        satellite._on_audio_chunk(_chunk(4))  # Wake word fires on this chunk
+        satellite.wakeword.process_audio.return_value = None
+        satellite._on_audio_chunk(_chunk(5))  # Arrives while the handshake is pending
+
+        assert satellite._wakeword_pending
+        assert len(satellite.scheduled) == 1
+        asyncio.run(satellite.scheduled.pop())
+        assert satellite._state == SatelliteState.LISTENING
+
+        satellite._on_audio_chunk(_chunk(6))
+
+        sent = [np.frombuffer(audio, dtype=np.int16)[0] for _, sid, audio in satellite.scheduled]
+        assert {sid for _, sid, _ in satellite.scheduled} == {"sat-1-123"}
+        # Pre-roll (chunks 3 + 4), handshake (5), then live audio (6)
+        assert sent == [3, 4, 5, 6]
+        assert len(satellite._audio_buffer) == 4
+
+        satellite._on_audio_chunk(_chunk(7))
+        assert np.frombuffer(satellite.scheduled[-1][2], dtype=np.int16)[0] == 7
+        assert len(satellite.scheduled) == 5
+
+    @pytest.mark.satellite
+    def test_manual_trigger_streams_without_preroll(self, satellite):
+        for value in (1, 2):
+            satellite._on_audio_chunk(_chunk(value))
+
+        asyncio.run(satellite._on_wakeword_detected("manual", 1.0))
+        satellite._on_audio_chunk(_chunk(3))
+
+        assert [np.frombuffer(audio, dtype=np.int16)[0] for _, _, audio in satellite.scheduled] == [3]
+
+    @pytest.mark.satellite
+    def test_reset_drops_pending_stream_position(self, satellite):
+        satellite._session_id = "sat-1-123"
+        satellite._stream_from = 0
+
+        asyncio.run(satellite._reset_session("test"))
+
+        assert satellite._stream_from is None